@@ -50,7 +50,8 @@ def version_info(*paths):
 version, version_range = version_info('src', 'genie', 'libs', 'parser', '__init__.py')
 
 # generate package dependencies
-install_requires = ['xmltodict']
+install_requires = ['xmltodict',
+                    "importlib_metadata; python_version < '3.8'"]
 
 # launch setup
 setup(
@@ -13,12 +13,21 @@ __author__ = 'Cisco Systems Inc.'
 __contact__ = ['pyats-support@cisco.com', 'pyats-support-ext@cisco.com']
 __copyright__ = 'Copyright (c) 2018, Cisco Systems Inc.'
 
-from .base import tcl_invoke_ats_cmd,\
-                  tcl_package_require_caas,\
-                  tcl_package_require_caas_parsers,\
-                  tcl_invoke_caas_abstract_parser,\
-                  CaasMetaParser
-
 from genie import abstract
 abstract.declare_package(feature='parser')
 
+# legacy TCL/CaaS helpers from .base, imported on first access so that
+# importing the package does not pull in the metaparser and TCL machinery
+_LAZY_BASE = ('tcl_invoke_ats_cmd',
+              'tcl_package_require_caas',
+              'tcl_package_require_caas_parsers',
+              'tcl_invoke_caas_abstract_parser',
+              'CaasMetaParser')
+
+
+def __getattr__(name):
+    if name in _LAZY_BASE:
+        from . import base
+        return getattr(base, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
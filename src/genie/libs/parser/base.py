@@ -8,43 +8,47 @@ __all__ = (
 
 import os
 
-try:
-    from pyats import tcl
-    from pyats.tcl import tclstr, TclCommand
-except Exception:
-    pass
-
 from genie.metaparser import MetaParser
 
 
+def _tcl():
+    # pyats.tcl starts an interpreter, only import it once a CaaS parser runs
+    from pyats import tcl
+    return tcl
+
+
 def tcl_invoke_ats_cmd(cmd, *, cast_=None, **kwargs):
+    tcl = _tcl()
 
-    cmd = TclCommand(cmd, keywords=kwargs, cast=tcl.cast_list)
+    cmd = tcl.TclCommand(cmd, keywords=kwargs, cast=tcl.cast_list)
     result = cmd()
     result_code = result[0]
     result_msg = result[1] if len(result) == 2 else result[1:]
     try:
         result_code = tcl.cast_int(result[0])
     except ValueError:
-        result_code = tclstr(result[0])
+        result_code = tcl.tclstr(result[0])
     if result_code in ('passed', 1):
         if cast_:
             result_msg = cast_(result_msg)
         return result_msg
     else:
-        raise RuntimeError(tclstr(result_msg))
+        raise RuntimeError(tcl.tclstr(result_msg))
 
 
 def tcl_package_require_caas():
+    tcl = _tcl()
+
     if 'XBU_SHARED' in os.environ \
             and os.environ['XBU_SHARED'] not in \
-            tcl.cast_list(tcl.get_var('::auto_path'), item_cast=tclstr):
+            tcl.cast_list(tcl.get_var('::auto_path'), item_cast=tcl.tclstr):
         tcl.call('lappend', '::auto_path', os.environ['XBU_SHARED'])
     tcl.call('package', 'require', 'cAAs')
 
 
 def tcl_package_require_caas_parsers():
     tcl_package_require_caas()
+    tcl = _tcl()
     tcl.call('package', 'require', 'IOS_Parser')
     tcl.call('package', 'require', 'IOSXE_Parser')
     tcl.call('package', 'require', 'NXOS_Parser')
@@ -56,6 +60,7 @@ def tcl_invoke_caas_abstract_parser(device, exec, *,
                                     cast_ = None,
                                     **kwargs):
     tcl_package_require_caas_parsers()
+    tcl = _tcl()
 
     try:
         device = device.handle
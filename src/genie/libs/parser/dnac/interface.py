@@ -26,6 +26,7 @@ from genie.metaparser.util.schemaengine import Schema, \
                                          Use
 # import parser utils
 from genie.libs.parser.utils.common import Common
+from genie.libs.parser.utils.rest import iter_pages, DEFAULT_PREFETCH
 
 logger = logging.getLogger(__name__)
 
@@ -92,37 +93,51 @@ class Interface(InterfaceSchema):
 
     cli_command = ['/dna/intent/api/v1/interface', 
                    '/dna/intent/api/v1/interface/{interface}']
-
-    def cli(self,interface="", output=None):
+    device_command = '/dna/intent/api/v1/network-device/{device_id}'
+
+    def cli(self, interface="", output=None, page_size=None,
+            prefetch=DEFAULT_PREFETCH):
+        '''
+            Args:
+                interface (`str`): interface id
+                output (`list`): interface objects, nothing is fetched
+                page_size (`int`): interfaces per page, the collection is
+                                   read page by page instead of in one
+                                   response (max 500)
+                prefetch (`int`): pages requested ahead when paginated
+        '''
         if output is None:
             if interface:
                 cmd = self.cli_command[1].format(interface=interface)
+                out = self.device.get(cmd).json()['response']
+            elif page_size:
+                out = iter_pages(self.device.get, self.cli_command[0],
+                                 limit=page_size, prefetch=prefetch)
             else:
-                cmd = self.cli_command[0]
-            out = self.device.get(cmd).json()['response']
+                out = self.device.get(self.cli_command[0]).json()['response']
 
         else:
             out = output
 
-        # get device by id
-        cmd = '/dna/intent/api/v1/network-device/{device_id}'
-
-        result_dict={}
+        result_dict = {}
         id_to_hostname = {}
         for intf_dict in out:
-            device_id = intf_dict['deviceId']
-            if device_id not in id_to_hostname:
-                device_id_cmd = cmd.format(device_id=device_id)
-                device_info = self.device.get(device_id_cmd).json()['response']
-                hostname = device_info['hostname']
-                id_to_hostname[device_id] = hostname
-            else:
-                hostname = id_to_hostname[device_id]
-
-            host_info = result_dict.setdefault('hostname', {}).setdefault(hostname, {}).setdefault('interfaces', {})
-            # remove None values
-            host_info[intf_dict['portName']] = {k: v 
-                                                for k, v in intf_dict.items() 
-                                                if v is not None}
+            self._add_interface(result_dict, intf_dict, id_to_hostname)
 
         return result_dict
+
+    def _add_interface(self, result_dict, intf_dict, id_to_hostname):
+        '''Add one interface object under its hostname'''
+        device_id = intf_dict['deviceId']
+        if device_id not in id_to_hostname:
+            # get device by id
+            device_id_cmd = self.device_command.format(device_id=device_id)
+            device_info = self.device.get(device_id_cmd).json()['response']
+            id_to_hostname[device_id] = device_info['hostname']
+        hostname = id_to_hostname[device_id]
+
+        host_info = result_dict.setdefault('hostname', {}).setdefault(hostname, {}).setdefault('interfaces', {})
+        # remove None values
+        host_info[intf_dict['portName']] = {k: v 
+                                            for k, v in intf_dict.items() 
+                                            if v is not None}
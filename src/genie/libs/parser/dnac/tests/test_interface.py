@@ -10,6 +10,8 @@ from genie.metaparser.util.exceptions import SchemaEmptyParserError, \
 
 # Parser
 from genie.libs.parser.dnac.interface import Interface
+from genie.libs.parser.utils.rest import RestClient
+from genie.libs.parser.utils.tests.fake_device import StubServer
 
 
 class TestInterfaceRest(unittest.TestCase):
@@ -220,6 +222,21 @@ class TestInterfaceRest(unittest.TestCase):
         parsed_output = obj.parse()
         self.assertEqual(parsed_output, self.golden_parsed_output)
 
+    def test_golden_paginated(self):
+        # the golden interfaces served one per page
+        interfaces = self.golden_response_output1['response']
+        page = '/dna/intent/api/v1/interface?offset={}&limit=1'
+        fixtures = {page.format(offset): {'response': interfaces[offset - 1:offset]}
+                    for offset in range(1, len(interfaces) + 3)}
+        fixtures['/dna/intent/api/v1/network-device/'
+                 'f34890c0-ff08-4562-af83-dfe516b2dcab'] = self.golden_response_output2
+
+        with StubServer(fixtures) as stub, RestClient(stub.url) as client:
+            obj = Interface(device=client)
+            parsed_output = obj.parse(page_size=1)
+        self.assertEqual(parsed_output, self.golden_parsed_output)
+        self.assertIn(page.format(3), stub.requests)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -23,6 +23,7 @@ from genie.metaparser.util.schemaengine import Schema, Any, Optional
 
 # parser utils
 from genie.libs.parser.utils.common import Common
+from genie.libs.parser.utils.interning import InternMixin
 
 
 # =============================================
@@ -66,7 +67,7 @@ class ShowArpSchema(MetaParser):
     }
 
 
-class ShowArp(ShowArpSchema):
+class ShowArp(InternMixin, ShowArpSchema):
     """ Parser for show arp
                   show arp <WROD>
                   show arp vrf <vrf>
@@ -75,6 +76,13 @@ class ShowArp(ShowArpSchema):
     cli_command = ['show arp','show arp vrf {vrf}','show arp vrf {vrf} {intf_or_ip}','show arp {intf_or_ip}']
     exclude = ['age']
 
+    # columnar mode, see utils.columnar
+    table_path = ('interfaces', '{interface}', 'ipv4', 'neighbors', '{ip}')
+
+    # interned with the keys, see utils.interning
+    intern_fields = ('ip', 'origin', 'age', 'type', 'protocol',
+                     'encap_type')
+
     def cli(self, vrf='', intf_or_ip='', cmd=None, output=None):
         if output is None:
             if not cmd:
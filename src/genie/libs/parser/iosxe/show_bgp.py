@@ -70,6 +70,12 @@ from genie.metaparser.util.schemaengine import Schema, Any, Or, Optional
 
 # Parser
 from genie.libs.parser.iosxe.show_vrf import ShowVrf
+from genie.libs.parser.utils.interning import InternMixin
+from genie.libs.parser.utils.records import RecordMixin
+from genie.libs.parser.utils.session import sub_parse
+from genie.libs.parser.utils.subcommands import execute_commands, \
+                                               execute_command, \
+                                               run_concurrently
 
 
 # ============================================
@@ -148,7 +154,7 @@ class ShowBgpSchema(MetaParser):
 #   * 'show ip bgp {address_family} rd {rd}'
 #   * 'show ip bgp {address_family} vrf {vrf}'
 # ============================================
-class ShowBgpSuperParser(ShowBgpSchema):
+class ShowBgpSuperParser(InternMixin, ShowBgpSchema):
 
     ''' Super Parser for:
         * 'show bgp all'
@@ -163,6 +169,10 @@ class ShowBgpSuperParser(ShowBgpSchema):
         * 'show ip bgp {address_family} vrf {vrf}'
     '''
 
+    # interned with the keys, see utils.interning
+    intern_fields = ('next_hop', 'origin_codes', 'path', 'status_codes',
+                     'route_distinguisher', 'default_vrf')
+
     def cli(self, address_family='', vrf='', output=None):
 
         # Init dictionary
@@ -761,7 +771,8 @@ class ShowBgpAllDetailSchema(MetaParser):
 #   * 'show ip bgp {address_family} vrf {vrf} detail'
 #   * 'show ip bgp {address_family} rd {rd} detail'
 # ======================================================
-class ShowBgpDetailSuperParser(ShowBgpAllDetailSchema):
+class ShowBgpDetailSuperParser(RecordMixin, InternMixin,
+                               ShowBgpAllDetailSchema):
 
     ''' Super Parser for:
         * 'show bgp all detail'
@@ -772,6 +783,18 @@ class ShowBgpDetailSuperParser(ShowBgpAllDetailSchema):
         * 'show ip bgp {address_family} rd {rd} detail'
     '''
 
+    # interned with the keys, see utils.interning
+    intern_fields = ('next_hop', 'next_hop_via', 'gateway', 'originator',
+                     'origin_codes', 'status_codes', 'route_info',
+                     'route_status', 'community', 'ext_community',
+                     'cluster_list', 'update_group', 'route_distinguisher',
+                     'default_vrf', 'weight', 'next_hop_igp_metric')
+
+    # parse(records=True) emits the paths as records, see utils.records
+    record_paths = (('instance', 'default', 'vrf', '{vrf}', 'address_family',
+                     '{address_family}', 'prefixes', '{prefix}', 'index',
+                     '{index}'),)
+
     def cli(self, address_family='', vrf='', rd='', evi='', rt='', output=None):
         # Init dictionary
         ret_dict = {}
@@ -1943,16 +1966,15 @@ class ShowBgpSummarySuperParser(ShowBgpSummarySchema):
         if not vrf:
             vrf ='default'
 
-        show_vrf_output = None
-        if ('rd' in cmd and 'summary' in cmd and
-            output != '% RD does not match the default RD of any VRF'):
-            obj = ShowVrf(device=self.device)
-            show_vrf_output = obj.parse()
-            # try:
-            #     show_vrf_output = obj.parse()
-            # except Exception:
-            #     pass
+        # Sub-commands are declared first and executed together, concurrently
+        # when the device allows it
+        sub_commands = []
+        fetch_vrfs = ('rd' in cmd and 'summary' in cmd and
+                      output != '% RD does not match the default RD of any VRF')
+        if fetch_vrfs:
+            sub_commands.append(ShowVrf.cli_command[0])
 
+        commands_list = []
         if address_family.lower() not in ['ipv4 unicast', 'ipv6 unicast']:
            
             if ('all summary' in cmd and 
@@ -1965,37 +1987,47 @@ class ShowBgpSummarySuperParser(ShowBgpSummarySchema):
                 else:
                     commands_list = ['show run | sec address-family ipv4 vrf',
                                      'show run | sec address-family ipv6 vrf']
-                
-                for command in commands_list:
-                    out_vrf = self.device.execute(command)
+                sub_commands.extend(commands_list)
 
-                    rc1 = re.compile(r'address\-family\s+(?P<address_family>'
-                                      r'ipv4|ipv6)\s+vrf\s+(?P<vrf>\S+)')
+        sub_outputs = execute_commands(self.device, sub_commands)
 
-                    rc2 = re.compile(r'neighbor\s+(?P<neighbor_address>\S+)\s+'
-                                r'remote\-as\s+(?P<remote_as>\S+)')
+        show_vrf_output = None
+        if fetch_vrfs:
+            # memoized by the parse session of the device
+            show_vrf_output = sub_parse(
+                self.device, ShowVrf,
+                output=sub_outputs[ShowVrf.cli_command[0]])
 
-                    flag_address_family = False            
+        for command in commands_list:
+            out_vrf = sub_outputs[command]
 
-                    for line in out_vrf.splitlines():
-                        line = line.strip()
+            rc1 = re.compile(r'address\-family\s+(?P<address_family>'
+                              r'ipv4|ipv6)\s+vrf\s+(?P<vrf>\S+)')
 
-                        result = rc1.match(line)
-                        if result:
-                            groupdict = result.groupdict()
-                            address_family_d = bgp_config_dict.setdefault(groupdict['address_family'], {})
-                            vrf_dict = address_family_d.setdefault(groupdict['vrf'], {})
+            rc2 = re.compile(r'neighbor\s+(?P<neighbor_address>\S+)\s+'
+                        r'remote\-as\s+(?P<remote_as>\S+)')
 
-                            flag_address_family = True
-                            continue
+            flag_address_family = False            
 
-                        if flag_address_family:
-                            result = rc2.match(line)
-                            if result:
-                                groupdict = result.groupdict()
-                                neighbor_dict = vrf_dict.setdefault(groupdict['neighbor_address'], {})
-                                neighbor_dict['remote_as'] = groupdict['remote_as']
-                            continue
+            for line in out_vrf.splitlines():
+                line = line.strip()
+
+                result = rc1.match(line)
+                if result:
+                    groupdict = result.groupdict()
+                    address_family_d = bgp_config_dict.setdefault(groupdict['address_family'], {})
+                    vrf_dict = address_family_d.setdefault(groupdict['vrf'], {})
+
+                    flag_address_family = True
+                    continue
+
+                if flag_address_family:
+                    result = rc2.match(line)
+                    if result:
+                        groupdict = result.groupdict()
+                        neighbor_dict = vrf_dict.setdefault(groupdict['neighbor_address'], {})
+                        neighbor_dict['remote_as'] = groupdict['remote_as']
+                    continue
 
         # For address family: IPv4 Unicast
         p1 = re.compile(r'^For address family: +(?P<address_family>[a-zA-Z0-9\s\-\_]+)$')
@@ -4319,7 +4351,8 @@ class ShowBgpNeighborsAdvertisedRoutesSuperParser(ShowBgpNeighborsAdvertisedRout
         if not vrf:
             vrf = 'default'
         # Get VRF name by executing 'show bgp all neighbors | i BGP neighbor'
-        out_vrf = self.device.execute('show bgp all neighbors | i BGP neighbor')
+        out_vrf = execute_command(self.device,
+                                  'show bgp all neighbors | i BGP neighbor')
         bgp_neighbor_re = re.compile(r'^BGP +neighbor +is +(?P<bgp_neighbor>[0-9A-Z\:\.]+)'
                             r'(, +vrf +(?P<vrf>\S+))?, +remote AS '
                             r'+(?P<remote_as_id>[0-9]+), '
@@ -4908,7 +4941,8 @@ class ShowBgpNeighborsReceivedRoutesSuperParser(ShowBgpNeighborsReceivedRoutesSc
                             r'( +VRF Router ID (?P<vrf_router_id>(\S+)))?$')
 
         # Get VRF name by executing 'show bgp all neighbors | i BGP neighbor'
-        out_vrf = self.device.execute('show bgp all neighbors | i BGP neighbor')
+        out_vrf = execute_command(self.device,
+                                  'show bgp all neighbors | i BGP neighbor')
         vrf = 'default'
         for line in out_vrf.splitlines():
             line = line.strip()
@@ -5415,7 +5449,8 @@ class ShowBgpAllNeighborsRoutesSuperParser(ShowBgpAllNeighborsRoutesSchema):
 
         if not vrf:
             # Get VRF name by executing 'show bgp all neighbors | i BGP neighbor'
-            out_vrf = self.device.execute('show bgp all neighbors | i BGP neighbor')
+            out_vrf = execute_command(self.device,
+                                      'show bgp all neighbors | i BGP neighbor')
             vrf='default'
             p = re.compile(r'^BGP +neighbor +is +(?P<bgp_neighbor>[0-9A-Z\:\.]+)'
                             r'(, +vrf +(?P<vrf>[0-9A-Za-z]+))?, +remote AS '
@@ -5960,7 +5995,12 @@ class ShowBgpAllClusterIds(ShowBgpAllClusterIdsSchema):
         # find vrf names
         # show vrf detail | inc \(VRF
         cmd_vrfs = r'show vrf detail | inc \(VRF'
-        out_vrf = self.device.execute(cmd_vrfs)
+        # both commands are independent, execute them together, only the
+        # vrf names are memoized by the parse session of the device
+        cmd = self.cli_command
+        out_vrf, out = run_concurrently(
+            self.device, [lambda: execute_command(self.device, cmd_vrfs),
+                          lambda: self.device.execute(cmd)])
         vrf_dict = {'0':'default'}
         p = re.compile(r'^\s*VRF +(?P<vrf_name>[0-9a-zA-Z]+)'
                         r' +\(+VRF +Id += +(?P<vrf_id>[0-9]+)+\)+;'
@@ -5992,9 +6032,6 @@ class ShowBgpAllClusterIds(ShowBgpAllClusterIdsSchema):
                 continue
 
 
-        # show bgp all cluster-ids
-        cmd = self.cli_command
-        out = self.device.execute(cmd)
 
         # Init vars
         sum_dict = {}
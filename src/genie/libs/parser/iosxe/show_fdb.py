@@ -21,6 +21,8 @@ from genie.metaparser.util.schemaengine import Schema, \
 
 # import parser utils
 from genie.libs.parser.utils.common import Common
+from genie.libs.parser.utils.interning import InternMixin
+from genie.libs.parser.utils.records import RecordMixin
 import re
 
 from genie.libs.parser.utils.common import Common
@@ -60,7 +62,8 @@ class ShowMacAddressTableSchema(MetaParser):
         Optional('total_mac_addresses'): int,
     }
 
-class ShowMacAddressTable(ShowMacAddressTableSchema):
+class ShowMacAddressTable(RecordMixin, InternMixin,
+                          ShowMacAddressTableSchema):
     """Parser for show mac address-table"""
 
     cli_command = ['show mac address-table',
@@ -68,6 +71,19 @@ class ShowMacAddressTable(ShowMacAddressTableSchema):
                    'show mac address-table interface {interface}',
                    'show mac address-table interface {interface} vlan {vlan}']
 
+    # columnar mode, see utils.columnar
+    table_path = ('mac_table', 'vlans', '{vlan}', 'mac_addresses', '{mac}',
+                  'interfaces', '{interface}')
+    # the interface list of an entry may go on the next lines
+    table_row_start = r'^\s*(?:[\w\*] )?\s*(?:All|[\d\-]+) +[\w.]+ +\w+ '
+
+    # interned with the keys, see utils.interning
+    intern_fields = ('vlan', 'interface', 'entry_type', 'entry', 'learn',
+                     'protocols')
+
+    # parse(records=True) emits the entries as records, see utils.records
+    record_paths = (table_path,)
+
     def cli(self, vlan='', interface='', output=None):
         if output is None:
             # get output from device
@@ -69,6 +69,7 @@ from genie.metaparser.util.schemaengine import Schema, \
                                          Use
 # import parser utils
 from genie.libs.parser.utils.common import Common
+from genie.libs.parser.utils.subcommands import run_concurrently
 
 logger = logging.getLogger(__name__)
 
@@ -253,6 +254,12 @@ class ShowInterfaces(ShowInterfacesSchema):
                'out_lost_carrier', '(Tunnel.*)', 'input_queue_flushes',
                'reliability', 'out_broadcast_pkts']
 
+    # incremental re-parse, see utils.incremental
+    block_header = (r'^(?P<name>[\w\/\.\-\:]+) +is +[\w\s]+(?: +\S+)?, +line'
+                    r' +protocol +is ')
+    block_reference = (r'Interface +is +unnumbered. +Using +address +of +'
+                       r'(?P<reference>[\w\/\.]+)')
+
     def cli(self, interface="", include="", output=None):
         if output is None:
             if interface:
@@ -1455,6 +1462,10 @@ class ShowIpInterfaceBrief(ShowIpInterfaceBriefSchema):
 
     cli_command = ['show ip interface brief {interface}','show ip interface brief']
 
+    # columnar mode, see utils.columnar
+    table_path = ('interface', '{interface}')
+    table_header = r'^Interface +IP-Address'
+
     def cli(self, interface='',output=None):
         """parsing mechanism: cli
 
@@ -1512,8 +1523,9 @@ class ShowIpInterfaceBrief(ShowIpInterfaceBriefSchema):
         pass
 
     def yang_cli(self):
-        cli_output = self.cli()
-        yang_output = self.yang()
+        # cli and yang are served by different connections of the device
+        cli_output, yang_output = run_concurrently(self.device,
+                                                   [self.cli, self.yang])
         merged_output = merge_dict(yang_output,cli_output)
         return merged_output
 
@@ -3478,6 +3490,10 @@ class ShowInterfacesCounters(ShowInterfacesCountersSchema):
 
     cli_command = 'show interfaces {interface} counters'
 
+    # columnar mode, see utils.columnar
+    table_path = ('interface', '{interface}', '{direction}')
+    table_header = r'^\s*Port +(?:In|Out)Octets'
+
     def cli(self, interface,output=None):
         if output is None:
             out = self.device.execute(self.cli_command.format(interface=interface))
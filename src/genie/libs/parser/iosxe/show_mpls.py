@@ -1692,6 +1692,14 @@ class ShowMplsForwardingTable(ShowMplsForwardingTableSchema):
 
     exclude = ['bytes_label_switched']
 
+    # columnar mode, see utils.columnar
+    table_path = ('vrf', '{vrf}', 'local_label', '{local_label}',
+                  'outgoing_label_or_vc', '{outgoing_label}',
+                  'prefix_or_tunnel_id', '{prefix}',
+                  'outgoing_interface', '{interface}')
+    # the entries without local label and the detail lines are indented
+    table_row_start = r'^\S'
+
     def cli(self, vrf="", prefix="",tunnelid="", filter="", mask="", algo="", output=None):
         if output is None:
             if vrf:
@@ -8,6 +8,9 @@ from genie.metaparser.util.schemaengine import Schema, \
                                          Any, \
                                          Optional
 
+from genie.libs.parser.utils.interning import InternMixin
+from genie.libs.parser.utils.records import RecordMixin
+
 
 # ====================================================
 #  distributor class for show ip route
@@ -180,7 +183,7 @@ class ShowIpRouteSchema(MetaParser):
 # ====================================================
 #  parser for show ip route
 # ====================================================
-class ShowIpRoute(ShowIpRouteSchema):
+class ShowIpRoute(RecordMixin, InternMixin, ShowIpRouteSchema):
     """Parser for :
         show ip route
         show ip route vrf <vrf>"""
@@ -190,6 +193,15 @@ class ShowIpRoute(ShowIpRouteSchema):
     exclude = ['updated']
     IP_VER='ipv4'
 
+    # interned with the keys, see utils.interning
+    intern_fields = ('route', 'source_protocol', 'source_protocol_codes',
+                     'next_hop', 'outgoing_interface', 'updated')
+
+    # parse(records=True) emits the next hops as records, see utils.records
+    record_paths = (('vrf', '{vrf}', 'address_family', '{address_family}',
+                     'routes', '{route}', 'next_hop', 'next_hop_list',
+                     '{index}'),)
+
     def cli(self, vrf=None, protocol=None, output=None):
 
         if output is None:
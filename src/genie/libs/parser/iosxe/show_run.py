@@ -21,6 +21,7 @@ from genie.metaparser.util.schemaengine import Schema, Any, Or, ListOf, \
 
 # import parser utils
 from genie.libs.parser.utils.common import Common
+from genie.libs.parser.utils.config_tree import execute_config_command
 
 # =================================================
 # Schema for:
@@ -78,7 +79,7 @@ class ShowRunPolicyMap(ShowRunPolicyMapSchema):
         if output is None:
             cmd = self.cli_command[0].format(name=name)
             # Execute command on device
-            out = self.device.execute(cmd)
+            out = execute_config_command(self.device, cmd)
         else:
             out = output
 
@@ -487,6 +488,10 @@ class ShowRunInterface(ShowRunInterfaceSchema):
     cli_command = ['show running-config interface {interface}',
                    'show running-config | section ^interface']
 
+    # incremental re-parse, see utils.incremental
+    block_header = r'^interface +(?P<name>\S+)$'
+    block_key_path = ('interfaces',)
+
     def cli(self, interface=None, output=None):
 
         if output is None:
@@ -496,7 +501,7 @@ class ShowRunInterface(ShowRunInterfaceSchema):
                 cmd = self.cli_command[1]
 
             # Execute command on device
-            output = self.device.execute(cmd)
+            output = execute_config_command(self.device, cmd)
 
         # Init vars
         config_dict = {}
@@ -3049,7 +3054,7 @@ class ShowRunningConfigFlowMonitor(ShowRunningConfigFlowMonitorSchema):
 
     def cli(self, output=None):
         if output is None:
-            out = self.device.execute(self.cli_command)
+            out = execute_config_command(self.device, self.cli_command)
         else:
             out = output
 
@@ -4375,7 +4380,7 @@ class ShowRunRoute(ShowRunRouteSchema):
     def cli(self,output=None):
 
         if output is None:
-            output = self.device.execute(self.cli_command)
+            output = execute_config_command(self.device, self.cli_command[0])
 
         res_dict = {}
         
@@ -4455,7 +4460,7 @@ class ShowRunSectionBgp(ShowRunSectionBgpSchema):
 
     def cli(self, output=None):
         if output is None:
-            output = self.device.execute(self.cli_command)
+            output = execute_config_command(self.device, self.cli_command)
 
         ret_dict = {}
         bgp_asn = ''
@@ -4707,7 +4712,7 @@ class ShowRunSectionVrfDefinition(ShowRunSectionVrfDefinitionSchema):
 
     def cli(self, output=None):
         if output is None:
-            output = self.device.execute(self.cli_command)
+            output = execute_config_command(self.device, self.cli_command)
 
         # vrf definition ce1
         p0 = re.compile(r'^vrf +definition +(?P<vrf>\S+)$')
@@ -4797,7 +4802,7 @@ class ShowRunSectionMacAddress(ShowRunSectionMacAddressSchema):
 
     def cli(self, output=None):
         if output is None:
-            output = self.device.execute(self.cli_command)
+            output = execute_config_command(self.device, self.cli_command)
 
         ret_dict = {}
 
@@ -403,6 +403,8 @@ class ShowCdp(ShowCdpSchema):
     """Parser for show cdp"""
 
     cli_command = 'show cdp'
+    # '% CDP is not enabled' is parsed into {'enabled': False}
+    preclassify = False
 
     def cli(self, output=None):
         if output is None:
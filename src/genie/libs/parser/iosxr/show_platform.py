@@ -24,7 +24,6 @@ IOSXR parsers for the following show commands:
 
 # Python
 import re
-import xmltodict
 import logging
 
 # Metaparser
@@ -6,7 +6,6 @@ IOSXR parser for the following show command:
 
 # Python
 import re
-import xmltodict
 import collections
 from netaddr import IPAddress, IPNetwork
 
@@ -6,7 +6,6 @@ IOSXR parsers for the following show commands:
 
 # Python
 import re
-import xmltodict
 from netaddr import IPAddress, INET_ATON
 
 # Metaparser
@@ -14,6 +14,7 @@ from genie.metaparser.util.schemaengine import Schema, Any, Optional, Or, And,\
 										Default, Use
 from genie import parsergen
 from genie.libs.parser.utils.common import Common
+from genie.libs.parser.utils.interning import InternMixin
 
 
 # =====================================
@@ -52,7 +53,7 @@ class ShowIpArpSchema(MetaParser):
 # 	show ip arp vrf {vrf}
 # 	show ip arp vrf all
 # =====================================
-class ShowIpArp(ShowIpArpSchema):
+class ShowIpArp(InternMixin, ShowIpArpSchema):
 	"""Parser for:
 		show ip arp
 		show ip arp vrf {vrf}
@@ -61,6 +62,9 @@ class ShowIpArp(ShowIpArpSchema):
 	cli_command = ['show ip arp', 'show ip arp vrf {vrf}']
 	exclude = ['age']
 
+	# interned with the keys, see utils.interning
+	intern_fields = ('ip', 'age', 'origin', 'physical_interface', 'encap_type', 'flags')
+
 	def cli(self, vrf='', output=None):
 		if vrf:
 			cmd = self.cli_command[1].format(vrf=vrf)
@@ -36,7 +36,6 @@ NXOS parsers for the following show commands:
 # Python
 import re
 from copy import deepcopy
-import xml.etree.ElementTree as ET
 
 # Metaparser
 from genie.metaparser import MetaParser
@@ -794,259 +793,248 @@ class ShowBgpProcessVrfAll(ShowBgpProcessVrfAllSchema):
             out = output
 
         etree_dict = {}
-        # Remove junk characters returned by the device
-        out = out.replace("]]>]]>", "")
-        xml_output = ET.fromstring(out)
-
-        for item in xml_output:
-            for data in item:
-                for show in data:
-                    for bgp in show:
-                        for __XML__OPT_Cmd_show_ip_bgp_session_cmd_vrf in bgp:
-                            for process in __XML__OPT_Cmd_show_ip_bgp_session_cmd_vrf:
-                                for __XML__OPT_Cmd_show_bgp_process_cmd_vrf in process:
-                                    for __XML__OPT_Cmd_show_bgp_process_cmd___readonly__ in __XML__OPT_Cmd_show_bgp_process_cmd_vrf:
-                                        for key in __XML__OPT_Cmd_show_bgp_process_cmd___readonly__:
-                                            # Get key text
-                                            text = key.tag[key.tag.find('}')+1:]
-                                            # bgp_pid
-                                            if text == 'processid':
-                                                etree_dict['bgp_pid'] = int(key.text)
-                                            # bgp_protocol_started_reason
-                                            if text == 'protocolstartedreason':
-                                                etree_dict['bgp_protocol_started_reason'] = key.text
-                                            # bgp_tag
-                                            if text == 'protocoltag':
-                                                etree_dict['bgp_tag'] = key.text
-                                            # bgp_protocol_state
-                                            if text == 'protocolstate':
-                                                etree_dict['bgp_protocol_state'] = str(key.text).lower()
-                                            # bgp_isolate_mode
-                                            if text == 'isolatemode':
-                                                etree_dict['bgp_isolate_mode'] = key.text
-                                            # bgp_mmode
-                                            if text == 'mmode':
-                                                etree_dict['bgp_mmode'] = key.text
-                                            # bgp_memory_state
-                                            if text == 'memorystate':
-                                                etree_dict['bgp_memory_state'] = str(key.text).lower()
-                                            # bgp_performance_mode
-                                            if text == 'forwardingstatesaved':
-                                                if key.text == 'false':
-                                                    etree_dict['bgp_performance_mode'] = 'No'
-                                                else:
-                                                    etree_dict['bgp_performance_mode'] = 'Yes'
-                                            # bgp_asformat
-                                            if text == 'asformat':
-                                                etree_dict['bgp_asformat'] = key.text
-                                            if text == 'srgbmin':
-                                                srgbin = key.text
-                                            if text == 'srgbmax':
-                                                srgmax = key.text
-                                                try:
-                                                    etree_dict['segment_routing_global_block'] = srgbin + '-' + srgmax
-                                                except Exception:
-                                                    pass
-                                            # num_attr_entries
-                                            if text == 'attributeentries':
-                                                etree_dict['num_attr_entries'] = int(key.text)
-                                            # hwm_attr_entries
-                                            if text == 'hwmattributeentries':
-                                                etree_dict['hwm_attr_entries'] = int(key.text)
-                                            # bytes_used
-                                            if text == 'bytesused':
-                                                etree_dict['bytes_used'] = int(key.text)
-                                            # entries_pending_delete
-                                            if text == 'entriespendingdelete':
-                                                etree_dict['entries_pending_delete'] = int(key.text)
-                                            # hwm_entries_pending_delete
-                                            if text == 'hwmentriespendingdelete':
-                                                etree_dict['hwm_entries_pending_delete'] = int(key.text)
-                                            # bgp_paths_per_hwm_attr
-                                            if text == 'pathsperattribute':
-                                                etree_dict['bgp_paths_per_hwm_attr'] = int(key.text)
-                                            # bgp_as_path_entries
-                                            if text == 'aspathentries':
-                                                etree_dict['bgp_as_path_entries'] = int(key.text)
-                                            # bytes_used_as_path_entries
-                                            if text == 'aspathbytes':
-                                                etree_dict['bytes_used_as_path_entries'] = int(key.text)
-                                            
-                                            if text == 'TABLE_vrf':
-                                                for table_vrf in key:
-                                                    for row_vrf in table_vrf:
-                                                        vrf_tag = row_vrf.tag[row_vrf.tag.find('}')+1:]
-
-                                                        # vrf
-                                                        #   vrf_name
-                                                        if vrf_tag == 'vrf-name-out':
-                                                            vrf_name = row_vrf.text
-                                                            if 'vrf' not in etree_dict:
-                                                                etree_dict['vrf'] = {}
-                                                            if vrf_name not in etree_dict['vrf']:
-                                                                etree_dict['vrf'][vrf_name] = {}
-                                                                vrf_dict = etree_dict['vrf'][vrf_name]
-                                                        # vrf_id
-                                                        if vrf_tag == 'vrf-id':
-                                                            vrf_dict['vrf_id'] = row_vrf.text
-                                                        # vrf_state
-                                                        if vrf_tag == 'vrf-state':
-                                                            vrf_dict['vrf_state'] = str(row_vrf.text).lower()
-                                                        # router_id
-                                                        if vrf_tag == 'vrf-router-id':
-                                                            vrf_dict['router_id'] = row_vrf.text
-                                                        # conf_router_id
-                                                        if vrf_tag == 'vrf-cfgd-id':
-                                                            vrf_dict['conf_router_id'] = row_vrf.text
-                                                        # confed_id
-                                                        if vrf_tag == 'vrf-confed-id':
-                                                            vrf_dict['confed_id'] = int(row_vrf.text)
-                                                        # cluster_id
-                                                        if vrf_tag == 'vrf-cluster-id':
-                                                           vrf_dict['cluster_id'] = row_vrf.text
-                                                        # num_conf_peers
-                                                        if vrf_tag == 'vrf-peers':
-                                                            vrf_dict['num_conf_peers'] = int(row_vrf.text)
-                                                        # num_pending_conf_peers
-                                                        if vrf_tag == 'vrf-pending-peers':
-                                                            vrf_dict['num_pending_conf_peers'] = int(row_vrf.text)
-                                                        # num_established_peers
-                                                        if vrf_tag == 'vrf-est-peers':
-                                                            vrf_dict['num_established_peers'] = int(row_vrf.text)
-                                                            vrf_dict['vrf_rd'] = 'not configured'
-                                                        # vrf_rd
-                                                        if vrf_tag == 'vrf-rd':
-                                                            vrf_dict['vrf_rd'] = row_vrf.text
-
-                                                        if vrf_tag == 'TABLE_af':
-                                                            for table_af in row_vrf:
-                                                                for row_af in table_af:
-                                                                    af_tag = row_af.tag[row_af.tag.find('}')+1:]
-
-                                                                    # address_family
-                                                                    #   address_family_name
-                                                                    if af_tag == 'af-name':
-                                                                        address_family_name = str(row_af.text).lower()
-                                                                        if 'address_family' not in etree_dict['vrf'][vrf_name]:
-                                                                            etree_dict['vrf'][vrf_name]['address_family'] = {}
-                                                                        if address_family_name not in etree_dict['vrf'][vrf_name]['address_family']:
-                                                                            etree_dict['vrf'][vrf_name]['address_family'][address_family_name] = {}
-                                                                            af_dict = etree_dict['vrf'][vrf_name]['address_family'][address_family_name]
-                                                                        # Initialize empty lists
-                                                                        export_rt_list = ''
-                                                                        import_rt_list = ''
-                                                                    # table_id
-                                                                    if af_tag == 'af-table-id':
-                                                                        table_id = str(row_af.text)
-                                                                        if '0x' in table_id:
-                                                                            af_dict['table_id'] = table_id
-                                                                        else:
-                                                                            af_dict['table_id'] = '0x' + table_id
-                                                                    # table_state
-                                                                    if af_tag == 'af-state':
-                                                                        af_dict['table_state'] = str(row_af.text).lower()
-                                                                    # peers
-                                                                    if af_tag == 'af-num-peers':
-                                                                        peers = int(row_af.text)
-                                                                        if 'peers' not in af_dict:
-                                                                            af_dict['peers'] = {}
-                                                                        if peers not in af_dict['peers']:
-                                                                            af_dict['peers'][peers] = {}
-                                                                    # active_peers
-                                                                    if af_tag == 'af-num-active-peers':
-                                                                        af_dict['peers'][peers]['active_peers'] = int(row_af.text)
-                                                                    # routes
-                                                                    if af_tag == 'af-peer-routes':
-                                                                        af_dict['peers'][peers]['routes'] = int(row_af.text)
-                                                                    # paths
-                                                                    if af_tag == 'af-peer-paths':
-                                                                        af_dict['peers'][peers]['paths'] = int(row_af.text)
-                                                                    # networks
-                                                                    if af_tag == 'af-peer-networks':
-                                                                        af_dict['peers'][peers]['networks'] = int(row_af.text)
-                                                                    # aggregates
-                                                                    if af_tag == 'af-peer-aggregates':
-                                                                        af_dict['peers'][peers]['aggregates'] = int(row_af.text)
-                                                                    # route_reflector
-                                                                    if af_tag == 'af-rr':
-                                                                        if row_af.text == 'true':
-                                                                            af_dict['route_reflector'] = True
-                                                                    # next_hop_trigger_delay
-                                                                    #   critical
-                                                                    if af_tag == 'nexthop-trigger-delay-critical':
-                                                                        if 'next_hop_trigger_delay' not in af_dict:
-                                                                            af_dict['next_hop_trigger_delay'] = {}
-                                                                        af_dict['next_hop_trigger_delay']['critical'] = int(row_af.text)
-                                                                    # next_hop_trigger_delay
-                                                                    #   non_critical
-                                                                    if af_tag == 'nexthop-trigger-delay-non-critical':
-                                                                        af_dict['next_hop_trigger_delay']['non_critical'] = int(row_af.text)
-                                                                    # aggregate_label
-                                                                    if af_tag == 'af-aggregate-label':
-                                                                        af_dict['aggregate_label'] = row_af.text
-                                                                    # label_mode
-                                                                    if af_tag == 'af-label-mode':
-                                                                        af_dict['label_mode'] = row_af.text
-                                                                    # import_default_map
-                                                                    if af_tag == 'importdefault_map':
-                                                                        af_dict['import_default_map'] = row_af.text
-                                                                    # import_default_prefix_limit
-                                                                    if af_tag == 'importdefault_prefixlimit':
-                                                                        af_dict['import_default_prefix_limit'] = int(row_af.text)
-                                                                    # import_default_prefix_count
-                                                                    if af_tag == 'importdefault_prefixcount':
-                                                                        af_dict['import_default_prefix_count'] = int(row_af.text)
-                                                                    # export_default_map
-                                                                    if af_tag == 'exportdefault_map':
-                                                                        af_dict['export_default_map'] = row_af.text
-                                                                    # export_default_prefix_limit
-                                                                    if af_tag == 'exportdefault_prefixlimit':
-                                                                        af_dict['export_default_prefix_limit'] = int(row_af.text)
-                                                                    # export_default_prefix_count
-                                                                    if af_tag == 'exportdefault_prefixcount':
-                                                                        af_dict['export_default_prefix_count'] = int(row_af.text)
-
-                                                                    # TABLE_redist
-                                                                    #   ROW_redist
-                                                                    if af_tag == 'TABLE_redist':
-                                                                        for table_redist in row_af:
-                                                                            for row_redist in table_redist:
-                                                                                row_redist_tag = row_redist.tag[row_redist.tag.find('}')+1:]
-                                                                                # protocol
-                                                                                if row_redist_tag == 'protocol':
-                                                                                    protocol = row_redist.text
-                                                                                    if 'redistribution' not in af_dict:
-                                                                                        af_dict['redistribution'] = {}
-                                                                                    if protocol not in af_dict['redistribution']:
-                                                                                        af_dict['redistribution'][protocol] = {}
-                                                                                # route_map
-                                                                                if row_redist_tag == 'route-map':
-                                                                                    af_dict['redistribution'][protocol]['route_map'] = row_redist.text
-
-                                                                    # TABLE_evpn_export_rt
-                                                                    #   ROW_evpn_export_rt
-                                                                    if af_tag == 'TABLE_evpn_export_rt':
-                                                                        for table_evpn_export in row_af:
-                                                                            for row_export in table_evpn_export:
-                                                                                row_export_tag = row_export.tag[row_export.tag.find('}')+1:]
-                                                                                # export_rt_list
-                                                                                if row_export_tag == 'evpn-export-rt':
-                                                                                    export_rt_list = str(export_rt_list + ' ' + row_export.text).strip()
-                                                                                    af_dict['export_rt_list'] = export_rt_list
-                                                                    # TABLE_evpn_import_rt
-                                                                    #   ROW_evpn_import_rt
-                                                                    if af_tag == 'TABLE_evpn_import_rt':
-                                                                        for table_evpn_import in row_af:
-                                                                            for row_import in table_evpn_import:
-                                                                                row_import_tag = row_import.tag[row_import.tag.find('}')+1:]
-                                                                                # export_rt_list
-                                                                                if row_import_tag == 'evpn-import-rt':
-                                                                                    import_rt_list = str(import_rt_list + ' ' + row_import.text).strip()
-                                                                                    af_dict['import_rt_list'] = import_rt_list
-
-                                                                    # parsed all tags
-                                                                    continue
-                                                                                    
+        # -----   loop __readonly__ values and vrf  -----
+        for namespace, key in Common.iterparse_xml(
+                out, rows=('vrf',), readonly=True):
+            # Get key text
+            text = key.tag[key.tag.find('}')+1:]
+            # bgp_pid
+            if text == 'processid':
+                etree_dict['bgp_pid'] = int(key.text)
+            # bgp_protocol_started_reason
+            if text == 'protocolstartedreason':
+                etree_dict['bgp_protocol_started_reason'] = key.text
+            # bgp_tag
+            if text == 'protocoltag':
+                etree_dict['bgp_tag'] = key.text
+            # bgp_protocol_state
+            if text == 'protocolstate':
+                etree_dict['bgp_protocol_state'] = str(key.text).lower()
+            # bgp_isolate_mode
+            if text == 'isolatemode':
+                etree_dict['bgp_isolate_mode'] = key.text
+            # bgp_mmode
+            if text == 'mmode':
+                etree_dict['bgp_mmode'] = key.text
+            # bgp_memory_state
+            if text == 'memorystate':
+                etree_dict['bgp_memory_state'] = str(key.text).lower()
+            # bgp_performance_mode
+            if text == 'forwardingstatesaved':
+                if key.text == 'false':
+                    etree_dict['bgp_performance_mode'] = 'No'
+                else:
+                    etree_dict['bgp_performance_mode'] = 'Yes'
+            # bgp_asformat
+            if text == 'asformat':
+                etree_dict['bgp_asformat'] = key.text
+            if text == 'srgbmin':
+                srgbin = key.text
+            if text == 'srgbmax':
+                srgmax = key.text
+                try:
+                    etree_dict['segment_routing_global_block'] = srgbin + '-' + srgmax
+                except Exception:
+                    pass
+            # num_attr_entries
+            if text == 'attributeentries':
+                etree_dict['num_attr_entries'] = int(key.text)
+            # hwm_attr_entries
+            if text == 'hwmattributeentries':
+                etree_dict['hwm_attr_entries'] = int(key.text)
+            # bytes_used
+            if text == 'bytesused':
+                etree_dict['bytes_used'] = int(key.text)
+            # entries_pending_delete
+            if text == 'entriespendingdelete':
+                etree_dict['entries_pending_delete'] = int(key.text)
+            # hwm_entries_pending_delete
+            if text == 'hwmentriespendingdelete':
+                etree_dict['hwm_entries_pending_delete'] = int(key.text)
+            # bgp_paths_per_hwm_attr
+            if text == 'pathsperattribute':
+                etree_dict['bgp_paths_per_hwm_attr'] = int(key.text)
+            # bgp_as_path_entries
+            if text == 'aspathentries':
+                etree_dict['bgp_as_path_entries'] = int(key.text)
+            # bytes_used_as_path_entries
+            if text == 'aspathbytes':
+                etree_dict['bytes_used_as_path_entries'] = int(key.text)
+
+            if text == 'ROW_vrf':
+                for row_vrf in key:
+                    vrf_tag = row_vrf.tag[row_vrf.tag.find('}')+1:]
+
+                    # vrf
+                    #   vrf_name
+                    if vrf_tag == 'vrf-name-out':
+                        vrf_name = row_vrf.text
+                        if 'vrf' not in etree_dict:
+                            etree_dict['vrf'] = {}
+                        if vrf_name not in etree_dict['vrf']:
+                            etree_dict['vrf'][vrf_name] = {}
+                            vrf_dict = etree_dict['vrf'][vrf_name]
+                    # vrf_id
+                    if vrf_tag == 'vrf-id':
+                        vrf_dict['vrf_id'] = row_vrf.text
+                    # vrf_state
+                    if vrf_tag == 'vrf-state':
+                        vrf_dict['vrf_state'] = str(row_vrf.text).lower()
+                    # router_id
+                    if vrf_tag == 'vrf-router-id':
+                        vrf_dict['router_id'] = row_vrf.text
+                    # conf_router_id
+                    if vrf_tag == 'vrf-cfgd-id':
+                        vrf_dict['conf_router_id'] = row_vrf.text
+                    # confed_id
+                    if vrf_tag == 'vrf-confed-id':
+                        vrf_dict['confed_id'] = int(row_vrf.text)
+                    # cluster_id
+                    if vrf_tag == 'vrf-cluster-id':
+                       vrf_dict['cluster_id'] = row_vrf.text
+                    # num_conf_peers
+                    if vrf_tag == 'vrf-peers':
+                        vrf_dict['num_conf_peers'] = int(row_vrf.text)
+                    # num_pending_conf_peers
+                    if vrf_tag == 'vrf-pending-peers':
+                        vrf_dict['num_pending_conf_peers'] = int(row_vrf.text)
+                    # num_established_peers
+                    if vrf_tag == 'vrf-est-peers':
+                        vrf_dict['num_established_peers'] = int(row_vrf.text)
+                        vrf_dict['vrf_rd'] = 'not configured'
+                    # vrf_rd
+                    if vrf_tag == 'vrf-rd':
+                        vrf_dict['vrf_rd'] = row_vrf.text
+
+                    if vrf_tag == 'TABLE_af':
+                        for table_af in row_vrf:
+                            for row_af in table_af:
+                                af_tag = row_af.tag[row_af.tag.find('}')+1:]
+
+                                # address_family
+                                #   address_family_name
+                                if af_tag == 'af-name':
+                                    address_family_name = str(row_af.text).lower()
+                                    if 'address_family' not in etree_dict['vrf'][vrf_name]:
+                                        etree_dict['vrf'][vrf_name]['address_family'] = {}
+                                    if address_family_name not in etree_dict['vrf'][vrf_name]['address_family']:
+                                        etree_dict['vrf'][vrf_name]['address_family'][address_family_name] = {}
+                                        af_dict = etree_dict['vrf'][vrf_name]['address_family'][address_family_name]
+                                    # Initialize empty lists
+                                    export_rt_list = ''
+                                    import_rt_list = ''
+                                # table_id
+                                if af_tag == 'af-table-id':
+                                    table_id = str(row_af.text)
+                                    if '0x' in table_id:
+                                        af_dict['table_id'] = table_id
+                                    else:
+                                        af_dict['table_id'] = '0x' + table_id
+                                # table_state
+                                if af_tag == 'af-state':
+                                    af_dict['table_state'] = str(row_af.text).lower()
+                                # peers
+                                if af_tag == 'af-num-peers':
+                                    peers = int(row_af.text)
+                                    if 'peers' not in af_dict:
+                                        af_dict['peers'] = {}
+                                    if peers not in af_dict['peers']:
+                                        af_dict['peers'][peers] = {}
+                                # active_peers
+                                if af_tag == 'af-num-active-peers':
+                                    af_dict['peers'][peers]['active_peers'] = int(row_af.text)
+                                # routes
+                                if af_tag == 'af-peer-routes':
+                                    af_dict['peers'][peers]['routes'] = int(row_af.text)
+                                # paths
+                                if af_tag == 'af-peer-paths':
+                                    af_dict['peers'][peers]['paths'] = int(row_af.text)
+                                # networks
+                                if af_tag == 'af-peer-networks':
+                                    af_dict['peers'][peers]['networks'] = int(row_af.text)
+                                # aggregates
+                                if af_tag == 'af-peer-aggregates':
+                                    af_dict['peers'][peers]['aggregates'] = int(row_af.text)
+                                # route_reflector
+                                if af_tag == 'af-rr':
+                                    if row_af.text == 'true':
+                                        af_dict['route_reflector'] = True
+                                # next_hop_trigger_delay
+                                #   critical
+                                if af_tag == 'nexthop-trigger-delay-critical':
+                                    if 'next_hop_trigger_delay' not in af_dict:
+                                        af_dict['next_hop_trigger_delay'] = {}
+                                    af_dict['next_hop_trigger_delay']['critical'] = int(row_af.text)
+                                # next_hop_trigger_delay
+                                #   non_critical
+                                if af_tag == 'nexthop-trigger-delay-non-critical':
+                                    af_dict['next_hop_trigger_delay']['non_critical'] = int(row_af.text)
+                                # aggregate_label
+                                if af_tag == 'af-aggregate-label':
+                                    af_dict['aggregate_label'] = row_af.text
+                                # label_mode
+                                if af_tag == 'af-label-mode':
+                                    af_dict['label_mode'] = row_af.text
+                                # import_default_map
+                                if af_tag == 'importdefault_map':
+                                    af_dict['import_default_map'] = row_af.text
+                                # import_default_prefix_limit
+                                if af_tag == 'importdefault_prefixlimit':
+                                    af_dict['import_default_prefix_limit'] = int(row_af.text)
+                                # import_default_prefix_count
+                                if af_tag == 'importdefault_prefixcount':
+                                    af_dict['import_default_prefix_count'] = int(row_af.text)
+                                # export_default_map
+                                if af_tag == 'exportdefault_map':
+                                    af_dict['export_default_map'] = row_af.text
+                                # export_default_prefix_limit
+                                if af_tag == 'exportdefault_prefixlimit':
+                                    af_dict['export_default_prefix_limit'] = int(row_af.text)
+                                # export_default_prefix_count
+                                if af_tag == 'exportdefault_prefixcount':
+                                    af_dict['export_default_prefix_count'] = int(row_af.text)
+
+                                # TABLE_redist
+                                #   ROW_redist
+                                if af_tag == 'TABLE_redist':
+                                    for table_redist in row_af:
+                                        for row_redist in table_redist:
+                                            row_redist_tag = row_redist.tag[row_redist.tag.find('}')+1:]
+                                            # protocol
+                                            if row_redist_tag == 'protocol':
+                                                protocol = row_redist.text
+                                                if 'redistribution' not in af_dict:
+                                                    af_dict['redistribution'] = {}
+                                                if protocol not in af_dict['redistribution']:
+                                                    af_dict['redistribution'][protocol] = {}
+                                            # route_map
+                                            if row_redist_tag == 'route-map':
+                                                af_dict['redistribution'][protocol]['route_map'] = row_redist.text
+
+                                # TABLE_evpn_export_rt
+                                #   ROW_evpn_export_rt
+                                if af_tag == 'TABLE_evpn_export_rt':
+                                    for table_evpn_export in row_af:
+                                        for row_export in table_evpn_export:
+                                            row_export_tag = row_export.tag[row_export.tag.find('}')+1:]
+                                            # export_rt_list
+                                            if row_export_tag == 'evpn-export-rt':
+                                                export_rt_list = str(export_rt_list + ' ' + row_export.text).strip()
+                                                af_dict['export_rt_list'] = export_rt_list
+                                # TABLE_evpn_import_rt
+                                #   ROW_evpn_import_rt
+                                if af_tag == 'TABLE_evpn_import_rt':
+                                    for table_evpn_import in row_af:
+                                        for row_import in table_evpn_import:
+                                            row_import_tag = row_import.tag[row_import.tag.find('}')+1:]
+                                            # export_rt_list
+                                            if row_import_tag == 'evpn-import-rt':
+                                                import_rt_list = str(import_rt_list + ' ' + row_import.text).strip()
+                                                af_dict['import_rt_list'] = import_rt_list
+
+                                # parsed all tags
+                                continue
+
         return etree_dict
 
     def yang(self, vrf=''):
@@ -3395,31 +3383,10 @@ class ShowBgpAllDampeningFlapStatistics(ShowBgpAllDampeningFlapStatisticsSchema)
 
         etree_dict = {}
         sub_dict = {}
-        # Remove junk characters returned by the device
-        out = out.replace("]]>]]>", "")
-        root = ET.fromstring(out)
-
-        # top table root
-        show_root = Common.retrieve_xml_child(root=root, key='show')
-        # get xml namespace
-        # {http://www.cisco.com/nxos:7.0.3.I7.1.:bgp}
-        try:
-            m = re.compile(r'(?P<name>\{[\S]+\})').match(show_root.tag)
-            namespace = m.groupdict()['name']
-        except Exception:
-            return etree_dict
-
-        # compare cli command
-        Common.compose_compare_command(root=root, namespace=namespace,
-                                expect_command=self.cli_command)
-
-        # top table root
-        vrf_root = Common.retrieve_xml_child(root=root, key='TABLE_vrf')
-        if not vrf_root:
-            return etree_dict
-
         # -----   loop vrf  -----
-        for vrf_tree in vrf_root.findall('{}ROW_vrf'.format(namespace)):
+        for namespace, vrf_tree in Common.iterparse_xml(
+                out, rows=('vrf',),
+                expect_command=self.cli_command):
             # vrf
             try:
                 vrf = vrf_tree.find('{}vrf-name-out'.format(namespace)).text
@@ -3637,31 +3604,10 @@ class ShowBgpAllNexthopDatabase(ShowBgpVrfAllAllNextHopDatabase):
 
         etree_dict = {}
         sub_dict = {}
-        # Remove junk characters returned by the device
-        out = out.replace("]]>]]>", "")
-        root = ET.fromstring(out)
-
-        # top table root
-        show_root = Common.retrieve_xml_child(root=root, key='show')
-        # get xml namespace
-        # {http://www.cisco.com/nxos:7.0.3.I7.1.:bgp}
-        try:
-            m = re.compile(r'(?P<name>\{[\S]+\})').match(show_root.tag)
-            namespace = m.groupdict()['name']
-        except Exception:
-            return etree_dict
-
-        # compare cli command
-        Common.compose_compare_command(root=root, namespace=namespace,
-                                expect_command=self.cli_command)
-
-        # top table root
-        vrf_root = Common.retrieve_xml_child(root=root, key='TABLE_nhvrf')
-        if not vrf_root:
-            return etree_dict
-
         # -----   loop vrf  -----
-        for vrf_tree in vrf_root.findall('{}ROW_nhvrf'.format(namespace)):
+        for namespace, vrf_tree in Common.iterparse_xml(
+                out, rows=('nhvrf',),
+                expect_command=self.cli_command):
             # vrf
             try:
                 vrf = vrf_tree.find('{}nhvrf-name-out'.format(namespace)).text
@@ -4234,31 +4180,10 @@ class ShowBgpPeerTemplateCmd(ShowBgpPeerTemplateCmdSchema):
 
         etree_dict = {}
         sub_dict = {}
-        # Remove junk characters returned by the device
-        out = out.replace("]]>]]>", "")
-        root = ET.fromstring(out)
-
-        # top table root
-        show_root = Common.retrieve_xml_child(root=root, key='show')
-        # get xml namespace
-        # {http://www.cisco.com/nxos:7.0.3.I7.1.:bgp}
-        try:
-            m = re.compile(r'(?P<name>\{[\S]+\})').match(show_root.tag)
-            namespace = m.groupdict()['name']
-        except Exception:
-            return etree_dict
-
-        # compare cli command
-        Common.compose_compare_command(root=root, namespace=namespace,
-                                expect_command=self.cli_command)
-
-        # top table root
-        root = Common.retrieve_xml_child(root=root, key='TABLE_neighbor')
-        if not root:
-            return etree_dict
-
         # -----   loop vrf  -----
-        for peer_tree in root.findall('{}ROW_neighbor'.format(namespace)):
+        for namespace, peer_tree in Common.iterparse_xml(
+                out, rows=('neighbor',),
+                expect_command=self.cli_command):
             # vrf
             try:
                 template = peer_tree.find('{}templatepeer'.format(namespace)).text
@@ -4763,49 +4688,9 @@ class ShowBgpPolicyStatisticsParser(ShowBgpPolicyStatisticsSchema):
         out = self.device.execute('{cmd} | xml'.format(cmd=cmd))
 
         etree_dict = {}
-        neighbor = None
-        # Remove junk characters returned by the device
-        out = out.replace("]]>]]>", "")
-        root = ET.fromstring(out)
-
-        # top table root
-        show_root = Common.retrieve_xml_child(root=root, key='show')
-        # get xml namespace
-        # {http://www.cisco.com/nxos:7.0.3.I7.1.:bgp}
-        try:
-            m = re.compile(r'(?P<name>\{[\S]+\})').match(show_root.tag)
-            namespace = m.groupdict()['name']
-        except Exception:
-            return etree_dict
-
-        # compare cli command
-        Common.compose_compare_command(root=root, namespace=namespace,
-                                       expect_command=cmd)
-
-        # get neighbor
-        nei = Common.retrieve_xml_child(root=root, key='__XML__PARAM__neighbor-id')
-
-        if hasattr(nei, 'tag'):
-            for item in list(nei):
-                if '__XML__value' in item.tag:
-                    neighbor = item.text
-                    continue
-
-                # cover the senario that __readonly__ may be mssing when
-                # there are values in the output
-                if '__readonly__' in item.tag:
-                    root = list(item)[0]
-                else:
-                    root = item
-        else:
-            # top table rootl
-            root = Common.retrieve_xml_child(root=root, key='TABLE_vrf')
-
-        if not root:
-            return etree_dict
-
         # -----   loop vrf  -----
-        for vrf_tree in root.findall('{}ROW_vrf'.format(namespace)):
+        for namespace, vrf_tree in Common.iterparse_xml(
+                out, rows=('vrf',), expect_command=cmd):
             # vrf
             try:
                 vrf = vrf_tree.find('{}vrf-name-polstats'.format(namespace)).text
@@ -5332,63 +5217,39 @@ class ShowBgpSessions(ShowBgpSessionsSchema):
 
         etree_dict = {}
 
-        # Remove junk characters returned by the device
-        out = out.replace("]]>]]>", "")
-        root = ET.fromstring(out)
-
-        # top table root
-        show_root = Common.retrieve_xml_child(root=root, key='show')
-        # get xml namespace
-        # {http://www.cisco.com/nxos:7.0.3.I7.1.:bgp}
-        try:
-            m = re.compile(r'(?P<name>\{[\S]+\})').match(show_root.tag)
-            namespace = m.groupdict()['name']
-        except Exception:
-            return etree_dict
-
-        # compare cli command
-        Common.compose_compare_command(root=root, namespace=namespace,
-                                       expect_command=cli_cmd)
-
-        ret = Common.retrieve_xml_child(
-                root=root,
-                key='__readonly__')
-
-        if hasattr(ret, 'tag'):
-            # get total_peers                
-            try:
-                total_peers = ret.find('{}totalpeers'.format(namespace)).text
-                etree_dict['total_peers'] = int(total_peers)
-            except Exception:
-                pass
-
-            # get total_established_peers            
-            try:
-                total_established_peers = ret.find(
-                    '{}totalestablishedpeers'.format(namespace)).text
-                etree_dict['total_established_peers'] = int(total_established_peers)
-            except Exception:
-                pass
+        # -----   loop __readonly__ values and vrf  -----
+        for namespace, item in Common.iterparse_xml(
+                out, rows=('vrf',), readonly=True, expect_command=cli_cmd):
+            tag = item.tag.replace(namespace, '')
 
-            # get local_as               
-            try:
-                local_as = ret.find('{}localas'.format(namespace)).text
-                etree_dict['local_as'] = int(local_as)
-            except Exception:
-                pass
+            # get total_peers
+            if tag == 'totalpeers':
+                try:
+                    etree_dict['total_peers'] = int(item.text)
+                except Exception:
+                    pass
+                continue
 
-        else:
-            # output is empty
-            return etree_dict
+            # get total_established_peers
+            if tag == 'totalestablishedpeers':
+                try:
+                    etree_dict['total_established_peers'] = int(item.text)
+                except Exception:
+                    pass
+                continue
 
-        # find Vrf root
-        root = ret.find('{}TABLE_vrf'.format(namespace))
+            # get local_as
+            if tag == 'localas':
+                try:
+                    etree_dict['local_as'] = int(item.text)
+                except Exception:
+                    pass
+                continue
 
-        if not root:
-            return etree_dict
+            if tag != 'ROW_vrf':
+                continue
+            vrf_tree = item
 
-        # -----   loop vrf  -----
-        for vrf_tree in root.findall('{}ROW_vrf'.format(namespace)):
             # vrf
             try:
                 vrf = vrf_tree.find('{}vrf-name-out'.format(namespace)).text
@@ -5788,32 +5649,10 @@ class ShowBgpLabels(ShowBgpLabelsSchema):
 
         etree_dict = {}
 
-        # Remove junk characters returned by the device
-        out = out.replace("]]>]]>", "")
-        root = ET.fromstring(out)
-
-        # top table root
-        show_root = Common.retrieve_xml_child(root=root, key='show')
-        # get xml namespace
-        # {http://www.cisco.com/nxos:7.0.3.I7.1.:bgp}
-        try:
-            m = re.compile(r'(?P<name>\{[\S]+\})').match(show_root.tag)
-            namespace = m.groupdict()['name']
-        except Exception:
-            return etree_dict
-
-        # compare cli command
-        Common.compose_compare_command(root=root, namespace=namespace,
-                                       expect_command=cli_cmd)
-
-        # find Vrf root
-        root = Common.retrieve_xml_child(root=root, key='TABLE_vrf')
-
-        if not root:
-            return etree_dict
-
         # -----   loop vrf  -----
-        for vrf_tree in root.findall('{}ROW_vrf'.format(namespace)):
+        for namespace, vrf_tree in Common.iterparse_xml(
+                out, rows=('vrf',),
+                expect_command=cli_cmd):
             # vrf
             try:
                 vrf = vrf_tree.find('{}vrf-name-out'.format(namespace)).text
@@ -28,6 +28,8 @@ from genie.metaparser.util.schemaengine import Schema, \
                                          Default, \
                                          Use
 from genie.libs.parser.utils.common import Common
+from genie.libs.parser.utils.interning import InternMixin
+from genie.libs.parser.utils.records import RecordMixin
 
 class ShowMacAddressTableBaseSchema(MetaParser):
     """Schema for:
@@ -67,13 +69,29 @@ class ShowMacAddressTableBaseSchema(MetaParser):
         }
 
 
-class ShowMacAddressTableBase(ShowMacAddressTableBaseSchema):
+class ShowMacAddressTableBase(RecordMixin, InternMixin,
+                              ShowMacAddressTableBaseSchema):
     """Base parser for:
         'show mac address-table vni <WORD> | grep <WORD>'
         'show mac address-table local vni <WORD>'
         'show mac address-table'
     """
 
+    # columnar mode, see utils.columnar
+    table_path = ('mac_table', 'vlans', '{vlan}', 'mac_addresses', '{mac}',
+                  'interfaces', '{interface}')
+    # an entry without port updates the interface of the entry before it
+    table_row_start = (r'^\s*(?:[\w\*\+] )?\s*(?:All|[\d\-]+) +[0-9a-z\.\:]+ '
+                       r'+[a-z]+ +(?:[0-9\-\~]+|NA) +[A-Z]+ +[A-Z]+ '
+                       r'+(?!(?:drop|Drop)\s*$)\S')
+
+    # interned with the keys, see utils.interning
+    intern_fields = ('vlan', 'interface', 'mac_type', 'age', 'entry',
+                     'secure', 'ntfy')
+
+    # parse(records=True) emits the entries as records, see utils.records
+    record_paths = (table_path,)
+
     def cli(self, out):
 
         # initial return dictionary
@@ -10,7 +10,6 @@ NXOS parsers for the following commands
 """
 # Python
 import re 
-import xmltodict
 
 #Metaparser
 from genie.metaparser import MetaParser
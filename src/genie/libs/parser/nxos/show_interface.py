@@ -4,6 +4,8 @@ NXOS parsers for the following show commands:
     * show interface
     * show interface {interface}
     * show interface | include {include}
+    * show interface | json
+    * show interface {interface} | json
     * show ip interface {interface} vrf {vrf}
     * show ip interface {interface} vrf all
     * show ip interface vrf {vrf}
@@ -228,6 +230,88 @@ class ShowInterface(ShowInterfaceSchema):
         'in_crc_errors',
         'reliability']
 
+    # incremental re-parse, see utils.incremental
+    block_header = (r'^(?P<name>\S+) *is *(?:down|up|inactive|administratively|'
+                    r'\(Administratively|Transceiver|SFP|Channel)')
+
+    # native structured output, parse(context='json') executes the command
+    # with `| json` and maps the TABLE_interface rows, see json()
+    CONTEXT_LIST = MetaParser.CONTEXT_LIST + ('json',)
+    json_command = ['show interface | json',
+                    'show interface {interface} | json']
+
+    # `| json` key -> key of the interface (int values)
+    json_integers = {
+        'eth_mtu': 'mtu', 'svi_mtu': 'mtu',
+        'eth_bw': 'bandwidth', 'svi_bw': 'bandwidth',
+        'eth_dly': 'delay', 'svi_delay': 'delay',
+        'eth_reset_cntr': 'interface_reset',
+    }
+
+    # `| json` key -> key of the interface (str values)
+    json_strings = {
+        'admin_state': 'admin_state',
+        'desc': 'description',
+        'eth_hw_desc': 'types', 'svi_hw_desc': 'types',
+        'eth_hw_addr': 'mac_address', 'svi_mac': 'mac_address',
+        'eth_bia_addr': 'phys_address',
+        'svi_line_proto': 'line_protocol',
+        'medium': 'medium',
+        'eth_mode': 'port_mode',
+        'eth_media': 'media_type',
+        'eth_beacon': 'beacon',
+        'eth_fec_mode': 'fec_mode',
+        'eth_mdix': 'auto_mdix',
+        'eth_swt_monitor': 'switchport_monitor',
+        'eth_ethertype': 'ethertype',
+        'eth_eee_state': 'efficient_ethernet',
+        'eth_link_flapped': 'last_link_flapped',
+        'eth_clear_counters': 'last_clear_counters',
+    }
+
+    # `| json` key -> key of the counters
+    json_counters = {
+        'eth_inucast': 'in_unicast_pkts',
+        'eth_inmcast': 'in_multicast_pkts',
+        'eth_inbcast': 'in_broadcast_pkts',
+        'eth_inpkts': 'in_pkts',
+        'eth_inbytes': 'in_octets',
+        'eth_jumbo_inpkts': 'in_jumbo_packets',
+        'eth_storm_supp': 'in_storm_suppression_packets',
+        'eth_storm_supp_bytes': 'in_storm_suppression_bytes',
+        'eth_runts': 'in_runts',
+        'eth_giants': 'in_oversize_frame',
+        'eth_crc': 'in_crc_errors',
+        'eth_nobuf': 'in_no_buffer',
+        'eth_inerr': 'in_errors',
+        'eth_frame': 'in_short_frame',
+        'eth_overrun': 'in_overrun',
+        'eth_underrun': 'in_underrun',
+        'eth_ignored': 'in_ignored',
+        'eth_watchdog': 'in_watchdog',
+        'eth_bad_eth': 'in_bad_etype_drop',
+        'eth_bad_proto': 'in_unknown_protos',
+        'eth_in_ifdown_drops': 'in_if_down_drop',
+        'eth_dribble': 'in_with_dribble',
+        'eth_indiscard': 'in_discard',
+        'eth_inpause': 'in_mac_pause_frames',
+        'eth_outucast': 'out_unicast_pkts',
+        'eth_outmcast': 'out_multicast_pkts',
+        'eth_outbcast': 'out_broadcast_pkts',
+        'eth_outpkts': 'out_pkts',
+        'eth_outbytes': 'out_octets',
+        'eth_jumbo_outpkts': 'out_jumbo_packets',
+        'eth_outerr': 'out_errors',
+        'eth_coll': 'out_collision',
+        'eth_deferred': 'out_deferred',
+        'eth_latecoll': 'out_late_collision',
+        'eth_lostcarrier': 'out_lost_carrier',
+        'eth_nocarrier': 'out_no_carrier',
+        'eth_babbles': 'out_babble',
+        'eth_outdiscard': 'out_discard',
+        'eth_outpause': 'out_mac_pause_frames',
+    }
+
     def cli(self, command, interface="", include="", output=None):
         if output is None:
             output = self.device.execute(command)
@@ -1125,6 +1209,132 @@ class ShowInterface(ShowInterfaceSchema):
 
         return interface_dict
 
+    def json(self, interface="", output=None):
+        '''Parse the `| json` output into the schema of cli()'''
+        if output is None:
+            if interface:
+                output = self.device.execute(
+                    self.json_command[1].format(interface=interface))
+            else:
+                output = self.device.execute(self.json_command[0])
+
+        interface_dict = {}
+        for row in Common.json_rows(Common.load_json(output), 'interface'):
+            intf_dict = interface_dict.setdefault(row['interface'], {})
+            intf_dict['port_channel'] = {'port_channel_member': False}
+
+            # Ethernet1/10 is down (Link not connected)
+            # Vlan1 is down (Administratively down), line protocol is down
+            state = row.get('state') or row.get('svi_admin_state')
+            reason = row.get('state_rsn_desc') or row.get('svi_rsn_desc')
+            if 'state' in row and state != 'administratively down':
+                intf_dict['link_state'] = intf_dict['oper_status'] = state
+            if 'svi_line_proto' in row:
+                intf_dict.setdefault('oper_status', row['svi_line_proto'])
+            intf_dict['enabled'] = not (state == 'administratively down' or
+                                        reason == 'Administratively down')
+            if 'svi_autostate' in row:
+                intf_dict['autostate'] = row['svi_autostate'] == 'enabled'
+
+            for key, name in self.json_strings.items():
+                if key in row:
+                    intf_dict[name] = str(row[key])
+            for key, name in self.json_integers.items():
+                if key in row:
+                    intf_dict[name] = int(row[key])
+            if intf_dict.get('admin_state') == 'up':
+                intf_dict['enabled'] = True
+
+            if row.get('share_state') == 'Dedicated':
+                intf_dict['dedicated_interface'] = True
+
+            # Belongs to Po101
+            if 'eth_bundle' in row:
+                bundle = str(row['eth_bundle'])
+                intf_dict['port_channel'].update({
+                    'port_channel_member': True,
+                    'port_channel_int': Common.convert_intf_name(
+                        'Po' + bundle if bundle.isdigit() else bundle)})
+
+            # Members in this channel: Eth1/15, Eth1/16
+            if row.get('eth_members'):
+                intf_dict['port_channel'].update({
+                    'port_channel_member': True,
+                    'port_channel_member_intfs': [
+                        Common.convert_intf_name(item)
+                        for item in row['eth_members'].split(',')]})
+
+            # Internet Address is 10.4.4.4/24
+            for prefix in ('eth', 'svi'):
+                ip = row.get(prefix + '_ip_addr')
+                if ip:
+                    prefix_length = str(row[prefix + '_ip_mask'])
+                    intf_dict.setdefault('ipv4', {})[
+                        ip + '/' + prefix_length] = {
+                            'ip': ip, 'prefix_length': prefix_length}
+
+            # reliability 255/255, txload 1/255, rxload 1/255
+            for key in ('reliability', 'txload', 'rxload'):
+                if 'eth_' + key in row:
+                    intf_dict[key] = '{}/255'.format(row['eth_' + key])
+
+            # Encapsulation 802.1Q Virtual LAN, Vlan ID 10, medium is broadcast
+            if 'encapsulation' in row:
+                intf_dict['encapsulations'] = {
+                    'encapsulation': row['encapsulation'].lower().replace(
+                        '802.1q virtual lan', 'dot1q')}
+                if 'eth_vlan' in row:
+                    intf_dict['encapsulations']['first_dot1q'] = \
+                        str(row['eth_vlan'])
+
+            # full-duplex, 1000 Mb/s, media type is 1G
+            # auto-duplex, auto-speed is not kept without a media type
+            if 'eth_speed' in row and (row['eth_speed'] != 'auto-speed' or
+                                       'eth_media' in row):
+                speed = row['eth_speed'].split()
+                intf_dict['duplex_mode'] = row['eth_duplex'].lower()
+                intf_dict['port_speed'] = speed[0]
+                if len(speed) > 1:
+                    intf_dict['port_speed_unit'] = speed[1]
+
+            if 'eth_autoneg' in row:
+                intf_dict['auto_negotiate'] = row['eth_autoneg'] == 'on'
+            if 'eth_in_flowctrl' in row:
+                intf_dict['flow_control'] = {
+                    'receive': row['eth_in_flowctrl'] == 'on',
+                    'send': row['eth_out_flowctrl'] == 'on'}
+
+            counters = {}
+            for key, name in self.json_counters.items():
+                if key in row:
+                    counters[name] = int(row[key])
+            # the cli keeps the rates of the last load interval
+            for interval in ('2', '1'):
+                if 'eth_load_interval{}_rx'.format(interval) in row:
+                    counters['rate'] = {
+                        'load_interval': int(row[
+                            'eth_load_interval{}_rx'.format(interval)]),
+                        'in_rate': int(row[
+                            'eth_inrate{}_bits'.format(interval)]),
+                        'in_rate_pkts': int(row[
+                            'eth_inrate{}_pkts'.format(interval)]),
+                        'out_rate': int(row[
+                            'eth_outrate{}_bits'.format(interval)]),
+                        'out_rate_pkts': int(row[
+                            'eth_outrate{}_pkts'.format(interval)])}
+                    break
+            if 'eth_inpkts' in row:
+                counters['rx'] = True
+                if 'eth_inucast' in row and 'eth_clear_counters' in row:
+                    counters['last_clear'] = row['eth_clear_counters']
+            if 'eth_outpkts' in row:
+                counters['tx'] = True
+            if counters:
+                intf_dict['counters'] = counters
+
+        return interface_dict
+
+
 
 # ===================================
 # Schema for 'show interface vrf all'
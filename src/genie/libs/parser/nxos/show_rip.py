@@ -21,7 +21,6 @@ NXOS parser class for below commands:
     * show ip rip interface vrf {vrf}
     * show ip rip interface vrf all
 """
-import xmltodict
 import re
 
 try:
@@ -20,6 +20,7 @@ NXOS parser for the following show commands:
     * show ip route vrf {vrf}
     * show ip route vrf all
     * show ip route
+    * show ip route ... | json
     * show ip route summary vrf {vrf}
     * show ip route summary
     * show ipv6 route {route} {protocol} interface {interface} vrf {vrf}
@@ -53,6 +54,8 @@ from genie.metaparser.util.schemaengine import Schema, Any, Optional, Or, And,\
 
 # import parser utils
 from genie.libs.parser.utils.common import Common
+from genie.libs.parser.utils.interning import InternMixin
+from genie.libs.parser.utils.records import RecordMixin
 
 # =================================
 # Parser for 'show routing vrf all'
@@ -567,7 +570,7 @@ class ShowIpRouteSchema(MetaParser):
 # show ip route vrf all
 # show ip route
 # ====================================================
-class ShowIpRoute(ShowIpRouteSchema):
+class ShowIpRoute(RecordMixin, InternMixin, ShowIpRouteSchema):
     """Parser for :
         'show ip route {route} {protocol} interface {interface} vrf {vrf}',
         'show ip route {route} {protocol} interface {interface}',
@@ -608,6 +611,20 @@ class ShowIpRoute(ShowIpRouteSchema):
     exclude = [
         'updated']
 
+    # interned with the keys, see utils.interning
+    intern_fields = ('route', 'source_protocol', 'source_protocol_status',
+                     'next_hop', 'next_hop_vrf', 'next_hop_af',
+                     'outgoing_interface', 'process_id', 'encap', 'updated')
+
+    # parse(records=True) emits the next hops as records, see utils.records
+    record_paths = (('vrf', '{vrf}', 'address_family', '{address_family}',
+                     'routes', '{route}', 'next_hop', 'next_hop_list',
+                     '{index}'),)
+
+    # native structured output, parse(context='json') executes the command
+    # with `| json` and maps the TABLE_vrf rows, see json()
+    CONTEXT_LIST = MetaParser.CONTEXT_LIST + ('json',)
+
     def sort_next_hop_list(self, obj: dict):
         for key, value in obj.items():
             if isinstance(value, dict):
@@ -623,90 +640,96 @@ class ShowIpRoute(ShowIpRouteSchema):
                 else:
                     self.sort_next_hop_list(value)
 
+    def get_command(self, route=None, protocol=None, vrf=None, interface=None):
+        '''Command matching the given arguments, shared by cli() and json()'''
+        if protocol and route and interface and vrf:
+            cmd = self.cli_command[0].format(
+                    protocol=protocol,
+                    route=route,
+                    interface=interface,
+                    vrf=vrf,
+                    )
+        elif protocol and route and interface:
+            cmd = self.cli_command[1].format(
+                    protocol=protocol,
+                    route=route,
+                    interface=interface,
+                    )
+        elif protocol and route and vrf:
+            cmd = self.cli_command[2].format(
+                    protocol=protocol,
+                    route=route,
+                    vrf=vrf,
+                    )
+        elif protocol and interface and vrf:
+            cmd = self.cli_command[3].format(
+                    protocol=protocol,
+                    vrf=vrf,
+                    interface=interface,
+                    )
+        elif route and interface and vrf:
+            cmd = self.cli_command[4].format(
+                    vrf=vrf,
+                    route=route,
+                    interface=interface,
+                    )
+        elif protocol and route:
+            cmd = self.cli_command[5].format(
+                    protocol=protocol,
+                    route=route,
+                    )
+        elif protocol and interface:
+            cmd = self.cli_command[6].format(
+                    protocol=protocol,
+                    interface=interface,
+                    )
+        elif protocol and vrf:
+            cmd = self.cli_command[7].format(
+                    protocol=protocol,
+                    vrf=vrf,
+                    )
+        elif route and interface:
+            cmd = self.cli_command[8].format(
+                    route=route,
+                    interface=interface,
+                    )
+        elif route and vrf:
+            cmd = self.cli_command[9].format(
+                    route=route,
+                    vrf=vrf,
+                    )
+        elif interface and vrf:
+            cmd = self.cli_command[10].format(
+                    interface=interface,
+                    vrf=vrf,
+                    )
+        elif protocol:
+            cmd = self.cli_command[11].format(
+                    protocol=protocol,
+                    )
+        elif route:
+            cmd = self.cli_command[12].format(
+                    route=route,
+                    )
+        elif interface:
+            cmd = self.cli_command[13].format(
+                    interface=interface,
+                    )
+        elif vrf:
+            cmd = self.cli_command[14].format(
+                    vrf=vrf,
+                    )
+        else:
+            cmd = self.cli_command[15]
+
+        return cmd
+
     def cli(self, route=None, protocol=None, vrf=None, interface=None, output=None, cmd=None):
 
         # execute command to get output
         if output is None:
-            if protocol and route and interface and vrf:
-                cmd = self.cli_command[0].format(
-                        protocol=protocol,
-                        route=route,
-                        interface=interface,
-                        vrf=vrf,
-                        )
-            elif protocol and route and interface:
-                cmd = self.cli_command[1].format(
-                        protocol=protocol,
-                        route=route,
-                        interface=interface,
-                        )
-            elif protocol and route and vrf:
-                cmd = self.cli_command[2].format(
-                        protocol=protocol,
-                        route=route,
-                        vrf=vrf,
-                        )
-            elif protocol and interface and vrf:
-                cmd = self.cli_command[3].format(
-                        protocol=protocol,
-                        vrf=vrf,
-                        interface=interface,
-                        )
-            elif route and interface and vrf:
-                cmd = self.cli_command[4].format(
-                        vrf=vrf,
-                        route=route,
-                        interface=interface,
-                        )
-            elif protocol and route:
-                cmd = self.cli_command[5].format(
-                        protocol=protocol,
-                        route=route,
-                        )
-            elif protocol and interface:
-                cmd = self.cli_command[6].format(
-                        protocol=protocol,
-                        interface=interface,
-                        )
-            elif protocol and vrf:
-                cmd = self.cli_command[7].format(
-                        protocol=protocol,
-                        vrf=vrf,
-                        )
-            elif route and interface:
-                cmd = self.cli_command[8].format(
-                        route=route,
-                        interface=interface,
-                        )
-            elif route and vrf:
-                cmd = self.cli_command[9].format(
-                        route=route,
-                        vrf=vrf,
-                        )
-            elif interface and vrf:
-                cmd = self.cli_command[10].format(
-                        interface=interface,
-                        vrf=vrf,
-                        )
-            elif protocol:
-                cmd = self.cli_command[11].format(
-                        protocol=protocol,
-                        )
-            elif route:
-                cmd = self.cli_command[12].format(
-                        route=route,
-                        )
-            elif interface:
-                cmd = self.cli_command[13].format(
-                        interface=interface,
-                        )
-            elif vrf:
-                cmd = self.cli_command[14].format(
-                        vrf=vrf,
-                        )
-            else:
-                cmd = self.cli_command[15]
-
+            cmd = self.get_command(route=route, protocol=protocol, vrf=vrf,
+                                   interface=interface)
             out = self.device.execute(cmd)
         else:
             out = output
@@ -1032,6 +1055,138 @@ class ShowIpRoute(ShowIpRouteSchema):
         self.sort_next_hop_list(result_dict)
         return result_dict
 
+    def json(self, route=None, protocol=None, vrf=None, interface=None, output=None):
+        '''Parse the `| json` output into the schema of cli()'''
+        if output is None:
+            cmd = self.get_command(route=route, protocol=protocol, vrf=vrf,
+                                   interface=interface)
+            output = self.device.execute(cmd + ' | json')
+        else:
+            cmd = self.cli_command[-1]
+
+        result_dict = {}
+        # interface names and ages repeat over the table, convert them once
+        names = {}
+        for row_vrf in Common.json_rows(Common.load_json(output), 'vrf'):
+            af_dict = result_dict.setdefault('vrf', {}). \
+                setdefault(row_vrf['vrf-name-out'], {}). \
+                setdefault('address_family', {})
+            rows_addrf = Common.json_rows(row_vrf, 'addrf')
+            if not rows_addrf:
+                # IP Route Table for VRF "red", without any route
+                af_dict.setdefault('ipv6' if 'v6' in cmd else 'ipv4',
+                                   {}).setdefault('routes', {})
+
+            for row_addrf in rows_addrf:
+                af = 'ipv6' if 'v6' in row_addrf['addrf'] else 'ipv4'
+                routes_dict = af_dict.setdefault(af, {}). \
+                    setdefault('routes', {})
+
+                for row_prefix in Common.json_rows(row_addrf, 'prefix'):
+                    # 10.36.3.3/32, ubest/mbest: 2/0, attached
+                    route = row_prefix['ipprefix']
+                    route_dict = routes_dict.setdefault(route, {})
+                    route_dict.update({'route': route, 'active': True})
+                    if 'ucast-nhops' in row_prefix:
+                        route_dict['ubest'] = int(row_prefix['ucast-nhops'])
+                    if 'mcast-nhops' in row_prefix:
+                        route_dict['mbest'] = int(row_prefix['mcast-nhops'])
+                    if row_prefix.get('attached') == 'true':
+                        route_dict['attached'] = True
+
+                    # *via 10.1.3.1, Eth1/2, [110/41], 01:01:18, ospf-1, intra
+                    for index, row_path in enumerate(
+                            Common.json_rows(row_prefix, 'path'), 1):
+                        self._json_path(route_dict, index, row_path, names)
+
+        self.sort_next_hop_list(result_dict)
+        return result_dict
+
+    def _json_path(self, route_dict, index, row_path, names):
+        '''Add a ROW_path of the `| json` output to a route, as cli() does
+        for a "via" line, `names` caches the converted names and ages'''
+        next_hop = row_path.get('ipnexthop') or row_path.get('ipv6nexthop')
+        next_hop_vrf = next_hop_af = process_id = ''
+        if next_hop and '%' in next_hop:
+            next_hop, next_hop_vrf = next_hop.split('%', 1)
+            if ':' in next_hop_vrf:
+                next_hop_vrf, next_hop_af = next_hop_vrf.split(':', 1)
+                next_hop_af = next_hop_af.lower()
+
+        interface = row_path.get('ifname', '')
+        if interface:
+            if interface not in names:
+                names[interface] = Common.convert_intf_name(
+                    interface)
+            interface = names[interface]
+        updated = row_path.get('uptime', '')
+        if updated:
+            if updated not in names:
+                names[updated] = Common.convert_xml_time(updated)
+            updated = names[updated]
+
+        source_protocol = row_path.get('clientname', '')
+        if '-' in source_protocol:
+            source_protocol, process_id = source_protocol.split('-', 1)
+        source_protocol_status = row_path.get('type', '')
+
+        # '*' denotes best ucast next-hop, '**' best mcast next-hop
+        cast = None
+        if row_path.get('ubest') == 'true':
+            cast = 'best_ucast_nexthop'
+        elif row_path.get('mbest') == 'true':
+            cast = 'best_mcast_nexthop'
+        route_preference = int(row_path.get('pref', 0))
+        metric = int(row_path.get('metric', 0))
+
+        if row_path.get('hidden') == 'true':
+            route_dict['hidden'] = True
+        if cast:
+            route_dict['metric'] = metric
+            route_dict['route_preference'] = route_preference
+        if process_id:
+            route_dict['process_id'] = process_id
+        if row_path.get('tag'):
+            route_dict['tag'] = int(row_path['tag'])
+
+        next_hop_dict = route_dict.setdefault('next_hop', {})
+        if not next_hop:
+            interface_dict = next_hop_dict.setdefault(
+                'outgoing_interface', {}).setdefault(interface, {})
+            if interface:
+                interface_dict['outgoing_interface'] = interface
+            if updated:
+                interface_dict['updated'] = updated
+            return
+
+        index_dict = next_hop_dict.setdefault('next_hop_list', {}). \
+            setdefault(index, {})
+        index_dict.update({'index': index, 'next_hop': next_hop})
+        if source_protocol:
+            route_dict['source_protocol'] = source_protocol
+            index_dict['source_protocol'] = source_protocol
+        if source_protocol_status:
+            route_dict['source_protocol_status'] = source_protocol_status
+            index_dict['source_protocol_status'] = source_protocol_status
+        if cast:
+            index_dict[cast] = True
+        if updated:
+            index_dict['updated'] = updated
+        if interface:
+            index_dict['outgoing_interface'] = interface
+        if next_hop_vrf:
+            index_dict['next_hop_vrf'] = next_hop_vrf
+        if next_hop_af:
+            index_dict['next_hop_af'] = next_hop_af
+        index_dict['metric'] = metric
+        index_dict['route_preference'] = route_preference
+        if row_path.get('segid'):
+            index_dict['segid'] = int(row_path['segid'])
+        if row_path.get('tunnelid'):
+            index_dict['tunnelid'] = row_path['tunnelid']
+        if row_path.get('encap'):
+            index_dict['encap'] = row_path['encap'].lower()
+
 
 # ====================================================
 #  parser for:
@@ -1193,6 +1348,8 @@ class ShowRouting(ShowIpRoute):
         Parser for show routing
         show routing <ip>"""
     cli_command = ['show routing', 'show routing {protocol}']
+    # the json() of ShowIpRoute is bound to its commands
+    CONTEXT_LIST = MetaParser.CONTEXT_LIST
 
     def cli(self, protocol=None, route=None, vrf=None, interface=None, output=None, cmd=None):
 
@@ -6,7 +6,6 @@ NXOS parsers for the following show commands:
 
 # Python
 import re
-import xmltodict
 
 # Metaparser
 from genie.metaparser import MetaParser
@@ -0,0 +1,180 @@
+'''Asyncio execution API for parsers
+
+Every parser `cli()` calls ``self.device.execute(cmd)`` synchronously, one
+worker thread is blocked per command in flight.  The coroutines below await
+the device instead and only hand the CPU bound parsing to an executor, so a
+single event loop can drive thousands of device sessions:
+
+    >>> parsed = await aparse(device, 'show ip route')
+
+    >>> parser = ShowVersion(device=device)
+    >>> parsed = await aparse_parser(parser, command='show version')
+
+The device may provide a coroutine ``aexecute(command)``, a coroutine
+``execute(command)`` or a regular blocking ``execute(command)`` which is then
+run in the executor.
+
+Composite parsers run more than one command from their `cli()`.  When no
+command is given, the whole `parse()` runs in the executor against a device
+proxy whose ``execute`` schedules the device coroutine on the event loop and
+waits for it, the loop keeps serving the other sessions meanwhile.  The
+sub-commands such parsers declare through `subcommands.execute_commands` are
+all in flight on the loop at once.
+'''
+
+# python
+import copy
+import asyncio
+import inspect
+import logging
+import functools
+
+from .common import get_parser
+from .classifier import check_output
+
+log = logging.getLogger(__name__)
+
+# sub-commands of a composite parser awaited at once through the proxy
+PROXY_SUB_COMMAND_WORKERS = 16
+
+
+def _async_execute(device):
+    '''Coroutine function executing commands on `device`, or None'''
+    for name in ('aexecute', 'execute'):
+        execute = getattr(device, name, None)
+        if execute is not None and inspect.iscoroutinefunction(execute):
+            return execute
+    return None
+
+
+async def aexecute(device, command, executor=None, **kwargs):
+    '''Await the output of `command` on `device`
+
+        Args:
+            device (`Device`): device with an async or blocking execute
+            command (`str`): command to execute
+            executor (`Executor`): executor of a blocking execute, the loop
+                                   default executor when None
+            kwargs (`dict`): extra arguments of execute
+
+        Returns:
+            `str` output of the command
+    '''
+    execute = _async_execute(device)
+    if execute is not None:
+        return await execute(command, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    output = await loop.run_in_executor(
+        executor, functools.partial(device.execute, command, **kwargs))
+    if inspect.isawaitable(output):
+        output = await output
+    return output
+
+
+class SyncDeviceProxy(object):
+    '''Blocking view of an async device, used from executor threads
+
+    ``execute`` submits the device coroutine to the event loop the proxy was
+    created on and blocks the calling thread until the output arrives.  Every
+    other attribute is looked up on the wrapped device, so the parsers see
+    the usual device attributes (os, name, ...).
+
+    The threads of ``execute`` only wait on the loop, the sub-commands of
+    composite parsers are executed concurrently through the proxy.
+    '''
+
+    sub_command_workers = PROXY_SUB_COMMAND_WORKERS
+
+    def __init__(self, device, loop):
+        self.__dict__['_device'] = device
+        self.__dict__['_loop'] = loop
+
+    def execute(self, command, **kwargs):
+        future = asyncio.run_coroutine_threadsafe(
+            aexecute(self._device, command, **kwargs), self._loop)
+        return future.result()
+
+    def __getattr__(self, name):
+        return getattr(self._device, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._device, name, value)
+
+
+async def _aparse(parser, output, command, executor, classify,
+                  parser_kwargs):
+    loop = asyncio.get_running_loop()
+    device = parser.device
+
+    if output is None and command is not None:
+        output = await aexecute(device, command)
+
+    if output is not None and classify \
+            and getattr(parser, 'preclassify', True):
+        check_output(output, os=getattr(device, 'os', None),
+                     command=command or '')
+
+    if output is not None:
+        parser_kwargs = dict(parser_kwargs, output=output)
+
+    # composite parsers execute more commands from cli(), even when given an
+    # output, they reach the async device through the blocking proxy.  The
+    # proxy is bound to a copy of the parser, the caller's parser may be in
+    # use by other calls at the same time
+    if _async_execute(device) is not None:
+        parser = copy.copy(parser)
+        parser.device = SyncDeviceProxy(device, loop)
+    return await loop.run_in_executor(
+        executor, functools.partial(parser.parse, **parser_kwargs))
+
+
+async def aparse_parser(parser, output=None, command=None, executor=None,
+                        classify=True, **kwargs):
+    '''Parse asynchronously with a parser instance
+
+        Args:
+            parser (`MetaParser`): parser bound to a device
+            output (`str`): already collected output, nothing is executed
+            command (`str`): command to await on the device before parsing.
+                             When both output and command are None, the
+                             whole parse runs in the executor and the parser
+                             executes its own commands through the loop.
+            executor (`Executor`): executor of the CPU bound parsing, the
+                                   loop default executor when None
+            classify (`bool`): check the output with the pre-parse classifier
+            kwargs (`dict`): arguments of the parser
+
+        Returns:
+            parsed `dict`
+    '''
+    return await _aparse(parser, output, command, executor, classify, kwargs)
+
+
+async def aparse(device, command, output=None, executor=None, classify=True,
+                 fuzzy=False, revision=None, abstract=None, **kwargs):
+    '''Find the parser of `command` for `device` and parse asynchronously
+
+        Args:
+            device (`Device`): device with an async or blocking execute
+            command (`str`): show command, as given to `get_parser`
+            output (`str`): already collected output, nothing is executed
+            executor (`Executor`): executor of the CPU bound parsing
+            classify (`bool`): check the output with the pre-parse classifier
+            kwargs (`dict`): extra arguments of the parser
+
+        Returns:
+            parsed `dict`
+
+        example:
+
+            >>> async def poll(devices):
+            ...     return await asyncio.gather(
+            ...         *(aparse(device, 'show version') for device in devices))
+    '''
+    parser_class, parser_kwargs = get_parser(command, device, fuzzy=fuzzy,
+                                             revision=revision,
+                                             abstract=abstract)
+    parser_kwargs.update(kwargs)
+    return await _aparse(parser_class(device=device), output, command,
+                         executor, classify, parser_kwargs)
@@ -0,0 +1,156 @@
+'''Batched execution of show commands, demultiplexed to their parsers
+
+Every parser `cli()` is a ``device.execute()`` round trip: the command is
+sent and the session waits for the prompt before the next one is sent.  A
+40 command health check spends most of its time in those waits.
+
+`execute_batch` writes all the commands to the session at once, each one
+followed by a marker line (a comment carrying a unique token), and reads
+until the echo of the last marker.  The device echoes a line when its exec
+reads it, so the markers cut the combined output back into the output of
+every command.  `parse_batch` resolves the parsers of the commands with
+`get_parser` before anything is sent and parses every output with its
+parser:
+
+    >>> parsed = parse_batch(device, ['show version', 'show ip route',
+    ...                               'show interfaces'])
+    >>> parsed['show version']['version']['version']
+
+The device needs the unicon ``transmit``/``receive``/``receive_buffer``
+services, the paging of the terminal must be disabled (unicon does it on
+connect).  Commands without a parser and outputs a parser fails on are left
+out of the result, `errors` collects the reason of each of them.
+'''
+
+# python
+import re
+import uuid
+import logging
+
+from .common import get_parser
+
+log = logging.getLogger(__name__)
+
+# comment line following every command, echoed but not executed
+MARKER_COMMAND = '! {token}-{index}'
+
+# seconds to wait for the echo of the last marker
+DEFAULT_TIMEOUT = 120
+
+
+def _marker_token():
+    return 'BATCH-{}'.format(uuid.uuid4().hex[:12])
+
+
+def demultiplex(output, commands, token):
+    '''Cut a batched session output into the output of every command
+
+        Args:
+            output (`str`): session output of the batch
+            commands (`list`): commands of the batch, in order
+            token (`str`): token of the marker lines
+
+        Returns:
+            `dict` of command -> output, without the command echo and the
+            prompt.  The commands whose marker is missing are left out.
+    '''
+    marker = re.compile(r'^.*{}-(\d+)\s*$'.format(re.escape(token)))
+    outputs = {}
+    lines = []
+    for line in output.replace('\r', '').splitlines():
+        m = marker.match(line)
+        if not m:
+            lines.append(line)
+            continue
+        index = int(m.group(1))
+        if index < len(commands):
+            command = commands[index]
+            # drop the echo of the command, prompt included, and what the
+            # session held before it
+            for echo, text in enumerate(lines[:3]):
+                if text.rstrip().endswith(command):
+                    del lines[:echo + 1]
+                    break
+            outputs[command] = '\n'.join(lines).strip('\n') + '\n'
+        lines = []
+    return outputs
+
+
+def execute_batch(device, commands, marker=MARKER_COMMAND,
+                  timeout=DEFAULT_TIMEOUT):
+    '''Execute show commands in one session write
+
+        Args:
+            device (`Device`): connected device
+            commands (`list`): show commands
+            marker (`str`): marker line, formatted with token and index
+            timeout (`int`): seconds to wait for the whole batch
+
+        Returns:
+            `dict` of command -> output
+    '''
+    commands = list(dict.fromkeys(commands))
+    if not commands:
+        return {}
+
+    token = _marker_token()
+    lines = []
+    for index, command in enumerate(commands):
+        lines.append(command)
+        lines.append(marker.format(token=token, index=index))
+    last = re.escape(marker.format(token=token, index=len(commands) - 1))
+
+    device.transmit('\r'.join(lines) + '\r')
+    if not device.receive(r'{}\s*[\r\n]'.format(last), timeout=timeout):
+        log.warning('Last marker of the batch not received within %s '
+                    'seconds', timeout)
+    output = device.receive_buffer()
+
+    return demultiplex(output, commands, token)
+
+
+def parse_batch(device, commands, marker=MARKER_COMMAND,
+                timeout=DEFAULT_TIMEOUT, errors=None):
+    '''Execute show commands in one session write and parse their outputs
+
+        Args:
+            device (`Device`): connected device, its os and platform select
+                               the parsers
+            commands (`list`): show commands
+            marker (`str`): marker line, formatted with token and index
+            timeout (`int`): seconds to wait for the whole batch
+            errors (`dict`): filled with command -> reason of the commands
+                             which are not in the result
+
+        Returns:
+            `dict` of command -> parsed output, in the command order
+    '''
+    errors = {} if errors is None else errors
+
+    # resolve every parser before anything is sent
+    parsers = {}
+    for command in commands:
+        if command in parsers:
+            continue
+        try:
+            parsers[command] = get_parser(command, device)
+        except Exception as e:
+            errors[command] = '{}: {}'.format(type(e).__name__, e)
+
+    outputs = execute_batch(device, list(parsers), marker=marker,
+                            timeout=timeout)
+
+    results = {}
+    for command, (parser_class, kwargs) in parsers.items():
+        if command not in outputs:
+            errors[command] = 'output not found in the batch'
+            continue
+        try:
+            results[command] = parser_class(device=device).parse(
+                output=outputs[command], **kwargs)
+        except Exception as e:
+            errors[command] = '{}: {}'.format(type(e).__name__, e)
+
+    log.info('Parsed %d of %d batched commands', len(results),
+             len(results) + len(errors))
+    return results
@@ -0,0 +1,1742 @@
+'''Benchmarks for genie.libs.parser
+
+Run from the command line:
+
+    python -m genie.libs.parser.utils.benchmark scaling \\
+        --generator iosxe_show_ip_route --sizes 1000,10000,100000
+
+    python -m genie.libs.parser.utils.benchmark import --runs 5
+
+    python -m genie.libs.parser.utils.benchmark classifier --error-ratio 0.5
+
+    python -m genie.libs.parser.utils.benchmark json --size 1000
+
+    python -m genie.libs.parser.utils.benchmark lpm --size 1000000
+
+    python -m genie.libs.parser.utils.benchmark columnar --size 256000
+
+    python -m genie.libs.parser.utils.benchmark intern --size 100000
+
+    python -m genie.libs.parser.utils.benchmark records --size 500000
+
+    python -m genie.libs.parser.utils.benchmark topology --devices 10000 \\
+        --links 500000
+
+    python -m genie.libs.parser.utils.benchmark ospf --routers 5000
+
+    python -m genie.libs.parser.utils.benchmark isis --routers 2400
+
+    python -m genie.libs.parser.utils.benchmark rates --devices 1000 \\
+        --interfaces 1000
+
+    python -m genie.libs.parser.utils.benchmark diff --size 100000
+
+    python -m genie.libs.parser.utils.benchmark serialize --size 100000
+
+The scaling benchmark feeds the synthetic outputs of
+`genie.libs.parser.utils.synthetic` to their parsers at increasing sizes and
+records parse time and peak memory.  The growth exponent between two
+consecutive sizes is reported so super-linear behaviour (an accidental O(n^2)
+loop) is caught before it reaches devices with full tables.
+
+The import benchmark measures ``python -X importtime`` of the package in fresh
+interpreters, the startup cost paid by every short lived worker process.
+
+The classifier benchmark replays a mix of golden outputs and error banners
+through the parsers, with and without the pre-parse output classifier.
+
+The json benchmark parses paired synthetic outputs of the same data, the cli
+text and the NX-OS ``| json`` reply, through the cli() and json() contexts of
+their parser.
+
+The lpm benchmark loads a synthetic routing table into a `RouteIndex` and
+times longest prefix match queries against a linear scan of the parsed
+prefixes.
+
+The columnar benchmark parses a synthetic table output into the parsed dict
+and into a `ColumnarTable`, and compares their parse time, peak memory and
+the memory the result holds.
+
+The intern benchmark compares the memory held by the parsed output of the
+parsers interning their strings, with and without interning.
+
+The records benchmark measures the memory held by a parsed synthetic output
+before and after its leaf entries are converted to slotted records.
+
+The topology benchmark feeds the parsed CDP and LLDP neighbors of a synthetic
+network to a `Topology`, then re-adds the devices whose neighbors changed and
+times link lookups by abbreviated interface names.
+
+The ospf benchmark loads the router and network LSAs of a synthetic area in
+an `OspfGraph`, then times SPF runs and the update of a poll where a few
+LSAs changed against a rebuild of the graph.
+
+The isis benchmark does the same with the LSPs of a synthetic level 2 domain
+in an `IsisGraph`, some of them split in fragments.
+
+The rates benchmark feeds polls of the interface counters of a synthetic
+network to a `RateEngine`, and to the dict of the previous parsed counters
+the rates are usually computed from, and compares their time per cycle and
+the memory they hold.
+
+The diff benchmark finds the changes between two polls of a synthetic route
+table or BGP table with `genie.utils.diff.Diff`, and with the snapshots of
+`genie.libs.parser.utils.diff`, also for a poll sharing its unchanged entries
+with the previous one.
+
+The serialize benchmark writes a parsed synthetic output with ``json.dumps``,
+`format_output` and the json and binary `dump` of
+`genie.libs.parser.utils.serialize`, and compares their time and peak
+memory, then loads it back with ``json.loads`` and the binary `load`.
+'''
+
+# python
+import os
+import copy
+import gc
+import sys
+import json
+import ipaddress
+import math
+import random
+import time
+import logging
+import argparse
+import subprocess
+import tracemalloc
+from collections.abc import Mapping
+
+from .synthetic import GENERATORS, JSON_GENERATORS, load_parser_class
+
+log = logging.getLogger(__name__)
+
+# growth exponent above which a parser is reported as super-linear
+SUPERLINEAR_EXPONENT = 1.5
+
+
+def measure(func, *args, repeat=1, memory=True, **kwargs):
+    '''Run `func` and return its best wall time and peak allocated memory
+
+        Args:
+            func (`callable`): function to measure
+            repeat (`int`): number of timed runs, the fastest one is kept
+            memory (`bool`): also run once under tracemalloc
+
+        Returns:
+            tuple of (seconds, peak bytes or None, last result)
+    '''
+    best = math.inf
+    result = None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        # tracemalloc slows execution down, keep it out of the timed runs
+        result = None
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = func(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return best, peak, result
+
+
+def growth_exponents(samples, key='seconds'):
+    '''Exponent k of `key ~ size ** k` between consecutive samples'''
+    exponents = []
+    for previous, current in zip(samples, samples[1:]):
+        if not previous[key] or not current[key] \
+                or current['size'] == previous['size']:
+            exponents.append(None)
+            continue
+        exponents.append(
+            math.log(current[key] / previous[key]) /
+            math.log(current['size'] / previous['size']))
+    return exponents
+
+
+def scaling_benchmark(generator, sizes=None, repeat=1, memory=True, seed=0):
+    '''Parse synthetic outputs of increasing size
+
+        Args:
+            generator (`str`): name of a generator in `synthetic.GENERATORS`
+            sizes (`list`): sizes to generate, defaults to the generator ones
+            repeat (`int`): timed runs per size
+            memory (`bool`): record the peak memory of every parse
+            seed (`int`): seed of the synthetic output
+
+        Returns:
+            list of `dict` with size, lines, seconds and peak_bytes
+    '''
+    func, parser_path, kwargs, default_sizes = GENERATORS[generator]
+    parser_class = load_parser_class(parser_path)
+
+    samples = []
+    for size in sizes or default_sizes:
+        output = func(size, seed=seed)
+        seconds, peak, _ = measure(
+            lambda: parser_class(device=None).parse(output=output, **kwargs),
+            repeat=repeat, memory=memory)
+        samples.append({'size': size,
+                        'lines': output.count('\n') + 1,
+                        'seconds': seconds,
+                        'peak_bytes': peak})
+        log.info('%s size %s parsed in %.3fs', generator, size, seconds)
+
+    for sample, exponent in zip(samples[1:], growth_exponents(samples)):
+        sample['time_exponent'] = exponent
+        if exponent and exponent > SUPERLINEAR_EXPONENT:
+            log.warning('%s grows super-linearly between sizes %s: '
+                        'time ~ n^%.2f', generator, sample['size'], exponent)
+    return samples
+
+
+def plot_samples(results, path):
+    '''Plot parse time and peak memory against size into `path`
+
+    matplotlib is an optional dependency, nothing is plotted without it.
+
+        Args:
+            results (`dict`): generator name -> list of samples
+            path (`str`): image file to write
+    '''
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        from matplotlib import pyplot
+    except ImportError:
+        log.warning('matplotlib is not installed, skipping plot')
+        return False
+
+    figure, (time_axis, memory_axis) = pyplot.subplots(1, 2, figsize=(12, 5))
+    for name, samples in results.items():
+        sizes = [s['size'] for s in samples]
+        time_axis.loglog(sizes, [s['seconds'] for s in samples],
+                         marker='o', label=name)
+        if all(s['peak_bytes'] for s in samples):
+            memory_axis.loglog(sizes, [s['peak_bytes'] for s in samples],
+                               marker='o', label=name)
+    time_axis.set_xlabel('size')
+    time_axis.set_ylabel('parse time (s)')
+    memory_axis.set_xlabel('size')
+    memory_axis.set_ylabel('peak memory (bytes)')
+    time_axis.legend()
+    figure.tight_layout()
+    figure.savefig(path)
+    return True
+
+
+def format_samples(name, samples):
+    '''Aligned text table of benchmark samples'''
+    lines = ['{}:'.format(name),
+             '  {:>10} {:>10} {:>12} {:>14} {:>8}'.format(
+                 'size', 'lines', 'seconds', 'peak MB', 'n^k')]
+    for sample in samples:
+        peak = sample.get('peak_bytes')
+        exponent = sample.get('time_exponent')
+        lines.append('  {:>10} {:>10} {:>12.4f} {:>14} {:>8}'.format(
+            sample['size'], sample.get('lines', ''), sample['seconds'],
+            '{:.1f}'.format(peak / 2 ** 20) if peak else '-',
+            '{:.2f}'.format(exponent) if exponent else '-'))
+    return '\n'.join(lines)
+
+
+def import_time(module='genie.libs.parser', runs=5, top=10):
+    '''Import time of `module` in a fresh interpreter
+
+    Every run starts a new python with ``-X importtime``, the fastest run is
+    kept to remove the noise of a cold file system cache.
+
+        Args:
+            module (`str`): module to import
+            runs (`int`): number of interpreters to start
+            top (`int`): number of most expensive modules to report
+
+        Returns:
+            `dict` with the cumulative import time in microseconds, the
+            number of modules imported and the `top` modules by self time
+    '''
+    best = None
+    for _ in range(runs):
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c',
+             'import {}'.format(module)],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True, check=True)
+
+        modules = {}
+        cumulative = None
+        for line in process.stderr.splitlines():
+            # import time:       382 |     312593 | genie.libs.parser
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, name = line[12:].split('|')
+            name = name.strip()
+            modules[name] = int(self_us)
+            if name == module:
+                cumulative = int(cumulative_us)
+
+        if best is None or cumulative < best['cumulative_us']:
+            best = {'module': module,
+                    'cumulative_us': cumulative,
+                    'modules': len(modules),
+                    'imported': set(modules),
+                    'top': sorted(modules.items(), key=lambda item: item[1],
+                                  reverse=True)[:top]}
+    return best
+
+
+# parsers of the mixed workload, (os, module, class)
+CLASSIFIER_PARSERS = (
+    ('iosxe', 'genie.libs.parser.iosxe.show_routing', 'ShowIpRoute'),
+    ('iosxe', 'genie.libs.parser.iosxe.show_bgp', 'ShowBgpAllDetail'),
+    ('iosxe', 'genie.libs.parser.iosxe.show_fdb', 'ShowMacAddressTable'),
+    ('iosxe', 'genie.libs.parser.iosxe.show_interface',
+     'ShowIpInterfaceBrief'),
+    ('nxos', 'genie.libs.parser.nxos.show_routing', 'ShowIpRoute'),
+    ('nxos', 'genie.libs.parser.nxos.show_interface', 'ShowIpInterfaceBrief'),
+)
+
+
+def classifier_workload(total=1000, error_ratio=0.5, seed=0):
+    '''Mixed workload of golden outputs and error banners
+
+        Returns:
+            list of (os, parser class, output, arguments)
+    '''
+    from unittest.mock import Mock
+    from .classifier import __file__ as classifier_file
+    from .tests.fake_device import golden_outputs
+
+    with open(os.path.join(os.path.dirname(classifier_file),
+                           'error_banners.json')) as f:
+        banners = json.load(f)
+
+    data, errors = [], []
+    for os_name, module, class_name in CLASSIFIER_PARSERS:
+        parser_class = load_parser_class('{}.{}'.format(module, class_name))
+        for output, arguments in golden_outputs(os_name, class_name):
+            data.append((os_name, parser_class, output, arguments))
+        for output, arguments in golden_outputs(os_name, class_name, 'empty'):
+            errors.append((os_name, parser_class, output, arguments))
+        for banner in banners.get(os_name, []):
+            errors.append((os_name, parser_class, banner['output'], {}))
+
+    rng = random.Random(seed)
+    workload = [rng.choice(errors) if rng.random() < error_ratio
+                else rng.choice(data) for _ in range(total)]
+    return [(os_name, parser_class, output, arguments,
+             Mock(os=os_name, execute=Mock(return_value=output)))
+            for os_name, parser_class, output, arguments in workload]
+
+
+def classifier_benchmark(total=1000, error_ratio=0.5, repeat=3, seed=0):
+    '''Time a mixed workload with and without the output classifier
+
+        Args:
+            total (`int`): number of outputs in the workload
+            error_ratio (`float`): share of error and empty outputs
+            repeat (`int`): timed runs, the fastest one is kept
+
+        Returns:
+            `dict` with the seconds of both runs and the speedup
+    '''
+    from .classifier import parse_classified
+
+    workload = classifier_workload(total, error_ratio, seed)
+
+    def plain():
+        for _, parser_class, output, arguments, device in workload:
+            try:
+                parser_class(device=device).parse(output=output, **arguments)
+            except Exception:
+                pass
+
+    def classified():
+        for _, parser_class, output, arguments, device in workload:
+            try:
+                parse_classified(parser_class(device=device), output=output,
+                                 **arguments)
+            except Exception:
+                pass
+
+    plain_seconds, _, _ = measure(plain, repeat=repeat, memory=False)
+    classified_seconds, _, _ = measure(classified, repeat=repeat,
+                                       memory=False)
+    return {'total': total,
+            'error_ratio': error_ratio,
+            'plain_seconds': plain_seconds,
+            'classified_seconds': classified_seconds,
+            'speedup': plain_seconds / classified_seconds}
+
+
+def _drop_keys(data, keys):
+    '''Copy of a parsed structure without `keys`, at any depth'''
+    if isinstance(data, dict):
+        return {key: _drop_keys(value, keys)
+                for key, value in data.items() if key not in keys}
+    return data
+
+
+def json_benchmark(name, size=None, repeat=3, seed=0):
+    '''Time the cli() and json() contexts of a parser on paired outputs
+
+        Args:
+            name (`str`): generator name, a key of JSON_GENERATORS
+            size (`int`): size of the outputs, largest default size / 10 when
+                          None
+            repeat (`int`): timed runs, the fastest one is kept
+
+        Returns:
+            `dict` with the seconds and peak memory of both contexts, the
+            speedup and whether both contexts return the same structure,
+            the `exclude` keys of the parser left aside
+    '''
+    generator, parser_path, kwargs, sizes = GENERATORS[name]
+    size = size or sizes[-1] // 10
+    parser_class = load_parser_class(parser_path)
+    text = generator(size, seed=seed)
+    reply = JSON_GENERATORS[name](size, seed=seed)
+    json_kwargs = {key: value for key, value in kwargs.items()
+                   if key != 'command'}
+
+    cli_seconds, cli_peak, cli_result = measure(
+        parser_class(device=None).cli, output=text, repeat=repeat, **kwargs)
+    json_seconds, json_peak, json_result = measure(
+        parser_class(device=None).json, output=reply, repeat=repeat,
+        **json_kwargs)
+    return {'name': name,
+            'size': size,
+            'cli_seconds': cli_seconds,
+            'cli_peak': cli_peak,
+            'json_seconds': json_seconds,
+            'json_peak': json_peak,
+            'speedup': cli_seconds / json_seconds,
+            'equal': _drop_keys(cli_result, set(parser_class.exclude)) ==
+                     _drop_keys(json_result, set(parser_class.exclude))}
+
+
+def _linear_lookup(routes, address):
+    '''Longest prefix match by a scan of the parsed prefixes'''
+    address = ipaddress.ip_address(address)
+    best = None
+    for prefix in routes:
+        network = ipaddress.ip_network(prefix)
+        if address in network and \
+                (best is None or network.prefixlen > best.prefixlen):
+            best = network
+    return str(best) if best else None
+
+
+def route_index_benchmark(size=100000, queries=10000, scans=3, seed=0):
+    '''Build a RouteIndex from a parsed synthetic table and time lookups
+
+        Args:
+            size (`int`): prefixes of the IOS-XE 'show ip route' output
+            queries (`int`): addresses looked up in the index
+            scans (`int`): addresses looked up by a linear scan
+
+        Returns:
+            `dict` with the build time and peak memory, the seconds per
+            query of the index and of the scan
+    '''
+    from .route_index import RouteIndex
+
+    generator, parser_path, kwargs, _ = GENERATORS['iosxe_show_ip_route']
+    parsed = load_parser_class(parser_path)(device=None).parse(
+        output=generator(size, seed=seed))
+    routes = parsed['vrf']['default']['address_family']['ipv4']['routes']
+
+    build_seconds, build_peak, index = measure(
+        lambda: RouteIndex().add(parsed))
+    rng = random.Random(seed)
+    addresses = [str(ipaddress.IPv4Address(rng.randrange(1 << 24,
+                                                         (1 << 24) + (size << 8))))
+                 for _ in range(queries)]
+
+    start = time.perf_counter()
+    found = [index.lookup(address) for address in addresses]
+    lookup_seconds = (time.perf_counter() - start) / queries
+
+    start = time.perf_counter()
+    for address, result in zip(addresses[:scans], found):
+        assert _linear_lookup(routes, address) == result[0]
+    scan_seconds = (time.perf_counter() - start) / max(scans, 1)
+
+    return {'size': len(index),
+            'build_seconds': build_seconds,
+            'build_peak': build_peak,
+            'routes': len(index._routes),
+            'lookup_seconds': lookup_seconds,
+            'scan_seconds': scan_seconds,
+            'speedup': scan_seconds / lookup_seconds}
+
+
+def _retained(func):
+    '''Bytes allocated by `func` and still held once it returned'''
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current, result
+
+
+def columnar_benchmark(name='iosxe_show_mac_address_table', size=None,
+                       repeat=1, seed=0):
+    '''Parse a synthetic table output as a dict and as a ColumnarTable
+
+        Args:
+            name (`str`): generator of a parser declaring ``table_path``
+            size (`int`): rows of the output, the second largest default
+                          size of the generator when None
+            repeat (`int`): timed runs of each parse
+
+        Returns:
+            `dict` with the seconds, peak and retained bytes of both parses
+    '''
+    from .columnar import parse_columnar
+
+    generator, parser_path, kwargs, sizes = GENERATORS[name]
+    size = size or sizes[-2]
+    parser_class = load_parser_class(parser_path)
+    output = generator(size, seed=seed)
+
+    def parse_dict():
+        return parser_class(device=None).parse(output=output, **kwargs)
+
+    def parse_table():
+        return parse_columnar(parser_class, output=output, **kwargs)
+
+    dict_seconds, dict_peak, _ = measure(parse_dict, repeat=repeat)
+    table_seconds, table_peak, _ = measure(parse_table, repeat=repeat)
+    dict_retained, parsed = _retained(parse_dict)
+    table_retained, table = _retained(parse_table)
+    return {'name': name,
+            'size': size,
+            'rows': table.rows,
+            'dict_seconds': dict_seconds,
+            'dict_peak': dict_peak,
+            'dict_retained': dict_retained,
+            'table_seconds': table_seconds,
+            'table_peak': table_peak,
+            'table_retained': table_retained,
+            'equal': table.view() == parsed}
+
+
+def interning_benchmark(name, size=None, seed=0):
+    '''Memory held by a parsed synthetic output, with and without interning
+
+        Args:
+            name (`str`): generator of a parser based on InternMixin
+            size (`int`): size of the output, the largest default size of
+                          the generator when None
+
+        Returns:
+            `dict` with the seconds and the held bytes of both parses
+    '''
+    generator, parser_path, kwargs, sizes = GENERATORS[name]
+    size = size or sizes[-1]
+    parser_class = load_parser_class(parser_path)
+    output = generator(size, seed=seed)
+
+    def parse(intern_strings):
+        return parser_class(device=None).parse(
+            output=output, intern_strings=intern_strings, **kwargs)
+
+    plain_seconds, _, _ = measure(parse, False, memory=False)
+    interned_seconds, _, _ = measure(parse, True, memory=False)
+    plain_retained, _ = _retained(lambda: parse(False))
+    interned_retained, _ = _retained(lambda: parse(True))
+    return {'name': name,
+            'size': size,
+            'plain_seconds': plain_seconds,
+            'plain_retained': plain_retained,
+            'interned_seconds': interned_seconds,
+            'interned_retained': interned_retained,
+            'reduction': 1 - interned_retained / plain_retained}
+
+
+def _deep_size(parsed):
+    '''Bytes of the distinct objects referenced by a parsed output'''
+    seen = set()
+    size = 0
+    stack = [parsed]
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        size += sys.getsizeof(value)
+        if isinstance(value, Mapping):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return size
+
+
+def records_benchmark(name='iosxe_show_bgp_all_detail', size=None, seed=0):
+    '''Memory held by a parsed synthetic output as dicts and as records
+
+    The output is parsed once, the held memory is measured before and after
+    its entries are converted in place.  It is the size of the objects the
+    output references, the parse of a 500k path bgp table under tracemalloc
+    takes hours.
+
+        Args:
+            name (`str`): generator of a parser based on RecordMixin
+            size (`int`): size of the output, the largest default size of
+                          the generator when None
+
+        Returns:
+            `dict` with the parse and conversion seconds and the held bytes
+            of both forms
+    '''
+    from .records import to_records
+
+    generator, parser_path, kwargs, sizes = GENERATORS[name]
+    size = size or sizes[-1]
+    parser_class = load_parser_class(parser_path)
+    output = generator(size, seed=seed)
+
+    start = time.perf_counter()
+    parsed = parser_class(device=None).parse(output=output, **kwargs)
+    parse_seconds = time.perf_counter() - start
+    dict_retained = _deep_size(parsed)
+    classes = {}
+    start = time.perf_counter()
+    to_records(parsed, parser_class.schema, parser_class.record_paths,
+               classes)
+    records_seconds = time.perf_counter() - start
+    records_retained = _deep_size(parsed)
+    return {'name': name,
+            'size': size,
+            'parse_seconds': parse_seconds,
+            'records_seconds': records_seconds,
+            'shapes': sum(len(cls._shapes) for cls in classes.values()),
+            'dict_retained': dict_retained,
+            'records_retained': records_retained,
+            'reduction': 1 - records_retained / dict_retained}
+
+
+def _records(args):
+    results = {}
+    for name in args.generator or ['iosxe_show_bgp_all_detail']:
+        results[name] = result = records_benchmark(name, size=args.size)
+        print('{name} ({size}): parse {parse_seconds:.2f}s held '
+              '{dict_mb:.1f}MB, records {records_seconds:.2f}s held '
+              '{records_mb:.1f}MB, {shapes} shapes, -{reduction:.0%}'.format(
+                  dict_mb=result['dict_retained'] / 2 ** 20,
+                  records_mb=result['records_retained'] / 2 ** 20,
+                  **result))
+    return results
+
+
+# interface names of the synthetic network, full and abbreviated, by os
+TOPOLOGY_INTERFACES = {
+    'iosxe': ('TenGigabitEthernet{}/0/{}', 'Te{}/0/{}', 1),
+    'nxos': ('Ethernet{}/{}', 'Eth{}/{}', 1),
+    'iosxr': ('TenGigE0/0/{}/{}', 'Te0/0/{}/{}', 0),
+}
+
+
+class TopologyWorkload(object):
+    '''Parsed CDP and LLDP neighbors of a synthetic network
+
+    Links join random pairs of devices.  The IOS-XE and IOS-XR devices
+    report CDP, full port names and device ids with a domain, the NX-OS
+    devices LLDP, abbreviated port names.  The outputs are made on demand,
+    the parsed outputs of the whole network would not fit in memory.
+
+        Args:
+            devices (`int`): devices of the network
+            links (`int`): links of the network
+    '''
+
+    OS = ('iosxe',) * 7 + ('nxos',) * 2 + ('iosxr',)
+
+    def __init__(self, devices=10000, links=500000, seed=0):
+        rng = random.Random(seed)
+        self.os = [self.OS[rng.randrange(len(self.OS))]
+                   for _ in range(devices)]
+        self.ports = [[] for _ in range(devices)]
+        for _ in range(links):
+            first = rng.randrange(devices)
+            second = rng.randrange(devices - 1)
+            second += second >= first
+            # (local port, peer, peer port)
+            self.ports[first].append([len(self.ports[first]), second,
+                                      len(self.ports[second])])
+            self.ports[second].append([len(self.ports[second]), first,
+                                       len(self.ports[first]) - 1])
+
+    def name(self, device):
+        return 'DEV{:05d}'.format(device)
+
+    def interface(self, device, port, short=False):
+        full, abbreviated, first = TOPOLOGY_INTERFACES[self.os[device]]
+        return (abbreviated if short else full).format(port // 48 + first,
+                                                       port % 48 + first)
+
+    def parsed(self, device):
+        '''(os, parsed output) of a device'''
+        os_name = self.os[device]
+        if os_name == 'nxos':
+            interfaces = {}
+            for port, peer, peer_port in self.ports[device]:
+                system_name = self.name(peer).lower() + '.example.net'
+                interfaces[self.interface(device, port)] = {'port_id': {
+                    self.interface(peer, peer_port, short=True): {
+                        'neighbors': {system_name: {
+                            'system_name': system_name,
+                            'chassis_id': '0000.0000.{:04x}'.format(peer),
+                            'time_remaining': 100}}}}}
+            return os_name, {'total_entries': len(self.ports[device]),
+                             'interfaces': interfaces}
+        index = {}
+        for port, peer, peer_port in self.ports[device]:
+            device_id = self.name(peer) + '.example.net'
+            if self.os[peer] == 'nxos':
+                device_id += '(FOX{:08d})'.format(peer)
+            index[port + 1] = {'device_id': device_id,
+                               'platform': 'cisco',
+                               'local_interface': self.interface(device,
+                                                                 port),
+                               'port_id': self.interface(peer, peer_port),
+                               'hold_time': 120,
+                               'entry_addresses': {},
+                               'management_addresses': {}}
+        return os_name, {'total_entries_displayed': len(index),
+                         'index': index}
+
+
+def topology_benchmark(devices=10000, links=500000, changes=100,
+                       lookups=100000, seed=0):
+    '''Build the topology of a synthetic network, update and query it
+
+        Args:
+            devices (`int`): devices of the network
+            links (`int`): links of the network
+            changes (`int`): devices moving a link to another port, added
+                             again once the topology is built
+            lookups (`int`): link lookups by abbreviated interface name
+
+        Returns:
+            `dict` with the build, update and lookup seconds and the memory
+            held by the topology
+    '''
+    from .topology import Topology
+
+    workload = TopologyWorkload(devices, links, seed=seed)
+    rng = random.Random(seed)
+
+    def build():
+        topology = Topology()
+        seconds = 0
+        for device in range(devices):
+            os_name, parsed = workload.parsed(device)
+            start = time.perf_counter()
+            topology.add(workload.name(device), parsed, os=os_name)
+            seconds += time.perf_counter() - start
+        return topology, seconds
+
+    (topology, build_seconds) = build()
+    retained, _ = _retained(lambda: build()[0])
+
+    # a device moves one of its links to a new port, then both sides of the
+    # link report it again
+    updated, update_seconds, changed = [], 0, 0
+    for device in rng.sample(range(devices), changes):
+        if not workload.ports[device]:
+            continue
+        entry = rng.choice(workload.ports[device])
+        entry[0] += 1000
+        peer_entry = next(item for item in workload.ports[entry[1]]
+                          if item[1] == device and item[2] == entry[0] - 1000)
+        peer_entry[2] = entry[0]
+        updated.extend((device, entry[1]))
+    for device in updated:
+        os_name, parsed = workload.parsed(device)
+        start = time.perf_counter()
+        added, removed = topology.add(workload.name(device), parsed,
+                                      os=os_name)
+        update_seconds += time.perf_counter() - start
+        changed += len(added) + len(removed)
+
+    queries = []
+    for _ in range(lookups):
+        device = rng.randrange(devices)
+        if workload.ports[device]:
+            port = rng.choice(workload.ports[device])[0]
+            queries.append((workload.name(device).lower(),
+                            workload.interface(device, port, short=True)))
+    start = time.perf_counter()
+    found = sum(topology.link(device, interface) is not None
+                for device, interface in queries)
+    lookup_seconds = (time.perf_counter() - start) / max(len(queries), 1)
+
+    return {'devices': devices,
+            'links': len(topology),
+            'interfaces': len(topology.interface_names),
+            'build_seconds': build_seconds,
+            'retained': retained,
+            'updates': len(updated),
+            'update_seconds': update_seconds / max(len(updated), 1),
+            'changed': changed,
+            'lookup_seconds': lookup_seconds,
+            'found': found / max(len(queries), 1)}
+
+
+def _topology(args):
+    result = topology_benchmark(args.devices, args.links, args.changes,
+                                args.lookups)
+    print('{devices} devices, {links} links, {interfaces} interfaces: build '
+          '{build_seconds:.2f}s held {held_mb:.1f}MB, update {update_ms:.2f}ms '
+          'per device ({changed} link changes), lookup {lookup_us:.2f}us, '
+          '{found:.0%} found'.format(
+              held_mb=result['retained'] / 2 ** 20,
+              update_ms=result['update_seconds'] * 1e3,
+              lookup_us=result['lookup_seconds'] * 1e6, **result))
+    return result
+
+
+class OspfAreaWorkload(object):
+    '''Parsed router and network LSAs of a synthetic OSPF area
+
+    The routers form a ring with random chords.  Every `lan`-th router is
+    the designated router of a transit network it shares with the next two
+    routers.  Each router has a loopback stub network.
+
+        Args:
+            routers (`int`): routers of the area
+            degree (`int`): point-to-point links per router, on average
+            lan (`int`): routers between two designated routers
+    '''
+
+    def __init__(self, routers=5000, degree=4, lan=10, seed=0):
+        self.rng = random.Random(seed)
+        self.routers = routers
+        self.sequences = [1] * routers
+        self.links = [{} for _ in range(routers)]
+        pairs = [(router, (router + 1) % routers) for router in
+                 range(routers)]
+        for _ in range(routers * (degree - 2) // 2):
+            first, second = self.rng.sample(range(routers), 2)
+            pairs.append((first, second))
+        for first, second in pairs:
+            metric = self.rng.randint(1, 100)
+            self.links[first][self.router_id(second)] = metric
+            self.links[second][self.router_id(first)] = metric
+        # designated router -> attached routers
+        self.lans = {router: list(range(router, min(router + 3, routers)))
+                     for router in range(0, routers, lan)}
+
+    def router_id(self, router):
+        return '10.{}.{}.1'.format(router // 256, router % 256)
+
+    def lan_address(self, router):
+        return '172.{}.{}.1'.format(16 + router // 256, router % 256)
+
+    def change(self, count):
+        '''Change the metric of a link of `count` routers'''
+        for router in self.rng.sample(range(self.routers), count):
+            link_id = self.rng.choice(list(self.links[router]))
+            self.links[router][link_id] += 1
+            self.sequences[router] += 1
+
+    def _lsa(self, lsa_type, lsa_id, adv_router, sequence, body):
+        return {'lsa_id': lsa_id,
+                'adv_router': adv_router,
+                'ospfv2': {'header': {'option': 'None',
+                                      'option_desc': 'No TOS-capability, DC',
+                                      'lsa_id': lsa_id,
+                                      'age': 100,
+                                      'type': lsa_type,
+                                      'adv_router': adv_router,
+                                      'seq_num': '{:08X}'.format(
+                                          0x80000000 + sequence),
+                                      'checksum': '0x0',
+                                      'length': 36},
+                           'body': body}}
+
+    def _database(self, lsa_type, lsas):
+        return {'vrf': {'default': {'address_family': {'ipv4': {'instance': {
+            '1': {'areas': {'0.0.0.0': {'database': {'lsa_types': {
+                lsa_type: {'lsa_type': lsa_type,
+                           'lsas': {'{} {}'.format(lsa['lsa_id'],
+                                                   lsa['adv_router']): lsa
+                                    for lsa in lsas}}}}}}}}}}}}}
+
+    def router_lsas(self):
+        '''Parsed output of show ip ospf database router'''
+        lan_of = {member: lan for lan, members in self.lans.items()
+                  for member in members}
+        lsas = []
+        for router in range(self.routers):
+            router_id = self.router_id(router)
+            links = {}
+            for link_id, metric in self.links[router].items():
+                links[link_id] = {
+                    'link_id': link_id, 'link_data': router_id,
+                    'type': 'another router (point-to-point)',
+                    'topologies': {0: {'mt_id': 0, 'metric': metric}}}
+            if router in lan_of:
+                address = self.lan_address(lan_of[router])
+                links[address] = {
+                    'link_id': address, 'link_data': address,
+                    'type': 'transit network',
+                    'topologies': {0: {'mt_id': 0, 'metric': 10}}}
+            links[router_id] = {
+                'link_id': router_id, 'link_data': '255.255.255.255',
+                'type': 'stub network',
+                'topologies': {0: {'mt_id': 0, 'metric': 1}}}
+            lsas.append(self._lsa(1, router_id, router_id,
+                                  self.sequences[router],
+                                  {'router': {'num_of_links': len(links),
+                                              'links': links}}))
+        return self._database(1, lsas)
+
+    def network_lsas(self):
+        '''Parsed output of show ip ospf database network'''
+        return self._database(2, [
+            self._lsa(2, self.lan_address(lan), self.router_id(lan), 1,
+                      {'network': {'network_mask': '255.255.255.0',
+                                   'attached_routers': {
+                                       self.router_id(member): {}
+                                       for member in members}}})
+            for lan, members in self.lans.items()])
+
+
+def ospf_benchmark(routers=5000, changes=50, sources=10, repeat=3, seed=0):
+    '''Load a synthetic OSPF area, run SPF and apply a poll with changes
+
+        Args:
+            routers (`int`): routers of the area
+            changes (`int`): router LSAs changing between two polls
+            sources (`int`): routers SPF is run from
+
+        Returns:
+            `dict` with the seconds of the build, SPF, update and rebuild
+    '''
+    from .graph import OspfGraph
+
+    workload = OspfAreaWorkload(routers, seed=seed)
+    router_lsas, network_lsas = workload.router_lsas(), \
+        workload.network_lsas()
+
+    def build():
+        graph = OspfGraph(area='0.0.0.0')
+        graph.update(router_lsas)
+        graph.update(network_lsas)
+        return graph
+
+    build_seconds, _, graph = measure(build, repeat=repeat, memory=False)
+    start = time.perf_counter()
+    graph.graph.csr(two_way=True)
+    csr_seconds = time.perf_counter() - start
+    names = [workload.router_id(router) for router in
+             random.Random(seed).sample(range(routers), sources)]
+    start = time.perf_counter()
+    for name in names:
+        paths = graph.spf(name)
+    spf_seconds = (time.perf_counter() - start) / sources
+
+    workload.change(changes)
+    router_lsas = workload.router_lsas()
+    start = time.perf_counter()
+    counts = graph.update(router_lsas)
+    graph.spf(names[0])
+    update_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    rebuilt = build()
+    rebuilt.spf(names[0])
+    rebuild_seconds = time.perf_counter() - start
+
+    return {'routers': routers,
+            'nodes': len(graph.graph),
+            'edges': graph.graph.edge_count(),
+            'reached': len(list(paths.reachable())),
+            'build_seconds': build_seconds,
+            'csr_seconds': csr_seconds,
+            'spf_seconds': spf_seconds,
+            'changed': counts['changed'],
+            'update_seconds': update_seconds,
+            'rebuild_seconds': rebuild_seconds,
+            'equal': all(graph.spf(name).distances ==
+                         rebuilt.spf(name).distances for name in names)}
+
+
+def _ospf(args):
+    result = ospf_benchmark(args.routers, args.changes)
+    print('{routers} routers, {nodes} nodes, {edges} edges: build '
+          '{build_seconds:.3f}s, csr {csr_ms:.1f}ms, spf {spf_ms:.1f}ms '
+          '({reached} reached), poll with {changed} changed lsas: update + '
+          'spf {update_ms:.1f}ms, rebuild + spf {rebuild_ms:.1f}ms'
+          '{differs}'.format(
+              csr_ms=result['csr_seconds'] * 1e3,
+              spf_ms=result['spf_seconds'] * 1e3,
+              update_ms=result['update_seconds'] * 1e3,
+              rebuild_ms=result['rebuild_seconds'] * 1e3,
+              differs='' if result['equal'] else ', spf results differ',
+              **result))
+    return result
+
+
+class IsisDomainWorkload(object):
+    '''Parsed LSPs of a synthetic IS-IS level 2 domain
+
+    The routers are linked like the ones of `OspfAreaWorkload`.  Every
+    `lan`-th router is the designated router of a broadcast circuit it
+    shares with the next two routers, every `split`-th router spreads its
+    prefixes over a second fragment.
+
+        Args:
+            routers (`int`): routers of the domain
+            degree (`int`): point-to-point adjacencies per router, on average
+            lan (`int`): routers between two designated routers
+            split (`int`): routers between two routers with two fragments
+    '''
+
+    def __init__(self, routers=2400, degree=4, lan=10, split=4, seed=0):
+        area = OspfAreaWorkload(routers, degree=degree, lan=lan, seed=seed)
+        self.rng = area.rng
+        self.routers = routers
+        self.split = split
+        systems = {area.router_id(router): self.system(router)
+                   for router in range(routers)}
+        self.links = [{systems[router_id]: metric
+                       for router_id, metric in links.items()}
+                      for links in area.links]
+        self.lans = area.lans
+        # lsp id -> sequence number
+        self.sequences = {}
+
+    def system(self, router):
+        return 'R{}'.format(router)
+
+    def change(self, count):
+        '''Change the metric of an adjacency of `count` routers'''
+        for router in self.rng.sample(range(self.routers), count):
+            neighbor = self.rng.choice(list(self.links[router]))
+            self.links[router][neighbor] += 1
+            lsp_id = '{}.00-00'.format(self.system(router))
+            self.sequences[lsp_id] = self.sequences.get(lsp_id, 1) + 1
+
+    def _lsp(self, lsp_id, neighbors, prefixes):
+        lsp = {'lsp_sequence_num': '0x{:08X}'.format(
+                   self.sequences.get(lsp_id, 1)),
+               'lsp_checksum': '0x0000',
+               'lsp_holdtime': '1000',
+               'attach_bit': 0,
+               'p_bit': 0,
+               'overload_bit': 0}
+        if neighbors:
+            lsp['extended_is_neighbor'] = {
+                neighbor: [{'neighbor_id': neighbor, 'metric': metric}]
+                for neighbor, metric in neighbors.items()}
+        if prefixes:
+            lsp['ipv4_internal_reachability'] = {
+                prefix: [{'ip_prefix': prefix.split('/')[0],
+                          'prefix_len': prefix.split('/')[1],
+                          'metric': 10}]
+                for prefix in prefixes}
+        return lsp
+
+    def lsps(self):
+        '''Parsed output of show isis database detail'''
+        lan_of = {member: lan for lan, members in self.lans.items()
+                  for member in members}
+        lsps = {}
+        for router in range(self.routers):
+            system = self.system(router)
+            neighbors = {'{}.00'.format(neighbor): metric
+                         for neighbor, metric in self.links[router].items()}
+            if router in lan_of:
+                neighbors['{}.01'.format(self.system(lan_of[router]))] = 10
+            prefixes = ['10.{}.{}.1/32'.format(router // 256, router % 256),
+                        '172.{}.{}.0/24'.format(16 + router // 256,
+                                                router % 256)]
+            if router % self.split:
+                lsps[system + '.00-00'] = self._lsp(system + '.00-00',
+                                                    neighbors, prefixes)
+            else:
+                lsps[system + '.00-00'] = self._lsp(system + '.00-00',
+                                                    neighbors, prefixes[:1])
+                lsps[system + '.00-01'] = self._lsp(system + '.00-01', {},
+                                                    prefixes[1:])
+        for lan, members in self.lans.items():
+            lsp_id = '{}.01-00'.format(self.system(lan))
+            lsps[lsp_id] = self._lsp(lsp_id, {
+                '{}.00'.format(self.system(member)): 0
+                for member in members}, [])
+        return {'tag': {'core': {'level': {2: lsps}}}}
+
+
+def isis_benchmark(routers=2400, changes=50, sources=10, repeat=3, seed=0):
+    '''Load a synthetic IS-IS domain, run SPF and apply a poll with changes
+
+        Args:
+            routers (`int`): routers of the domain
+            changes (`int`): LSPs changing between two polls
+            sources (`int`): routers SPF is run from
+
+        Returns:
+            `dict` with the seconds of the build, SPF, update and rebuild
+    '''
+    from .graph import IsisGraph
+
+    workload = IsisDomainWorkload(routers, seed=seed)
+    lsps = workload.lsps()
+
+    def build():
+        graph = IsisGraph()
+        graph.update(lsps)
+        return graph
+
+    build_seconds, _, graph = measure(build, repeat=repeat, memory=False)
+    names = [workload.system(router) for router in
+             random.Random(seed).sample(range(routers), sources)]
+    start = time.perf_counter()
+    for name in names:
+        paths = graph.spf(name)
+    spf_seconds = (time.perf_counter() - start) / sources
+
+    workload.change(changes)
+    lsps = workload.lsps()
+    start = time.perf_counter()
+    counts = graph.update(lsps)
+    graph.spf(names[0])
+    update_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    rebuilt = build()
+    rebuilt.spf(names[0])
+    rebuild_seconds = time.perf_counter() - start
+
+    return {'routers': routers,
+            'lsps': len(graph.lsps),
+            'nodes': len(graph.graphs[2]),
+            'edges': graph.graphs[2].edge_count(),
+            'reached': len(list(paths.reachable())),
+            'build_seconds': build_seconds,
+            'spf_seconds': spf_seconds,
+            'changed': counts['changed'],
+            'unchanged': counts['unchanged'],
+            'update_seconds': update_seconds,
+            'rebuild_seconds': rebuild_seconds,
+            'equal': all(graph.spf(name).distances ==
+                         rebuilt.spf(name).distances for name in names)}
+
+
+def _isis(args):
+    result = isis_benchmark(args.routers, args.changes)
+    print('{routers} routers, {lsps} lsps, {nodes} nodes, {edges} edges: '
+          'build {build_seconds:.3f}s, spf {spf_ms:.1f}ms ({reached} '
+          'reached), poll with {changed} changed lsps: update + spf '
+          '{update_ms:.1f}ms, rebuild + spf {rebuild_ms:.1f}ms{differs}'
+          .format(spf_ms=result['spf_seconds'] * 1e3,
+                  update_ms=result['update_seconds'] * 1e3,
+                  rebuild_ms=result['rebuild_seconds'] * 1e3,
+                  differs='' if result['equal'] else ', spf results differ',
+                  **result))
+    return result
+
+
+class CounterWorkload(object):
+    '''Parsed interface counters of the devices of a synthetic network
+
+    Interface `k` of a device moves a fixed number of octets per second, its
+    counters at cycle `c` are those of a poll every `interval` seconds.  One
+    interface in 50 has a 32 bit ``in_octets`` counter starting close to the
+    wrap.
+
+        Args:
+            devices (`int`): devices polled
+            interfaces (`int`): interfaces per device
+            interval (`int`): seconds between two polls
+    '''
+
+    def __init__(self, devices=1000, interfaces=1000, interval=300, seed=0):
+        rng = random.Random(seed)
+        self.devices = devices
+        self.interval = interval
+        self.names = ['GigabitEthernet{}/0/{}'.format(index // 48 + 1,
+                                                      index % 48 + 1)
+                      for index in range(interfaces)]
+        self.speeds = [rng.randrange(1, 10 ** 6) for _ in range(interfaces)]
+        self.bases = [rng.randrange(2 ** 40) for _ in range(interfaces)]
+
+    def device(self, device):
+        return 'device{}'.format(device)
+
+    def in_octets(self, interface, cycle):
+        octets = self.bases[interface] + \
+            cycle * self.interval * self.speeds[interface]
+        if interface % 50 == 0:
+            octets = (2 ** 32 - self.interval * self.speeds[interface] // 2 +
+                      cycle * self.interval * self.speeds[interface]) % \
+                2 ** 32
+        return octets
+
+    def parsed(self, device, cycle):
+        '''Parsed ShowInterfaces of a device at a cycle'''
+        parsed = {}
+        seconds = cycle * self.interval
+        for interface, name in enumerate(self.names):
+            octets = self.bases[interface] + seconds * self.speeds[interface]
+            parsed[name] = {'counters': {
+                'in_octets': self.in_octets(interface, cycle),
+                'out_octets': octets * 2,
+                'in_pkts': octets // 100,
+                'out_pkts': octets // 50,
+                'in_errors': cycle,
+                'out_errors': 0,
+                'last_clear': 'never'}}
+        return parsed
+
+
+def _dict_rates(previous, device, parsed, timestamp, names):
+    # deltas and rates from the previous parsed counters, the usual way
+    rates = {}
+    for interface, entry in parsed.items():
+        counters = entry['counters']
+        key = (device, interface)
+        known = previous.get(key)
+        previous[key] = (timestamp, {counter: counters[counter]
+                                     for counter in names})
+        if known is None:
+            continue
+        seconds = timestamp - known[0]
+        interface_rates = rates[interface] = {}
+        for counter, value in known[1].items():
+            delta = counters[counter] - value
+            if delta < 0:
+                delta += 2 ** 32 if value < 2 ** 32 else 2 ** 64
+            interface_rates[counter] = (delta, delta / seconds)
+    return rates
+
+
+def rates_benchmark(devices=1000, interfaces=1000, cycles=3, seed=0):
+    '''Compute the counter rates of successive polls of a synthetic network
+
+        Args:
+            devices (`int`): devices polled
+            interfaces (`int`): interfaces per device
+            cycles (`int`): polls of every device, the first one only loads
+                            the samples
+
+        Returns:
+            `dict` with the seconds per cycle and the memory held by the
+            engine and by the dict of the previous counters
+    '''
+    from .rates import DEFAULT_COUNTERS, RateEngine
+
+    workload = CounterWorkload(devices, interfaces, seed=seed)
+    engine, previous = RateEngine(), {}
+    engine_seconds, dict_seconds, wrong = [], [], 0
+    expected = [workload.interval * speed for speed in workload.speeds]
+    for cycle in range(cycles):
+        timestamp = 1.0 + cycle * workload.interval
+        engine_cycle = dict_cycle = 0
+        for device in range(devices):
+            name = workload.device(device)
+            parsed = workload.parsed(device, cycle)
+            start = time.perf_counter()
+            rates = engine.update(name, parsed, timestamp)
+            engine_cycle += time.perf_counter() - start
+            start = time.perf_counter()
+            _dict_rates(previous, name, parsed, timestamp, DEFAULT_COUNTERS)
+            dict_cycle += time.perf_counter() - start
+            if cycle:
+                wrong += rates.deltas['in_octets'].tolist() != expected
+        engine_seconds.append(engine_cycle)
+        dict_seconds.append(dict_cycle)
+
+    return {'devices': devices,
+            'interfaces': len(engine),
+            'cycles': cycles,
+            'engine_seconds': min(engine_seconds[1:] or engine_seconds),
+            'dict_seconds': min(dict_seconds[1:] or dict_seconds),
+            'engine_retained': engine.nbytes() + _deep_size(
+                [engine.devices, engine.interfaces, engine._slots]),
+            'dict_retained': _deep_size(previous),
+            'equal': not wrong}
+
+
+def _rates(args):
+    result = rates_benchmark(args.devices, args.interfaces, args.cycles)
+    print('{devices} devices, {interfaces} interfaces: engine '
+          '{engine_seconds:.2f}s per cycle held {engine_mb:.1f}MB, dict '
+          '{dict_seconds:.2f}s per cycle held {dict_mb:.1f}MB{differs}'
+          .format(engine_mb=result['engine_retained'] / 2 ** 20,
+                  dict_mb=result['dict_retained'] / 2 ** 20,
+                  differs='' if result['equal'] else ', wrong deltas',
+                  **result))
+    return result
+
+
+# container of the entries of a synthetic output, key path of a value changed
+# in some of them between two polls
+DIFF_WORKLOADS = {
+    'iosxe_show_ip_route': (('vrf', 'default', 'address_family', 'ipv4',
+                             'routes'), ('metric',)),
+    'iosxe_show_bgp_all_detail': (('instance', 'default', 'vrf', 'default',
+                                   'address_family', 'ipv4 unicast',
+                                   'prefixes'), ('index', 1, 'localpref')),
+}
+
+
+def _touch(data, keys):
+    '''Change the values of `keys` at any depth, in place'''
+    for key, value in data.items():
+        if isinstance(value, Mapping):
+            _touch(value, keys)
+        elif key in keys:
+            data[key] = '{}+'.format(value)
+
+
+def _next_poll(parsed, container, field, changes, exclude, shared, rng):
+    '''Parsed output of the next poll and the paths expected to change
+
+    The values of `exclude` change everywhere, `field` changes in `changes`
+    entries, `changes // 2` entries are removed and as many added.  With
+    `shared` the new poll holds the unchanged entries of the previous one,
+    as an `IncrementalParser` result does, and the values of `exclude` are
+    left as they are.
+    '''
+    entries = previous = parsed
+    for key in container:
+        previous = previous[key]
+    if shared:
+        poll = entries = dict(parsed)
+        node = parsed
+        for key in container:
+            node = node[key]
+            entries[key] = dict(node)
+            entries = entries[key]
+    else:
+        poll = entries = copy.deepcopy(parsed)
+        _touch(poll, set(exclude))
+        for key in container:
+            entries = entries[key]
+    picked = rng.sample(list(entries), changes + changes // 2)
+    expected = set()
+    for name in picked[:changes]:
+        node = entries[name] = copy.deepcopy(entries[name])
+        for key in field[:-1]:
+            node = node[key]
+        node[field[-1]] += 1
+        expected.add(container + (name,) + field)
+    for index, name in enumerate(picked[changes:]):
+        del entries[name]
+        entries['added{}'.format(index)] = copy.deepcopy(previous[name])
+        expected.add(container + (name,))
+        expected.add(container + ('added{}'.format(index),))
+    return poll, expected
+
+
+def diff_benchmark(name='iosxe_show_ip_route', size=100000, changes=100,
+                   repeat=3, seed=0):
+    '''Changes between consecutive polls of a synthetic table output
+
+        Args:
+            name (`str`): generator, a key of `DIFF_WORKLOADS`
+            size (`int`): entries of the output
+            changes (`int`): entries with a changed value, half as many are
+                             removed and added
+
+        Returns:
+            `dict` with the seconds of `genie.utils.diff.Diff`, of a
+            snapshot of the new poll and of the changes between snapshots,
+            and of a snapshot of a poll sharing its unchanged entries
+    '''
+    from genie.utils.diff import Diff
+    from .diff import Snapshot
+
+    generator, parser_path, kwargs, _ = GENERATORS[name]
+    parser_class = load_parser_class(parser_path)
+    container, field = DIFF_WORKLOADS[name]
+    exclude = tuple(parser_class.exclude)
+    parsed = parser_class(device=None).parse(output=generator(size, seed=seed),
+                                             **kwargs)
+    rng = random.Random(seed)
+    poll, expected = _next_poll(parsed, container, field, changes, exclude,
+                                False, rng)
+    shared, shared_expected = _next_poll(parsed, container, field, changes,
+                                         exclude, True, rng)
+
+    genie_seconds, _, _ = measure(
+        lambda: Diff(parsed, poll, exclude=list(exclude)).findDiff(),
+        repeat=repeat, memory=False)
+    previous = Snapshot(parsed, exclude)
+    snapshot_seconds, _, snapshot = measure(
+        Snapshot, poll, exclude, previous, repeat=repeat, memory=False)
+    changes_seconds, _, found = measure(previous.diff, snapshot,
+                                        repeat=repeat, memory=False)
+    shared_seconds, _, shared_snapshot = measure(
+        Snapshot, shared, exclude, previous, repeat=repeat, memory=False)
+    shared_changes = previous.diff(shared_snapshot)
+
+    return {'name': name,
+            'size': size,
+            'changes': len(found),
+            'genie_seconds': genie_seconds,
+            'snapshot_seconds': snapshot_seconds,
+            'changes_seconds': changes_seconds,
+            'shared_seconds': shared_seconds,
+            'speedup': genie_seconds / (snapshot_seconds + changes_seconds),
+            'equal': {change.path for change in found} == expected and
+                     {change.path for change in shared_changes} ==
+                     shared_expected}
+
+
+def _diff(args):
+    results = {}
+    for name in args.generator or sorted(DIFF_WORKLOADS):
+        results[name] = result = diff_benchmark(name, args.size, args.changes,
+                                                args.repeat)
+        print('{name} ({size}): Diff {genie_seconds:.2f}s, snapshot '
+              '{snapshot_seconds:.2f}s + changes {changes_ms:.1f}ms, '
+              'x{speedup:.1f}, shared snapshot {shared_ms:.1f}ms, '
+              '{changes} changes{differs}'.format(
+                  changes_ms=result['changes_seconds'] * 1e3,
+                  shared_ms=result['shared_seconds'] * 1e3,
+                  differs='' if result['equal'] else ', wrong changes',
+                  **result))
+    return results
+
+class _Discard(object):
+    '''File discarding what is written, the size of the output is counted'''
+
+    def write(self, chunk):
+        return len(chunk)
+
+
+def serialize_benchmark(name='iosxe_show_ip_route', size=100000, repeat=3,
+                        seed=0):
+    '''Serialize and load a parsed synthetic output
+
+        Args:
+            name (`str`): generator
+            size (`int`): entries of the output
+
+        Returns:
+            `dict` with the seconds and peak memory of ``json.dumps``, of
+            `format_output` and of the json and binary `dump` of the
+            output, the size of the json and binary outputs and the seconds
+            of ``json.loads`` and of the binary `load`
+    '''
+    from .common import format_output
+    from . import serialize
+
+    generator, parser_path, kwargs, _ = GENERATORS[name]
+    parser_class = load_parser_class(parser_path)
+    parsed = parser_class(device=None).parse(output=generator(size, seed=seed),
+                                             **kwargs)
+
+    json_seconds, json_peak, text = measure(json.dumps, parsed, repeat=repeat)
+    format_seconds, format_peak, _ = measure(format_output, parsed,
+                                             repeat=repeat)
+    stream_seconds, stream_peak, stream_size = measure(
+        serialize.dump, parsed, _Discard(), parser_class, repeat=repeat)
+    binary_seconds, binary_peak, binary_size = measure(
+        serialize.dump, parsed, _Discard(), parser_class, True,
+        repeat=repeat)
+
+    data = serialize.dumps(parsed, parser_class, binary=True)
+    load_seconds, _, loaded = measure(json.loads, text, repeat=repeat,
+                                      memory=False)
+    equal = json.loads(serialize.dumps(parsed, parser_class)) == loaded
+    binary_load_seconds, _, loaded = measure(serialize.loads, data,
+                                             repeat=repeat, memory=False)
+
+    return {'name': name,
+            'size': size,
+            'json_seconds': json_seconds,
+            'json_peak': json_peak,
+            'json_size': len(text),
+            'format_seconds': format_seconds,
+            'format_peak': format_peak,
+            'stream_seconds': stream_seconds,
+            'stream_peak': stream_peak,
+            'stream_size': stream_size,
+            'binary_seconds': binary_seconds,
+            'binary_peak': binary_peak,
+            'binary_size': binary_size,
+            'load_seconds': load_seconds,
+            'binary_load_seconds': binary_load_seconds,
+            'equal': equal and loaded == parsed}
+
+
+def _serialize(args):
+    results = {}
+    for name in args.generator or ['iosxe_show_bgp_all_detail',
+                                   'iosxe_show_ip_route']:
+        results[name] = result = serialize_benchmark(name, args.size,
+                                                     args.repeat)
+        print('{name} ({size}): json.dumps {json_seconds:.2f}s peak '
+              '{json_mb:.1f}MB, format_output {format_seconds:.2f}s peak '
+              '{format_mb:.1f}MB, json {stream_seconds:.2f}s peak '
+              '{stream_mb:.1f}MB, binary {binary_seconds:.2f}s peak '
+              '{binary_mb:.1f}MB {binary_size_mb:.1f}/{stream_size_mb:.1f}MB, '
+              'json.loads {load_seconds:.2f}s, load {binary_load_seconds:.2f}s'
+              '{differs}'.format(
+                  json_mb=result['json_peak'] / 2 ** 20,
+                  format_mb=result['format_peak'] / 2 ** 20,
+                  stream_mb=result['stream_peak'] / 2 ** 20,
+                  binary_mb=result['binary_peak'] / 2 ** 20,
+                  binary_size_mb=result['binary_size'] / 2 ** 20,
+                  stream_size_mb=result['stream_size'] / 2 ** 20,
+                  differs='' if result['equal'] else ', outputs differ',
+                  **result))
+    return results
+
+
+def _interned_generators():
+    from .interning import InternMixin
+
+    return sorted(name for name, value in GENERATORS.items()
+                  if issubclass(load_parser_class(value[1]), InternMixin))
+
+
+def _record_generators():
+    from .records import RecordMixin
+
+    return sorted(name for name, value in GENERATORS.items()
+                  if issubclass(load_parser_class(value[1]), RecordMixin))
+
+
+def _intern(args):
+    results = {}
+    for name in args.generator or _interned_generators():
+        results[name] = result = interning_benchmark(name, size=args.size)
+        print('{name} ({size}): plain {plain_seconds:.2f}s held '
+              '{plain_mb:.1f}MB, interned {interned_seconds:.2f}s held '
+              '{interned_mb:.1f}MB, -{reduction:.0%}'.format(
+                  plain_mb=result['plain_retained'] / 2 ** 20,
+                  interned_mb=result['interned_retained'] / 2 ** 20,
+                  **result))
+    return results
+
+
+def _columnar(args):
+    results = {}
+    for name in args.generator or ['iosxe_show_mac_address_table']:
+        results[name] = result = columnar_benchmark(name, size=args.size,
+                                                    repeat=args.repeat)
+        print('{name} ({rows} rows): dict {dict_seconds:.2f}s peak '
+              '{dict_mb:.1f}MB held {dict_held:.1f}MB, columnar '
+              '{table_seconds:.2f}s peak {table_mb:.1f}MB held '
+              '{table_held:.1f}MB{differs}'.format(
+                  dict_mb=result['dict_peak'] / 2 ** 20,
+                  dict_held=result['dict_retained'] / 2 ** 20,
+                  table_mb=result['table_peak'] / 2 ** 20,
+                  table_held=result['table_retained'] / 2 ** 20,
+                  differs='' if result['equal'] else ', outputs differ',
+                  **result))
+    return results
+
+
+def _lpm(args):
+    result = route_index_benchmark(args.size, args.queries, args.scans)
+    print('{size} prefixes, {routes} distinct routes: build '
+          '{build_seconds:.2f}s {build_mb:.1f}MB, lookup {lookup_us:.1f}us, '
+          'scan {scan_ms:.1f}ms, x{speedup:.0f}'.format(
+              build_mb=result['build_peak'] / 2 ** 20,
+              lookup_us=result['lookup_seconds'] * 1e6,
+              scan_ms=result['scan_seconds'] * 1e3, **result))
+    return result
+
+
+def _json(args):
+    results = {}
+    for name in args.generator or sorted(JSON_GENERATORS):
+        results[name] = result = json_benchmark(name, size=args.size,
+                                                repeat=args.repeat)
+        print('{name} ({size}): cli {cli_seconds:.3f}s {cli_mb:.1f}MB, '
+              'json {json_seconds:.3f}s {json_mb:.1f}MB, x{speedup:.2f}'
+              '{differs}'.format(
+                  cli_mb=result['cli_peak'] / 2 ** 20,
+                  json_mb=result['json_peak'] / 2 ** 20,
+                  differs='' if result['equal'] else ', outputs differ',
+                  **result))
+    return results
+
+
+def _classifier(args):
+    result = classifier_benchmark(args.total, args.error_ratio, args.repeat)
+    print('{total} outputs, {error_ratio:.0%} errors: parse {plain_seconds:.3f}s, '
+          'classified {classified_seconds:.3f}s, x{speedup:.2f}'.format(
+              **result))
+    return result
+
+
+def _import(args):
+    result = import_time(args.module, runs=args.runs, top=args.top)
+    print('{}: {:.1f} ms, {} modules'.format(
+        result['module'], result['cumulative_us'] / 1000, result['modules']))
+    for name, self_us in result['top']:
+        print('  {:>10.1f} ms  {}'.format(self_us / 1000, name))
+    return result
+
+
+def _sizes(value):
+    return [int(size) for size in value.split(',') if size]
+
+
+def _scaling(args):
+    names = args.generator or sorted(GENERATORS)
+    results = {}
+    for name in names:
+        results[name] = scaling_benchmark(name, sizes=args.sizes,
+                                          repeat=args.repeat,
+                                          memory=not args.no_memory)
+        print(format_samples(name, results[name]))
+    if args.plot:
+        plot_samples(results, args.plot)
+    return results
+
+
+BENCHMARKS = {
+    'scaling': _scaling,
+    'import': _import,
+    'classifier': _classifier,
+    'json': _json,
+    'lpm': _lpm,
+    'columnar': _columnar,
+    'intern': _intern,
+    'records': _records,
+    'topology': _topology,
+    'ospf': _ospf,
+    'isis': _isis,
+    'rates': _rates,
+    'diff': _diff,
+    'serialize': _serialize,
+}
+
+
+def main(argv=None):
+    '''Command line entry point of the benchmarks'''
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    scaling = subparsers.add_parser('scaling',
+                                    help='parse time and memory against size')
+    scaling.add_argument('--generator', action='append',
+                         choices=sorted(GENERATORS),
+                         help='generator to run, may be repeated')
+    scaling.add_argument('--sizes', type=_sizes, default=None,
+                         help='comma separated sizes')
+    scaling.add_argument('--repeat', type=int, default=1)
+    scaling.add_argument('--no-memory', action='store_true',
+                         help='skip the tracemalloc run')
+    scaling.add_argument('--plot', default=None,
+                         help='write a plot to this file (needs matplotlib)')
+
+    imports = subparsers.add_parser('import',
+                                    help='python -X importtime of a module')
+    imports.add_argument('--module', default='genie.libs.parser')
+    imports.add_argument('--runs', type=int, default=5)
+    imports.add_argument('--top', type=int, default=10)
+
+    classifier = subparsers.add_parser(
+        'classifier', help='mixed workload with the output classifier')
+    classifier.add_argument('--total', type=int, default=1000)
+    classifier.add_argument('--error-ratio', type=float, default=0.5)
+    classifier.add_argument('--repeat', type=int, default=3)
+
+    json_context = subparsers.add_parser(
+        'json', help='cli() against json() on paired outputs')
+    json_context.add_argument('--generator', action='append',
+                              choices=sorted(JSON_GENERATORS),
+                              help='generator to run, may be repeated')
+    json_context.add_argument('--size', type=int, default=None)
+    json_context.add_argument('--repeat', type=int, default=3)
+
+    lpm = subparsers.add_parser(
+        'lpm', help='route index lookups against a linear scan')
+    lpm.add_argument('--size', type=int, default=100000)
+    lpm.add_argument('--queries', type=int, default=10000)
+    lpm.add_argument('--scans', type=int, default=3)
+
+    columnar = subparsers.add_parser(
+        'columnar', help='columnar table against the parsed dict')
+    columnar.add_argument('--generator', action='append',
+                          choices=sorted(name for name, value in
+                                         GENERATORS.items()
+                                         if hasattr(load_parser_class(
+                                             value[1]), 'table_path')),
+                          help='generator to run, may be repeated')
+    columnar.add_argument('--size', type=int, default=None)
+    columnar.add_argument('--repeat', type=int, default=1)
+
+    interning = subparsers.add_parser(
+        'intern', help='held memory with and without string interning')
+    interning.add_argument('--generator', action='append',
+                           choices=_interned_generators(),
+                           help='generator to run, may be repeated')
+    interning.add_argument('--size', type=int, default=None)
+
+    records = subparsers.add_parser(
+        'records', help='held memory of the dicts and of the records')
+    records.add_argument('--generator', action='append',
+                         choices=_record_generators(),
+                         help='generator to run, may be repeated')
+    records.add_argument('--size', type=int, default=None)
+
+    topology = subparsers.add_parser(
+        'topology', help='topology of the cdp and lldp neighbors')
+    topology.add_argument('--devices', type=int, default=10000)
+    topology.add_argument('--links', type=int, default=500000)
+    topology.add_argument('--changes', type=int, default=100)
+    topology.add_argument('--lookups', type=int, default=100000)
+
+    ospf = subparsers.add_parser(
+        'ospf', help='spf and updates of the graph of an ospf area')
+    ospf.add_argument('--routers', type=int, default=5000)
+    ospf.add_argument('--changes', type=int, default=50)
+
+    isis = subparsers.add_parser(
+        'isis', help='spf and updates of the graph of an is-is domain')
+    isis.add_argument('--routers', type=int, default=2400)
+    isis.add_argument('--changes', type=int, default=50)
+
+    rates = subparsers.add_parser(
+        'rates', help='interface counter rates of successive polls')
+    rates.add_argument('--devices', type=int, default=1000)
+    rates.add_argument('--interfaces', type=int, default=1000)
+    rates.add_argument('--cycles', type=int, default=3)
+
+    diffs = subparsers.add_parser(
+        'diff', help='changes between consecutive polls of a table')
+    diffs.add_argument('--generator', action='append',
+                       choices=sorted(DIFF_WORKLOADS),
+                       help='generator to run, may be repeated')
+    diffs.add_argument('--size', type=int, default=100000)
+    diffs.add_argument('--changes', type=int, default=100)
+    diffs.add_argument('--repeat', type=int, default=3)
+
+    serializer = subparsers.add_parser(
+        'serialize', help='streamed json and binary against json.dumps')
+    serializer.add_argument('--generator', action='append',
+                            choices=sorted(GENERATORS),
+                            help='generator to run, may be repeated')
+    serializer.add_argument('--size', type=int, default=100000)
+    serializer.add_argument('--repeat', type=int, default=3)
+
+    args = parser.parse_args(argv)
+    return BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == '__main__':
+    main()
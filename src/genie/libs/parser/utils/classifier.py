@@ -0,0 +1,279 @@
+'''Pre-parse classifier of device outputs
+
+A large share of polled outputs are error banners (``% Invalid input
+detected``, ``% Ambiguous command``, ``% <feature> not enabled``) or empty
+strings.  Running them through a parser only to end up with an empty dict and
+a `SchemaEmptyParserError` wastes the whole regex loop of the parser.
+
+`classify_output` recognizes those outputs with a single precompiled pattern
+per OS and `check_output` raises the matching exception right away:
+
+    * empty, not enabled and not found outputs raise `SchemaEmptyParserError`
+    * invalid, incomplete and ambiguous commands raise `InvalidCommandError`
+
+An output is only classified as an error when *every* line of it is a known
+banner, an echo of the command or a ``^`` marker.  Outputs carrying data next
+to a banner (for example ``% EID table not enabled for MAC.`` inside a LISP
+table) are left to the parser.  Outputs longer than `MAX_BANNER_OUTPUT`
+characters are never error banners and are returned as data without scanning.
+
+Parsers which turn a banner into data (IOS-XR ``ShowCdp`` parses
+``% CDP is not enabled`` into ``{'enabled': False}``) opt out with the class
+attribute ``preclassify = False``.
+'''
+
+# python
+import re
+import logging
+import collections
+
+from genie.metaparser.util.exceptions import SchemaEmptyParserError, \
+                                             InvalidCommandError
+
+log = logging.getLogger(__name__)
+
+# output kinds
+DATA = 'data'
+EMPTY = 'empty'
+INVALID = 'invalid'
+INCOMPLETE = 'incomplete'
+AMBIGUOUS = 'ambiguous'
+NOT_ENABLED = 'not_enabled'
+NOT_FOUND = 'not_found'
+# lines which are not data in an error output: ^ markers, prompts echoing
+# the command and headers printed before the banner
+NOISE = 'noise'
+
+EMPTY_KINDS = (EMPTY, NOT_ENABLED, NOT_FOUND)
+INVALID_KINDS = (INVALID, INCOMPLETE, AMBIGUOUS)
+
+# error outputs are a handful of lines, anything longer holds data
+MAX_BANNER_OUTPUT = 4096
+
+Classification = collections.namedtuple('Classification',
+                                        ['kind', 'message'])
+
+# os -> kind -> regexes of a complete banner line (leading spaces stripped)
+ERROR_BANNERS = {
+    'generic': {
+        INVALID: [
+            r"% ?Invalid input detected at '\^' marker\.?",
+            r'% ?Invalid input detected\.?',
+            r'% ?Unrecognized command',
+            r'% ?Unknown command( or computer name, or unable to find '
+            r'computer address)?\.?',
+        ],
+        INCOMPLETE: [
+            r"% ?Incomplete command( at '\^' marker)?\.?",
+        ],
+        AMBIGUOUS: [
+            r'% ?Ambiguous command:?.*',
+        ],
+        NOT_ENABLED: [
+            r'% ?[\w\-\./ ]+ (is )?not (enabled|running|active|configured)'
+            r'( for [\w\-\./ ]+)?\.?',
+        ],
+        NOT_FOUND: [
+            r'% ?[\w\-\./ ]+ does not exist\.?( Create first)?',
+        ],
+        NOISE: [
+            r'\^',
+            r'=+',
+            r'[\w\-\.:/@()]+[#>]',
+            r'[\w\-\.:/@()]+[#>] ?(show|sh|display) .*',
+        ],
+    },
+    'ios': {
+        NOT_ENABLED: [
+            r'% ?No such interface',
+        ],
+        NOISE: [
+            r'For address family: [\w\- ]+',
+        ],
+    },
+    'iosxe': {
+        NOT_ENABLED: [
+            r'% ?No such interface',
+            r'% ?OSPF: No router process is configured',
+        ],
+        NOISE: [
+            r'For address family: [\w\- ]+',
+        ],
+    },
+    'nxos': {
+        INVALID: [
+            r"% ?Invalid command at '\^' marker\.?",
+            r"% ?Invalid parameter detected at '\^' marker\.?",
+            r"% ?Invalid (ip|ipv6) address at '\^' marker\.?",
+            r"% ?Invalid number, value is out of range at '\^' marker\.?",
+            r'Syntax error while parsing .*',
+            r'Invalid command \(.*\)',
+            r"Cmd exec error\.?",
+        ],
+        NOT_ENABLED: [
+            r'% ?Feature [\w\-]+ (is )?not enabled.*',
+            r'Feature not enabled\.?',
+            r'% ?Invalid command \(feature not enabled\?\).*',
+            r'Error: Feature [\w\-]+ (is )?not enabled.*',
+        ],
+    },
+    'iosxr': {
+        INVALID: [
+            r"% ?Invalid input detected at '\^' marker\.?",
+            r'% ?Invalid command(\.| - .*)?',
+        ],
+        NOT_ENABLED: [
+            r'% ?No such configuration item\(s\)',
+            r'% ?[\w\-\./ ]+ (is )?not (enabled|running|active|configured)'
+            r' in the current context.*',
+            r'BGP instance \d+: .*',
+        ],
+    },
+    'junos': {
+        INVALID: [
+            r'syntax error(, expecting <command>)?\.?',
+            r'syntax error, expecting .*',
+            r'unknown command\.?',
+            r'error: syntax error: .*',
+            r'error: unknown command: .*',
+        ],
+        NOT_ENABLED: [
+            r'error: the [\w\-\. ]+ subsystem is not running',
+            r'warning: [\w\-\. ]+ is not running',
+            r'error: [\w\-\. ]+ is not running',
+        ],
+        NOT_FOUND: [
+            r'error: [\w\-\. ]+ not found',
+            r'error: device [\w\-\./]+ not found',
+        ],
+    },
+    'asa': {
+        INVALID: [
+            r"ERROR: % ?Invalid input detected at '\^' marker\.?",
+            r'ERROR: % ?Incomplete command',
+        ],
+    },
+}
+
+_patterns = {}
+
+
+def _pattern(os=None):
+    '''Compiled banner pattern for an OS, the generic banners included'''
+    os = os if os in ERROR_BANNERS else 'generic'
+    try:
+        return _patterns[os]
+    except KeyError:
+        pass
+
+    alternatives = []
+    for table in ([ERROR_BANNERS[os], ERROR_BANNERS['generic']]
+                  if os != 'generic' else [ERROR_BANNERS['generic']]):
+        for kind, regexes in table.items():
+            for regex in regexes:
+                # one named group per signature, the kind is the group prefix
+                alternatives.append('(?P<{}__{}>{})'.format(
+                    kind, len(alternatives), regex))
+    pattern = _patterns[os] = re.compile('(?:{})$'.format(
+        '|'.join(alternatives)))
+    return pattern
+
+
+def classify_output(output, os=None, command=None):
+    '''Classify a device output before it is parsed
+
+        Args:
+            output (`str`): output of the device
+            os (`str`): device os, selects the os specific banners
+            command (`str`): executed command, echoes of it are ignored
+
+        Returns:
+            `Classification` of (kind, message) where kind is one of
+            DATA, EMPTY, INVALID, INCOMPLETE, AMBIGUOUS, NOT_ENABLED or
+            NOT_FOUND and message the matched banner line.
+
+        example:
+
+            >>> classify_output("% BGP not active", os='iosxe')
+            Classification(kind='not_enabled', message='% BGP not active')
+    '''
+    if output is None or not output.strip():
+        return Classification(EMPTY, '')
+
+    if len(output) > MAX_BANNER_OUTPUT:
+        return Classification(DATA, None)
+
+    pattern = _pattern(os)
+    found = None
+    for line in output.splitlines():
+        line = line.strip()
+        if not line or line == command:
+            continue
+        m = pattern.match(line)
+        if not m:
+            # a line which is not a banner, the output holds data
+            return Classification(DATA, None)
+        kind = m.lastgroup.split('__', 1)[0]
+        if kind == NOISE:
+            continue
+        # the first banner wins, a following line is usually the ^ marker
+        if found is None:
+            found = Classification(kind, line)
+
+    return found or Classification(EMPTY, '')
+
+
+def check_output(output, os=None, command=''):
+    '''Raise the parser exception of an error or empty output
+
+        Args:
+            output (`str`): output of the device
+            os (`str`): device os
+            command (`str`): executed command
+
+        Returns:
+            `Classification` of the output when it holds data
+
+        Raises:
+            SchemaEmptyParserError: empty, not enabled or not found output
+            InvalidCommandError: invalid, incomplete or ambiguous command
+    '''
+    result = classify_output(output, os=os, command=command)
+    if result.kind in EMPTY_KINDS:
+        log.debug('Output of %r classified as %s: %s', command, result.kind,
+                  result.message)
+        raise SchemaEmptyParserError(data={}, command=command)
+    if result.kind in INVALID_KINDS:
+        log.debug('Output of %r classified as %s: %s', command, result.kind,
+                  result.message)
+        raise InvalidCommandError(command=command)
+    return result
+
+
+def parse_classified(parser, output=None, command=None, **kwargs):
+    '''Execute if needed, classify and only then parse an output
+
+        Args:
+            parser (`MetaParser`): parser instance bound to a device
+            output (`str`): device output, executed with `command` when None
+            command (`str`): command to execute and to report in errors
+            kwargs (`dict`): arguments of the parser
+
+        Returns:
+            parsed `dict`
+
+        Raises:
+            SchemaEmptyParserError, InvalidCommandError and any exception
+            of the parser itself
+    '''
+    device = getattr(parser, 'device', None)
+    if output is None:
+        if command is None:
+            # nothing to classify before the parser executes its command
+            return parser.parse(**kwargs)
+        output = device.execute(command)
+    if not getattr(parser, 'preclassify', True):
+        return parser.parse(output=output, **kwargs)
+    check_output(output, os=getattr(device, 'os', None),
+                 command=command or '')
+    return parser.parse(output=output, **kwargs)
@@ -0,0 +1,524 @@
+'''Columnar output of the table parsers
+
+Table outputs such as ``show mac address-table`` or ``show ip arp`` parse to
+one small dict per row, a few hundred bytes per entry once the key strings,
+the dict and its values are counted.  A 256k entry mac table holds more
+memory as a parsed dict than as text.  `parse_columnar` parses such an output
+into a `ColumnarTable` instead: one typed array per key and per field, filled
+chunk by chunk while the output is parsed, so at no point does the full
+nested dict exist:
+
+    >>> table = parse_columnar(ShowMacAddressTable, device=device)
+    >>> table.rows
+    256000
+    >>> table.columns['entry_type'].get(0)
+    'dynamic'
+    >>> table.view() == ShowMacAddressTable(device=device).parse()
+    True
+
+The columns of integers are ``array('q')`` with a validity mask, the other
+values are interned: ``array('I')`` codes into a list of categories, code 0
+being a missing value.  `ColumnarTable.view` is a read-only mapping with the
+layout of the parsed dict, built level by level on access, and
+`ColumnarTable.to_dict` the parsed dict itself.  ``to_numpy()`` of a column
+returns numpy arrays sharing the memory of the column (numpy is optional).
+
+A parser supports the columnar mode by declaring class attributes:
+
+    * ``table_path``: keys leading to a row in the parsed output, the
+      ``{name}`` elements are the keys of the rows.  The scalar values of a
+      row and of the levels above it become columns, the rest of the parsed
+      output (totals, sub-dicts, lists) is kept as is in `extras`
+    * ``table_row_start`` (optional): regex matching the lines a row starts
+      with, the output is only cut before these lines so the continuation
+      lines stay with their row.  Every line when missing
+    * ``table_header`` (optional): regex matching the header lines the
+      parser needs, the last one seen is repeated at the top of every chunk
+
+The regexes are matched on the lines as they are, indentation included.
+'''
+
+# python
+import re
+import logging
+from array import array
+from collections.abc import Mapping
+from inspect import getfullargspec
+
+from genie.metaparser.util.exceptions import SchemaEmptyParserError
+
+from .interning import InternMixin
+
+log = logging.getLogger(__name__)
+
+# lines of output parsed at once, the memory of one chunk parsed as a dict
+# is the overhead of the columnar mode
+DEFAULT_CHUNK_LINES = 2000
+
+_MISSING = object()
+_INT_MIN = -2 ** 63
+_INT_MAX = 2 ** 63 - 1
+
+
+def _is_int(value):
+    return type(value) is int and _INT_MIN <= value <= _INT_MAX
+
+
+def _placeholder(element):
+    '''Name of a ``{name}`` path element, None for a literal key'''
+    if element.startswith('{') and element.endswith('}'):
+        return element[1:-1]
+    return None
+
+
+def _merge(target, source):
+    '''Deep merge `source` into `target`'''
+    for key, value in source.items():
+        existing = target.get(key)
+        if isinstance(existing, dict) and isinstance(value, dict):
+            _merge(existing, value)
+        else:
+            target[key] = value
+
+
+class Column(object):
+    '''Values of a key or of a field, one per row
+
+    A column holds integers in an ``array('q')`` and a validity mask as long
+    as it only receives integers, it is turned into a categorical column
+    with the first other value: ``codes`` index ``categories``, code 0 is a
+    missing value.
+
+        Args:
+            size (`int`): missing values the column starts with
+    '''
+
+    def __init__(self, size=0):
+        self.kind = 'int'
+        self.values = array('q', bytes(8 * size))
+        self.valid = bytearray(size)
+        self.codes = None
+        self.categories = None
+        self._lookup = None
+
+    def __len__(self):
+        if self.kind == 'int':
+            return len(self.values)
+        return len(self.codes)
+
+    def _code(self, value):
+        lookup = self._lookup
+        if lookup is None:
+            lookup = self._lookup = {self._key(category): code for
+                                     code, category in
+                                     enumerate(self.categories) if code}
+        key = value if value.__class__ is str else self._key(value)
+        code = lookup.get(key)
+        if code is None:
+            code = lookup[key] = len(self.categories)
+            self.categories.append(value)
+        return code
+
+    @staticmethod
+    def _key(value):
+        # True, 1 and 1.0 are distinct categories
+        return value if value.__class__ is str else (value.__class__, value)
+
+    def _to_categorical(self):
+        self.kind = 'category'
+        self.categories = [None]
+        self._lookup = {}
+        codes = array('I')
+        for value, valid in zip(self.values, self.valid):
+            codes.append(self._code(value) if valid else 0)
+        self.codes = codes
+        self.values = self.valid = None
+
+    def append(self, value=_MISSING):
+        '''Append a value, a missing one when not given'''
+        if self.kind == 'int':
+            if value is _MISSING:
+                self.values.append(0)
+                self.valid.append(0)
+                return
+            if _is_int(value):
+                self.values.append(value)
+                self.valid.append(1)
+                return
+            self._to_categorical()
+        self.codes.append(0 if value is _MISSING else self._code(value))
+
+    def freeze(self):
+        '''Release the index of the categories, rebuilt by the next append'''
+        self._lookup = None
+
+    def get(self, row, default=None):
+        '''Value of a row, `default` when missing'''
+        if self.kind == 'int':
+            return self.values[row] if self.valid[row] else default
+        code = self.codes[row]
+        return self.categories[code] if code else default
+
+    def has(self, row):
+        if self.kind == 'int':
+            return bool(self.valid[row])
+        return self.codes[row] != 0
+
+    def nbytes(self):
+        '''Bytes of the arrays, the categories are not counted'''
+        if self.kind == 'int':
+            return self.values.itemsize * len(self.values) + len(self.valid)
+        return self.codes.itemsize * len(self.codes)
+
+    def to_numpy(self):
+        '''numpy arrays sharing the memory of the column
+
+        The column can no longer grow while the arrays are alive.
+
+            Returns:
+                (int64 values, bool validity) of an integer column,
+                (uint32 codes, categories list) of a categorical one
+        '''
+        import numpy
+
+        if self.kind == 'int':
+            return (numpy.frombuffer(self.values, dtype=numpy.int64),
+                    numpy.frombuffer(self.valid, dtype=numpy.bool_))
+        return (numpy.frombuffer(self.codes, dtype=numpy.uint32),
+                self.categories)
+
+
+class ColumnarTable(object):
+    '''Rows of a parsed table, stored as columns
+
+        Args:
+            path (`tuple`): keys leading to a row, ``{name}`` for the keys of
+                            the rows, the last element is one of them
+
+        Attributes:
+            rows (`int`): number of rows
+            key_columns (`dict`): key name -> `Column`
+            columns (`dict`): field name -> `Column`.  The fields of a row
+                              are named as in the parsed output, the fields
+                              of the levels above it ``<key name>.<field>``
+            extras (`dict`): what is not in the columns, as in the parsed
+                             output
+    '''
+
+    def __init__(self, path):
+        self.path = tuple(path)
+        self.keys = [_placeholder(element) for element in self.path]
+        if not self.path or self.keys[-1] is None:
+            raise ValueError('The table path {!r} does not end with a row '
+                             'key'.format(self.path))
+        self.rows = 0
+        self.key_columns = {name: Column() for name in self.keys if name}
+        self._key_columns = list(self.key_columns.values())
+        self.columns = {}
+        self.extras = {}
+        # field name -> depth of the level holding it
+        self._depths = {}
+
+    def __len__(self):
+        return self.rows
+
+    def nbytes(self):
+        '''Bytes of the column arrays'''
+        return sum(column.nbytes() for column in
+                   list(self.key_columns.values()) +
+                   list(self.columns.values()))
+
+    # building
+    # --------
+    def _extra(self, path, value):
+        node = self.extras
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        existing = node.get(path[-1])
+        if isinstance(existing, dict) and isinstance(value, dict):
+            _merge(existing, value)
+        else:
+            node[path[-1]] = value
+
+    def _append(self, keys, fields):
+        for column, key in zip(self._key_columns, keys):
+            column.append(key)
+        pop = fields.pop
+        for name, column in self.columns.items():
+            field = pop(name, None)
+            column.append(_MISSING if field is None else field[1])
+        # fields seen for the first time
+        for name, (depth, value) in fields.items():
+            column = self.columns[name] = Column(self.rows)
+            column.append(value)
+            self._depths[name] = depth
+        self.rows += 1
+
+    def _walk(self, node, depth, keys, fields, path):
+        pattern = self.path
+        if depth == len(pattern):
+            row = dict(fields)
+            for name, value in node.items():
+                if isinstance(value, (dict, list)):
+                    self._extra(path + (name,), value)
+                else:
+                    row[name] = (depth, value)
+            self._append(keys, row)
+            return
+
+        name = self.keys[depth]
+        if name is None:
+            element = pattern[depth]
+            # below a row key, the other values were taken with the key as
+            # fields of the level
+            if not depth or self.keys[depth - 1] is None:
+                for key, value in node.items():
+                    if key != element:
+                        self._extra(path + (key,), value)
+            child = node.get(element, _MISSING)
+            if isinstance(child, dict):
+                rows = self.rows
+                self._walk(child, depth + 1, keys, fields, path + (element,))
+                if self.rows == rows:
+                    self._extra(path + (element,), child)
+            elif child is not _MISSING:
+                self._extra(path + (element,), child)
+            return
+
+        for key, record in node.items():
+            if not isinstance(record, dict):
+                self._extra(path + (key,), record)
+                continue
+            record_path = path + (key,)
+            if depth + 1 == len(pattern):
+                self._walk(record, depth + 1, keys + [key], fields,
+                           record_path)
+                continue
+            # fields of a level above the rows, repeated in its rows
+            element = pattern[depth + 1]
+            level_fields = dict(fields)
+            for field, value in record.items():
+                if field == element:
+                    continue
+                if isinstance(value, (dict, list)):
+                    self._extra(record_path + (field,), value)
+                else:
+                    level_fields['{}.{}'.format(name, field)] = \
+                        (depth + 1, value)
+            rows = self.rows
+            self._walk(record, depth + 1, keys + [key], level_fields,
+                       record_path)
+            if self.rows == rows:
+                # no row below, the level is kept whole
+                self._extra(record_path, record)
+
+    def add(self, parsed):
+        '''Add the rows of a parsed output
+
+            Args:
+                parsed (`dict`): parsed output laid out along the path
+        '''
+        self._walk(parsed, 0, [], {}, ())
+
+    def freeze(self):
+        '''Release the memory only needed while rows are added'''
+        for column in list(self.key_columns.values()) + \
+                list(self.columns.values()):
+            column.freeze()
+
+    # reading
+    # -------
+    def _fields(self, depth):
+        return [(name.split('.', 1)[1] if depth < len(self.path) else name,
+                 self.columns[name])
+                for name, field_depth in self._depths.items()
+                if field_depth == depth]
+
+    def view(self):
+        '''Read-only mapping laid out as the parsed output, equal to it'''
+        return ColumnarView(self, 0, range(self.rows), self.extras)
+
+    def to_dict(self):
+        '''The parsed output, the extras are shared with the table'''
+        result = {}
+        key_columns = [self.key_columns[name] if name else None
+                       for name in self.keys]
+        level_fields = {depth: self._fields(depth)
+                        for depth in range(len(self.path) + 1)}
+        for row in range(self.rows):
+            node = result
+            for depth, element in enumerate(self.path):
+                column = key_columns[depth]
+                if column is None:
+                    node = node.setdefault(element, {})
+                    continue
+                node = node.setdefault(column.get(row), {})
+                for name, field in level_fields[depth + 1]:
+                    if field.has(row):
+                        node[name] = field.get(row)
+        _merge(result, self.extras)
+        return result
+
+
+class ColumnarView(Mapping):
+    '''Level of a `ColumnarTable`, laid out as in the parsed output
+
+    The keys and values of a level are computed on first access, the levels
+    below it are views too.
+
+        Args:
+            table (`ColumnarTable`): table of the rows
+            depth (`int`): position of the level in the table path
+            rows (`list`): rows below the level
+            extras (`dict`): extras of the level, None when it has none
+    '''
+
+    def __init__(self, table, depth, rows, extras):
+        self._table = table
+        self._depth = depth
+        self._rows = rows
+        self._extras = extras if isinstance(extras, dict) else None
+        self._items = None
+
+    def _build(self):
+        table, depth, rows = self._table, self._depth, self._rows
+        extras = self._extras or {}
+        items = {}
+        if depth and table.keys[depth - 1]:
+            # fields of a row or of a level above the rows, merged over the
+            # rows holding the same keys
+            for name, column in table._fields(depth):
+                for row in reversed(rows):
+                    if column.has(row):
+                        items[name] = column.get(row)
+                        break
+
+        if depth < len(table.path):
+            name = table.keys[depth]
+            if name is None:
+                element = table.path[depth]
+                if rows:
+                    items[element] = ColumnarView(table, depth + 1, rows,
+                                                  extras.get(element))
+            else:
+                column = table.key_columns[name]
+                groups = {}
+                for row in rows:
+                    groups.setdefault(column.get(row), []).append(row)
+                for key, group in groups.items():
+                    items[key] = ColumnarView(table, depth + 1, group,
+                                              extras.get(key))
+
+        for key, value in extras.items():
+            if key not in items or not isinstance(items[key], ColumnarView):
+                items[key] = value
+        self._items = items
+        return items
+
+    def __getitem__(self, key):
+        items = self._items if self._items is not None else self._build()
+        return items[key]
+
+    def __iter__(self):
+        items = self._items if self._items is not None else self._build()
+        return iter(items)
+
+    def __len__(self):
+        items = self._items if self._items is not None else self._build()
+        return len(items)
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def to_dict(self):
+        '''The level as a dict'''
+        return {key: value.to_dict() if isinstance(value, ColumnarView)
+                else value for key, value in self.items()}
+
+
+def _lines(output):
+    if isinstance(output, str):
+        return output.splitlines()
+    return output
+
+
+def iter_chunks(output, row_start=None, header=None,
+                chunk_lines=DEFAULT_CHUNK_LINES):
+    '''Cut an output into chunks of whole rows
+
+        Args:
+            output (`str` or iterable): output or its lines
+            row_start (`re.Pattern`): regex of the first line of a row, the
+                                      chunks only start on these lines
+            header (`re.Pattern`): regex of the header lines repeated at the
+                                   top of the chunks
+            chunk_lines (`int`): lines of a chunk, more when a row does not
+                                 start at that line
+
+        Returns:
+            generator of chunk texts
+    '''
+    lines = []
+    current_header = None
+    for line in _lines(output):
+        if header is not None and header.match(line):
+            current_header = line
+        if len(lines) >= chunk_lines and \
+                (row_start is None or row_start.match(line)):
+            yield '\n'.join(lines)
+            lines = [current_header] if current_header is not None and \
+                line is not current_header else []
+        lines.append(line)
+    if lines:
+        yield '\n'.join(lines)
+
+
+def parse_columnar(parser_class, output=None, device=None, command=None,
+                   chunk_lines=DEFAULT_CHUNK_LINES, **kwargs):
+    '''Parse a table output into a ColumnarTable
+
+        Args:
+            parser_class (`MetaParser`): parser declaring ``table_path``
+            output (`str` or iterable): output or its lines, `command` is
+                                        executed on `device` when None
+            device (`Device`): device executing the command
+            command (`str`): command executed when no output is given, also
+                             given to the parsers taking a command argument
+            chunk_lines (`int`): lines parsed at once
+            kwargs (`dict`): arguments of the parser
+
+        Returns:
+            `ColumnarTable`, its view equal to the parsed output
+    '''
+    try:
+        table = ColumnarTable(parser_class.table_path)
+    except AttributeError:
+        raise TypeError('{} does not declare table_path'.format(
+            parser_class.__name__)) from None
+    row_start = getattr(parser_class, 'table_row_start', None)
+    header = getattr(parser_class, 'table_header', None)
+    if 'command' in getfullargspec(parser_class.cli).args:
+        # parsers taking the executed command, as in get_parser
+        kwargs['command'] = command or ''
+    if output is None:
+        output = device.execute(command)
+    if issubclass(parser_class, InternMixin):
+        # the categorical columns intern the values already
+        kwargs['intern_strings'] = False
+
+    for chunk in iter_chunks(output,
+                             row_start=re.compile(row_start)
+                             if row_start else None,
+                             header=re.compile(header) if header else None,
+                             chunk_lines=chunk_lines):
+        try:
+            parsed = parser_class(device=device).parse(output=chunk,
+                                                       **kwargs)
+        except SchemaEmptyParserError:
+            continue
+        table.add(parsed)
+    table.freeze()
+
+    log.debug('%d rows of %s in %d bytes of columns', table.rows,
+              parser_class.__name__, table.nbytes())
+    return table
@@ -9,23 +9,23 @@ import math
 import logging
 import warnings
 import importlib
-import pkg_resources
-from packaging import version
 from inspect import getfullargspec
 from json.decoder import JSONDecodeError
 
-from pyats.log.utils import banner
-from pyats.configuration import configuration as cfg
-
 from genie.abstract.package import AbstractTree, DEFAULT_ABSTRACT_ORDER
 from genie.abstract import Lookup
 
-from .extension import ExtendParsers
+# pyats.configuration, pyats.log, importlib.metadata and the parser extension
+# machinery are only needed while the parser json is loaded, they are imported
+# there so that importing this module stays cheap for short lived processes.
 
 PARSER_MODULE_NAME = 'genie.libs.parser'
 ENTRY_POINT_NAME = PARSER_MODULE_NAME
 PYATS_EXT_PARSER = 'pyats.libs.external.parser'
 
+# characters of a xml reply fed at once to the streaming parser
+XML_CHUNK_SIZE = 64 * 1024
+
 log = logging.getLogger(__name__)
 
 try:
@@ -173,6 +173,7 @@ def _load_parser_json():
         try:
             json_data = json.load(f)
         except JSONDecodeError:
+            from pyats.log.utils import banner
             log.error(banner("parser json file could be corrupted. "
                                 "Please try 'make json'"))
             raise
@@ -184,6 +185,8 @@ def _load_parser_json():
                         'package token order\n{} != {}'.\
                             format(parser_data.order, token_order))
 
+    from pyats.configuration import configuration as cfg
+
     # check if provided external parser packages
     PYATS_EXT_PARSER_ENV_VAR = PYATS_EXT_PARSER.upper().replace('.', '_')
     ext_parser_packages = []
@@ -198,7 +201,7 @@ def _load_parser_json():
         ext_parser_packages_from_env = ext_parser_package_env.split(',')
         ext_parser_packages.extend(ext_parser_packages_from_env)
 
-    for ep in pkg_resources.iter_entry_points(ENTRY_POINT_NAME):
+    for ep in _iter_entry_points(ENTRY_POINT_NAME):
         parser_package = ep.load()
         if callable(parser_package):
             log.warning(
@@ -206,12 +209,16 @@ def _load_parser_json():
                 'Please create an abstracted package instead.')
             _load_parser_callable(parser_package, parser_data)
         else:
-            ext_parser_packages.append(ep.module_name)
+            # 'package.module:attr', EntryPoint.module is python 3.9+
+            ext_parser_packages.append(ep.value.split(':')[0].strip())
 
     # remove duplicates
     ext_parser_packages = set(ext_parser_packages)
     log.debug(f'External parser packages: {ext_parser_packages}')
 
+    if ext_parser_packages:
+        from .extension import ExtendParsers
+
     for ext_parser_package in ext_parser_packages:
         log.debug(f'Extending {ext_parser_package}')
         ext = ExtendParsers(ext_parser_package)
@@ -232,6 +239,30 @@ def _load_parser_json():
     return parser_data
 
 
+def _iter_entry_points(group):
+    '''Entry points registered under `group`, discovered with
+    importlib.metadata instead of the slow to import pkg_resources'''
+    try:
+        from importlib import metadata
+    except ImportError:
+        # python < 3.8
+        import importlib_metadata as metadata
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        return entry_points.select(group=group)
+    # python < 3.10 returns a dict of group -> entry points
+    return entry_points.get(group, [])
+
+
+def __getattr__(name):
+    # kept importable from here for backward compatibility, loaded on use
+    if name == 'ExtendParsers':
+        from .extension import ExtendParsers
+        return ExtendParsers
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
 def _load_parser_callable(package, parser_data):
     '''_load_parser_callable
 
@@ -795,6 +826,20 @@ def _matches_fuzzy(i,
         return None
 
 
+def _xml_chunks(output, chunk_size):
+    '''chunks of a xml reply without the junk characters returned by the
+    device, the reply is not copied as a whole'''
+    junk = ']]>]]>'
+    position = 0
+    while position < len(output):
+        end = output.find(junk, position)
+        if end < 0:
+            end = len(output)
+        for start in range(position, end, chunk_size):
+            yield output[start:min(start + chunk_size, end)]
+        position = end + len(junk)
+
+
 class Common:
     '''Common functions to be used in parsers.'''
     @classmethod
@@ -986,6 +1031,180 @@ class Common:
             'Cli created from XML tags does not match the actual cli:\n' \
             'XML Tags cli: {c}\nCli command: {e}'.format(c=cli, e=expect_command)
 
+    @classmethod
+    def iterparse_xml(self, output, rows=(), readonly=False,
+                      expect_command=None, chunk_size=XML_CHUNK_SIZE):
+        '''stream a NX-OS `| xml` reply instead of building its whole tree.
+           The command is composed from the tags while they are read and
+           compared as compose_compare_command does, the ROW elements are
+           handed out once complete and cleared after being processed.
+
+            Args:
+
+                output (`str`): xml reply of the device
+                rows (`tuple`): names of the rows to yield, 'vrf' for ROW_vrf
+                readonly (`bool`): also yield the values directly under
+                                   __readonly__ (not the TABLE elements)
+                expect_command (`str`): expected command, not compared if None
+                chunk_size (`int`): characters fed to the parser at once
+
+            Returns:
+                generator of (namespace, element), namespace as in
+                '{http://www.cisco.com/nxos:7.0.3.I7.1.:bgp}'. A row nested in
+                another yielded row is yielded first, then removed from it.
+
+            Raises:
+                AssertionError: xml tag cli and command is not matched
+
+            example:
+
+                >>> for namespace, vrf_tree in iterparse_xml(
+                        output=out, rows=('vrf',),
+                        expect_command='show bgp sessions'):
+                ...     vrf_tree.find('{}vrf-name-out'.format(namespace))
+        '''
+        # ElementTree is only needed by the xml parsers
+        from xml.etree.ElementTree import XMLPullParser
+
+        parser = XMLPullParser(events=('start', 'end'))
+
+        namespace = None
+        row_tags = ()
+        # tags of the command, from <show> to __readonly__
+        words = []
+        composed = False
+        # depth of __readonly__, once known only the rows are looked at
+        readonly_depth = None
+        settled = False
+        stack = []
+
+        def compare():
+            cli = ' '.join(words).strip()
+            if expect_command is not None:
+                assert cli == expect_command, \
+                    'Cli created from XML tags does not match the actual ' \
+                    'cli:\nXML Tags cli: {c}\nCli command: {e}'.format(
+                        c=cli, e=expect_command)
+
+        for chunk in _xml_chunks(output, chunk_size):
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == 'start':
+                    stack.append(element)
+                    if settled:
+                        continue
+                    tag = element.tag.split('}', 1)[-1]
+                    if namespace is None:
+                        if tag != 'show':
+                            continue
+                        namespace = element.tag[:-len(tag)]
+                        row_tags = {namespace + 'ROW_' + row for row in rows}
+                    if not composed:
+                        # __readonly__ is the end of the command
+                        if '__readonly__' in tag:
+                            composed = True
+                            compare()
+                        elif 'TABLE' in tag:
+                            # if there is no __readonly__ but the command has
+                            # outputs should be warning
+                            warnings.warn(
+                                'Tag "__readonly__" should exsist in output '
+                                'when there are actual values in output')
+                            composed = True
+                            compare()
+                        elif '__XML__PARAM__' not in tag and \
+                                '__XML__value' not in tag:
+                            words.append(tag)
+                    if tag == '__readonly__':
+                        readonly_depth = len(stack)
+                    settled = composed and (
+                        readonly_depth is not None or not readonly)
+                    continue
+
+                stack.pop()
+                if namespace is None:
+                    continue
+                if not composed:
+                    # <__XML__PARAM__vrf-name>
+                    #  <__XML__value>VRF1</__XML__value>
+                    if '__XML__value' in element.tag:
+                        words.append(element.text or '')
+                        continue
+                    # last tag of a command without __readonly__
+                    composed = True
+                    settled = not readonly
+                    compare()
+
+                if element.tag in row_tags or (
+                        readonly and len(stack) == readonly_depth and
+                        not element.tag[len(namespace):].startswith(
+                            'TABLE_')):
+                    yield namespace, element
+                    element.clear()
+                    if stack:
+                        stack[-1].remove(element)
+
+        parser.close()
+        if namespace is not None and not composed:
+            compare()
+
+    @classmethod
+    def load_json(self, output):
+        '''decode a NX-OS `| json` reply, the characters printed around
+           the document by some terminals are dropped
+
+            Args:
+
+                output (`str`): json reply of the device
+
+            Returns:
+                decoded `dict`, empty when the command has no output
+
+            example:
+
+                >>> load_json('{"TABLE_vrf": {"ROW_vrf": {}}}\\n]]>]]>')
+                >>> {'TABLE_vrf': {'ROW_vrf': {}}}
+        '''
+        start = output.find('{')
+        end = output.rfind('}')
+        if start < 0 or end < start:
+            return {}
+        return json.loads(output[start:end + 1])
+
+    @classmethod
+    def json_rows(self, parent, name):
+        '''rows of a TABLE_<name>/ROW_<name> pair of a NX-OS `| json` reply.
+           The device prints a single row as an object instead of a list of
+           one object, and some commands repeat TABLE_<name> as a list.
+
+            Args:
+
+                parent (`dict`): object holding TABLE_<name>
+                name (`str`): name of the table, 'vrf' for TABLE_vrf
+
+            Returns:
+                `list` of the ROW_<name> objects
+
+            example:
+
+                >>> json_rows({'TABLE_vrf': {'ROW_vrf': {'vrf-name-out': 'a'}}},
+                              'vrf')
+                >>> [{'vrf-name-out': 'a'}]
+        '''
+        tables = parent.get('TABLE_' + name)
+        if not tables:
+            return []
+        if isinstance(tables, dict):
+            tables = [tables]
+        rows = []
+        for table in tables:
+            row = table.get('ROW_' + name)
+            if isinstance(row, dict):
+                rows.append(row)
+            elif row:
+                rows.extend(row)
+        return rows
+
     @classmethod
     def convert_xml_time(self, xml_time):
         '''Convert xml time "PT1H4M41S" to normal time "01:04:41"
@@ -0,0 +1,234 @@
+'''Indexed tree of a running-config shared by the show-run parsers
+
+Every show-run parser executes its own filtered view of the configuration
+(``show running-config interface X``, ``show running-config | section bgp``,
+``show running-config flow monitor`` ...) and the device renders the whole
+configuration again for each of them.  On large configurations that is a
+dozen round trips, each one scanning the full configuration.
+
+`ConfigTree` reads a full ``show running-config`` once, indentation aware,
+and indexes every block by its header (``interface GigabitEthernet1``,
+``router bgp 65000``, ``address-family ipv4 vrf red``).  `render` then
+produces the filtered views from the tree:
+
+    >>> tree = ConfigTree(device.execute('show running-config'))
+    >>> tree.render('show running-config interface Gi1')
+    >>> tree.render('show running-config | section bgp')
+
+While a `session.ParseSession` is active on the device, the show-run parsers
+are served from a single fetched and indexed configuration through
+`execute_config_command`, views which can not be derived from the tree are
+still executed on the device.
+'''
+
+# python
+import re
+import logging
+import collections
+
+from .common import Common
+from .session import get_session
+
+log = logging.getLogger(__name__)
+
+SHOW_RUNNING_CONFIG = 'show running-config'
+
+# lines of the configuration which are not part of any block
+_SKIPPED = re.compile(r'^(!.*|Building configuration\.\.\.|'
+                      r'Current configuration *:.*|end)\s*$')
+
+# views of the configuration which can be derived from the tree
+_VIEWS = [
+    ('full', re.compile(r'^show run(?:ning-config)?$')),
+    ('interface', re.compile(r'^show run(?:ning-config)? +interface +'
+                             r'(?P<name>\S+)$')),
+    ('section', re.compile(r'^show run(?:ning-config)? *\| *sec(?:tion)? +'
+                           r'(?P<regex>.+)$')),
+    ('header', re.compile(r'^show run(?:ning-config)? +'
+                          r'(?P<header>flow monitor|policy-map(?: +\S+)?)$')),
+]
+
+def _match_view(command):
+    '''(view, match) of a show running-config command, None when the tree
+    can not render it'''
+    command = ' '.join(command.split())
+    for view, pattern in _VIEWS:
+        m = pattern.match(command)
+        if m:
+            return view, m
+    return None
+
+
+Block = collections.namedtuple('Block', ['header', 'start', 'end'])
+
+
+def _normalize_interface(name):
+    return Common.convert_intf_name(name).lower()
+
+
+class ConfigTree(object):
+    '''Indentation aware index of a running-config
+
+        Args:
+            config (`str`): output of ``show running-config``
+
+        Attributes:
+            lines (`list`): configuration lines, comments and banners of the
+                            show command removed
+            blocks (`list`): top level `Block` (header, start, end), the
+                             lines of a block are ``lines[start:end]``
+            index (`dict`): header -> list of `Block` at any depth
+    '''
+
+    def __init__(self, config):
+        self.lines = []
+        self.blocks = []
+        self.index = collections.defaultdict(list)
+        self._interfaces = None
+        self._starts = None
+
+        # open blocks as (indent, header, start)
+        stack = []
+        for line in config.splitlines():
+            line = line.rstrip()
+            if not line or _SKIPPED.match(line):
+                continue
+            indent = len(line) - len(line.lstrip())
+            position = len(self.lines)
+            self.lines.append(line)
+            while stack and stack[-1][0] > indent:
+                self._close(stack.pop(), position)
+            # exit-address-family, exit-peer-policy ... end the block opened
+            # at the same indentation and belong to it
+            if stack and stack[-1][0] == indent and \
+                    line.lstrip().startswith('exit-'):
+                self._close(stack.pop(), position + 1)
+                continue
+            while stack and stack[-1][0] >= indent:
+                self._close(stack.pop(), position)
+            stack.append((indent, line.strip(), position))
+
+        while stack:
+            self._close(stack.pop(), len(self.lines))
+        self.blocks.sort(key=lambda block: block.start)
+
+    def _close(self, opened, end):
+        indent, header, start = opened
+        block = Block(header, start, end)
+        self.index[header].append(block)
+        if indent == 0:
+            self.blocks.append(block)
+
+    def text(self, blocks):
+        '''Configuration text of `blocks`'''
+        return ''.join('\n'.join(self.lines[block.start:block.end]) + '\n'
+                       for block in blocks)
+
+    def block(self, header):
+        '''First block, at any depth, with exactly this header'''
+        blocks = self.index.get(header)
+        return blocks[0] if blocks else None
+
+    def interface(self, name):
+        '''Block of an interface, the name may be abbreviated'''
+        if self._interfaces is None:
+            self._interfaces = {}
+            for block in self.blocks:
+                if block.header.startswith('interface '):
+                    self._interfaces.setdefault(
+                        _normalize_interface(block.header.split(None, 1)[1]),
+                        block)
+        return self._interfaces.get(_normalize_interface(name))
+
+    def section(self, regex):
+        '''Blocks, at any depth, whose header line matches `regex` with
+        their children, as the ``| section`` filter of the device'''
+        pattern = re.compile(regex)
+        if self._starts is None:
+            self._starts = {block.start: block
+                            for blocks in self.index.values()
+                            for block in blocks}
+        blocks = []
+        position = 0
+        while position < len(self.lines):
+            line = self.lines[position]
+            if not pattern.search(line):
+                position += 1
+                continue
+            # the lines of a matched block are not searched again
+            block = self._starts.get(position) or \
+                Block(line.strip(), position, position + 1)
+            blocks.append(block)
+            position = block.end
+        return blocks
+
+    def headers(self, prefix):
+        '''Top level blocks whose header starts with `prefix`'''
+        return [block for block in self.blocks
+                if block.header == prefix or
+                block.header.startswith(prefix + ' ')]
+
+    def render(self, command):
+        '''Output of a show running-config view, None when the view can not
+        be derived from the tree'''
+        matched = _match_view(command)
+        if matched is None:
+            return None
+        view, m = matched
+        if view == 'full':
+            return '\n'.join(self.lines) + '\n'
+        if view == 'interface':
+            block = self.interface(m.group('name'))
+            return self.text([block]) if block else ''
+        if view == 'section':
+            try:
+                return self.text(self.section(m.group('regex').strip()))
+            except re.error:
+                return None
+        return self.text(self.headers(m.group('header')))
+
+
+def config_tree(device):
+    '''`ConfigTree` of the device running-config, memoized by the parse
+    session of the device, None without an active session'''
+    session = get_session(device)
+    if session is None:
+        return None
+
+    def build():
+        output = session.get_output(SHOW_RUNNING_CONFIG)
+        if output is None:
+            output = device.execute(SHOW_RUNNING_CONFIG)
+            session.set_output(SHOW_RUNNING_CONFIG, output)
+        return ConfigTree(output)
+
+    return session.memoize(('config_tree', SHOW_RUNNING_CONFIG), build)
+
+
+def render_config(device, command):
+    '''Output of a show running-config view served from the session config
+    tree, None when the view has to be executed on the device'''
+    if _match_view(command) is None:
+        return None
+    tree = config_tree(device)
+    if tree is None:
+        return None
+    return tree.render(command)
+
+
+def execute_config_command(device, command, **kwargs):
+    '''Execute a show running-config view, from the session config tree when
+    possible
+
+        Args:
+            device (`Device`): device to execute the command on
+            command (`str`): show running-config command
+            kwargs (`dict`): extra arguments of execute
+
+        Returns:
+            `str` output of the command
+    '''
+    output = render_config(device, command)
+    if output is None:
+        output = device.execute(command, **kwargs)
+    return output
@@ -0,0 +1,270 @@
+'''Changes between consecutive parsed outputs
+
+Telling what changed between two polls of a command with
+``genie.utils.diff.Diff`` walks and compares both results in full, a few
+seconds for a full routing table where a handful of routes changed.  The
+parsed outputs of a parser share their shape, `Snapshot` digests every
+nested dict of a result once, bottom up, and `Snapshot.diff` only descends
+into the dicts whose digests differ:
+
+    >>> tracker = ChangeTracker(exclude=ShowIpRoute.exclude)
+    >>> tracker.update(ShowIpRoute(device=device).parse())
+    []
+    >>> tracker.update(ShowIpRoute(device=device).parse())
+    [Change(path=('vrf', 'default', 'address_family', 'ipv4', 'routes',
+                  '10.1.0.0/16', 'metric'), kind='changed', old=0, new=20)]
+
+The changes are events addressed by the path of keys to the value, the
+added or removed dicts are one event holding the whole dict.  The keys of
+`exclude`, such as ``updated`` for the age of a route, are left out of the
+digests and of the changes, at any depth.  Lists are compared item by item
+in order.  A value changing type is a change, ``1`` to ``True`` or ``1.0``
+for instance, though they are equal in Python.
+
+A snapshot taken with the previous one reuses the digests of the dicts both
+results share, the unchanged blocks of an `IncrementalParser` result for
+instance, so the parsed outputs must be treated as read-only once digested.
+Equal digests are taken for equal dicts.  The digests are blake2b hashes of
+the marshal of the keys and values, which tells the types apart, rather than
+Python hashes: ``hash(-1) == hash(-2)`` and ``hash(1) == hash(True)``.  An
+interned string marshals apart from an equal one which is not, equal dicts
+digesting differently only cost walking them down.
+'''
+
+# python
+import logging
+import hashlib
+import marshal
+import collections
+from collections.abc import Mapping
+
+log = logging.getLogger(__name__)
+
+Change = collections.namedtuple('Change', ['path', 'kind', 'old', 'new'])
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+
+# tags of the digests of the dicts and lists held by a dict
+_DICT = '{}'
+_LIST = '[]'
+
+# types of the leaves, kept as they are in the digested parts
+_SCALARS = frozenset([str, int, float, bool, type(None)])
+
+
+def _hash(parts):
+    try:
+        # version 2 writes no references, its bytes do not depend on which
+        # objects are shared
+        data = marshal.dumps(parts, 2)
+    except ValueError:
+        data = repr(parts).encode('utf-8', 'surrogatepass')
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _equal(old, new, exclude):
+    '''Equality of two values telling ``1``, ``1.0`` and ``True`` apart,
+    leaving out the keys of `exclude` of the dicts held by lists'''
+    if isinstance(old, Mapping) and isinstance(new, Mapping):
+        keys = old.keys() - exclude
+        return keys == new.keys() - exclude and \
+            all(_equal(old[key], new[key], exclude) for key in keys)
+    if old.__class__ is not new.__class__:
+        return False
+    if old.__class__ is list or old.__class__ is tuple:
+        return len(old) == len(new) and \
+            all(_equal(item, other, exclude)
+                for item, other in zip(old, new))
+    return old == new
+
+
+class Snapshot(object):
+    '''Digests of the nested dicts of a parsed output
+
+    ``digests[id(node)]`` is the digest of the dicts, or mappings, of
+    `parsed`, which the snapshot keeps alive.  The dicts shared with the
+    previous snapshot only have theirs, not the digests of the dicts they
+    hold.
+
+        Args:
+            parsed (`dict`): parsed output
+            exclude (`iterable`): keys left out at any depth
+            previous (`Snapshot`): snapshot of the previous poll, the
+                                   digests of the dicts it shares with
+                                   `parsed` are reused
+    '''
+
+    def __init__(self, parsed, exclude=(), previous=None):
+        self.parsed = parsed
+        self.exclude = frozenset(exclude)
+        self.digests = {}
+        if previous is not None and previous.exclude == self.exclude:
+            self._known = previous.digests
+        else:
+            self._known = {}
+        self.reused = 0
+        self.root = self._digest(parsed)
+        self._known = {}
+
+    def _digest(self, node):
+        known = self._known.get(id(node))
+        if known is not None:
+            # the same object in the previous result, which is alive, the
+            # digests of its own dicts are computed when asked for
+            self.reused += 1
+            self.digests[id(node)] = known
+            return known
+        exclude = self.exclude
+        parts = []
+        for key, value in node.items():
+            if key in exclude:
+                continue
+            cls = value.__class__
+            if cls in _SCALARS:
+                pass
+            elif cls is dict or isinstance(value, Mapping):
+                value = (_DICT, self._digest(value))
+            elif cls is list:
+                value = (_LIST, self._list(value))
+            parts.append((key, value))
+        digest = _hash(parts)
+        self.digests[id(node)] = digest
+        return digest
+
+    def _list(self, items):
+        return _hash([(_DICT, self._digest(item))
+                      if isinstance(item, Mapping) else item
+                      for item in items])
+
+    def get(self, path):
+        '''The value at a path of keys, KeyError when missing'''
+        node = self.parsed
+        for key in path:
+            node = node[key]
+        return node
+
+    def digest(self, path=()):
+        '''Digest of the dict at a path of keys, None when there is no dict
+        at the path
+
+        Two snapshots with equal digests at a path hold equal dicts there.
+        '''
+        try:
+            node = self.get(path)
+        except (KeyError, TypeError):
+            return None
+        if not isinstance(node, Mapping):
+            return None
+        digest = self.digests.get(id(node))
+        if digest is None:
+            digest = self._digest(node)
+        return digest
+
+    def diff(self, new, path=()):
+        '''The changes from this snapshot to a newer one
+
+            Args:
+                new (`Snapshot`): snapshot of the newer parsed output
+                path (`tuple`): only compare the subtrees at this path
+
+            Returns:
+                `list` of `Change`, sorted depth first in the order of the
+                keys of the old output, then of the new one
+        '''
+        changes = []
+        try:
+            old_node = self.get(path)
+        except (KeyError, TypeError):
+            old_node = None
+        try:
+            new_node = new.get(path)
+        except (KeyError, TypeError):
+            new_node = None
+        if old_node is None and new_node is None:
+            return changes
+        if old_node is None or new_node is None:
+            changes.append(Change(tuple(path),
+                                  ADDED if old_node is None else REMOVED,
+                                  old_node, new_node))
+        elif isinstance(old_node, Mapping) and \
+                isinstance(new_node, Mapping):
+            self._diff(old_node, new_node, tuple(path), new.digests, changes)
+        elif not _equal(old_node, new_node, self.exclude):
+            changes.append(Change(tuple(path), CHANGED, old_node, new_node))
+        return changes
+
+    def _diff(self, old, new, path, new_digests, changes):
+        if old is new:
+            return
+        digest = self.digests.get(id(old))
+        if digest is not None and digest == new_digests.get(id(new)):
+            return
+        exclude, digests = self.exclude, self.digests
+        for key, value in old.items():
+            if key in exclude:
+                continue
+            if key not in new:
+                changes.append(Change(path + (key,), REMOVED, value, None))
+                continue
+            other = new[key]
+            if value is other:
+                continue
+            if (value.__class__ is dict or isinstance(value, Mapping)) and \
+                    (other.__class__ is dict or isinstance(other, Mapping)):
+                # checked here too, the entries of a table are mostly equal
+                digest = digests.get(id(value))
+                if digest is None or digest != new_digests.get(id(other)):
+                    self._diff(value, other, path + (key,), new_digests,
+                               changes)
+            elif value.__class__ is not other.__class__ or \
+                    (not _equal(value, other, exclude)
+                     if value.__class__ is list else value != other):
+                changes.append(Change(path + (key,), CHANGED, value, other))
+        for key, value in new.items():
+            if key not in old and key not in exclude:
+                changes.append(Change(path + (key,), ADDED, None, value))
+
+
+def diff(old, new, exclude=()):
+    '''The changes between two parsed outputs
+
+        Args:
+            old (`dict`): previous parsed output
+            new (`dict`): newer parsed output
+            exclude (`iterable`): keys left out at any depth, the
+                                  ``exclude`` of the parser for instance
+
+        Returns:
+            `list` of `Change`
+    '''
+    old_snapshot = Snapshot(old, exclude)
+    return old_snapshot.diff(Snapshot(new, exclude, previous=old_snapshot))
+
+
+class ChangeTracker(object):
+    '''Changes between the consecutive parsed outputs of a command
+
+        Args:
+            exclude (`iterable`): keys left out at any depth, the
+                                  ``exclude`` of the parser for instance
+    '''
+
+    def __init__(self, exclude=()):
+        self.exclude = tuple(exclude)
+        self.snapshot = None
+
+    def update(self, parsed):
+        '''Take a new poll
+
+            Returns:
+                `list` of `Change` since the previous poll, empty for the
+                first one
+        '''
+        snapshot = Snapshot(parsed, self.exclude, previous=self.snapshot)
+        previous, self.snapshot = self.snapshot, snapshot
+        if previous is None:
+            return []
+        return previous.diff(snapshot)
@@ -0,0 +1,765 @@
+'''Link-state graphs of parsed OSPF and IS-IS databases
+
+The OSPF database parsers return one nested dict per LSA:
+
+    * IOS-XE ``ShowIpOspfDatabaseRouter``: the links of each router, to
+      another router, a transit network or a stub network, with their
+      metric per topology
+    * IOS-XE ``ShowIpOspfDatabaseNetwork``: the routers attached to each
+      transit network, advertised by its designated router
+    * IOS-XE ``ShowIpOspfDatabaseOpaqueArea``: the traffic engineering
+      attributes of the links, ``te_metric`` among them
+
+`OspfGraph` derives the link-state graph of an area from those outputs,
+poll after poll.  A LSA whose sequence number did not change is skipped, the
+others only replace the edges of the router or network advertising them:
+
+    >>> graph = OspfGraph(area='0.0.0.0')
+    >>> graph.update(ShowIpOspfDatabaseRouter(device=device).parse())
+    {'added': 5000, 'changed': 0, 'removed': 0, 'unchanged': 0}
+    >>> graph.update(ShowIpOspfDatabaseNetwork(device=device).parse())
+    >>> paths = graph.spf('10.0.0.1')
+    >>> paths.distance('10.0.4.4')
+    30
+    >>> paths.first_hops('10.0.4.4')
+    {'10.0.0.2'}
+
+`IsisGraph` does the same for the LSPs of the IS-IS database parsers, IOS-XE
+``ShowIsisDatabaseDetail`` and IOS-XR ``ShowIsisDatabaseDetail``, with one
+graph per level over a single table of system ids.  The fragments of a
+system are merged, a changed fragment only rebuilds the edges of its system:
+
+    >>> graph = IsisGraph()
+    >>> graph.update(ShowIsisDatabaseDetail(device=device).parse())
+    {'added': 3000, 'changed': 0, 'removed': 0, 'unchanged': 0}
+    >>> graph.spf('R1', level=2).distance('R7')
+    40
+
+`Graph` is the graph itself: the nodes are numbered through a `NodeTable`,
+the edges are kept per node while they change and frozen on demand into
+compressed sparse rows (CSR), ``offsets``/``targets``/``weights`` arrays,
+which the shortest path first computation walks.  The transit networks are
+pseudonodes, they are never the first hop of a path.
+'''
+
+# python
+import heapq
+import logging
+import ipaddress
+from array import array
+
+log = logging.getLogger(__name__)
+
+# lsa types of the OSPF database
+ROUTER_LSA = 1
+NETWORK_LSA = 2
+OPAQUE_AREA_LSA = 10
+
+# key of the pseudonode of a transit network, by designated router address
+NETWORK = 'network'
+
+# lsp tlvs of the IS-IS database parsers, by topology
+IS_NEIGHBOR_TLVS = ('is_neighbor', 'extended_is_neighbor')
+MT_IS_NEIGHBOR_TLVS = ('mt_is_neighbor',)
+PREFIX_TLVS = {
+    'ipv4': ('ipv4_internal_reachability', 'ipv4_interarea_reachability',
+             'extended_ipv4_reachability', 'ipv4_reachability',
+             'mt_ipv4_reachability', 'ip_neighbor', 'ip_interarea'),
+    'ipv6': ('ipv6_reachability', 'mt_ipv6_reachability'),
+}
+
+
+class NodeTable(object):
+    '''Numbers of the nodes of a graph, in the order they were seen'''
+
+    def __init__(self):
+        self.numbers = {}
+        self.keys = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.numbers
+
+    def __call__(self, key):
+        '''Number of a node, added when unknown'''
+        number = self.numbers.get(key)
+        if number is None:
+            number = self.numbers[key] = len(self.keys)
+            self.keys.append(key)
+        return number
+
+    def get(self, key):
+        return self.numbers.get(key)
+
+
+class Graph(object):
+    '''Directed weighted graph, edited per node and read as CSR
+
+    The out edges of node `n` are ``edges[n]``, target number to weight.
+    `csr` freezes them into ``offsets``, ``targets`` and ``weights``, the
+    edges of `n` being ``targets[offsets[n]:offsets[n + 1]]``, rebuilt on
+    the first read after a change.
+
+        Args:
+            nodes (`NodeTable`): table numbering the nodes, shared by the
+                                 graphs of the same nodes
+    '''
+
+    def __init__(self, nodes=None):
+        self.nodes = NodeTable() if nodes is None else nodes
+        self.edges = []
+        self.pseudo = bytearray()
+        self._csr = {}
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def node(self, key, pseudo=False):
+        '''Number of a node, added when unknown'''
+        number = self.nodes(key)
+        while number >= len(self.edges):
+            self.edges.append({})
+            self.pseudo.append(0)
+        if pseudo:
+            self.pseudo[number] = 1
+        return number
+
+    def set_edges(self, key, edges, pseudo=False):
+        '''Replace the out edges of a node
+
+            Args:
+                key: node
+                edges (`iterable`): (target key, weight) pairs, the lowest
+                                    weight is kept for a repeated target
+                pseudo (`bool`): the node is a pseudonode
+
+            Returns:
+                `bool`, True when the edges changed
+        '''
+        number = self.node(key, pseudo)
+        targets = {}
+        for target, weight in edges:
+            target = self.node(target)
+            if weight < targets.get(target, weight + 1):
+                targets[target] = weight
+        if targets == self.edges[number]:
+            return False
+        self.edges[number] = targets
+        self._csr.clear()
+        return True
+
+    def remove(self, key):
+        '''Drop the out edges of a node, its number is kept'''
+        number = self.nodes.get(key)
+        if number is None or number >= len(self.edges) or \
+           not self.edges[number]:
+            return False
+        self.edges[number] = {}
+        self._csr.clear()
+        return True
+
+    def edge_count(self):
+        return sum(len(edges) for edges in self.edges)
+
+    def csr(self, two_way=False):
+        '''The edges as compressed sparse rows
+
+            Args:
+                two_way (`bool`): only keep the edges whose reverse edge
+                                  exists, as a link-state SPF does
+
+            Returns:
+                (offsets, targets, weights) arrays
+        '''
+        csr = self._csr.get(two_way)
+        if csr is not None:
+            return csr
+        offsets = array('i', [0])
+        targets = array('i')
+        weights = array('q')
+        edges = self.edges
+        for number, node_edges in enumerate(edges):
+            for target, weight in node_edges.items():
+                if two_way and number not in edges[target]:
+                    continue
+                targets.append(target)
+                weights.append(weight)
+            offsets.append(len(targets))
+        csr = self._csr[two_way] = (offsets, targets, weights)
+        return csr
+
+    def spf(self, source, two_way=True, transit=None):
+        '''Shortest paths from a node, Dijkstra over the CSR
+
+            Args:
+                source: node the paths start from
+                two_way (`bool`): only follow the edges whose reverse edge
+                                  exists
+                transit (`callable`): tells from a node number if paths may
+                                      go through the node, all of them may
+                                      when None
+
+            Returns:
+                `ShortestPaths`
+        '''
+        offsets, targets, weights = self.csr(two_way)
+        size = len(offsets) - 1
+        start = self.nodes.get(source)
+        if start is None or start >= size:
+            raise KeyError(source)
+        distances = [-1] * size
+        parents = array('i', [-1]) * size
+        more = {}
+        distances[start] = 0
+        done = bytearray(size)
+        order = array('i')
+        heap = [(0, start)]
+        pop, push = heapq.heappop, heapq.heappush
+        while heap:
+            distance, node = pop(heap)
+            if done[node]:
+                continue
+            done[node] = 1
+            order.append(node)
+            if transit is not None and node != start and \
+               not transit(node):
+                continue
+            for position in range(offsets[node], offsets[node + 1]):
+                target = targets[position]
+                total = distance + weights[position]
+                known = distances[target]
+                if done[target]:
+                    # settled already through a zero weight edge
+                    if total == known and target != start and \
+                       parents[target] != node:
+                        more.setdefault(target, []).append(node)
+                    continue
+                if known < 0 or total < known:
+                    distances[target] = total
+                    parents[target] = node
+                    more.pop(target, None)
+                    push(heap, (total, target))
+                elif total == known and parents[target] != node:
+                    more.setdefault(target, []).append(node)
+        return ShortestPaths(self, start, array('q', distances), parents,
+                             more, order)
+
+
+class ShortestPaths(object):
+    '''Result of `Graph.spf`
+
+    ``distances[n]`` is the cost of node `n`, -1 when unreachable,
+    ``parents[n]`` its first parent on a shortest path and ``more[n]`` its
+    other parents, for the equal cost paths.  ``order`` holds the nodes
+    reached, by increasing cost.
+    '''
+
+    def __init__(self, graph, source, distances, parents, more, order):
+        self.graph = graph
+        self.source = source
+        self.distances = distances
+        self.parents = parents
+        self.more = more
+        self.order = order
+        self._hops = None
+
+    def _number(self, key):
+        number = self.graph.nodes.get(key)
+        if number is None or number >= len(self.distances):
+            return None
+        return number
+
+    def distance(self, key):
+        '''Cost of a node, None when unreachable'''
+        number = self._number(key)
+        if number is None or self.distances[number] < 0:
+            return None
+        return self.distances[number]
+
+    def reachable(self):
+        '''(node, cost) of the nodes reached, pseudonodes excluded'''
+        keys, pseudo = self.graph.nodes.keys, self.graph.pseudo
+        for number, distance in enumerate(self.distances):
+            if distance >= 0 and not pseudo[number]:
+                yield keys[number], distance
+
+    def path(self, key):
+        '''Nodes of a shortest path from the source to a node, both
+        included, None when unreachable'''
+        number = self._number(key)
+        if number is None or self.distances[number] < 0:
+            return None
+        keys, path = self.graph.nodes.keys, []
+        while number >= 0:
+            path.append(keys[number])
+            number = self.parents[number]
+        path.reverse()
+        return path
+
+    def _parents(self, node):
+        parent = self.parents[node]
+        return ([parent] if parent >= 0 else []) + self.more.get(node, [])
+
+    def _all_first_hops(self):
+        # parents before children, a pseudonode next to the source is
+        # direct and the nodes after it are first hops
+        pseudo, source = self.graph.pseudo, self.source
+        hops, direct = {source: set()}, {source}
+        for node in self.order:
+            stack, visiting = [node], set()
+            while stack:
+                current = stack[-1]
+                visiting.add(current)
+                pending = [parent for parent in self._parents(current)
+                           if parent not in hops and parent not in visiting]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                stack.pop()
+                if current in hops:
+                    continue
+                current_hops = set()
+                for parent in self._parents(current):
+                    if parent in direct:
+                        if pseudo[current]:
+                            direct.add(current)
+                        else:
+                            current_hops.add(current)
+                    # a direct pseudonode also reached through a router
+                    # passes on the first hops of that router
+                    current_hops.update(hops.get(parent, ()))
+                hops[current] = current_hops
+        return hops
+
+    def first_hops(self, key):
+        '''The neighbors of the source the shortest paths to a node go
+        through, several for equal cost multipaths
+
+            Returns:
+                `set` of nodes, empty for the source or an unreachable node
+        '''
+        number = self._number(key)
+        if number is None or self.distances[number] < 0:
+            return set()
+        if self._hops is None:
+            self._hops = self._all_first_hops()
+        keys = self.graph.nodes.keys
+        return {keys[hop] for hop in self._hops.get(number, ())}
+
+
+def _metric(link, topology):
+    # metric of a router lsa link in a topology, None when not in it
+    entry = link.get('topologies', {}).get(topology)
+    if entry is None:
+        return None
+    return entry.get('metric', 0)
+
+
+class OspfGraph(object):
+    '''Link-state graph of one OSPF area
+
+    The routers are keyed by router id, the transit networks by
+    ``('network', designated router address)``, the stub networks are kept
+    as prefixes of their router.
+
+        Args:
+            area (`str`): area to load, the first one seen when None
+            vrf (`str`): vrf to load, any when None
+            instance (`str`): OSPF process to load, any when None
+            topology (`int`): multi-topology id of the metrics
+            te_metric (`bool`): use the te metric of the links when the
+                                opaque LSAs carry one
+    '''
+
+    def __init__(self, area=None, vrf=None, instance=None, topology=0,
+                 te_metric=False):
+        self.area = area
+        self.vrf = vrf
+        self.instance = instance
+        self.topology = topology
+        self.te_metric = te_metric
+        self.graph = Graph()
+        # (lsa type, lsa id, advertising router) -> sequence number
+        self.lsas = {}
+        # router id -> (link type, link id, metric) of its router lsa
+        self._links = {}
+        # router id -> {link id: te metric} of its opaque lsas
+        self._te = {}
+        # router id -> {(lsa id, link number): te metrics}
+        self._te_lsas = {}
+        # router id -> {prefix: metric} of its stub networks
+        self.prefixes = {}
+
+    def _areas(self, parsed):
+        for vrf, vrf_dict in parsed.get('vrf', {}).items():
+            if self.vrf is not None and vrf != self.vrf:
+                continue
+            for af_dict in vrf_dict.get('address_family', {}).values():
+                for instance, instance_dict in af_dict.get('instance',
+                                                           {}).items():
+                    if self.instance is not None and \
+                       instance != self.instance:
+                        continue
+                    for area, area_dict in instance_dict.get('areas',
+                                                             {}).items():
+                        if self.area is None:
+                            self.area = area
+                        if area == self.area:
+                            yield area_dict
+
+    def update(self, parsed):
+        '''Load a poll of the database of the area
+
+        The LSA types found in `parsed` are taken as complete, the LSAs of
+        those types it does not hold are withdrawn.
+
+            Args:
+                parsed (`dict`): result of ShowIpOspfDatabaseRouter,
+                                 ShowIpOspfDatabaseNetwork or
+                                 ShowIpOspfDatabaseOpaqueArea
+
+            Returns:
+                `dict` counting the added, changed, removed and unchanged
+                LSAs
+        '''
+        counts = {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 0}
+        seen, types = set(), set()
+        for area_dict in self._areas(parsed):
+            lsa_types = area_dict.get('database', {}).get('lsa_types', {})
+            for lsa_type, type_dict in lsa_types.items():
+                types.add(lsa_type)
+                for lsa in type_dict.get('lsas', {}).values():
+                    key = (lsa_type, lsa['lsa_id'], lsa['adv_router'])
+                    seen.add(key)
+                    ospfv2 = lsa.get('ospfv2', {})
+                    sequence = ospfv2.get('header', {}).get('seq_num')
+                    known = self.lsas.get(key)
+                    if known is not None and known == sequence:
+                        counts['unchanged'] += 1
+                        continue
+                    counts['added' if known is None else 'changed'] += 1
+                    self.lsas[key] = sequence
+                    self._apply(key, ospfv2.get('body', {}))
+        for key in [key for key in self.lsas
+                    if key[0] in types and key not in seen]:
+            del self.lsas[key]
+            self._apply(key, None)
+            counts['removed'] += 1
+        return counts
+
+    def _apply(self, key, body):
+        '''Apply a new LSA, or its withdrawal when `body` is None'''
+        lsa_type, lsa_id, adv_router = key
+        if lsa_type == ROUTER_LSA:
+            self._router(adv_router, body)
+        elif lsa_type == NETWORK_LSA:
+            self._network(lsa_id, body)
+        elif lsa_type == OPAQUE_AREA_LSA:
+            self._opaque(lsa_id, adv_router, body)
+
+    def _router(self, router, body):
+        if body is None:
+            self._links.pop(router, None)
+            self.prefixes.pop(router, None)
+            self.graph.remove(router)
+            return
+        links, prefixes = [], {}
+        for link in body.get('router', {}).get('links', {}).values():
+            metric = _metric(link, self.topology)
+            if metric is None:
+                continue
+            link_type, link_id = link.get('type', ''), link['link_id']
+            if 'stub' in link_type:
+                prefix = '{}/{}'.format(link_id, ipaddress.IPv4Network(
+                    '0.0.0.0/{}'.format(link['link_data'])).prefixlen)
+                prefixes[prefix] = metric
+            else:
+                links.append(('transit' if 'transit' in link_type else
+                              'router', link_id, metric))
+        self._links[router] = links
+        self.prefixes[router] = prefixes
+        self._router_edges(router)
+
+    def _router_edges(self, router):
+        links = self._links.get(router)
+        if links is None:
+            return
+        te = self._te.get(router, {}) if self.te_metric else {}
+        self.graph.set_edges(router, [
+            ((NETWORK, link_id) if link_type == 'transit' else link_id,
+             te.get(link_id, metric))
+            for link_type, link_id, metric in links])
+
+    def _network(self, address, body):
+        key = (NETWORK, address)
+        if body is None:
+            self.graph.remove(key)
+            return
+        attached = body.get('network', {}).get('attached_routers', {})
+        self.graph.set_edges(key, [(router, 0) for router in attached],
+                             pseudo=True)
+
+    def _opaque(self, lsa_id, router, body):
+        lsas = self._te_lsas.setdefault(router, {})
+        lsas.pop(lsa_id, None)
+        if body is not None:
+            metrics = {}
+            for tlv in body.get('opaque', {}).get('link_tlvs', {}).values():
+                if 'te_metric' in tlv and 'link_id' in tlv:
+                    metrics[tlv['link_id']] = tlv['te_metric']
+            if metrics:
+                lsas[lsa_id] = metrics
+        te = {}
+        for metrics in lsas.values():
+            te.update(metrics)
+        if te != self._te.get(router, {}):
+            self._te[router] = te
+            if self.te_metric:
+                self._router_edges(router)
+
+    def spf(self, router):
+        '''Shortest paths from a router, over the two way links
+
+            Returns:
+                `ShortestPaths`
+        '''
+        return self.graph.spf(router, two_way=True)
+
+    def routes(self, router):
+        '''Cost of the stub prefixes from a router
+
+            Returns:
+                `dict` prefix -> (cost, advertising routers)
+        '''
+        paths = self.spf(router)
+        routes = {}
+        for node, distance in paths.reachable():
+            for prefix, metric in self.prefixes.get(node, {}).items():
+                cost = distance + metric
+                known = routes.get(prefix)
+                if known is None or cost < known[0]:
+                    routes[prefix] = (cost, {node})
+                elif cost == known[0]:
+                    known[1].add(node)
+        return routes
+
+
+def lsp_node(lsp_id):
+    '''Node and fragment number of an IS-IS LSP id
+
+    A system is keyed by its system id, 'R1' for 'R1.00-01', a pseudonode by
+    its system id and circuit, 'R1.02' for 'R1.02-00'.
+
+        Returns:
+            (node, fragment, pseudo) tuple
+    '''
+    node, _, fragment = lsp_id.rpartition('-')
+    return neighbor_node(node), int(fragment, 16), not node.endswith('.00')
+
+
+def neighbor_node(neighbor_id):
+    '''Node of an IS-IS neighbor id, 'R1.00' is 'R1' and 'R1.02' is kept'''
+    if neighbor_id.endswith('.00'):
+        return neighbor_id[:-3]
+    return neighbor_id
+
+
+def _tlv_metric(value):
+    # metric of a neighbor or prefix entry of either os, the ios-xe entries
+    # are lists and the ios-xr metrics are sometimes strings
+    if isinstance(value, list):
+        return min(_tlv_metric(entry) for entry in value)
+    if 'address_family' in value:
+        return min(int(af['metric'])
+                   for af in value['address_family'].values())
+    return int(value['metric'])
+
+
+def _fragment(lsp, topology):
+    # (edges, prefixes, overload) of one lsp fragment
+    if topology == 'ipv6' and any(tlv in lsp for tlv in MT_IS_NEIGHBOR_TLVS):
+        tlvs = MT_IS_NEIGHBOR_TLVS
+    else:
+        tlvs = IS_NEIGHBOR_TLVS
+    edges = []
+    for tlv in tlvs:
+        for neighbor, value in lsp.get(tlv, {}).items():
+            edges.append((neighbor_node(neighbor), _tlv_metric(value)))
+    prefixes = {}
+    for tlv in PREFIX_TLVS[topology]:
+        for prefix, value in lsp.get(tlv, {}).items():
+            metric = _tlv_metric(value)
+            if metric < prefixes.get(prefix, metric + 1):
+                prefixes[prefix] = metric
+    header = lsp.get('lsp', lsp)
+    return edges, prefixes, bool(header.get('overload_bit'))
+
+
+class IsisGraph(object):
+    '''Link-state graphs of the levels of one IS-IS instance
+
+    ``graphs[level]`` is the `Graph` of a level, all of them numbering their
+    nodes through ``systems``.  The systems are keyed by system id and the
+    pseudonodes by system id and circuit, see `lsp_node`.  The prefixes of
+    a system are kept in ``prefixes[level][system]``, the systems with the
+    overload bit set in ``overloaded[level]``; paths end at them but do not
+    go through them.
+
+        Args:
+            instance (`str`): tag or instance to load, the first one seen
+                              when None
+            topology (`str`): 'ipv4', or 'ipv6' to follow the multi-topology
+                              neighbors of the systems advertising some
+    '''
+
+    def __init__(self, instance=None, topology='ipv4'):
+        if topology not in PREFIX_TLVS:
+            raise ValueError('Unknown topology {!r}, expected one of {}'
+                             .format(topology, sorted(PREFIX_TLVS)))
+        self.instance = instance
+        self.topology = topology
+        self.systems = NodeTable()
+        self.graphs = {}
+        self.prefixes = {}
+        self.overloaded = {}
+        # (level, lsp id) -> sequence number
+        self.lsps = {}
+        # (level, node) -> {fragment: (edges, prefixes, overload)}
+        self._fragments = {}
+
+    def _levels(self, parsed):
+        # both the ios-xe tag/level/lsp id and the ios-xr
+        # instance/level/lspid/lsp id layouts
+        for instance, instance_dict in (parsed.get('tag') or
+                                        parsed.get('instance') or
+                                        {}).items():
+            if self.instance is None:
+                self.instance = instance
+            if instance != self.instance:
+                continue
+            for level, level_dict in instance_dict.get('level', {}).items():
+                yield level, level_dict.get('lspid', level_dict)
+
+    def update(self, parsed):
+        '''Load a poll of the database
+
+        The levels found in `parsed` are taken as complete, the LSPs of those
+        levels it does not hold are withdrawn.
+
+            Args:
+                parsed (`dict`): result of ShowIsisDatabaseDetail
+
+            Returns:
+                `dict` counting the added, changed, removed and unchanged
+                LSPs
+        '''
+        counts = {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 0}
+        seen, levels, dirty = set(), set(), set()
+        for level, lsps in self._levels(parsed):
+            levels.add(level)
+            for lsp_id, lsp in lsps.items():
+                if not isinstance(lsp, dict):
+                    # total_lsp_count and local_lsp_count of ios-xr
+                    continue
+                key = (level, lsp_id)
+                seen.add(key)
+                sequence = lsp.get('lsp', lsp).get('seq_num') or \
+                    lsp.get('lsp_sequence_num')
+                known = self.lsps.get(key)
+                if known is not None and known == sequence:
+                    counts['unchanged'] += 1
+                    continue
+                counts['added' if known is None else 'changed'] += 1
+                self.lsps[key] = sequence
+                node, fragment, pseudo = lsp_node(lsp_id)
+                self._fragments.setdefault((level, node), {})[fragment] = \
+                    _fragment(lsp, self.topology) + (pseudo,)
+                dirty.add((level, node))
+        for key in [key for key in self.lsps
+                    if key[0] in levels and key not in seen]:
+            del self.lsps[key]
+            level, lsp_id = key
+            node, fragment, _ = lsp_node(lsp_id)
+            fragments = self._fragments.get((level, node), {})
+            fragments.pop(fragment, None)
+            dirty.add((level, node))
+            counts['removed'] += 1
+        for level, node in dirty:
+            self._merge(level, node)
+        return counts
+
+    def _merge(self, level, node):
+        '''Rebuild the edges and prefixes of a node from its fragments'''
+        graph = self.graphs.get(level)
+        if graph is None:
+            graph = self.graphs[level] = Graph(self.systems)
+            self.prefixes[level] = {}
+            self.overloaded[level] = set()
+        fragments = self._fragments.get((level, node))
+        if not fragments:
+            self._fragments.pop((level, node), None)
+            self.prefixes[level].pop(node, None)
+            self.overloaded[level].discard(self.systems.get(node))
+            graph.remove(node)
+            return
+        edges, prefixes = [], {}
+        pseudo = False
+        for fragment in sorted(fragments):
+            fragment_edges, fragment_prefixes, _, pseudo = \
+                fragments[fragment]
+            edges.extend(fragment_edges)
+            for prefix, metric in fragment_prefixes.items():
+                if metric < prefixes.get(prefix, metric + 1):
+                    prefixes[prefix] = metric
+        graph.set_edges(node, edges, pseudo=pseudo)
+        self.prefixes[level][node] = prefixes
+        # only the first fragment carries the overload bit that counts
+        number = self.systems.get(node)
+        if 0 in fragments and fragments[0][2]:
+            self.overloaded[level].add(number)
+        else:
+            self.overloaded[level].discard(number)
+
+    def spf(self, system, level=2):
+        '''Shortest paths from a system in a level, over the two way
+        adjacencies and around the overloaded systems
+
+            Returns:
+                `ShortestPaths`
+        '''
+        graph = self.graphs.get(level)
+        if graph is None:
+            raise KeyError(level)
+        overloaded = self.overloaded[level]
+        transit = (lambda node: node not in overloaded) if overloaded \
+            else None
+        return graph.spf(system, two_way=True, transit=transit)
+
+    def reachable(self, system, level=2):
+        '''The systems a system reaches in a level
+
+            Returns:
+                `dict` system -> cost
+        '''
+        return dict(self.spf(system, level).reachable())
+
+    def routes(self, system, level=2):
+        '''Cost of the prefixes of a level from a system
+
+            Returns:
+                `dict` prefix -> (cost, advertising systems)
+        '''
+        paths = self.spf(system, level)
+        prefixes = self.prefixes.get(level, {})
+        routes = {}
+        for node, distance in paths.reachable():
+            for prefix, metric in prefixes.get(node, {}).items():
+                cost = distance + metric
+                known = routes.get(prefix)
+                if known is None or cost < known[0]:
+                    routes[prefix] = (cost, {node})
+                elif cost == known[0]:
+                    known[1].add(node)
+        return routes
@@ -0,0 +1,217 @@
+'''Incremental re-parse of block structured outputs between polls
+
+Outputs such as ``show interfaces`` or ``show running-config interface`` are
+a sequence of independent blocks, one per interface, and from one poll to the
+next most of the blocks are identical.  `IncrementalParser` splits every new
+output into its top level blocks, hashes them, reuses the parsed sub-dicts of
+the blocks seen in the previous poll and only parses the changed and new
+blocks:
+
+    >>> poller = IncrementalParser(ShowInterfaces, device=device,
+    ...                            command='show interfaces')
+    >>> parsed = poller.parse()          # every block is parsed
+    >>> parsed = poller.parse()          # only the changed blocks
+    >>> poller.changes
+    Changes(added=set(), changed={'GigabitEthernet1/0/1'}, removed=set())
+
+A parser supports the incremental mode by declaring class attributes:
+
+    * ``block_header``: regex matching the first line (stripped) of a block,
+      its ``name`` group is the key of the block
+    * ``block_key_path``: keys leading to the dict holding one entry per
+      block in the parsed output, ``()`` when the blocks are top level keys
+    * ``block_reference`` (optional): regex searched in a block which uses
+      data of another block, its ``reference`` group is the name of that
+      block.  For example an unnumbered interface takes its address from
+      the referenced interface, such a block is parsed next to the block it
+      references and cached for this pair.
+
+The unchanged sub-dicts are shared between consecutive results, they must be
+treated as read-only.
+'''
+
+# python
+import re
+import hashlib
+import logging
+import collections
+from inspect import getfullargspec
+
+from genie.metaparser.util.exceptions import SchemaEmptyParserError
+
+log = logging.getLogger(__name__)
+
+Changes = collections.namedtuple('Changes', ['added', 'changed', 'removed'])
+
+
+def split_blocks(output, header):
+    '''Split an output into blocks starting at the lines matching `header`
+
+        Args:
+            output (`str`): device output
+            header (`re.Pattern` or `str`): regex of a block first line, it is
+                                            matched on the stripped line
+
+        Returns:
+            `list` of block texts, the lines before the first header make a
+            block of their own
+    '''
+    if isinstance(header, str):
+        header = re.compile(header)
+    blocks = []
+    lines = []
+    for line in output.splitlines():
+        if header.match(line.strip()) and lines:
+            blocks.append('\n'.join(lines))
+            lines = []
+        lines.append(line)
+    if lines:
+        blocks.append('\n'.join(lines))
+    return blocks
+
+
+def _merge(target, source, owned):
+    '''Merge `source` into `target`, the sub-dicts of `source` are reused as
+    is, a dict is only copied when two blocks contribute to it.  `owned`
+    holds the ids of the copies, which can be modified in place.'''
+    for key, value in source.items():
+        existing = target.get(key)
+        if isinstance(existing, dict) and isinstance(value, dict):
+            if id(existing) not in owned:
+                existing = target[key] = dict(existing)
+                owned.add(id(existing))
+            _merge(existing, value, owned)
+        else:
+            target[key] = value
+
+
+class IncrementalParser(object):
+    '''Parse consecutive outputs of a block structured show command
+
+        Args:
+            parser_class (`MetaParser`): parser declaring ``block_header`` and
+                                         ``block_key_path``
+            device (`Device`): device executing the command
+            command (`str`): command executed when no output is given, also
+                             given to the parsers taking a command argument
+            kwargs (`dict`): arguments of the parser
+
+        Attributes:
+            changes (`Changes`): block keys added, changed and removed by the
+                                 last parse
+            parsed_blocks (`int`): blocks parsed by the last parse
+            reused_blocks (`int`): blocks reused by the last parse
+    '''
+
+    def __init__(self, parser_class, device=None, command=None, **kwargs):
+        try:
+            self.header = re.compile(parser_class.block_header)
+        except AttributeError:
+            raise TypeError('{} does not declare block_header'.format(
+                parser_class.__name__)) from None
+        self.key_path = tuple(getattr(parser_class, 'block_key_path', ()))
+        reference = getattr(parser_class, 'block_reference', None)
+        self.reference = re.compile(reference) if reference else None
+        self.parser_class = parser_class
+        self.device = device
+        self.command = command
+        self.kwargs = kwargs
+        if 'command' in getfullargspec(parser_class.cli).args:
+            # parsers taking the executed command, as in get_parser
+            self.kwargs['command'] = command or ''
+        self.changes = Changes(set(), set(), set())
+        self.parsed_blocks = 0
+        self.reused_blocks = 0
+        # digest -> (parsed block, keys of the block)
+        self._blocks = {}
+
+    def _keys(self, parsed):
+        for key in self.key_path:
+            parsed = parsed.get(key, {})
+        return set(parsed)
+
+    def _parse_block(self, block, name=None, referenced=None):
+        try:
+            parsed = self.parser_class(device=self.device).parse(
+                output=block if referenced is None
+                else referenced + '\n' + block, **self.kwargs)
+        except SchemaEmptyParserError:
+            return {}
+        if referenced is not None:
+            # drop the entry of the referenced block
+            entries = parsed
+            for key in self.key_path:
+                entries = entries.get(key, {})
+            for key in list(entries):
+                if key != name:
+                    del entries[key]
+        return parsed
+
+    def _name(self, block):
+        m = self.header.match(block.lstrip().split('\n', 1)[0].strip())
+        return m.groupdict().get('name') if m else None
+
+    def parse(self, output=None):
+        '''Parse a new output, reusing the unchanged blocks of the last one
+
+            Args:
+                output (`str`): device output, `command` is executed when None
+
+            Returns:
+                parsed `dict`, equal to a full parse of the output
+        '''
+        if output is None:
+            output = self.device.execute(self.command)
+
+        previous_keys = set()
+        for _, keys in self._blocks.values():
+            previous_keys |= keys
+
+        blocks = {}
+        result = {}
+        owned = set()
+        added, changed = set(), set()
+        self.parsed_blocks = self.reused_blocks = 0
+        texts = split_blocks(output, self.header)
+        named = {}
+        if self.reference is not None:
+            named = {self._name(block): block for block in texts}
+
+        for block in texts:
+            referenced = None
+            if self.reference is not None:
+                m = self.reference.search(block)
+                if m:
+                    referenced = named.get(m.group('reference'))
+            digest = hashlib.blake2b(
+                block.encode() if referenced is None
+                else (referenced + '\0' + block).encode(),
+                digest_size=16).digest()
+            entry = self._blocks.get(digest) or blocks.get(digest)
+            if entry is None:
+                parsed = self._parse_block(
+                    block, name=self._name(block) if referenced else None,
+                    referenced=referenced)
+                keys = self._keys(parsed)
+                entry = (parsed, keys)
+                self.parsed_blocks += 1
+                changed |= keys & previous_keys
+                added |= keys - previous_keys
+            else:
+                self.reused_blocks += 1
+            blocks[digest] = entry
+            _merge(result, entry[0], owned)
+
+        current_keys = set()
+        for _, keys in blocks.values():
+            current_keys |= keys
+        self.changes = Changes(added, changed, previous_keys - current_keys)
+        self._blocks = blocks
+
+        if not result:
+            raise SchemaEmptyParserError(data=result,
+                                         command=self.command or '')
+        log.debug('%s: %d blocks parsed, %d reused',
+                  self.parser_class.__name__, self.parsed_blocks,
+                  self.reused_blocks)
+        return result
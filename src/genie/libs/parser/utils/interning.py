@@ -0,0 +1,111 @@
+'''Interning of the repeated strings of a parsed output
+
+Every value a parser takes from ``m.groupdict()`` is a fresh `str`.  A full
+routing or mac table repeats the same few strings hundreds of thousands of
+times: interface names, next hops, ``'dynamic'``/``'static'``, protocol
+codes, and each copy is held by the parsed output.  `Interner` maps equal
+strings to a single instance, `intern_parsed` applies it to a parsed output:
+
+    * every string key of the output, the keys of the ``Any()`` levels of a
+      schema repeat the names of interfaces, vrfs and neighbors
+    * the values of the fields named in `fields`, strings or lists of strings
+
+The table of an `Interner` only lives as long as it is referenced, nothing is
+kept between two parses, unlike `sys.intern` which keeps the strings for the
+life of the process.
+
+A parser interns its output with the `InternMixin` base class and the class
+attribute ``intern_fields``, the fields holding categorical values, when
+asked with ``parse(intern_strings=True)``.  It is a second pass over the
+output, which costs parse time and holds both copies for a moment, for the
+callers keeping large outputs around.
+'''
+
+# python
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class Interner(object):
+    '''Parse scoped table of interned strings'''
+
+    def __init__(self):
+        self.strings = {}
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __call__(self, value):
+        '''The interned instance of a string'''
+        return self.strings.setdefault(value, value)
+
+    def intern_parsed(self, parsed, fields=()):
+        '''A copy of a parsed output sharing its equal strings
+
+            Args:
+                parsed (`dict`): parsed output
+                fields (`iterable`): names of the categorical fields, their
+                                     string values are interned
+
+            Returns:
+                `dict` laid out as `parsed`, the leaf values which are not
+                interned are shared with `parsed`
+        '''
+        return self._dict(parsed, frozenset(fields))
+
+    def _dict(self, node, fields):
+        strings = self.strings
+        setdefault = strings.setdefault
+        result = {}
+        for key, value in node.items():
+            if key.__class__ is str:
+                key = setdefault(key, key)
+            cls = value.__class__
+            if cls is dict:
+                value = self._dict(value, fields)
+            elif key in fields:
+                if cls is str:
+                    value = setdefault(value, value)
+                elif cls is list:
+                    value = [setdefault(item, item)
+                             if item.__class__ is str else item
+                             for item in value]
+            elif cls is list:
+                value = [self._dict(item, fields)
+                         if item.__class__ is dict else item
+                         for item in value]
+            result[key] = value
+        return result
+
+
+def intern_parsed(parsed, fields=()):
+    '''Intern the keys and the categorical fields of a parsed output
+
+        Args:
+            parsed (`dict`): parsed output
+            fields (`iterable`): names of the categorical fields
+
+        Returns:
+            `dict` equal to `parsed`, its equal strings are one instance
+    '''
+    return Interner().intern_parsed(parsed, fields)
+
+
+class InternMixin(object):
+    '''Base class of the parsers interning their output on request
+
+    It comes before the schema class in the bases of the parser:
+
+        class ShowIpRoute(InternMixin, ShowIpRouteSchema):
+            intern_fields = ('source_protocol', 'next_hop', ...)
+    '''
+
+    # fields holding categorical values, interned with the keys
+    intern_fields = ()
+
+    def parse(self, *args, intern_strings=False, **kwargs):
+        parsed = super().parse(*args, **kwargs)
+        if not intern_strings or not isinstance(parsed, dict):
+            return parsed
+        return intern_parsed(parsed, self.intern_fields)
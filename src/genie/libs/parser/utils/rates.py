@@ -0,0 +1,445 @@
+'''Rates of the interface counters of successive polls
+
+The interface parsers return absolute counters:
+
+    * IOS-XE ``ShowInterfaces``, NX-OS ``ShowInterface`` and IOS-XR
+      ``ShowInterfacesDetail``: interface -> ``counters`` with
+      ``in_octets``, ``out_pkts``, ... and ``last_clear``, the time since
+      the counters were cleared
+
+`RateEngine` keeps the previous sample of every (device, interface) and turns
+each new poll into the deltas and rates since that sample:
+
+    >>> engine = RateEngine()
+    >>> engine.update('R1', ShowInterfaces(device=r1).parse())
+    >>> rates = engine.update('R1', ShowInterfaces(device=r1).parse())
+    >>> rates.get('GigabitEthernet1')['in_octets']
+    (1048576, 3495.25)
+
+The samples live in typed arrays, one slot per interface and one
+``array('Q')`` per counter, the slots of the interfaces gone from the polls
+of their device are reused.  A poll is computed a counter at a time over the
+whole column of its interfaces and the result, `Rates`, is columnar as well.
+
+A counter lower than in the previous sample wrapped or was cleared:
+
+    * the counters were cleared when ``last_clear`` is more recent than the
+      previous sample, the delta is the counter itself
+    * otherwise a counter in the upper half of the 32 or 64 bit range
+      wrapped, the delta goes through the wrap
+    * otherwise the counters were reset without ``last_clear`` telling,
+      an interface recreated or a line card reloaded, and the delta is the
+      counter itself
+'''
+
+# python
+import re
+import time
+import logging
+import operator
+import functools
+from array import array
+
+log = logging.getLogger(__name__)
+
+# flags of the interfaces of a `Rates`
+NEW = 1
+WRAPPED = 2
+CLEARED = 4
+
+DEFAULT_COUNTERS = ('in_octets', 'out_octets', 'in_pkts', 'out_pkts',
+                    'in_errors', 'out_errors')
+
+# value of a counter missing from a sample
+_MISSING = 2 ** 64 - 1
+# time of a slot without sample
+_NEVER = float('-inf')
+_WRAP_32 = 2 ** 32
+_WRAP_64 = 2 ** 64
+
+# '1y2w', '4w3d', '1d02h'
+_AGE = re.compile(r'^(?:(?P<years>\d+)y)?(?:(?P<weeks>\d+)w)?'
+                  r'(?:(?P<days>\d+)d)?(?:(?P<hours>\d+)h)?$')
+_AGE_SECONDS = {'years': 365 * 86400, 'weeks': 7 * 86400, 'days': 86400,
+                'hours': 3600}
+
+# '17:00:12'
+_CLOCK = re.compile(r'^(?P<hours>\d+):(?P<minutes>\d+):(?P<seconds>\d+)$')
+
+
+@functools.lru_cache(maxsize=4096)
+def clear_age(last_clear):
+    '''Seconds since the counters were cleared
+
+        Args:
+            last_clear (`str`): ``last_clear`` of the parsed counters,
+                                '17:00:12', '1d02h', '4w3d' or 'never'
+
+        Returns:
+            `int`, None when never cleared or unknown
+    '''
+    if not last_clear:
+        return None
+    m = _CLOCK.match(last_clear)
+    if m:
+        return (int(m.group('hours')) * 3600 + int(m.group('minutes')) * 60 +
+                int(m.group('seconds')))
+    m = _AGE.match(last_clear)
+    if m and any(m.groupdict().values()):
+        return sum(int(value) * _AGE_SECONDS[unit]
+                   for unit, value in m.groupdict().items() if value)
+    return None
+
+
+class Rates(object):
+    '''Deltas and rates of the interfaces of one poll
+
+    Interface `i` is ``interfaces[i]``, sampled ``seconds[i]`` after its
+    previous sample, or after the clear of its counters, with ``flags[i]``
+    a combination of `NEW`, `WRAPPED` and `CLEARED`.  ``deltas[counter][i]``
+    is -1 when the counter is missing from either sample or the interface is
+    new.
+    '''
+
+    def __init__(self, device, timestamp, interfaces, seconds, flags,
+                 deltas, rates):
+        self.device = device
+        self.timestamp = timestamp
+        self.interfaces = interfaces
+        self.seconds = seconds
+        self.flags = flags
+        self.deltas = deltas
+        self.rates = rates
+        self._rows = None
+
+    def __len__(self):
+        return len(self.interfaces)
+
+    def row(self, interface):
+        '''Index of an interface, None when not in the poll'''
+        if self._rows is None:
+            self._rows = {name: row for row, name in
+                          enumerate(self.interfaces)}
+        return self._rows.get(interface)
+
+    def get(self, interface):
+        '''The counters of an interface
+
+            Returns:
+                `dict` counter -> (delta, rate per second), None when the
+                interface is not in the poll
+        '''
+        row = self.row(interface)
+        if row is None:
+            return None
+        return {counter: (deltas[row], self.rates[counter][row])
+                for counter, deltas in self.deltas.items()
+                if deltas[row] >= 0}
+
+    def to_dict(self):
+        '''The rates as a dict
+
+            Returns:
+                `dict` interface -> ``seconds``, ``flags`` and ``counters``,
+                counter -> ``delta`` and ``rate``
+        '''
+        result = {}
+        for row, interface in enumerate(self.interfaces):
+            result[interface] = {
+                'seconds': self.seconds[row],
+                'flags': self.flags[row],
+                'counters': {counter: {'delta': delta,
+                                       'rate': self.rates[counter][row]}
+                             for counter, delta in
+                             ((counter, deltas[row]) for counter, deltas in
+                              self.deltas.items())
+                             if delta >= 0}}
+        return result
+
+
+class RateEngine(object):
+    '''Deltas and rates of the interface counters of many devices
+
+    Slot `s` holds the sample of interface ``interfaces[s]``, None for a
+    free slot, of device ``devices[slot_devices[s]]``: its counters in
+    ``values[counter][s]`` and its time in ``times[s]``.
+
+        Args:
+            counters (`tuple`): counters to follow
+            max_interfaces (`int`): interfaces kept at most, the ones sampled
+                                    the longest ago are evicted beyond, no
+                                    limit when None
+            max_missed (`int`): polls of its device an interface may be
+                                missing from before it is evicted
+    '''
+
+    def __init__(self, counters=DEFAULT_COUNTERS, max_interfaces=None,
+                 max_missed=1):
+        self.counters = tuple(counters)
+        self.max_interfaces = max_interfaces
+        self.max_missed = max_missed
+        self.devices = []
+        self.interfaces = []
+        self.slot_devices = array('l')
+        self.values = {counter: array('Q') for counter in self.counters}
+        self.times = array('d')
+        self._missed = bytearray()
+        self._free = []
+        # device name -> number, device number -> interface -> slot
+        self._numbers = {}
+        self._slots = []
+
+    def __len__(self):
+        return len(self.interfaces) - len(self._free)
+
+    def __contains__(self, key):
+        device, interface = key
+        number = self._numbers.get(device)
+        return number is not None and interface in self._slots[number]
+
+    def _device(self, name):
+        number = self._numbers.get(name)
+        if number is None:
+            number = self._numbers[name] = len(self.devices)
+            self.devices.append(name)
+            self._slots.append({})
+        return number
+
+    def nbytes(self):
+        '''Bytes of the arrays of the samples'''
+        return (sum(column.itemsize * len(column)
+                    for column in self.values.values()) +
+                self.times.itemsize * len(self.times) +
+                self.slot_devices.itemsize * len(self.slot_devices) +
+                len(self._missed))
+
+    def _allocate(self, number, interface):
+        if self._free:
+            slot = self._free.pop()
+            self.interfaces[slot] = interface
+            self.slot_devices[slot] = number
+            return slot
+        slot = len(self.interfaces)
+        self.interfaces.append(interface)
+        self.slot_devices.append(number)
+        for column in self.values.values():
+            column.append(_MISSING)
+        self.times.append(_NEVER)
+        self._missed.append(0)
+        return slot
+
+    def _release(self, slot):
+        self._slots[self.slot_devices[slot]].pop(self.interfaces[slot], None)
+        self.interfaces[slot] = None
+        self.slot_devices[slot] = -1
+        self.times[slot] = _NEVER
+        self._missed[slot] = 0
+        for column in self.values.values():
+            column[slot] = _MISSING
+        self._free.append(slot)
+
+    def _evict(self, count, keep=None):
+        '''Evict the `count` interfaces sampled the longest ago, a batch of
+        at least a sixteenth of the limit so the scan is amortized'''
+        if self.max_interfaces:
+            count = max(count, self.max_interfaces // 16)
+        times, devices = self.times, self.slot_devices
+        oldest = sorted((times[slot], slot) for slot, interface in
+                        enumerate(self.interfaces)
+                        if interface is not None and
+                        devices[slot] != keep)[:count]
+        for _, slot in oldest:
+            self._release(slot)
+        return len(oldest)
+
+    def expire(self, max_age, now=None):
+        '''Evict the interfaces not sampled for `max_age` seconds, those of
+        the devices no longer polled
+
+            Returns:
+                `int`, the number of interfaces evicted
+        '''
+        cutoff = (time.time() if now is None else now) - max_age
+        times = self.times
+        expired = [slot for slot, interface in enumerate(self.interfaces)
+                   if interface is not None and times[slot] < cutoff]
+        for slot in expired:
+            self._release(slot)
+        return len(expired)
+
+    def remove(self, device):
+        '''Evict the interfaces of a device'''
+        number = self._numbers.get(getattr(device, 'name', device))
+        if number is None:
+            return 0
+        slots = list(self._slots[number].values())
+        for slot in slots:
+            self._release(slot)
+        return len(slots)
+
+    @staticmethod
+    def _delta(value, previous, flags, row):
+        '''Delta of a counter of an interface whose flags are set or whose
+        counter went down or is missing, -1 when there is none'''
+        flag = flags[row]
+        if flag & NEW or value == _MISSING or previous == _MISSING:
+            return -1
+        if flag & CLEARED:
+            return value
+        delta = value - previous
+        if delta >= 0:
+            return delta
+        if _WRAP_32 // 2 <= previous < _WRAP_32:
+            flags[row] = flag | WRAPPED
+            return delta + _WRAP_32
+        if previous >= _WRAP_64 // 2:
+            flags[row] = flag | WRAPPED
+            return delta + _WRAP_64
+        flags[row] = flag | CLEARED
+        return value
+
+    def update(self, device, parsed, timestamp=None):
+        '''Compute the rates of a poll and keep it as the previous sample
+
+            Args:
+                device (`str`): hostname of the device, or a device object
+                                with ``name``
+                parsed (`dict`): result of ShowInterfaces, ShowInterface or
+                                 ShowInterfacesDetail
+                timestamp (`float`): time of the poll, now when None
+
+            Returns:
+                `Rates`
+        '''
+        if timestamp is None:
+            timestamp = time.time()
+        name = getattr(device, 'name', device)
+        number = self._device(name)
+        interfaces = self._slots[number]
+        entries = [(interface, entry['counters'])
+                   for interface, entry in parsed.items()
+                   if isinstance(entry, dict) and entry.get('counters')]
+        if self.max_interfaces:
+            new = sum(1 for interface, _ in entries
+                      if interface not in interfaces)
+            excess = len(self) + new - self.max_interfaces
+            if excess > 0:
+                self._evict(excess, keep=number)
+                room = self.max_interfaces - len(self)
+                if new > room:
+                    log.warning('%s: %d interfaces over the limit of %d are '
+                                'not followed', name, new - room,
+                                self.max_interfaces)
+                    kept = []
+                    for interface, counters in entries:
+                        if interface not in interfaces:
+                            if room <= 0:
+                                continue
+                            room -= 1
+                        kept.append((interface, counters))
+                    entries = kept
+
+        names = [interface for interface, _ in entries]
+        dicts = [counters for _, counters in entries]
+        slots = [interfaces.get(interface) for interface in names]
+        if None in slots:
+            for row, interface in enumerate(names):
+                if slots[row] is None:
+                    slots[row] = interfaces[interface] = self._allocate(
+                        number, interface)
+        slots = array('l', slots)
+        size = len(slots)
+        times, missed = self.times, self._missed
+
+        # the slots of a device polled again are usually contiguous, they
+        # are then read and written as slices
+        first = slots[0] if size else 0
+        contiguous = slots == array('l', range(first, first + size))
+
+        # interval and flags of every interface, the clear times are only
+        # read once per distinct value
+        if contiguous:
+            previous_times = times[first:first + size]
+        else:
+            previous_times = array('d', [times[slot] for slot in slots])
+        seconds = array('d', [timestamp - previous
+                              for previous in previous_times])
+        flags = bytearray(size)
+        if _NEVER in previous_times:
+            for row in range(size):
+                if previous_times[row] == _NEVER:
+                    flags[row] = NEW
+                    seconds[row] = 0.0
+        clears = [counters.get('last_clear') for counters in dicts]
+        longest = max(seconds) if size else 0.0
+        ages = {text: clear_age(text) for text in set(clears)}
+        if any(age is not None and age < longest for age in ages.values()):
+            for row, text in enumerate(clears):
+                age = ages[text]
+                if age is not None and age < seconds[row] and \
+                   not flags[row]:
+                    flags[row] = CLEARED
+                    seconds[row] = age
+        flagged = [row for row, flag in enumerate(flags) if flag] \
+            if flags.count(0) != size else []
+        uniform = not flagged and seconds.count(seconds[0]) == size \
+            if size else False
+
+        # deltas and rates, a counter at a time over all the interfaces
+        deltas, rates = {}, {}
+        for counter in self.counters:
+            column = self.values[counter]
+            current = array('Q', [counters.get(counter, _MISSING)
+                                  for counters in dicts])
+            if contiguous:
+                previous = column[first:first + size]
+                column[first:first + size] = current
+            else:
+                previous = array('Q', [column[slot] for slot in slots])
+                for slot, value in zip(slots, current):
+                    column[slot] = value
+            counter_deltas = list(map(operator.sub, current, previous))
+            # the rows a plain difference is not the delta of
+            rows = set(flagged)
+            if size and min(counter_deltas) < 0:
+                rows.update(row for row, delta in enumerate(counter_deltas)
+                            if delta < 0)
+            if _MISSING in current or _MISSING in previous:
+                rows.update(row for row in range(size)
+                            if current[row] == _MISSING or
+                            previous[row] == _MISSING)
+            for row in rows:
+                counter_deltas[row] = self._delta(current[row], previous[row],
+                                                  flags, row)
+            if uniform:
+                inverse = 1.0 / seconds[0] if seconds[0] > 0 else 0.0
+                counter_rates = array('d', [delta * inverse
+                                            for delta in counter_deltas])
+            else:
+                counter_rates = array('d', [
+                    delta / interval if interval > 0 else 0.0
+                    for delta, interval in zip(counter_deltas, seconds)])
+            for row in rows:
+                if counter_deltas[row] < 0:
+                    counter_rates[row] = 0.0
+            deltas[counter] = array('q', counter_deltas)
+            rates[counter] = counter_rates
+
+        if contiguous:
+            times[first:first + size] = array('d', [timestamp]) * size
+            missed[first:first + size] = bytes(size)
+        else:
+            for slot in slots:
+                times[slot] = timestamp
+                missed[slot] = 0
+
+        # the interfaces gone from the poll
+        if len(interfaces) > size:
+            polled = set(names)
+            for interface, slot in list(interfaces.items()):
+                if interface not in polled:
+                    missed[slot] = min(missed[slot] + 1, 255)
+                    if missed[slot] > self.max_missed:
+                        self._release(slot)
+
+        return Rates(name, timestamp, names, seconds, flags, deltas, rates)
@@ -0,0 +1,323 @@
+'''Slotted records for the leaf entries of a parsed output
+
+The bulk of a large parsed output is its innermost level: one small dict per
+bgp path, per next hop or per mac address entry.  A dict holds a hash table
+sized for growth next to its values, 272 bytes for 6 to 10 keys and 464 bytes
+above that.  `to_records` replaces these dicts with records: instances of a
+``__slots__`` class holding the values only, 8 bytes per value.
+
+The record classes are derived from the schema of the parser.  The level of
+the schema a path leads to gives a base class, `Record`, knowing the keys
+that level accepts, and each set of keys found in the output a slotted
+subclass of it, so a record holds the keys it has and no empty slot for the
+optional keys it has not.  A record is a read-only `Mapping`:
+
+    >>> parsed = ShowBgpAllDetail(device=device).parse(records=True)
+    >>> path = parsed['instance']['default']['vrf']['default'][
+    ...     'address_family']['ipv4 unicast']['prefixes']['10.0.0.0/24'][
+    ...     'index'][1]
+    >>> path['next_hop']
+    '10.1.1.1'
+    >>> path == {'next_hop': '10.1.1.1', ...}
+    True
+
+Records are built once the output is validated, the schema only accepts
+`dict`.  Code needing the dicts back, json or `Dq` for instance, calls
+`to_dicts` on the output.
+
+A parser emits records on ``parse(records=True)`` with the `RecordMixin`
+base class and the class attribute ``record_paths``, the keys leading to the
+entries to convert, the ``{name}`` elements being the keys of an ``Any()``
+level as in ``table_path`` of `genie.libs.parser.utils.columnar`.
+'''
+
+# python
+import logging
+from collections.abc import Mapping
+
+from genie.metaparser.util.schemaengine import Any, Optional
+
+log = logging.getLogger(__name__)
+
+
+def _placeholder(element):
+    '''Name of a ``{name}`` path element, None for a literal key'''
+    if element.startswith('{') and element.endswith('}'):
+        return element[1:-1]
+    return None
+
+
+def _schema_key(key):
+    '''The key a schema key matches, None for an ``Any()`` key'''
+    if isinstance(key, Any):
+        return None
+    if isinstance(key, Optional):
+        return key.schema
+    return key
+
+
+def schema_level(schema, path):
+    '''The level of a schema a path of a parsed output leads to
+
+        Args:
+            schema (`dict`): schema of a parser
+            path (`tuple`): keys of the parsed output, ``{name}`` for the
+                            keys of an ``Any()`` level
+
+        Returns:
+            `dict`, the schema of the entries at the end of the path
+
+        Raises:
+            ValueError: the path does not lead to a level of the schema
+    '''
+    level = schema
+    for element in path:
+        if not isinstance(level, dict):
+            raise ValueError('{!r} of {} is not a level of the schema'.format(
+                element, path))
+        placeholder = _placeholder(element)
+        for key in level:
+            if placeholder is not None and isinstance(key, Any) or \
+               placeholder is None and _schema_key(key) == element:
+                level = level[key]
+                break
+        else:
+            raise ValueError('{!r} of {} is not in the schema'.format(
+                element, path))
+    if not isinstance(level, dict):
+        raise ValueError('{} does not lead to a level of the schema'.format(
+            path))
+    return level
+
+
+class Record(Mapping):
+    '''Base class of the record classes of a schema level
+
+    The subclasses made by `record_class` declare one slot per key, ``_keys``
+    the keys in order and ``_members`` the slot descriptor of each key.
+    '''
+
+    __slots__ = ()
+
+    # keys accepted by the schema level
+    schema_keys = frozenset()
+    _keys = ()
+    _members = {}
+
+    def __getitem__(self, key):
+        try:
+            member = self._members[key]
+        except (KeyError, TypeError):
+            raise KeyError(key) from None
+        return member.__get__(self)
+
+    def __contains__(self, key):
+        try:
+            return key in self._members
+        except TypeError:
+            return False
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def get(self, key, default=None):
+        try:
+            member = self._members[key]
+        except (KeyError, TypeError):
+            return default
+        return member.__get__(self)
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def __reduce__(self):
+        # pickled and copied as a dict, the record classes are made at run
+        # time and are not importable
+        return dict, (self.to_dict(),)
+
+    def to_dict(self):
+        '''The entry as a dict'''
+        return {key: member.__get__(self)
+                for key, member in self._members.items()}
+
+    @classmethod
+    def shape(cls, keys):
+        '''The slotted subclass holding exactly `keys`
+
+            Args:
+                keys (`tuple`): keys of an entry, in order
+
+            Returns:
+                subclass of `cls`, made on the first call for these keys
+        '''
+        try:
+            return cls._shapes[keys]
+        except KeyError:
+            pass
+        unknown = set(keys) - cls.schema_keys
+        if unknown:
+            raise KeyError('{} not in the schema of {}'.format(
+                sorted(unknown, key=str), cls.__name__))
+        # keys are not always identifiers, the slots are named by position
+        slots = tuple('_{}'.format(position) for position in range(len(keys)))
+        shape = type(cls.__name__, (cls,), {'__slots__': slots,
+                                            '__module__': cls.__module__})
+        shape._keys = keys
+        shape._members = {key: shape.__dict__[slot]
+                          for key, slot in zip(keys, slots)}
+        shape._setters = tuple(shape.__dict__[slot].__set__
+                               for slot in slots)
+        cls._shapes[keys] = shape
+        return shape
+
+    @classmethod
+    def from_dict(cls, entry):
+        '''The record of a parsed entry
+
+            Args:
+                entry (`dict`): entry of the parsed output
+
+            Returns:
+                instance of a subclass of `cls`
+
+            Raises:
+                KeyError: a key of `entry` is not in the schema level
+        '''
+        shape = cls.shape(tuple(entry))
+        record = shape.__new__(shape)
+        for setter, value in zip(shape._setters, entry.values()):
+            setter(record, value)
+        return record
+
+
+def record_class(schema, path, name=None):
+    '''The record base class of the entries at the end of a path
+
+        Args:
+            schema (`dict`): schema of a parser
+            path (`tuple`): keys leading to the entries, see `schema_level`
+            name (`str`): name of the class, derived from the path when None
+
+        Returns:
+            subclass of `Record`
+
+        Raises:
+            ValueError: the level is not made of fixed keys
+    '''
+    keys = set()
+    for key in schema_level(schema, path):
+        key = _schema_key(key)
+        if not isinstance(key, str):
+            raise ValueError('{} leads to a level without fixed keys'.format(
+                path))
+        keys.add(key)
+    if name is None:
+        literals = [element for element in path
+                    if _placeholder(element) is None]
+        name = ''.join(part.capitalize() for part in
+                       (literals[-1] if literals else 'entry').split('_'))
+        name += 'Record'
+    return type(name, (Record,), {'__slots__': (),
+                                  'schema_keys': frozenset(keys),
+                                  '_shapes': {}})
+
+
+def _convert(node, path, depth, cls):
+    '''Replace the entries under `node` in place, returns the count'''
+    if depth == len(path) - 1:
+        converted = 0
+        for key, entry in node.items():
+            if entry.__class__ is dict:
+                try:
+                    node[key] = cls.from_dict(entry)
+                except KeyError as e:
+                    log.debug('Entry {!r} kept as a dict: {}'.format(key, e))
+                    continue
+                converted += 1
+        return converted
+    if _placeholder(path[depth]) is None:
+        child = node.get(path[depth])
+        children = [child] if child.__class__ is dict else []
+    else:
+        children = [child for child in node.values()
+                    if child.__class__ is dict]
+    return sum(_convert(child, path, depth + 1, cls) for child in children)
+
+
+def to_records(parsed, schema=None, paths=(), classes=None):
+    '''Replace the entries of a parsed output with records, in place
+
+        Args:
+            parsed (`dict`): parsed output, validated against `schema`
+            schema (`dict`): schema of the parser
+            paths (`iterable`): paths of the entries to convert, the last
+                                element is a ``{name}``
+            classes (`dict`): record base classes by path, reused between
+                              calls, filled by the call
+
+        Returns:
+            `dict`, `parsed`
+    '''
+    classes = {} if classes is None else classes
+    # the deeper entries first, a record is not modified once made
+    for path in sorted(paths, key=len, reverse=True):
+        path = tuple(path)
+        if not path or _placeholder(path[-1]) is None:
+            raise ValueError('{} does not end with a {{name}} element'.format(
+                path))
+        cls = classes.get(path)
+        if cls is None:
+            cls = classes[path] = record_class(schema, path)
+        count = _convert(parsed, path, 0, cls)
+        log.debug('{} entries of {} converted to {}'.format(
+            count, path, cls.__name__))
+    return parsed
+
+
+def to_dicts(parsed):
+    '''A copy of a parsed output holding dicts in place of its records
+
+        Args:
+            parsed (`dict`): parsed output
+
+        Returns:
+            `dict`, its nested mappings are all dicts
+    '''
+    result = {}
+    for key, value in parsed.items():
+        if isinstance(value, Mapping):
+            value = to_dicts(value)
+        elif value.__class__ is list:
+            value = [to_dicts(item) if isinstance(item, Mapping) else item
+                     for item in value]
+        result[key] = value
+    return result
+
+
+class RecordMixin(object):
+    '''Base class of the parsers emitting records
+
+    It comes first in the bases of the parser, records are made once the
+    output is validated, and interned when asked:
+
+        class ShowBgpAllDetail(RecordMixin, InternMixin, ShowBgpSchema):
+            record_paths = (('instance', 'default', 'vrf', '{vrf}', ...),)
+    '''
+
+    # paths of the entries emitted as records
+    record_paths = ()
+
+    def parse(self, *args, records=False, **kwargs):
+        parsed = super().parse(*args, **kwargs)
+        if not records or not isinstance(parsed, dict):
+            return parsed
+        cls = type(self)
+        # record classes are made once per parser class
+        classes = cls.__dict__.get('_record_classes')
+        if classes is None:
+            classes = {}
+            setattr(cls, '_record_classes', classes)
+        return to_records(parsed, self.schema, self.record_paths, classes)
@@ -0,0 +1,286 @@
+'''Concurrent bulk collection of REST resources
+
+The BIG-IP parsers (``bigip/``) read one iControl REST resource each, their
+`rest()` is a blocking ``self.device.get(self.cli_command).json()``.  Pulling
+a whole F5 inventory parser by parser is 700+ sequential HTTP round trips.
+`collect_rest` GETs a set of resources concurrently, a bounded number at a
+time, and decodes the JSON bodies in the worker threads, off the event loop:
+
+    >>> from genie.libs.parser.bigip.get_ltm_pool import LtmPool
+    >>> inventory = collect_rest(device, [LtmPool, '/mgmt/tm/net/'])
+    >>> inventory['/mgmt/tm/ltm/pool']['items']
+
+The resources are BIG-IP parser classes or URL prefixes, a prefix selects the
+resource of every BIG-IP parser below it.  A path no parser reads is
+collected as given.  The result is keyed by resource path and holds what the
+`rest()` of the parser returns.
+
+The device is a device connected through the BIG-IP REST connector, or a
+`RestClient` which GETs from a base URL through a requests session whose
+connection pool is bounded to the requests in flight.  Like `async_parse`,
+a coroutine ``aget(path)`` or ``get(path)`` of the device is awaited on the
+loop, a blocking ``get(path)`` runs in the executor.
+
+`iter_pages` walks an offset/limit paginated collection (DNAC intent API)
+item by item, the next pages are fetched while the current one is consumed:
+
+    >>> for interface in iter_pages(device.get, '/dna/intent/api/v1/interface',
+    ...                             limit=500):
+    ...     ...
+'''
+
+# python
+import asyncio
+import inspect
+import logging
+import pkgutil
+import importlib
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+log = logging.getLogger(__name__)
+
+# requests in flight, the default pool of a requests session holds 10
+# connections per host
+DEFAULT_MAX_CONNECTIONS = 8
+
+BIGIP_PACKAGE = 'genie.libs.parser.bigip'
+
+# pages in flight while a paginated collection is read
+DEFAULT_PREFETCH = 2
+
+# resource path -> BIG-IP parser class, loaded on first use
+_bigip_resources = None
+
+
+def bigip_resources():
+    '''Resources read by the BIG-IP parsers
+
+        Returns:
+            `dict` of resource path -> parser class
+    '''
+    global _bigip_resources
+    if _bigip_resources is None:
+        package = importlib.import_module(BIGIP_PACKAGE)
+        resources = {}
+        for module_info in pkgutil.iter_modules(package.__path__):
+            module = importlib.import_module(
+                '{}.{}'.format(BIGIP_PACKAGE, module_info.name))
+            for value in vars(module).values():
+                if inspect.isclass(value) and \
+                        value.__module__ == module.__name__ and \
+                        isinstance(getattr(value, 'cli_command', None), str) \
+                        and hasattr(value, 'rest'):
+                    resources[value.cli_command] = value
+        _bigip_resources = resources
+    return _bigip_resources
+
+
+def resolve_resources(resources):
+    '''Resource paths of parser classes and URL prefixes
+
+        Args:
+            resources (`list`): BIG-IP parser classes or URL prefixes
+
+        Returns:
+            `list` of resource paths, without duplicates, in the given order
+    '''
+    paths = []
+    for resource in resources:
+        if isinstance(resource, str):
+            index = bigip_resources()
+            prefix = resource.rstrip('/')
+            matched = sorted(path for path in index
+                             if path == prefix or
+                             path.startswith(prefix + '/'))
+            paths.extend(matched or [resource])
+        else:
+            paths.append(resource.cli_command)
+    return list(dict.fromkeys(paths))
+
+
+class RestClient(object):
+    '''GET resources from a base URL through a bounded connection pool
+
+        Args:
+            base_url (`str`): scheme, host and port, ex: https://10.1.1.1
+            max_connections (`int`): connections kept in the pool, the
+                                     requests above it wait for a connection
+            timeout (`float`): seconds of each request
+            kwargs (`dict`): attributes of the requests session, ex: auth,
+                             verify, headers
+    '''
+
+    def __init__(self, base_url, max_connections=DEFAULT_MAX_CONNECTIONS,
+                 timeout=30, **kwargs):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1,
+                              pool_maxsize=max_connections, pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        for name, value in kwargs.items():
+            setattr(self.session, name, value)
+
+    def get(self, path):
+        '''GET `path`, raises requests.HTTPError when not ok'''
+        response = self.session.get(self.base_url + path,
+                                    timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _decode(response):
+    '''JSON body of a response, as the rest() of the BIG-IP parsers'''
+    return response.json() or {}
+
+
+def _get_json(get, path):
+    '''Executor side of a blocking get'''
+    return _decode(get(path))
+
+
+def _async_get(device):
+    '''Coroutine function getting resources from `device`, or None'''
+    for name in ('aget', 'get'):
+        get = getattr(device, name, None)
+        if get is not None and inspect.iscoroutinefunction(get):
+            return get
+    return None
+
+
+async def acollect_rest(device, resources,
+                        max_connections=DEFAULT_MAX_CONNECTIONS,
+                        executor=None, errors=None):
+    '''GET REST resources concurrently
+
+        Args:
+            device (`Device` or `RestClient`): device with a get(path)
+            resources (`list`): BIG-IP parser classes or URL prefixes
+            max_connections (`int`): requests in flight
+            executor (`Executor`): executor of the blocking gets and of the
+                                   JSON decoding, a pool of max_connections
+                                   threads when None
+            errors (`dict`): filled with path -> reason of the resources
+                             which are not in the result
+
+        Returns:
+            `dict` of resource path -> decoded JSON, in the resource order
+    '''
+    errors = {} if errors is None else errors
+    paths = resolve_resources(resources)
+    loop = asyncio.get_running_loop()
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_connections)
+    semaphore = asyncio.Semaphore(max_connections)
+    get = _async_get(device)
+
+    async def fetch(path):
+        async with semaphore:
+            if get is not None:
+                response = await get(path)
+                return await loop.run_in_executor(executor, _decode,
+                                                  response)
+            return await loop.run_in_executor(executor, _get_json,
+                                              device.get, path)
+
+    try:
+        collected = await asyncio.gather(*(fetch(path) for path in paths),
+                                         return_exceptions=True)
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False)
+
+    results = {}
+    for path, value in zip(paths, collected):
+        if isinstance(value, Exception):
+            errors[path] = '{}: {}'.format(type(value).__name__, value)
+        else:
+            results[path] = value
+
+    log.info('Collected %d of %d REST resources', len(results), len(paths))
+    return results
+
+
+def collect_rest(device, resources, max_connections=DEFAULT_MAX_CONNECTIONS,
+                 executor=None, errors=None):
+    '''Blocking `acollect_rest`, runs its own event loop
+
+        Args:
+            device (`Device` or `RestClient`): device with a get(path)
+            resources (`list`): BIG-IP parser classes or URL prefixes
+            max_connections (`int`): requests in flight
+            executor (`Executor`): executor of the blocking gets and of the
+                                   JSON decoding
+            errors (`dict`): filled with path -> reason of the resources
+                             which are not in the result
+
+        Returns:
+            `dict` of resource path -> decoded JSON, in the resource order
+    '''
+    return asyncio.run(acollect_rest(device, resources,
+                                     max_connections=max_connections,
+                                     executor=executor, errors=errors))
+
+
+def iter_pages(get, path, limit, offset=1, prefetch=DEFAULT_PREFETCH,
+               key='response'):
+    '''Items of an offset/limit paginated collection
+
+    The pages are requested with ``offset=<offset>&limit=<limit>`` and
+    decoded in worker threads, `prefetch` of them are in flight while the
+    items of the current one are handed out.  The collection ends with the
+    first page holding less than `limit` items.
+
+        Args:
+            get (`callable`): blocking get(path) returning a response
+            path (`str`): collection path
+            limit (`int`): items per page
+            offset (`int`): offset of the first item, DNAC counts from 1
+            prefetch (`int`): pages requested ahead
+            key (`str`): key of the item list in the page body, None when
+                         the body is the list
+
+        Returns:
+            generator of the items, in the collection order
+    '''
+    separator = '&' if '?' in path else '?'
+
+    def fetch(page_offset):
+        body = get('{p}{s}offset={o}&limit={l}'.format(
+            p=path, s=separator, o=page_offset, l=limit)).json()
+        return (body[key] if key is not None else body) or []
+
+    executor = ThreadPoolExecutor(max_workers=max(prefetch, 1))
+    pending = collections.deque()
+    try:
+        for _ in range(max(prefetch, 1)):
+            pending.append(executor.submit(fetch, offset))
+            offset += limit
+        while pending:
+            items = pending.popleft().result()
+            yield from items
+            if len(items) < limit:
+                break
+            pending.append(executor.submit(fetch, offset))
+            offset += limit
+    finally:
+        # the pages past the end are not waited for, cancelled here rather
+        # than with shutdown(cancel_futures=True) which is python 3.9+
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -0,0 +1,354 @@
+'''Longest prefix match index of parsed routing tables
+
+The routing table parsers return nested dicts keyed by prefix string:
+
+    * IOS-XE ``ShowIpRoute``/``ShowIpv6Route``, NX-OS ``ShowIpRoute``/
+      ``ShowIpv6Route``: vrf -> address_family -> routes -> prefix
+    * Junos ``ShowRoute``: route-information -> route-table list -> rt list
+
+Finding the route covering an address in those means parsing every prefix
+string of the table for every query.  `RouteIndex` loads parsed tables once
+into a path compressed binary trie (Patricia) per vrf and address family,
+kept in flat arrays, and answers longest prefix match, covering prefixes and
+subnet enumeration by walking at most one node per prefix length:
+
+    >>> index = RouteIndex()
+    >>> index.add(ShowIpRoute(device=device).parse())
+    >>> index.lookup('10.1.2.3')
+    ('10.1.0.0/16', Route(source_protocol='ospf', next_hops=(...)))
+    >>> index.covering('10.1.2.0/24', vrf='red')
+    >>> list(index.subnets('10.0.0.0/8'))
+
+The routes are interned: the routes sharing their protocol and next-hops, the
+usual case of a full BGP table, hold the same `Route` object.
+'''
+
+# python
+import socket
+import logging
+import ipaddress
+import collections
+from array import array
+
+log = logging.getLogger(__name__)
+
+DEFAULT_VRF = 'default'
+
+NextHop = collections.namedtuple('NextHop', ['next_hop', 'outgoing_interface'])
+Route = collections.namedtuple('Route', ['source_protocol', 'next_hops'])
+
+
+class PrefixTree(object):
+    '''Patricia trie of the prefixes of one address family
+
+    Node `n` is the prefix ``keys[n]/lengths[n]``, its children are
+    ``zeros[n]`` and ``ones[n]`` (-1 when missing), ``routes[n]`` is the
+    index of its route in `values` or -1 for the nodes only joining two
+    branches.  Node 0 is the root, 0/0.
+
+        Args:
+            bits (`int`): address width, 32 or 128
+    '''
+
+    def __init__(self, bits):
+        self.bits = bits
+        self.keys = [0]
+        self.lengths = array('B', [0])
+        self.zeros = array('i', [-1])
+        self.ones = array('i', [-1])
+        self.routes = array('i', [-1])
+        self.values = []
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _node(self, key, length, route=-1):
+        self.keys.append(key)
+        self.lengths.append(length)
+        self.zeros.append(-1)
+        self.ones.append(-1)
+        self.routes.append(route)
+        return len(self.keys) - 1
+
+    def _bit(self, key, position):
+        return (key >> (self.bits - 1 - position)) & 1
+
+    def _link(self, parent, child):
+        if self._bit(self.keys[child], self.lengths[parent]):
+            self.ones[parent] = child
+        else:
+            self.zeros[parent] = child
+
+    def _set(self, node, value):
+        if self.routes[node] < 0:
+            self.size += 1
+            self.routes[node] = len(self.values)
+            self.values.append(value)
+        else:
+            self.values[self.routes[node]] = value
+
+    def insert(self, key, length, value):
+        '''Add or replace the prefix key/length, `key` masked to `length`'''
+        bits, keys, lengths = self.bits, self.keys, self.lengths
+        zeros, ones = self.zeros, self.ones
+        node = 0
+        while True:
+            node_length = lengths[node]
+            if node_length == length:
+                self._set(node, value)
+                return
+            if (key >> (bits - 1 - node_length)) & 1:
+                child = ones[node]
+            else:
+                child = zeros[node]
+            if child < 0:
+                leaf = self._node(key, length)
+                self._set(leaf, value)
+                self._link(node, leaf)
+                return
+
+            child_length = lengths[child]
+            common = bits - (key ^ keys[child]).bit_length()
+            if common >= child_length and length >= child_length:
+                node = child
+                continue
+            common = min(common, length, child_length)
+
+            if common == length:
+                # the new prefix sits between node and child
+                middle = self._node(key, length)
+                self._set(middle, value)
+            else:
+                # the new prefix and child branch off below a joint node
+                joint = key >> (bits - common) << (bits - common)
+                middle = self._node(joint, common)
+                leaf = self._node(key, length)
+                self._set(leaf, value)
+                self._link(middle, leaf)
+            self._link(middle, child)
+            self._link(node, middle)
+            return
+
+    def _matches(self, node, key):
+        shift = self.bits - self.lengths[node]
+        return (key ^ self.keys[node]) >> shift == 0
+
+    def covering(self, key, length):
+        '''Nodes holding a route whose prefix contains key/length, shortest
+        first'''
+        bits, keys, lengths = self.bits, self.keys, self.lengths
+        zeros, ones, routes = self.zeros, self.ones, self.routes
+        found = []
+        node = 0
+        while node >= 0:
+            node_length = lengths[node]
+            if node_length > length or \
+                    (key ^ keys[node]) >> (bits - node_length):
+                break
+            if routes[node] >= 0:
+                found.append(node)
+            if node_length == length:
+                break
+            if (key >> (bits - 1 - node_length)) & 1:
+                node = ones[node]
+            else:
+                node = zeros[node]
+        return found
+
+    def within(self, key, length):
+        '''Nodes holding a route whose prefix is inside key/length'''
+        node = 0
+        while node >= 0 and self.lengths[node] < length:
+            if not self._matches(node, key):
+                return
+            if self._bit(key, self.lengths[node]):
+                node = self.ones[node]
+            else:
+                node = self.zeros[node]
+        if node < 0:
+            return
+        # the first node at or below length must be inside key/length
+        shift = self.bits - length
+        if (self.keys[node] ^ key) >> shift:
+            return
+
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if self.routes[node] >= 0:
+                yield node
+            # zeros first, the subnets come out in address order
+            if self.ones[node] >= 0:
+                stack.append(self.ones[node])
+            if self.zeros[node] >= 0:
+                stack.append(self.zeros[node])
+
+    def prefix(self, node):
+        '''Prefix string of a node'''
+        if self.bits == 32:
+            address = ipaddress.IPv4Address(self.keys[node])
+        else:
+            address = ipaddress.IPv6Address(self.keys[node])
+        return '{}/{}'.format(address, self.lengths[node])
+
+    def value(self, node):
+        return self.values[self.routes[node]]
+
+
+def _network(prefix):
+    '''(key, length, bits) of a prefix or address string, the key masked to
+    the length'''
+    address, _, length = prefix.partition('/')
+    family, bits = (socket.AF_INET6, 128) if ':' in address \
+        else (socket.AF_INET, 32)
+    try:
+        key = int.from_bytes(socket.inet_pton(family, address), 'big')
+    except OSError:
+        raise ValueError('{!r} is not an ip prefix'.format(prefix)) from None
+    length = int(length) if length else bits
+    if not 0 <= length <= bits:
+        raise ValueError('{!r} is not an ip prefix'.format(prefix))
+    return key >> (bits - length) << (bits - length), length, bits
+
+
+def _table_vrf(table_name):
+    '''Vrf of a Junos routing table, None for the non ip unicast tables
+
+        inet.0 -> default, VRF1.inet6.0 -> VRF1, mpls.0 -> None
+    '''
+    parts = table_name.split('.')
+    if len(parts) < 2 or parts[-1] != '0' or \
+            parts[-2] not in ('inet', 'inet6'):
+        return None
+    return '.'.join(parts[:-2]) or DEFAULT_VRF
+
+
+class RouteIndex(object):
+    '''Longest prefix match index of parsed routing tables, per vrf'''
+
+    def __init__(self):
+        # (vrf, bits) -> PrefixTree
+        self.trees = {}
+        # interned next-hops and routes, shared by the prefixes
+        self._next_hops = {}
+        self._routes = {}
+
+    def __len__(self):
+        return sum(len(tree) for tree in self.trees.values())
+
+    @property
+    def vrfs(self):
+        return sorted({vrf for vrf, _ in self.trees})
+
+    def _intern(self, source_protocol, next_hops):
+        next_hops = tuple(self._next_hops.setdefault(next_hop, next_hop)
+                          for next_hop in next_hops)
+        route = Route(source_protocol, next_hops)
+        return self._routes.setdefault(route, route)
+
+    def insert(self, prefix, source_protocol=None, next_hops=(),
+               vrf=DEFAULT_VRF):
+        '''Add or replace a route
+
+            Args:
+                prefix (`str`): ex: 10.1.0.0/16, 2001:db8::/32
+                source_protocol (`str`): protocol of the route
+                next_hops (`list`): NextHop or (next-hop, interface) tuples
+                vrf (`str`): vrf of the route
+        '''
+        key, length, bits = _network(prefix)
+        tree = self.trees.get((vrf, bits))
+        if tree is None:
+            tree = self.trees[(vrf, bits)] = PrefixTree(bits)
+        tree.insert(key, length, self._intern(
+            source_protocol, (NextHop(*next_hop) for next_hop in next_hops)))
+
+    def add(self, parsed):
+        '''Load a parsed routing table
+
+            Args:
+                parsed (`dict`): result of an IOS-XE/NX-OS ShowIpRoute,
+                                 ShowIpv6Route or Junos ShowRoute
+
+            Returns:
+                self
+        '''
+        if 'route-information' in parsed:
+            self._add_junos(parsed['route-information'])
+        else:
+            self._add_vrfs(parsed.get('vrf', {}))
+        return self
+
+    def _add_vrfs(self, vrfs):
+        for vrf, vrf_dict in vrfs.items():
+            for af_dict in vrf_dict.get('address_family', {}).values():
+                for prefix, route in af_dict.get('routes', {}).items():
+                    next_hops = []
+                    next_hop = route.get('next_hop', {})
+                    for path in next_hop.get('next_hop_list', {}).values():
+                        next_hops.append((path.get('next_hop'),
+                                          path.get('outgoing_interface')))
+                    for interface in next_hop.get('outgoing_interface', {}):
+                        next_hops.append((None, interface))
+                    self.insert(prefix, route.get('source_protocol'),
+                                next_hops, vrf=vrf)
+
+    def _add_junos(self, route_information):
+        for table in route_information.get('route-table', []):
+            vrf = _table_vrf(table.get('table-name', ''))
+            if vrf is None:
+                continue
+            for rt in table.get('rt', []):
+                prefix = rt.get('rt-destination')
+                if not prefix:
+                    continue
+                entry = rt.get('rt-entry', {})
+                next_hops = [(nh.get('to'), nh.get('via') or
+                              nh.get('nh-local-interface'))
+                             for nh in entry.get('nh', [])]
+                protocol = entry.get('protocol-name')
+                self.insert(prefix, protocol.lower() if protocol else None,
+                            next_hops, vrf=vrf)
+
+    def _tree(self, address, vrf):
+        key, length, bits = _network(address)
+        return self.trees.get((vrf, bits)), key, length
+
+    def lookup(self, address, vrf=DEFAULT_VRF):
+        '''Longest prefix match of an address
+
+            Returns:
+                (prefix, Route) tuple, None when no route holds the address
+        '''
+        tree, key, length = self._tree(address, vrf)
+        if tree is None:
+            return None
+        found = tree.covering(key, length)
+        if not found:
+            return None
+        return tree.prefix(found[-1]), tree.value(found[-1])
+
+    def covering(self, prefix, vrf=DEFAULT_VRF):
+        '''Routes whose prefix contains `prefix`, itself included
+
+            Returns:
+                `list` of (prefix, Route) tuples, shortest prefix first
+        '''
+        tree, key, length = self._tree(prefix, vrf)
+        if tree is None:
+            return []
+        return [(tree.prefix(node), tree.value(node))
+                for node in tree.covering(key, length)]
+
+    def subnets(self, prefix, vrf=DEFAULT_VRF):
+        '''Routes whose prefix is inside `prefix`, itself included
+
+            Returns:
+                generator of (prefix, Route) tuples, in address order
+        '''
+        tree, key, length = self._tree(prefix, vrf)
+        if tree is None:
+            return
+        for node in tree.within(key, length):
+            yield tree.prefix(node), tree.value(node)
@@ -0,0 +1,299 @@
+'''Streaming serialization of parsed outputs
+
+``json.dumps`` of a full routing table builds the whole encoded string, a
+few hundred MB, before a byte of it is written, and
+`genie.libs.parser.utils.common.format_output` rebuilds and sorts every
+level in Python.  `dump` writes a parsed output in blocks instead, each one
+encoded by the C encoder of ``json`` or ``marshal``:
+
+    >>> with open('routes.json', 'w') as fp:
+    ...     dump(parsed, fp, schema=ShowIpRoute)
+    >>> with open('routes.bin', 'wb') as fp:
+    ...     dump(parsed, fp, schema=ShowIpRoute, binary=True)
+    >>> with open('routes.bin', 'rb') as fp:
+    ...     load(fp) == parsed
+    True
+
+The schema of the parser tells where to cut.  The levels holding no
+``Any()`` level are encoded whole.  The other levels are walked down, and a
+table of more than `batch` entries, such as the routes of a vrf, is encoded
+`batch` entries at a time.  Without a schema, any level holding a dict is
+walked down.
+
+The json output is compact json, read back by ``json.load``.  The binary
+output is a header followed by frames, each one a length and the marshal of
+the keys leading to a block and of the block.  A marshal frame writes the
+strings it holds more than once, the keys of the entries mostly, once and
+refers to them after, it carries its own key table.  The binary output keeps
+the integer keys, json turns them into strings.  It is read back by `load`
+in the Python version which wrote it or a later one, and like any marshal
+data must only be read from a trusted source.
+'''
+
+# python
+import io
+import json
+import struct
+import logging
+import marshal
+from itertools import islice
+from collections.abc import Mapping
+
+from genie.metaparser.util.schemaengine import Any
+
+from .records import _schema_key, to_dicts
+
+log = logging.getLogger(__name__)
+
+# entries of a table encoded at a time
+DEFAULT_BATCH = 256
+
+MAGIC = b'\x93GPB'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<4sBB')
+_LENGTH = struct.Struct('<I')
+
+_OPEN, _BLOCK, _CLOSE = range(3)
+
+
+def _mapping(value):
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError('Object of type {} is not JSON serializable'.format(
+        value.__class__.__name__))
+
+
+# the C encoder, one call per block
+_encode = json.JSONEncoder(separators=(',', ':'), check_circular=False,
+                           default=_mapping).encode
+
+# id of a schema level -> (level, (literal key -> level, level of Any()))
+_levels = {}
+# id of a schema level -> (level, whether it holds an Any() level)
+_nested = {}
+
+
+def _schema(schema):
+    '''The schema dict of a parser class, a parser or a schema'''
+    if schema is None or isinstance(schema, dict):
+        return schema
+    return getattr(schema, 'schema', None)
+
+
+def _children(level):
+    try:
+        return _levels[id(level)][1]
+    except KeyError:
+        pass
+    literals, any_level = {}, None
+    for key, value in level.items():
+        name = _schema_key(key)
+        if name is None:
+            any_level = value
+        else:
+            literals[name] = value
+    # the level is kept along, its id is not reused
+    _levels[id(level)] = level, (literals, any_level)
+    return literals, any_level
+
+
+def _is_nested(level):
+    '''Whether a schema level holds an ``Any()`` level'''
+    try:
+        return _nested[id(level)][1]
+    except KeyError:
+        pass
+    nested = any(isinstance(key, Any) or
+                 isinstance(value, dict) and _is_nested(value)
+                 for key, value in level.items())
+    _nested[id(level)] = level, nested
+    return nested
+
+
+def _walk(node, level, batch):
+    '''Events of the blocks of a parsed level
+
+        Args:
+            node (`Mapping`): parsed level
+            level (`dict`): its schema, None when unknown
+            batch (`int`): entries of a block
+
+        Yields:
+            (_OPEN, key) and (_CLOSE, None) around the events of a walked
+            down child, (_BLOCK, dict) for consecutive children encoded
+            whole
+    '''
+    if len(node) > batch:
+        # a table, its entries are small
+        items = iter(node.items())
+        block = dict(islice(items, batch))
+        while block:
+            yield _BLOCK, block
+            block = dict(islice(items, batch))
+        return
+    pending = {}
+    literals = any_level = None
+    if level is not None:
+        literals, any_level = _children(level)
+    for key, value in node.items():
+        walked = False
+        if value and isinstance(value, Mapping):
+            if level is None:
+                child = None
+                walked = any(isinstance(item, Mapping)
+                             for item in value.values())
+            else:
+                child = literals.get(key, any_level)
+                # a key missing from the schema is walked down as unknown
+                walked = child is None or \
+                    isinstance(child, dict) and _is_nested(child)
+        if walked:
+            if pending:
+                yield _BLOCK, pending
+                pending = {}
+            yield _OPEN, key
+            yield from _walk(value, child if isinstance(child, dict)
+                             else None, batch)
+            yield _CLOSE, None
+        else:
+            pending[key] = value
+    if pending:
+        yield _BLOCK, pending
+
+
+def _json_key(key):
+    # the key as json.dumps writes it, integer keys become strings
+    return _encode({key: 0})[1:-2]
+
+
+def iter_json(parsed, schema=None, batch=DEFAULT_BATCH):
+    '''Compact json of a parsed output, in chunks
+
+        Args:
+            parsed (`dict`): parsed output
+            schema (`dict`): schema of the parser, or the parser class
+            batch (`int`): entries of a table encoded at a time
+
+        Yields:
+            `str` chunks of the json document
+    '''
+    first = True
+    yield '{'
+    for event, value in _walk(parsed, _schema(schema), batch):
+        if event == _BLOCK:
+            text = _encode(value)[1:-1]
+            yield text if first else ',' + text
+            first = False
+        elif event == _OPEN:
+            yield ('{}{{' if first else ',{}{{').format(_json_key(value))
+            first = True
+        else:
+            yield '}'
+            first = False
+    yield '}'
+
+
+def iter_frames(parsed, schema=None, batch=DEFAULT_BATCH):
+    '''Binary framing of a parsed output, read back by `load`
+
+        Args:
+            parsed (`dict`): parsed output
+            schema (`dict`): schema of the parser, or the parser class
+            batch (`int`): entries of a table encoded at a time
+
+        Yields:
+            `bytes`, the header then the frames
+    '''
+    yield _HEADER.pack(MAGIC, FORMAT_VERSION, marshal.version)
+    path = []
+    for event, value in _walk(parsed, _schema(schema), batch):
+        if event == _BLOCK:
+            try:
+                frame = marshal.dumps((tuple(path), value))
+            except ValueError:
+                # records, marshal only writes the built-in types
+                frame = marshal.dumps((tuple(path), to_dicts(value)))
+            yield _LENGTH.pack(len(frame)) + frame
+        elif event == _OPEN:
+            path.append(value)
+        else:
+            path.pop()
+
+
+def dump(parsed, fp, schema=None, binary=False, batch=DEFAULT_BATCH):
+    '''Write a parsed output to a file
+
+        Args:
+            parsed (`dict`): parsed output
+            fp (`file`): text file for json, binary file for the binary
+                         framing
+            schema (`dict`): schema of the parser, or the parser class
+            binary (`bool`): write the binary framing rather than json
+            batch (`int`): entries of a table encoded at a time
+
+        Returns:
+            `int`, characters or bytes written
+    '''
+    chunks = iter_frames if binary else iter_json
+    written = 0
+    write = fp.write
+    for chunk in chunks(parsed, schema, batch):
+        write(chunk)
+        written += len(chunk)
+    return written
+
+
+def dumps(parsed, schema=None, binary=False, batch=DEFAULT_BATCH):
+    '''The json `str` or binary `bytes` of a parsed output'''
+    chunks = iter_frames if binary else iter_json
+    return (b'' if binary else '').join(chunks(parsed, schema, batch))
+
+
+def load(fp):
+    '''Read a parsed output written by `dump`
+
+        Args:
+            fp (`file`): binary file holding the binary framing or json
+
+        Returns:
+            `dict`, the parsed output
+
+        Raises:
+            ValueError: unknown format version or truncated frame
+    '''
+    read = fp.read
+    header = read(_HEADER.size)
+    if header[:len(MAGIC)] != MAGIC:
+        return json.loads(header + read())
+    _, version, _ = _HEADER.unpack(header)
+    if version != FORMAT_VERSION:
+        raise ValueError('Unknown format version {}'.format(version))
+    root = {}
+    unpack, loads = _LENGTH.unpack, marshal.loads
+    while True:
+        length = read(_LENGTH.size)
+        if not length:
+            return root
+        if len(length) != _LENGTH.size:
+            raise ValueError('Truncated frame length')
+        size, = unpack(length)
+        frame = read(size)
+        if len(frame) != size:
+            raise ValueError('Truncated frame of {} bytes, {} read'.format(
+                size, len(frame)))
+        path, block = loads(frame)
+        node = root
+        for key in path:
+            try:
+                node = node[key]
+            except KeyError:
+                node[key] = node = {}
+        node.update(block)
+
+
+def loads(data):
+    '''A parsed output from the `bytes` or json `str` written by `dumps`'''
+    if isinstance(data, str):
+        return json.loads(data)
+    return load(io.BytesIO(data))
@@ -0,0 +1,187 @@
+'''Parse session, memo of sub-command results during a polling cycle
+
+Composite parsers fetch supporting data next to their own command: IOS-XE
+``ShowBgpSummarySuperParser`` parses ``show vrf``, the BGP neighbor parsers
+execute ``show bgp all neighbors | i BGP neighbor``.  Polling several of
+those commands back to back fetches and parses the same supporting data
+again for every command.
+
+A `ParseSession` attached to the device memoizes, for a limited time:
+
+    * the outputs of the sub-commands executed through
+      `subcommands.execute_commands`
+    * the results of the sub-parsers run through `sub_parse`, keyed by
+      (parser class, kwargs, digest of the output handed to the parser)
+
+    >>> with ParseSession(device, ttl=60):
+    ...     device.parse('show ip bgp all summary')
+    ...     device.parse('show bgp vpnv4 unicast all summary')
+    ...     device.parse('show ip bgp vpnv4 rd 100:1 summary')
+
+Composite parsers consult the session of their device automatically, without
+a session nothing is memoized.  The command of the parsed show command itself
+is never memoized, only the supporting data.
+'''
+
+# python
+import copy
+import time
+import hashlib
+import logging
+import threading
+
+log = logging.getLogger(__name__)
+
+# attribute of the device holding its active session
+SESSION_ATTRIBUTE = 'parse_session'
+
+# seconds a memoized result stays valid, about one polling cycle
+DEFAULT_TTL = 60
+
+
+class ParseSession(object):
+    '''TTL bounded memo of sub-command outputs and sub-parser results
+
+        Args:
+            device (`Device`): device the session is attached to on enter
+            ttl (`float`): seconds an entry stays valid, None never expires
+    '''
+
+    def __init__(self, device=None, ttl=DEFAULT_TTL):
+        self.device = device
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._outputs = {}
+        self._results = {}
+        self._lock = threading.Lock()
+        self._previous = None
+
+    def __enter__(self):
+        if self.device is not None:
+            self._previous = get_session(self.device)
+            setattr(self.device, SESSION_ATTRIBUTE, self)
+        return self
+
+    def __exit__(self, *exc):
+        if self.device is not None:
+            setattr(self.device, SESSION_ATTRIBUTE, self._previous)
+            self._previous = None
+        self.clear()
+
+    def clear(self):
+        '''Drop every memoized entry'''
+        with self._lock:
+            self._outputs.clear()
+            self._results.clear()
+
+    def _get(self, memo, key):
+        with self._lock:
+            entry = memo.get(key)
+            if entry is not None and (self.ttl is None or
+                                      time.monotonic() - entry[0] < self.ttl):
+                self.hits += 1
+                return entry
+            memo.pop(key, None)
+            self.misses += 1
+            return None
+
+    def _set(self, memo, key, value):
+        with self._lock:
+            memo[key] = (time.monotonic(), value)
+
+    def get_output(self, command):
+        '''Memoized output of `command`, None when missing or expired'''
+        entry = self._get(self._outputs, command)
+        return None if entry is None else entry[1]
+
+    def set_output(self, command, output):
+        '''Memoize the output of `command`'''
+        self._set(self._outputs, command, output)
+
+    def memoize(self, key, factory):
+        '''Memoized result of ``factory()`` under `key`'''
+        entry = self._get(self._results, key)
+        if entry is not None:
+            return entry[1]
+        value = factory()
+        self._set(self._results, key, value)
+        return value
+
+    def parse(self, parser_class, device, output=None, **kwargs):
+        '''Result of ``parser_class(device=device).parse(**kwargs)``
+
+        The result, or the exception raised by the parser, is memoized by
+        (parser class, kwargs, digest of `output`).  An already collected
+        `output` is handed to the parser on a miss, the same output parsed
+        again is a hit and another one a miss.  A copy is returned so the
+        caller may modify it.
+        '''
+        key = (parser_class, _freeze(kwargs), _digest(output))
+        entry = self._get(self._results, key)
+        if entry is None:
+            if output is not None:
+                kwargs['output'] = output
+            try:
+                result = parser_class(device=device).parse(**kwargs)
+            except Exception as e:
+                self._set(self._results, key, (False, e))
+                raise
+            self._set(self._results, key, (True, result))
+        else:
+            ok, result = entry[1]
+            if not ok:
+                raise result
+        return copy.deepcopy(result)
+
+
+def _digest(output):
+    '''Digest of an output handed to a sub-parser, None without one'''
+    if output is None:
+        return None
+    if not isinstance(output, (bytes, str)):
+        output = repr(output)
+    if isinstance(output, str):
+        output = output.encode('utf-8', 'surrogatepass')
+    return hashlib.blake2b(output, digest_size=16).digest()
+
+
+def _freeze(value):
+    '''Hashable form of parser kwargs'''
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item))
+                            for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def get_session(device):
+    '''Active `ParseSession` of `device`, or None'''
+    session = getattr(device, SESSION_ATTRIBUTE, None)
+    # any attribute of a Mock device is a Mock
+    return session if isinstance(session, ParseSession) else None
+
+
+def sub_parse(device, parser_class, output=None, **kwargs):
+    '''Run a sub-parser of a composite parser, through the device session
+
+        Args:
+            device (`Device`): device of the composite parser
+            parser_class (`MetaParser`): class of the sub-parser
+            output (`str`): output already collected for the sub-parser
+            kwargs (`dict`): arguments of the sub-parser parse()
+
+        Returns:
+            parsed `dict`, memoized when the device has an active session
+
+        example:
+
+            >>> show_vrf_output = sub_parse(self.device, ShowVrf)
+    '''
+    session = get_session(device)
+    if session is None:
+        if output is not None:
+            kwargs['output'] = output
+        return parser_class(device=device).parse(**kwargs)
+    return session.parse(parser_class, device, output=output, **kwargs)
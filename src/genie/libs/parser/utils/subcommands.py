@@ -0,0 +1,150 @@
+'''Concurrent execution of the sub-commands of composite parsers
+
+Composite parsers run more than one command from their `cli()`, for example
+IOS-XE ``ShowBgpSummarySuperParser`` collects ``show vrf`` and the
+``show run | sec address-family ... vrf`` sections next to the summary
+itself.  Executed one after the other, every command costs a full round trip
+to the device.
+
+Such parsers declare the commands they need up front and collect them in one
+go:
+
+    >>> outputs = execute_commands(self.device, ['show vrf',
+    ...                                          'show run | sec vrf'])
+    >>> vrfs = ShowVrf(device=self.device).parse(output=outputs['show vrf'])
+
+Commands are executed concurrently when the device can serve them at once:
+
+    * devices with a ``sub_command_workers`` attribute, set by the user when
+      the device is connected through a connection pool
+      (``device.connect(pool_size=8)``; ``device.sub_command_workers = 8``)
+    * async devices driven through `async_parse`, their commands are awaited
+      on the event loop
+
+Any other device executes the commands serially, in the declared order, a
+single cli session can not run two commands at the same time.
+
+Outputs memoized by the `session.ParseSession` of the device are not
+executed again, show running-config views are rendered from the config tree
+of the session (see `config_tree`).
+'''
+
+# python
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from .session import get_session
+from .config_tree import render_config
+
+log = logging.getLogger(__name__)
+
+# attribute of a device giving the number of commands it runs at once
+WORKERS_ATTRIBUTE = 'sub_command_workers'
+
+
+def sub_command_workers(device, max_workers=None):
+    '''Number of sub-commands to execute at once on `device`
+
+        Args:
+            device (`Device`): device executing the commands
+            max_workers (`int`): explicit number of workers, wins over the
+                                 device attribute
+
+        Returns:
+            `int`, 1 when the commands must be executed serially
+    '''
+    if max_workers:
+        return max_workers
+    workers = getattr(device, WORKERS_ATTRIBUTE, None)
+    # the attribute of a Mock device is a Mock, only an int is a setting
+    if isinstance(workers, int) and not isinstance(workers, bool) \
+            and workers > 0:
+        return workers
+    return 1
+
+
+def run_concurrently(device, calls, max_workers=None):
+    '''Run callables using `device`, concurrently when it allows it
+
+        Args:
+            device (`Device`): device used by the callables
+            calls (`list`): callables without arguments
+            max_workers (`int`): number of threads, `sub_command_workers`
+                                 of the device when None
+
+        Returns:
+            `list` of the results, in the order of `calls`. The first
+            exception raised by a callable is raised again.
+    '''
+    calls = list(calls)
+    workers = min(sub_command_workers(device, max_workers), len(calls))
+    if workers <= 1:
+        return [call() for call in calls]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
+
+def execute_commands(device, commands, max_workers=None, **kwargs):
+    '''Execute the sub-commands of a composite parser
+
+        Args:
+            device (`Device`): device to execute the commands on
+            commands (`list`): commands to execute, duplicates are executed
+                               once
+            max_workers (`int`): number of commands in flight, see
+                                 `sub_command_workers`
+            kwargs (`dict`): extra arguments of execute (timeout, ...)
+
+        Returns:
+            `dict` of command -> output, in the order of `commands`
+
+        example:
+
+            >>> outputs = execute_commands(device, ['show vrf', 'show run'])
+            >>> outputs['show vrf']
+    '''
+    commands = list(dict.fromkeys(commands))
+    session = get_session(device)
+    outputs = {}
+    if session is not None:
+        for command in commands:
+            output = session.get_output(command)
+            if output is None:
+                # show running-config views come from the session config
+                output = render_config(device, command)
+                if output is not None:
+                    session.set_output(command, output)
+            if output is not None:
+                outputs[command] = output
+    missing = [command for command in commands if command not in outputs]
+
+    if missing:
+        log.debug('Executing %d sub-commands with %d workers', len(missing),
+                  sub_command_workers(device, max_workers))
+        executed = run_concurrently(
+            device,
+            [lambda command=command: device.execute(command, **kwargs)
+             for command in missing],
+            max_workers=max_workers)
+        for command, output in zip(missing, executed):
+            outputs[command] = output
+            if session is not None:
+                session.set_output(command, output)
+
+    return {command: outputs[command] for command in commands}
+
+
+def execute_command(device, command, **kwargs):
+    '''Execute a single sub-command, memoized by the device session
+
+        Args:
+            device (`Device`): device to execute the command on
+            command (`str`): command to execute
+            kwargs (`dict`): extra arguments of execute
+
+        Returns:
+            `str` output of the command
+    '''
+    return execute_commands(device, [command], **kwargs)[command]
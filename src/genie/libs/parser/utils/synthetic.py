@@ -0,0 +1,615 @@
+'''Synthetic large-output generators used for scaling tests
+
+The golden fixtures under ``<os>/tests/<Class>/cli/equal`` are small, most of
+them only a few dozen lines.  The generators below produce schema-valid
+outputs of an arbitrary size for the high-volume commands.  Every line
+template is lifted from an existing golden output so the generated text goes
+through the same regexes as real device output.
+
+Each generator exists in two flavours:
+
+    * ``iter_<name>(size, seed=0)`` yields the output line by line, so very
+      large outputs can be streamed to a file.
+    * ``<name>(size, seed=0)`` returns the whole output as one string, ready
+      to be passed as ``parser.parse(output=...)``.
+
+The same ``seed`` always produces the same output.
+'''
+
+# python
+import json
+import random
+import ipaddress
+import importlib
+
+# iosxe/tests/ShowIpRoute/cli/equal/golden_output1_output.txt
+IOSXE_ROUTE_HEADER = '''\
+Codes: L - local, C - connected, S - static, R - RIP, M - mobile, B - BGP
+       D - EIGRP, EX - EIGRP external, O - OSPF, IA - OSPF inter area
+       N1 - OSPF NSSA external type 1, N2 - OSPF NSSA external type 2
+       E1 - OSPF external type 1, E2 - OSPF external type 2
+       i - IS-IS, su - IS-IS summary, L1 - IS-IS level-1, L2 - IS-IS level-2
+       ia - IS-IS inter area, * - candidate default, U - per-user static route
+       o - ODR, P - periodic downloaded static route, H - NHRP, l - LISP
+       a - application route
+       + - replicated route, % - next hop override
+
+Gateway of last resort is not set
+'''
+
+# nxos/tests/ShowIpRoute/cli/equal/golden_output12_output.txt
+NXOS_ROUTE_HEADER = '''\
+IP Route Table for VRF "{vrf}"
+'*' denotes best ucast next-hop
+'**' denotes best mcast next-hop
+'[x/y]' denotes [preference/metric]
+'%<string>' in via output denotes VRF <string>
+'''
+
+# iosxe/tests/ShowInterfaces/cli/equal/golden_interface_output_output.txt
+IOSXE_INTERFACE_TEMPLATE = '''\
+{name} is {status}, line protocol is {status}
+  Hardware is CSR vNIC, address is {mac} (bia {mac})
+  Internet address is {address}/24
+  MTU 1500 bytes, BW 1000000 Kbit/sec, DLY 10 usec,
+     reliability 255/255, txload 1/255, rxload 1/255
+  Encapsulation ARPA, loopback not set
+  Keepalive set (10 sec)
+  Full Duplex, 1000Mbps, link type is auto, media type is Virtual
+  output flow-control is unsupported, input flow-control is unsupported
+  ARP type: ARPA, ARP Timeout 04:00:00
+  Last input 00:00:02, output 00:00:25, output hang never
+  Last clearing of "show interface" counters never
+  Input queue: 0/375/0/0 (size/max/drops/flushes); Total output drops: 0
+  Queueing strategy: fifo
+  Output queue: 0/40 (size/max)
+  5 minute input rate {in_rate} bits/sec, {in_pps} packets/sec
+  5 minute output rate {out_rate} bits/sec, {out_pps} packets/sec
+     {in_pkts} packets input, {in_octets} bytes, 0 no buffer
+     Received 0 broadcasts (0 IP multicasts)
+     0 runts, 0 giants, 0 throttles
+     {in_errors} input errors, {in_crc} CRC, 0 frame, 0 overrun, 0 ignored
+     0 watchdog, 0 multicast, 0 pause input
+     {out_pkts} packets output, {out_octets} bytes, 0 underruns
+     0 output errors, 0 collisions, 1 interface resets
+     0 unknown protocol drops
+     0 babbles, 0 late collision, 0 deferred
+     0 lost carrier, 0 no carrier, 0 pause output
+     0 output buffer failures, 0 output buffers swapped out'''
+
+# nxos/tests/ShowInterface/cli/equal/golden9_output.txt
+NXOS_INTERFACE_TEMPLATE = '''\
+{name} is {state}
+admin state is up, Dedicated Interface
+  Belongs to Po{bundle}
+  Hardware: 100/1000/10000/25000 Ethernet, address: {mac} (bia {mac})
+  Description: {description}
+  MTU 9216 bytes, BW 10000000 Kbit , DLY 10 usec
+  reliability 255/255, txload 1/255, rxload 1/255
+  Encapsulation ARPA, medium is broadcast
+  Port mode is trunk
+  full-duplex, 10 Gb/s, media type is 10G
+  Beacon is turned off
+  Auto-Negotiation is turned on  FEC mode is Auto
+  Input flow-control is off, output flow-control is off
+  Auto-mdix is turned off
+  Rate mode is dedicated
+  Switchport monitor is off
+  EtherType is 0x8100
+  EEE (efficient-ethernet) : n/a
+    admin fec state is auto, oper fec state is off
+  Last link flapped {flapped}
+  Last clearing of "show interface" counters never
+  {resets} interface resets
+  Load-Interval #1: 30 seconds
+    30 seconds input rate {in_rate} bits/sec, {in_pps} packets/sec
+    30 seconds output rate {out_rate} bits/sec, {out_pps} packets/sec
+    input rate 1.02 Kbps, 0 pps; output rate 15.58 Kbps, 23 pps
+  Load-Interval #2: 5 minute (300 seconds)
+    300 seconds input rate {in_rate} bits/sec, {in_pps} packets/sec
+    300 seconds output rate {out_rate} bits/sec, {out_pps} packets/sec
+    input rate 1.00 Kbps, 0 pps; output rate 15.19 Kbps, 22 pps
+  RX
+    {in_ucast} unicast packets  {in_mcast} multicast packets  {in_bcast} broadcast packets
+    {in_pkts} input packets  {in_octets} bytes
+    0 jumbo packets  0 storm suppression bytes
+    0 runts  0 giants  {in_crc} CRC  0 no buffer
+    {in_errors} input error  0 short frame  0 overrun   0 underrun  0 ignored
+    0 watchdog  0 bad etype drop  0 bad proto drop  0 if down drop
+    0 input with dribble  {in_discard} input discard
+    0 Rx pause
+  TX
+    {out_ucast} unicast packets  {out_mcast} multicast packets  {out_bcast} broadcast packets
+    {out_pkts} output packets  {out_octets} bytes
+    0 jumbo packets
+    0 output error  0 collision  0 deferred  0 late collision
+    0 lost carrier  0 no carrier  0 babble  {out_discard} output discard
+    0 Tx pause'''
+
+# iosxe/tests/ShowLogging/cli/equal/golden_output_1_output.txt
+IOSXE_LOGGING_HEADER = '''\
+Syslog logging: enabled (0 messages dropped, 0 messages rate-limited, 0 flushes, 0 overruns, xml disabled, filtering disabled)
+
+No Active Message Discriminator.
+
+No Inactive Message Discriminator.
+
+    Console logging: disabled
+    Monitor logging: disabled
+    Buffer logging:  level debugging, {lines} messages logged, xml disabled,
+                    filtering disabled
+    Exception Logging: size (4096 bytes)
+    Count and timestamp logging messages: disabled
+    Persistent logging: disabled
+
+No active filter modules.
+
+    Trap logging: level informational, {lines} message lines logged
+        Logging Source-Interface:       VRF Name:
+
+Log Buffer ({buffer} bytes):
+'''
+
+IOSXE_LOGGING_MESSAGES = (
+    '%IP-4-DUPADDR: Duplicate address {ip} on {intf}, sourced by {mac}',
+    '%SYS-5-CONFIG_I: Configured from console by cisco on vty0 ({ip})',
+    '%LINK-3-UPDOWN: Interface {intf}, changed state to up',
+    '%LINEPROTO-5-UPDOWN: Line protocol on Interface {intf}, changed state to down',
+    '%BGP-5-ADJCHANGE: neighbor {ip} Up',
+    '%OSPF-5-ADJCHG: Process 1, Nbr {ip} on {intf} from LOADING to FULL, Loading Done',
+)
+
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+def _ip(value):
+    '''Dotted quad of an integer ipv4 address'''
+    return str(ipaddress.IPv4Address(value & 0xFFFFFFFF))
+
+
+def _mac(value):
+    '''Cisco dotted mac address of an integer'''
+    value = '{:012x}'.format(value & 0xFFFFFFFFFFFF)
+    return '{}.{}.{}'.format(value[0:4], value[4:8], value[8:12])
+
+
+def _age(rng):
+    '''Random route age in one of the formats printed by the devices'''
+    choice = rng.random()
+    if choice < 0.5:
+        return '{:02d}:{:02d}:{:02d}'.format(
+            rng.randrange(24), rng.randrange(60), rng.randrange(60))
+    if choice < 0.8:
+        return '{}d{:02d}h'.format(rng.randrange(1, 7), rng.randrange(24))
+    return '{}w{}d'.format(rng.randrange(1, 52), rng.randrange(7))
+
+
+def iter_iosxe_show_ip_route(size, seed=0, ecmp=2):
+    '''Lines of an IOS-XE 'show ip route' with `size` /24 prefixes
+
+        Args:
+            size (`int`): number of prefixes
+            seed (`int`): seed of the random generator
+            ecmp (`int`): maximum number of next-hops for igp routes
+
+        Returns:
+            iterator of `str`
+    '''
+    rng = random.Random(seed)
+    yield from IOSXE_ROUTE_HEADER.splitlines()
+
+    # 1.0.0.0/24, 1.0.1.0/24, ... so every /8 holds up to 65536 prefixes
+    base = 1 << 24
+    for index in range(size):
+        network = base + (index << 8)
+        if index % 65536 == 0:
+            # routes below a "subnetted" header are printed without mask
+            yield '      {}/24 is subnetted, {} subnets'.format(
+                _ip(network), min(size - index, 65536))
+        prefix = _ip(network)
+        kind = rng.random()
+        if kind < 0.80:
+            yield 'B        {} [20/0] via {}, {}'.format(
+                prefix, _ip(0x0A000000 + rng.randrange(1, 256)), _age(rng))
+        elif kind < 0.95:
+            age = _age(rng)
+            paths = rng.randrange(1, ecmp + 1)
+            for path in range(paths):
+                nexthop = _ip(0xC0A80000 + (path << 8) + 2)
+                intf = 'GigabitEthernet0/{}'.format(path)
+                if path == 0:
+                    yield 'O        {} [110/{}] via {}, {}, {}'.format(
+                        prefix, index % 65535 + 1, nexthop, age, intf)
+                else:
+                    yield '                     [110/{}] via {}, {}, {}'.format(
+                        index % 65535 + 1, nexthop, age, intf)
+        else:
+            yield 'S        {} [1/0] via {}'.format(
+                prefix, _ip(0xC0A80001))
+
+
+def iosxe_show_ip_route(size, seed=0, ecmp=2):
+    '''IOS-XE 'show ip route' output with `size` prefixes'''
+    return '\n'.join(iter_iosxe_show_ip_route(size, seed=seed, ecmp=ecmp))
+
+
+def _nxos_routes(size, seed=0, ecmp=2):
+    '''(prefix, paths) of the NX-OS routing table generators, a path is a
+    tuple of (next-hop, interface, [pref, metric], age, client, type, tag)'''
+    rng = random.Random(seed)
+    base = 1 << 24
+    for index in range(size):
+        prefix = '{}/24'.format(_ip(base + (index << 8)))
+        if rng.random() < 0.8:
+            next_hop = _ip(0x0A000000 + rng.randrange(1, 256))
+            yield prefix, [('{}%default'.format(next_hop), None, (20, 0),
+                            _age(rng), 'bgp-65000', 'external', 65001)]
+        else:
+            paths = rng.randrange(1, ecmp + 1)
+            age = _age(rng)
+            yield prefix, [(_ip(0xC0A80002 + (path << 8)),
+                            'Eth1/{}'.format(path + 1),
+                            (110, index % 65535 + 1), age, 'ospf-1', 'intra',
+                            None)
+                           for path in range(paths)]
+
+
+def _iso_age(age):
+    '''ISO 8601 duration printed by `| json` for a route age'''
+    if ':' in age:
+        hours, minutes, seconds = (int(value) for value in age.split(':'))
+        return 'PT{}H{}M{}S'.format(hours, minutes, seconds)
+    if 'w' in age:
+        weeks, days = age.rstrip('d').split('w')
+        return 'P{}D'.format(int(weeks) * 7 + int(days))
+    days, hours = age.rstrip('h').split('d')
+    return 'P{}DT{}H'.format(int(days), int(hours))
+
+
+def iter_nxos_show_ip_route(size, seed=0, ecmp=2, vrf='default'):
+    '''Lines of an NX-OS 'show ip route' with `size` /24 prefixes
+
+        Args:
+            size (`int`): number of prefixes
+            seed (`int`): seed of the random generator
+            ecmp (`int`): maximum number of next-hops for igp routes
+            vrf (`str`): vrf name printed in the header
+
+        Returns:
+            iterator of `str`
+    '''
+    yield from NXOS_ROUTE_HEADER.format(vrf=vrf).splitlines()
+    yield ''
+
+    for prefix, paths in _nxos_routes(size, seed=seed, ecmp=ecmp):
+        yield '{}, ubest/mbest: {}/0'.format(prefix, len(paths))
+        for next_hop, intf, preference, age, client, kind, tag in paths:
+            yield '    *via {}, {}[{}/{}], {}, {}, {}{}'.format(
+                next_hop, intf + ', ' if intf else '', preference[0],
+                preference[1], age, client, kind,
+                ', tag {}'.format(tag) if tag else '')
+
+
+def nxos_show_ip_route(size, seed=0, ecmp=2, vrf='default'):
+    '''NX-OS 'show ip route' output with `size` prefixes'''
+    return '\n'.join(iter_nxos_show_ip_route(size, seed=seed, ecmp=ecmp,
+                                             vrf=vrf))
+
+
+def nxos_show_ip_route_json(size, seed=0, ecmp=2, vrf='default'):
+    '''NX-OS 'show ip route | json' output holding the routes of
+    nxos_show_ip_route() for the same arguments'''
+    prefixes = []
+    for prefix, paths in _nxos_routes(size, seed=seed, ecmp=ecmp):
+        rows = []
+        for next_hop, intf, preference, age, client, kind, tag in paths:
+            row = {'ipnexthop': next_hop, 'uptime': _iso_age(age),
+                   'pref': str(preference[0]), 'metric': str(preference[1]),
+                   'clientname': client, 'type': kind,
+                   'ubest': 'true', 'mbest': 'false'}
+            if intf:
+                row['ifname'] = intf
+            if tag:
+                row['tag'] = str(tag)
+            rows.append(row)
+        prefixes.append({'ipprefix': prefix, 'ucast-nhops': str(len(paths)),
+                         'mcast-nhops': '0', 'attached': 'false',
+                         # a single row is printed as an object
+                         'TABLE_path': {'ROW_path': rows[0] if len(rows) == 1
+                                        else rows}})
+    return json.dumps({'TABLE_vrf': {'ROW_vrf': {
+        'vrf-name-out': vrf,
+        'TABLE_addrf': {'ROW_addrf': {
+            'addrf': 'ipv4',
+            'TABLE_prefix': {'ROW_prefix': prefixes}}}}}}, indent=2)
+
+
+def iter_iosxe_show_bgp_all_detail(size, seed=0, paths_per_prefix=2):
+    '''Lines of an IOS-XE 'show bgp all detail' holding `size` paths
+
+        Args:
+            size (`int`): total number of paths
+            seed (`int`): seed of the random generator
+            paths_per_prefix (`int`): paths printed under every prefix
+
+        Returns:
+            iterator of `str`
+    '''
+    rng = random.Random(seed)
+    yield 'For address family: IPv4 Unicast'
+    yield ''
+
+    base = 1 << 24
+    prefixes = -(-size // paths_per_prefix)
+    emitted = 0
+    for index in range(prefixes):
+        paths = min(paths_per_prefix, size - emitted)
+        emitted += paths
+        yield 'BGP routing table entry for {}/24, version {}'.format(
+            _ip(base + (index << 8)), index + 2)
+        yield 'Paths: ({} available, best #1, table default)'.format(paths)
+        yield 'Advertised to update-groups:'
+        yield '   1'
+        for path in range(paths):
+            neighbor = _ip(0x0A000000 + rng.randrange(1, 256))
+            as_path = ' '.join(str(rng.randrange(64512, 65535))
+                               for _ in range(rng.randrange(1, 4)))
+            yield 'Refresh Epoch 1'
+            yield as_path
+            yield '  {n} from {n} ({n})'.format(n=neighbor)
+            yield '    Origin IGP, metric 0, localpref 100, valid, ' \
+                  'external{}'.format(', best' if path == 0 else '')
+            yield '    rx pathid: 0, tx pathid: {}'.format(
+                '0x0' if path == 0 else '0')
+
+
+def iosxe_show_bgp_all_detail(size, seed=0, paths_per_prefix=2):
+    '''IOS-XE 'show bgp all detail' output with `size` paths'''
+    return '\n'.join(iter_iosxe_show_bgp_all_detail(
+        size, seed=seed, paths_per_prefix=paths_per_prefix))
+
+
+def iter_iosxe_show_mac_address_table(size, seed=0, vlans=64):
+    '''Lines of an IOS-XE 'show mac address-table' with `size` entries
+
+        Args:
+            size (`int`): number of mac entries
+            seed (`int`): seed of the random generator
+            vlans (`int`): number of vlans the entries are spread over
+
+        Returns:
+            iterator of `str`
+    '''
+    rng = random.Random(seed)
+    yield '          Mac Address Table'
+    yield '-------------------------------------------'
+    yield ''
+    yield 'Vlan    Mac Address       Type        Ports'
+    yield '----    -----------       --------    -----'
+    for index in range(size):
+        yield '{:<7}{}    {:<12}Gi{}/0/{}'.format(
+            index % vlans + 1, _mac(0xCC9891000000 + index),
+            'DYNAMIC' if rng.random() < 0.95 else 'STATIC',
+            rng.randrange(1, 9), rng.randrange(1, 49))
+    yield 'Total Mac Addresses for this criterion: {}'.format(size)
+
+
+def iosxe_show_mac_address_table(size, seed=0, vlans=64):
+    '''IOS-XE 'show mac address-table' output with `size` entries'''
+    return '\n'.join(iter_iosxe_show_mac_address_table(size, seed=seed,
+                                                       vlans=vlans))
+
+
+def iter_iosxe_show_interfaces(size, seed=0):
+    '''Lines of an IOS-XE 'show interfaces' with `size` interfaces
+
+        Args:
+            size (`int`): number of interfaces
+            seed (`int`): seed of the random generator
+
+        Returns:
+            iterator of `str`
+    '''
+    rng = random.Random(seed)
+    for index in range(size):
+        in_pkts = rng.randrange(10 ** 9)
+        out_pkts = rng.randrange(10 ** 9)
+        yield from IOSXE_INTERFACE_TEMPLATE.format(
+            name='GigabitEthernet{}/0/{}'.format(index // 48 + 1,
+                                                index % 48 + 1),
+            status='up' if rng.random() < 0.9 else 'down',
+            mac=_mac(0x5E0000000000 + index),
+            address=_ip(0x0A000001 + (index << 8)),
+            in_rate=rng.randrange(10 ** 6), in_pps=rng.randrange(1000),
+            out_rate=rng.randrange(10 ** 6), out_pps=rng.randrange(1000),
+            in_pkts=in_pkts, in_octets=in_pkts * 64,
+            out_pkts=out_pkts, out_octets=out_pkts * 64,
+            in_errors=rng.randrange(10), in_crc=rng.randrange(10),
+        ).splitlines()
+
+
+def iosxe_show_interfaces(size, seed=0):
+    '''IOS-XE 'show interfaces' output with `size` interfaces'''
+    return '\n'.join(iter_iosxe_show_interfaces(size, seed=seed))
+
+
+def _nxos_interfaces(size, seed=0):
+    '''Values of the NX-OS 'show interface' generators, one dict per
+    interface'''
+    rng = random.Random(seed)
+    for index in range(size):
+        values = {
+            'name': 'Ethernet{}/{}'.format(index // 48 + 1, index % 48 + 1),
+            'state': 'up' if rng.random() < 0.9 else 'down',
+            'bundle': index // 2 + 100,
+            'mac': _mac(0xECCE13000000 + index),
+            'description': 'FAN-OUT-S{}_E{}/1'.format(index % 4 + 1,
+                                                      index % 32 + 1),
+            'flapped': _age(rng),
+            'resets': rng.randrange(10),
+            'in_rate': rng.randrange(10 ** 6), 'in_pps': rng.randrange(1000),
+            'out_rate': rng.randrange(10 ** 6), 'out_pps': rng.randrange(1000),
+            'in_crc': rng.randrange(10), 'in_errors': rng.randrange(10),
+            'in_discard': rng.randrange(10), 'out_discard': rng.randrange(10),
+        }
+        for direction in ('in', 'out'):
+            ucast, mcast, bcast = (rng.randrange(10 ** 9) for _ in range(3))
+            values.update({
+                direction + '_ucast': ucast,
+                direction + '_mcast': mcast,
+                direction + '_bcast': bcast,
+                direction + '_pkts': ucast + mcast + bcast,
+                direction + '_octets': (ucast + mcast + bcast) * 128})
+        yield values
+
+
+def iter_nxos_show_interface(size, seed=0):
+    '''Lines of an NX-OS 'show interface' with `size` interfaces
+
+        Args:
+            size (`int`): number of interfaces
+            seed (`int`): seed of the random generator
+
+        Returns:
+            iterator of `str`
+    '''
+    for values in _nxos_interfaces(size, seed=seed):
+        yield from NXOS_INTERFACE_TEMPLATE.format(**values).splitlines()
+
+
+def nxos_show_interface(size, seed=0):
+    '''NX-OS 'show interface' output with `size` interfaces'''
+    return '\n'.join(iter_nxos_show_interface(size, seed=seed))
+
+
+def nxos_show_interface_json(size, seed=0):
+    '''NX-OS 'show interface | json' output holding the interfaces of
+    nxos_show_interface() for the same arguments'''
+    rows = []
+    for values in _nxos_interfaces(size, seed=seed):
+        row = {
+            'interface': values['name'], 'state': values['state'],
+            'admin_state': 'up', 'share_state': 'Dedicated',
+            'eth_bundle': str(values['bundle']),
+            'eth_hw_desc': '100/1000/10000/25000 Ethernet',
+            'eth_hw_addr': values['mac'], 'eth_bia_addr': values['mac'],
+            'desc': values['description'],
+            'eth_mtu': '9216', 'eth_bw': 10000000, 'eth_dly': 10,
+            'eth_reliability': '255', 'eth_txload': '1', 'eth_rxload': '1',
+            'medium': 'broadcast', 'encapsulation': 'ARPA',
+            'eth_mode': 'trunk', 'eth_duplex': 'full',
+            'eth_speed': '10 Gb/s', 'eth_media': '10G',
+            'eth_beacon': 'off', 'eth_autoneg': 'on', 'eth_fec_mode': 'Auto',
+            'eth_in_flowctrl': 'off', 'eth_out_flowctrl': 'off',
+            'eth_mdix': 'off', 'eth_ratemode': 'dedicated',
+            'eth_swt_monitor': 'off', 'eth_ethertype': '0x8100',
+            'eth_eee_state': 'n/a',
+            'eth_link_flapped': values['flapped'],
+            'eth_clear_counters': 'never',
+            'eth_reset_cntr': values['resets'],
+            'eth_jumbo_inpkts': '0', 'eth_storm_supp_bytes': '0',
+            'eth_runts': 0, 'eth_giants': 0, 'eth_crc': values['in_crc'],
+            'eth_nobuf': 0, 'eth_inerr': values['in_errors'],
+            'eth_frame': 0, 'eth_overrun': 0, 'eth_underrun': 0,
+            'eth_ignored': 0, 'eth_watchdog': 0, 'eth_bad_eth': 0,
+            'eth_bad_proto': 0, 'eth_in_ifdown_drops': 0, 'eth_dribble': 0,
+            'eth_indiscard': values['in_discard'], 'eth_inpause': 0,
+            'eth_jumbo_outpkts': '0', 'eth_outerr': 0, 'eth_coll': 0,
+            'eth_deferred': 0, 'eth_latecoll': 0, 'eth_lostcarrier': 0,
+            'eth_nocarrier': 0, 'eth_babbles': 0,
+            'eth_outdiscard': values['out_discard'], 'eth_outpause': 0,
+        }
+        for interval, seconds in (('1', '30'), ('2', '300')):
+            row.update({
+                'eth_load_interval{}_rx'.format(interval): seconds,
+                'eth_inrate{}_bits'.format(interval): str(values['in_rate']),
+                'eth_inrate{}_pkts'.format(interval): str(values['in_pps']),
+                'eth_load_interval{}_tx'.format(interval): seconds,
+                'eth_outrate{}_bits'.format(interval): str(values['out_rate']),
+                'eth_outrate{}_pkts'.format(interval): str(values['out_pps'])})
+        for direction, key in (('in', 'eth_in'), ('out', 'eth_out')):
+            row.update({
+                key + 'ucast': str(values[direction + '_ucast']),
+                key + 'mcast': str(values[direction + '_mcast']),
+                key + 'bcast': str(values[direction + '_bcast']),
+                key + 'pkts': str(values[direction + '_pkts']),
+                key + 'bytes': str(values[direction + '_octets'])})
+        rows.append(row)
+    return json.dumps({'TABLE_interface': {'ROW_interface': rows}}, indent=2)
+
+
+def iter_iosxe_show_logging(size, seed=0):
+    '''Lines of an IOS-XE 'show logging' with `size` buffered messages
+
+        Args:
+            size (`int`): number of log lines
+            seed (`int`): seed of the random generator
+
+        Returns:
+            iterator of `str`
+    '''
+    rng = random.Random(seed)
+    yield from IOSXE_LOGGING_HEADER.format(lines=size,
+                                           buffer=size * 128).splitlines()
+    seconds = 0
+    for index in range(size):
+        seconds += rng.randrange(5)
+        message = rng.choice(IOSXE_LOGGING_MESSAGES).format(
+            ip=_ip(0xAC100000 + rng.randrange(65536)),
+            intf='GigabitEthernet1/0/{}'.format(rng.randrange(1, 49)),
+            mac=_mac(rng.randrange(1 << 48)))
+        yield '{} {:2d} {:02d}:{:02d}:{:02d}.{:03d} EST: {}'.format(
+            MONTHS[seconds // 2592000 % 12], seconds // 86400 % 28 + 1,
+            seconds // 3600 % 24, seconds // 60 % 60, seconds % 60,
+            index % 1000, message)
+
+
+def iosxe_show_logging(size, seed=0):
+    '''IOS-XE 'show logging' output with `size` buffered messages'''
+    return '\n'.join(iter_iosxe_show_logging(size, seed=seed))
+
+
+# name -> (generator, parser, parser kwargs, default benchmark sizes)
+GENERATORS = {
+    'iosxe_show_ip_route': (
+        iosxe_show_ip_route,
+        'genie.libs.parser.iosxe.show_routing.ShowIpRoute',
+        {}, (1000, 10000, 100000, 1000000)),
+    'nxos_show_ip_route': (
+        nxos_show_ip_route,
+        'genie.libs.parser.nxos.show_routing.ShowIpRoute',
+        {'vrf': 'default'}, (1000, 10000, 100000, 1000000)),
+    'iosxe_show_bgp_all_detail': (
+        iosxe_show_bgp_all_detail,
+        'genie.libs.parser.iosxe.show_bgp.ShowBgpAllDetail',
+        {}, (1000, 10000, 100000, 500000)),
+    'iosxe_show_mac_address_table': (
+        iosxe_show_mac_address_table,
+        'genie.libs.parser.iosxe.show_fdb.ShowMacAddressTable',
+        {}, (1000, 16000, 64000, 256000)),
+    'iosxe_show_interfaces': (
+        iosxe_show_interfaces,
+        'genie.libs.parser.iosxe.show_interface.ShowInterfaces',
+        {}, (100, 1000, 5000, 10000)),
+    'iosxe_show_logging': (
+        iosxe_show_logging,
+        'genie.libs.parser.iosxe.show_logging.ShowLogging',
+        {}, (1000, 10000, 100000, 1000000)),
+    'nxos_show_interface': (
+        nxos_show_interface,
+        'genie.libs.parser.nxos.show_interface.ShowInterface',
+        {'command': 'show interface'}, (100, 1000, 5000, 10000)),
+}
+
+# name of a text generator -> generator of the same data as `| json` output
+JSON_GENERATORS = {
+    'nxos_show_ip_route': nxos_show_ip_route_json,
+    'nxos_show_interface': nxos_show_interface_json,
+}
+
+
+def load_parser_class(path):
+    '''Import a parser class from its dotted path'''
+    module, _, name = path.rpartition('.')
+    return getattr(importlib.import_module(module), name)
@@ -0,0 +1,156 @@
+'''Split a show tech-support capture and parse every section
+
+A ``show tech-support`` (or ``show tech-support <feature>``) capture is the
+concatenation of many show commands, each one introduced by a banner:
+
+    ------------------ show version ------------------        (IOS, IOS-XE)
+    `show version`                                            (NX-OS)
+
+`iter_sections` walks the capture once, line by line, and yields one
+(command, output) section at a time, a capture of hundreds of MB is never
+held in memory as a whole.  `parse_tech_support` resolves the parser of every
+section with `get_parser` for the tokens of the device and parses the
+sections in parallel worker processes:
+
+    >>> with open('tech-support.txt') as f:
+    ...     parsed = parse_tech_support(device, f)
+    >>> parsed['show version']['version']['version']
+
+Sections without a parser, error banners and sections a parser fails on are
+left out of the result, `errors` collects the reason of each of them.
+'''
+
+# python
+import io
+import os
+import re
+import logging
+import collections
+from concurrent.futures import ProcessPoolExecutor
+
+from .common import get_parser
+from .classifier import classify_output, DATA
+
+log = logging.getLogger(__name__)
+
+# ------------------ show version ------------------
+# `show version`
+SECTION_BANNER = re.compile(r'^(?:-{3,}\s+(?P<command>show\s.*?)\s+-{3,}'
+                            r'|`(?P<nxos_command>show\s[^`]*)`)\s*$')
+
+# sections queued per worker, bounds the capture held in memory
+SECTIONS_PER_WORKER = 4
+
+
+def iter_sections(capture):
+    '''Cut a tech-support capture into its show commands
+
+        Args:
+            capture (`str` or iterable of lines): capture text or an open
+                                                  file
+
+        Returns:
+            generator of (command, output) tuples, in the capture order.
+            Text before the first banner is skipped.
+    '''
+    if isinstance(capture, str):
+        capture = io.StringIO(capture)
+
+    command = None
+    lines = []
+    for line in capture:
+        m = SECTION_BANNER.match(line.strip())
+        if m:
+            if command is not None:
+                yield command, ''.join(lines)
+            command = ' '.join((m.group('command') or
+                                m.group('nxos_command')).split())
+            lines = []
+        elif command is not None:
+            lines.append(line if line.endswith('\n') else line + '\n')
+
+    if command is not None:
+        yield command, ''.join(lines)
+
+
+def _parse_section(parser_class, kwargs, output):
+    '''Worker side of parse_tech_support, returns (ok, parsed or reason)'''
+    try:
+        return True, parser_class(device=None).parse(output=output, **kwargs)
+    except Exception as e:
+        # exceptions of the parsers do not all survive pickling
+        return False, '{}: {}'.format(type(e).__name__, e)
+
+
+def parse_tech_support(device, capture, max_workers=None, executor=None,
+                       errors=None):
+    '''Parse every section of a tech-support capture
+
+        Args:
+            device (`Device`): device the capture comes from, its os and
+                               platform select the parsers
+            capture (`str` or iterable of lines): capture text or an open
+                                                  file
+            max_workers (`int`): number of worker processes
+            executor (`Executor`): executor to parse with instead of a
+                                   process pool, for example a
+                                   ThreadPoolExecutor
+            errors (`dict`): filled with command -> reason of the sections
+                             which are not in the result
+
+        Returns:
+            `dict` of command -> parsed output, in the capture order
+    '''
+    errors = {} if errors is None else errors
+    results = {}
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    in_flight = collections.deque()
+    seen = set()
+    limit = SECTIONS_PER_WORKER * (max_workers or os.cpu_count() or 1)
+    os_name = getattr(device, 'os', None)
+
+    def collect(command, future):
+        ok, value = future.result()
+        if ok:
+            results[command] = value
+        else:
+            errors[command] = value
+
+    try:
+        for command, output in iter_sections(capture):
+            if command in seen:
+                log.debug('Section %r repeated, the first one is kept',
+                          command)
+                continue
+            seen.add(command)
+
+            kind = classify_output(output, os=os_name, command=command).kind
+            if kind != DATA:
+                errors[command] = 'output classified as {}'.format(kind)
+                continue
+
+            try:
+                parser_class, kwargs = get_parser(command, device)
+            except Exception as e:
+                errors[command] = '{}: {}'.format(type(e).__name__, e)
+                continue
+
+            in_flight.append((command, executor.submit(
+                _parse_section, parser_class, kwargs, output)))
+            while len(in_flight) >= limit:
+                collect(*in_flight.popleft())
+
+        while in_flight:
+            collect(*in_flight.popleft())
+    finally:
+        if own_executor:
+            # shutdown(cancel_futures=True) is python 3.9+
+            for _, future in in_flight:
+                future.cancel()
+            executor.shutdown()
+
+    log.info('Parsed %d of %d tech-support sections', len(results),
+             len(results) + len(errors))
+    return results
@@ -0,0 +1,156 @@
+'''In-process fake devices and REST server serving golden outputs with
+simulated latency'''
+
+import os
+import re
+import glob
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pyats.topology import Device
+
+
+def golden_outputs(os_name, class_name, kind='equal'):
+    '''Golden outputs of a parser from its tests folder
+
+        Args:
+            os_name (`str`): os folder of the parser, ex: 'iosxe'
+            class_name (`str`): parser class name
+            kind (`str`): 'equal' or 'empty' golden outputs
+
+        Returns:
+            list of (output, arguments) tuples
+    '''
+    folder = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(
+        __file__))), os_name, 'tests', class_name, 'cli', kind)
+    outputs = []
+    for path in sorted(glob.glob(os.path.join(folder, '*_output.txt'))):
+        with open(path) as f:
+            output = f.read()
+        arguments = {}
+        arguments_path = path[:-len('_output.txt')] + '_arguments.json'
+        if os.path.isfile(arguments_path):
+            with open(arguments_path) as f:
+                arguments = json.load(f)
+        outputs.append((output, arguments))
+    return outputs
+
+
+def golden_output(os_name, class_name, index=0, kind='equal'):
+    '''Output of a golden test of a parser'''
+    return golden_outputs(os_name, class_name, kind)[index][0]
+
+
+class FakeDevice(Device):
+    '''Device answering execute() from a dict of command -> output'''
+
+    def __init__(self, name, os, outputs, latency=0.0, **kwargs):
+        super().__init__(name, os=os, **kwargs)
+        self.outputs = outputs
+        self.latency = latency
+        self.executed = []
+
+    def _output(self, command):
+        self.executed.append(command)
+        return self.outputs[command]
+
+    def execute(self, command, **kwargs):
+        time.sleep(self.latency)
+        return self._output(command)
+
+
+class AsyncFakeDevice(FakeDevice):
+    '''Fake device with a coroutine execute()'''
+
+    async def execute(self, command, **kwargs):
+        await asyncio.sleep(self.latency)
+        return self._output(command)
+
+
+class StubServer(object):
+    '''Local HTTP server answering GET from a dict of path -> JSON body'''
+
+    def __init__(self, fixtures, latency=0.0):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # headers and body in one segment, no delayed ack per request
+            wbufsize = -1
+
+            def do_GET(self):
+                with stub.lock:
+                    stub.requests.append(self.path)
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight,
+                                             stub.in_flight)
+                time.sleep(stub.latency)
+                with stub.lock:
+                    stub.in_flight -= 1
+                if self.path in stub.fixtures:
+                    body = json.dumps(stub.fixtures[self.path]).encode()
+                    self.send_response(200)
+                else:
+                    body = b'{"code": 404, "message": "Not Found"}'
+                    self.send_response(404)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_port)
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class BatchFakeDevice(FakeDevice):
+    '''Fake device with the unicon transmit/receive services, the lines of
+    a write are echoed after a prompt and answered from `outputs`, lines
+    starting with '!' are comments, `receives` counts the receive calls'''
+
+    def __init__(self, name, os, outputs, latency=0.0, **kwargs):
+        super().__init__(name, os, outputs, latency=latency, **kwargs)
+        self.writes = []
+        self.receives = 0
+        self.buffer = ''
+
+    def transmit(self, data, **kwargs):
+        self.writes.append(data)
+        for line in data.replace('\r', '\n').splitlines():
+            self.buffer += '{}#{}\r\n'.format(self.name, line)
+            if line.strip() and not line.startswith('!'):
+                output = self._output(line)
+                if output and not output.endswith('\n'):
+                    output += '\n'
+                self.buffer += output.replace('\n', '\r\n')
+        self.buffer += '{}#'.format(self.name)
+        return True
+
+    def receive(self, pattern, timeout=None, **kwargs):
+        self.receives += 1
+        time.sleep(self.latency)
+        return re.search(pattern, self.buffer) is not None
+
+    def receive_buffer(self):
+        buffer, self.buffer = self.buffer, ''
+        return buffer
@@ -0,0 +1,107 @@
+import time
+import asyncio
+import unittest
+
+from genie.metaparser import MetaParser
+from genie.metaparser.util.exceptions import InvalidCommandError
+
+from genie.libs.parser.iosxe.show_routing import ShowIpRoute
+from genie.libs.parser.utils.async_parse import aparse, aparse_parser, \
+                                                aexecute
+from genie.libs.parser.utils.tests.fake_device import FakeDevice, \
+                                                     AsyncFakeDevice, \
+                                                     golden_output
+
+
+class ShowTwoCommands(MetaParser):
+    '''Composite parser executing two commands from cli()'''
+
+    schema = {'first': str, 'second': str}
+
+    def cli(self, output=None):
+        return {'first': self.device.execute('show first').strip(),
+                'second': self.device.execute('show second').strip()}
+
+
+class TestAsyncParse(unittest.TestCase):
+
+    def setUp(self):
+        self.output = golden_output('iosxe', 'ShowIpRoute')
+        self.expected = ShowIpRoute(device=None).parse(output=self.output)
+
+    def test_concurrent_devices(self):
+        latency = 0.2
+        devices = [AsyncFakeDevice('R{}'.format(index), 'iosxe',
+                                   {'show ip route': self.output},
+                                   latency=latency)
+                   for index in range(20)]
+
+        async def poll():
+            # the parser registry is loaded outside of the timed section
+            await aparse(devices[0], 'show ip route')
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(aparse(device, 'show ip route') for device in devices))
+            return time.perf_counter() - start, results
+
+        elapsed, results = asyncio.run(poll())
+        self.assertLess(elapsed, latency * len(devices) / 2)
+        for result in results:
+            self.assertEqual(result, self.expected)
+
+    def test_aparse_parser_with_output(self):
+        device = AsyncFakeDevice('R1', 'iosxe', {})
+        result = asyncio.run(aparse_parser(ShowIpRoute(device=device),
+                                           output=self.output))
+        self.assertEqual(result, self.expected)
+        self.assertEqual(device.executed, [])
+
+    def test_blocking_device(self):
+        device = FakeDevice('R1', 'iosxe', {'show ip route': self.output},
+                            latency=0.01)
+        self.assertEqual(asyncio.run(aexecute(device, 'show ip route')),
+                         self.output)
+        result = asyncio.run(aparse_parser(ShowIpRoute(device=device),
+                                           command='show ip route'))
+        self.assertEqual(result, self.expected)
+
+    def test_composite_parser(self):
+        device = AsyncFakeDevice('R1', 'iosxe', {'show first': 'one\n',
+                                                 'show second': 'two\n'},
+                                 latency=0.01)
+        parser = ShowTwoCommands(device=device)
+        result = asyncio.run(aparse_parser(parser))
+        self.assertEqual(result, {'first': 'one', 'second': 'two'})
+        self.assertEqual(device.executed, ['show first', 'show second'])
+        self.assertIs(parser.device, device)
+
+    def test_shared_parser(self):
+        # concurrent calls on one parser leave its device alone
+        device = AsyncFakeDevice('R1', 'iosxe', {'show first': 'one\n',
+                                                 'show second': 'two\n'},
+                                 latency=0.01)
+        parser = ShowTwoCommands(device=device)
+
+        async def both():
+            first = asyncio.ensure_future(aparse_parser(parser))
+            await asyncio.sleep(0.005)
+            # the first call is waiting on the device
+            self.assertIs(parser.device, device)
+            return await asyncio.gather(first, aparse_parser(parser))
+
+        self.assertEqual(asyncio.run(both()),
+                         [{'first': 'one', 'second': 'two'}] * 2)
+        self.assertEqual(len(device.executed), 4)
+        self.assertIs(parser.device, device)
+
+    def test_error_output(self):
+        device = AsyncFakeDevice(
+            'R1', 'iosxe',
+            {'show ip route': "% Invalid input detected at '^' marker."})
+        with self.assertRaises(InvalidCommandError):
+            asyncio.run(aparse_parser(ShowIpRoute(device=device),
+                                      command='show ip route'))
+
+
+if __name__ == '__main__':
+    unittest.main()
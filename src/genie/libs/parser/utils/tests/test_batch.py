@@ -0,0 +1,81 @@
+import unittest
+
+from genie.libs.parser.iosxe.show_platform import ShowVersion
+from genie.libs.parser.iosxe.show_routing import ShowIpRoute
+from genie.libs.parser.iosxe.show_vrf import ShowVrf
+from genie.libs.parser.utils.batch import demultiplex, execute_batch, \
+                                          parse_batch
+from genie.libs.parser.utils.tests.fake_device import BatchFakeDevice, \
+                                                     FakeDevice, \
+                                                     golden_output
+
+COMMANDS = [('show version', ShowVersion),
+            ('show ip route', ShowIpRoute),
+            ('show vrf', ShowVrf)]
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.outputs = {command: golden_output('iosxe', parser.__name__)
+                        for command, parser in COMMANDS}
+        self.outputs['show clock'] = ''
+        self.expected = {command: parser(device=None).parse(
+                             output=self.outputs[command])
+                         for command, parser in COMMANDS}
+
+    def test_demultiplex(self):
+        output = ('R1#\r\nR1#show clock\r\n*10:00:00.000 UTC Mon Oct 19 2026'
+                  '\r\nR1#! BATCH-1-0\r\nR1#show users\r\nR1#! BATCH-1-1\r\n'
+                  'R1#')
+        self.assertEqual(
+            demultiplex(output, ['show clock', 'show users'], 'BATCH-1'),
+            {'show clock': '*10:00:00.000 UTC Mon Oct 19 2026\n',
+             'show users': '\n'})
+        # missing marker, the command is left out
+        self.assertEqual(demultiplex(output, ['show clock', 'show users',
+                                              'show vrf'], 'BATCH-1'),
+                         {'show clock': '*10:00:00.000 UTC Mon Oct 19 2026\n',
+                          'show users': '\n'})
+
+    def test_execute_batch(self):
+        device = BatchFakeDevice('R1', 'iosxe', self.outputs)
+        outputs = execute_batch(device, ['show version', 'show ip route',
+                                         'show version'])
+        self.assertEqual(len(device.writes), 1)
+        self.assertEqual(list(outputs), ['show version', 'show ip route'])
+        for command, output in outputs.items():
+            self.assertEqual(output.strip(), self.outputs[command].strip())
+
+    def test_parse_batch(self):
+        device = BatchFakeDevice('R1', 'iosxe', self.outputs)
+        errors = {}
+        result = parse_batch(device, ['show version', 'show ip route',
+                                      'show vrf', 'show clock',
+                                      'show no such thing'], errors=errors)
+        self.assertEqual(result, self.expected)
+        self.assertEqual(list(result), [command for command, _ in COMMANDS])
+        self.assertEqual(set(errors), {'show clock', 'show no such thing'})
+        # the command without parser was not sent
+        self.assertEqual(len(device.writes), 1)
+        self.assertNotIn('show no such thing', device.writes[0])
+
+    def test_round_trips(self):
+        commands = [command for command, _ in COMMANDS] * 4
+        batched = BatchFakeDevice('R1', 'iosxe', self.outputs)
+        parse_batch(batched, commands)
+        # one write and one wait for the whole batch, each command once
+        self.assertEqual(len(batched.writes), 1)
+        self.assertEqual(batched.receives, 1)
+        self.assertEqual(batched.executed, [command for command, _ in
+                                            COMMANDS])
+
+        device = FakeDevice('R1', 'iosxe', self.outputs)
+        for command, parser in COMMANDS:
+            parser(device=device).parse()
+        # a round trip per command
+        self.assertEqual(len(device.executed), len(COMMANDS))
+
+
+if __name__ == '__main__':
+    unittest.main()
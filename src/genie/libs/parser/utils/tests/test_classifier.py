@@ -0,0 +1,98 @@
+import os
+import glob
+import json
+import unittest
+from unittest.mock import Mock
+
+from genie.metaparser.util.exceptions import SchemaEmptyParserError, \
+                                             InvalidCommandError
+
+from genie.libs.parser.utils import classifier
+from genie.libs.parser.utils.classifier import classify_output, \
+                                               check_output, \
+                                               parse_classified
+
+PARSER_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+
+class TestClassifyOutput(unittest.TestCase):
+
+    def test_error_banner_corpus(self):
+        with open(os.path.join(os.path.dirname(classifier.__file__),
+                               'error_banners.json')) as f:
+            corpus = json.load(f)
+
+        for os_name, samples in corpus.items():
+            for sample in samples:
+                with self.subTest(os=os_name, output=sample['output']):
+                    result = classify_output(sample['output'], os=os_name,
+                                             command=sample['command'])
+                    self.assertEqual(result.kind, sample['kind'])
+
+    def test_golden_outputs_are_data(self):
+        allowed = {
+            # empty golden output, the test mocks the parsergen result
+            os.path.join('iosxe', 'tests', 'ShowInterfaceParsergen'),
+            # turns a banner into data, opts out with preclassify
+            os.path.join('iosxr', 'tests', 'ShowCdp'),
+        }
+        pattern = os.path.join(PARSER_ROOT, '*', 'tests', '*', 'cli',
+                               'equal', '*_output.txt')
+        for path in glob.glob(pattern):
+            relative = os.path.relpath(path, PARSER_ROOT)
+            if any(relative.startswith(folder) for folder in allowed):
+                continue
+            with open(path, errors='ignore') as f:
+                output = f.read()
+            with self.subTest(path=relative):
+                result = classify_output(output, os=relative.split(os.sep)[0])
+                self.assertEqual(result.kind, classifier.DATA)
+
+    def test_banner_next_to_data(self):
+        output = '% EID table not enabled for MAC.\n' \
+                 'LISP IPv4 Mapping Cache for LISP 0 EID-table default\n'
+        self.assertEqual(classify_output(output, os='iosxe').kind,
+                         classifier.DATA)
+
+    def test_large_output_is_not_scanned(self):
+        output = '% BGP not active\n' * classifier.MAX_BANNER_OUTPUT
+        self.assertEqual(classify_output(output).kind, classifier.DATA)
+
+    def test_check_output(self):
+        with self.assertRaises(SchemaEmptyParserError):
+            check_output('', os='iosxe')
+        with self.assertRaises(SchemaEmptyParserError):
+            check_output('% BGP not active', os='iosxe')
+        with self.assertRaises(InvalidCommandError):
+            check_output("% Invalid input detected at '^' marker.",
+                         os='iosxe', command='show ip bgp summry')
+        result = check_output('Gi1  10.1.1.1  YES  NVRAM  up  up', os='iosxe')
+        self.assertEqual(result.kind, classifier.DATA)
+
+
+class TestParseClassified(unittest.TestCase):
+
+    def test_short_circuit(self):
+        parser = Mock(device=Mock(os='nxos'))
+        with self.assertRaises(InvalidCommandError):
+            parse_classified(parser, output="% Invalid command at '^' marker.")
+        parser.parse.assert_not_called()
+
+    def test_execute_and_parse(self):
+        parser = Mock(device=Mock(os='iosxe',
+                                  execute=Mock(return_value='data line')))
+        parser.parse.return_value = {'parsed': True}
+        self.assertEqual(parse_classified(parser, command='show version'),
+                         {'parsed': True})
+        parser.parse.assert_called_once_with(output='data line')
+
+    def test_preclassify_opt_out(self):
+        from genie.libs.parser.iosxr.show_cdp import ShowCdp
+        parser = ShowCdp(device=Mock(os='iosxr'))
+        self.assertEqual(parse_classified(parser,
+                                          output='% CDP is not enabled'),
+                         {'enabled': False})
+
+
+if __name__ == '__main__':
+    unittest.main()
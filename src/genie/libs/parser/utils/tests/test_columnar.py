@@ -0,0 +1,133 @@
+import re
+import unittest
+
+from genie.libs.parser.iosxe.show_arp import ShowArp, ShowIpArp
+from genie.libs.parser.iosxe.show_fdb import ShowMacAddressTable
+from genie.libs.parser.iosxe.show_interface import ShowInterfacesCounters, \
+                                                   ShowIpInterfaceBrief
+from genie.libs.parser.iosxe.show_mpls import ShowMplsForwardingTable
+from genie.libs.parser.iosxe.show_vrf import ShowVrf
+from genie.libs.parser.nxos.show_fdb import ShowMacAddressTable as \
+                                            NxosShowMacAddressTable
+from genie.libs.parser.utils import synthetic
+from genie.libs.parser.utils.columnar import Column, ColumnarTable, \
+                                             iter_chunks, parse_columnar
+from genie.libs.parser.utils.tests.fake_device import FakeDevice, \
+                                                      golden_outputs
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+PARSERS = [('iosxe', ShowMacAddressTable),
+           ('nxos', NxosShowMacAddressTable),
+           ('iosxe', ShowArp),
+           ('iosxe', ShowIpArp),
+           ('iosxe', ShowIpInterfaceBrief),
+           ('iosxe', ShowInterfacesCounters),
+           ('iosxe', ShowMplsForwardingTable)]
+
+
+class TestColumn(unittest.TestCase):
+
+    def test_int_to_categorical(self):
+        column = Column(2)
+        column.append(10)
+        column.append()
+        self.assertEqual(column.kind, 'int')
+        column.append('None')
+        column.append(True)
+        column.append(1)
+        self.assertEqual(column.kind, 'category')
+        self.assertEqual([column.get(row) for row in range(len(column))],
+                         [None, None, 10, None, 'None', True, 1])
+        self.assertIs(column.get(5), True)
+        self.assertEqual(column.get(0, 'missing'), 'missing')
+        # the index is rebuilt by the next append
+        column.freeze()
+        column.append('None')
+        self.assertEqual(column.codes[-1], column.codes[4])
+
+    def test_path(self):
+        with self.assertRaises(ValueError):
+            ColumnarTable(('interface', '{interface}', 'ipv4'))
+        with self.assertRaises(TypeError):
+            parse_columnar(ShowVrf, output='')
+
+    def test_chunks(self):
+        output = 'Port  InOctets\na\nb\nPort  OutOctets\nc\n  d\ne'
+        header = ShowInterfacesCounters.table_header
+        chunks = list(iter_chunks(output, header=re.compile(header),
+                                  row_start=re.compile(r'^\S'),
+                                  chunk_lines=2))
+        # the header is repeated, the indented line stays with its row
+        self.assertEqual(chunks, ['Port  InOctets\na',
+                                  'Port  InOctets\nb',
+                                  'Port  OutOctets\nc\n  d',
+                                  'Port  OutOctets\ne'])
+
+
+class TestColumnar(unittest.TestCase):
+
+    def test_golden(self):
+        for os_name, parser_class in PARSERS:
+            for output, arguments in golden_outputs(os_name,
+                                                    parser_class.__name__):
+                expected = parser_class(device=None).parse(output=output,
+                                                           **arguments)
+                for chunk_lines in (1, 5, 2000):
+                    with self.subTest(os=os_name,
+                                      parser=parser_class.__name__,
+                                      chunk_lines=chunk_lines):
+                        table = parse_columnar(parser_class, output=output,
+                                               chunk_lines=chunk_lines,
+                                               **arguments)
+                        self.assertEqual(table.view(), expected)
+                        self.assertEqual(table.to_dict(), expected)
+
+    def test_synthetic(self):
+        lines = synthetic.iter_iosxe_show_mac_address_table(3000)
+        table = parse_columnar(ShowMacAddressTable, output=lines,
+                               chunk_lines=500)
+        expected = ShowMacAddressTable(device=None).parse(
+            output=synthetic.iosxe_show_mac_address_table(3000))
+        self.assertEqual(table.rows, 3000)
+        self.assertEqual(table.extras, {'total_mac_addresses': 3000})
+        self.assertEqual(table.columns['vlan.vlan'].kind, 'int')
+        self.assertEqual(table.columns['entry_type'].kind, 'category')
+        self.assertLessEqual(len(table.columns['entry_type'].categories), 3)
+
+        view = table.view()
+        vlan = view['mac_table']['vlans']['5']
+        self.assertEqual(vlan, expected['mac_table']['vlans']['5'])
+        self.assertEqual(vlan['vlan'], 5)
+        self.assertEqual(view, expected)
+
+    def test_device(self):
+        output = synthetic.iosxe_show_mac_address_table(50)
+        device = FakeDevice('R1', 'iosxe',
+                            {'show mac address-table': output})
+        table = parse_columnar(ShowMacAddressTable, device=device,
+                               command='show mac address-table')
+        self.assertEqual(table.to_dict(), ShowMacAddressTable(
+            device=None).parse(output=output))
+
+    @unittest.skipUnless(numpy, 'numpy is not installed')
+    def test_numpy(self):
+        table = parse_columnar(ShowMacAddressTable,
+                               output=synthetic.iosxe_show_mac_address_table(
+                                   100, vlans=4))
+        values, valid = table.columns['vlan.vlan'].to_numpy()
+        self.assertEqual(values.tolist(), [row % 4 + 1 for row in
+                                           range(100)])
+        self.assertTrue(valid.all())
+        codes, categories = table.columns['entry_type'].to_numpy()
+        self.assertEqual(categories[codes[0]],
+                         table.columns['entry_type'].get(0))
+        # the arrays share the memory of the column
+        self.assertFalse(values.flags.owndata)
+
+
+if __name__ == '__main__':
+    unittest.main()
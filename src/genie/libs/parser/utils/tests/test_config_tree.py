@@ -0,0 +1,125 @@
+import os
+import unittest
+
+from genie.libs.parser.iosxe.show_run import ShowRunInterface, \
+                                            ShowRunSectionBgp, \
+                                            ShowRunSectionVrfDefinition, \
+                                            ShowRunningConfigFlowMonitor
+from genie.libs.parser.utils.config_tree import ConfigTree, \
+                                                execute_config_command
+from genie.libs.parser.utils.session import ParseSession
+from genie.libs.parser.utils.tests.fake_device import FakeDevice
+
+PARSER_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+CONFIG = '''\
+Building configuration...
+
+Current configuration : 1024 bytes
+!
+hostname R1
+!
+vrf definition red
+ rd 1:1
+ !
+ address-family ipv4
+  route-target export 1:1
+ exit-address-family
+!
+interface GigabitEthernet1
+ description uplink
+ ip address 10.0.0.1 255.255.255.0
+!
+interface Loopback0
+ ip address 1.1.1.1 255.255.255.255
+!
+router bgp 65000
+ neighbor 10.0.0.2 remote-as 65001
+ !
+ address-family ipv4 vrf red
+  neighbor 10.1.1.2 remote-as 65002
+ exit-address-family
+!
+end
+'''
+
+
+class TestConfigTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = ConfigTree(CONFIG)
+
+    def test_index(self):
+        self.assertEqual([block.header for block in self.tree.blocks],
+                         ['hostname R1', 'vrf definition red',
+                          'interface GigabitEthernet1', 'interface Loopback0',
+                          'router bgp 65000'])
+        block = self.tree.block('address-family ipv4 vrf red')
+        self.assertEqual(self.tree.lines[block.start:block.end],
+                         [' address-family ipv4 vrf red',
+                          '  neighbor 10.1.1.2 remote-as 65002',
+                          ' exit-address-family'])
+
+    def test_render(self):
+        self.assertEqual(
+            self.tree.render('show running-config interface Gi1'),
+            'interface GigabitEthernet1\n description uplink\n'
+            ' ip address 10.0.0.1 255.255.255.0\n')
+        self.assertEqual(
+            self.tree.render('show run | sec address-family ipv4 vrf'),
+            ' address-family ipv4 vrf red\n'
+            '  neighbor 10.1.1.2 remote-as 65002\n'
+            ' exit-address-family\n')
+        self.assertEqual(
+            self.tree.render('show running-config | section ^interface'),
+            self.tree.text(self.tree.blocks[2:4]))
+        # a matched block is not repeated for its matching children
+        self.assertEqual(
+            self.tree.render('show running-config | section bgp|remote-as'),
+            self.tree.text([self.tree.blocks[4]]))
+        self.assertEqual(
+            self.tree.render('show running-config | section remote-as'),
+            ' neighbor 10.0.0.2 remote-as 65001\n'
+            '  neighbor 10.1.1.2 remote-as 65002\n')
+        self.assertEqual(self.tree.render('show running-config interface Gi9'),
+                         '')
+        self.assertIsNone(self.tree.render('show running-config aaa'))
+        self.assertIsNone(self.tree.render('show version'))
+
+
+class TestShowRunParsers(unittest.TestCase):
+
+    PARSERS = [
+        (ShowRunInterface, 'golden_output11', {'interface': 'tunnel100'}),
+        (ShowRunSectionBgp, 'golden_output_1', {}),
+        (ShowRunSectionVrfDefinition, 'golden_output', {}),
+        (ShowRunningConfigFlowMonitor, 'golden_output', {}),
+    ]
+
+    def test_single_fetch(self):
+        expected = []
+        config = []
+        for parser, name, kwargs in self.PARSERS:
+            with open(os.path.join(PARSER_ROOT, 'iosxe', 'tests',
+                                   parser.__name__, 'cli', 'equal',
+                                   name + '_output.txt')) as f:
+                output = f.read()
+            expected.append(parser(device=None).parse(output=output, **kwargs))
+            config.append(output.rstrip() + '\n!\n')
+
+        device = FakeDevice('R1', 'iosxe',
+                            {'show running-config': ''.join(config),
+                             'show running-config aaa': 'aaa new-model\n'})
+        with ParseSession(device):
+            results = [parser(device=device).parse(**kwargs)
+                       for parser, _, kwargs in self.PARSERS]
+            # views the tree can not render are executed on the device
+            self.assertEqual(execute_config_command(
+                device, 'show running-config aaa'), 'aaa new-model\n')
+        self.assertEqual(results, expected)
+        self.assertEqual(device.executed, ['show running-config',
+                                           'show running-config aaa'])
+
+
+if __name__ == '__main__':
+    unittest.main()
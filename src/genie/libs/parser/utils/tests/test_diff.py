@@ -0,0 +1,106 @@
+import copy
+import unittest
+
+from genie.libs.parser.iosxe.show_routing import ShowIpRoute
+from genie.libs.parser.utils.diff import ADDED, CHANGED, REMOVED, Change, \
+                                         ChangeTracker, Snapshot, diff
+from genie.libs.parser.utils.tests.fake_device import golden_outputs
+
+
+class TestDiff(unittest.TestCase):
+
+    def test_changes(self):
+        old = {'a': {'x': 1, 'y': {'z': 2}, 'age': '1d'},
+               'b': {'list': [1, {'c': 2}]},
+               'c': 1}
+        new = {'a': {'x': 2, 'y': {'z': 2}, 'age': '2d'},
+               'b': {'list': [1, {'c': 3}]},
+               'd': {'e': 1}}
+        self.assertEqual(diff(old, new, exclude=['age']), [
+            Change(('a', 'x'), CHANGED, 1, 2),
+            Change(('b', 'list'), CHANGED, [1, {'c': 2}], [1, {'c': 3}]),
+            Change(('c',), REMOVED, 1, None),
+            Change(('d',), ADDED, None, {'e': 1})])
+        self.assertEqual(diff(old, copy.deepcopy(old)), [])
+        # the order of the keys is not a change
+        self.assertEqual(diff({'a': 1, 'b': {'c': 1, 'd': 2}},
+                              {'b': {'d': 2, 'c': 1}, 'a': 1}), [])
+
+    def test_collisions(self):
+        # equal python hashes, or equal values of other types
+        for old, new in ((-1, -2), (1, True), (1, 1.0), (0, 2 ** 61 - 1),
+                         ([1], [True]), ([{'m': -1}], [{'m': -2}])):
+            with self.subTest(old=old, new=new):
+                self.assertEqual(diff({'a': {'m': old}}, {'a': {'m': new}}),
+                                 [Change(('a', 'm'), CHANGED, old, new)])
+                self.assertNotEqual(Snapshot({'m': old}).root,
+                                    Snapshot({'m': new}).root)
+        # the keys of exclude are left out of the dicts held by lists too
+        self.assertEqual(diff({'l': [{'age': 1, 'b': 1}], 'c': 1},
+                              {'l': [{'age': 2, 'b': 1}], 'c': 2}, ['age']),
+                         [Change(('c',), CHANGED, 1, 2)])
+
+    def test_snapshot(self):
+        old = Snapshot({'a': {'b': {'c': 1}, 'age': 1}, 'l': [1]}, ['age'])
+        new = Snapshot({'a': {'b': {'c': 1}, 'age': 2}, 'l': [2]}, ['age'])
+        self.assertEqual(old.digest(('a',)), new.digest(('a',)))
+        self.assertEqual(old.digest(), old.root)
+        self.assertNotEqual(old.root, new.root)
+        for path in (('a', 'age'), ('l',), ('missing',), ('l', 'x')):
+            self.assertIsNone(old.digest(path))
+        self.assertEqual(old.get(('a', 'b', 'c')), 1)
+        self.assertEqual(old.diff(new, path=('a',)), [])
+        self.assertEqual(old.diff(new, path=('l',)),
+                         [Change(('l',), CHANGED, [1], [2])])
+        self.assertEqual(old.diff(new, path=('x', 'y')), [])
+
+    def test_golden(self):
+        for output, arguments in golden_outputs('iosxe', 'ShowIpRoute'):
+            parsed = ShowIpRoute(device=None).parse(output=output,
+                                                    **arguments)
+            with self.subTest(routes=len(str(parsed))):
+                poll = copy.deepcopy(parsed)
+                self.assertEqual(diff(parsed, poll, ShowIpRoute.exclude), [])
+                for vrf in poll['vrf'].values():
+                    for family in vrf['address_family'].values():
+                        for route in family.get('routes', {}).values():
+                            for hop in route.get('next_hop', {}).get(
+                                    'next_hop_list', {}).values():
+                                hop['updated'] = 'changed'
+                self.assertEqual(diff(parsed, poll, ShowIpRoute.exclude), [])
+
+    def test_shared(self):
+        routes = {'10.0.{}.0/24'.format(index): {'metric': index,
+                                                 'next_hop': {'1': 'Gi1'}}
+                  for index in range(100)}
+        first = {'routes': routes}
+        second = {'routes': dict(routes)}
+        second['routes']['10.0.1.0/24'] = {'metric': 5,
+                                           'next_hop': {'1': 'Gi1'}}
+        old = Snapshot(first)
+        new = Snapshot(second, previous=old)
+        self.assertEqual(new.reused, 99)
+        self.assertEqual(old.diff(new), [
+            Change(('routes', '10.0.1.0/24', 'metric'), CHANGED, 1, 5)])
+        # the dicts of a shared entry are digested when asked for
+        path = ('routes', '10.0.2.0/24', 'next_hop')
+        self.assertEqual(new.digest(path), old.digest(path))
+        third = {'routes': dict(second['routes'])}
+        third['routes']['10.0.2.0/24'] = {'metric': 2,
+                                          'next_hop': {'1': 'Gi2'}}
+        self.assertEqual(new.diff(Snapshot(third, previous=new)), [
+            Change(path + ('1',), CHANGED, 'Gi1', 'Gi2')])
+
+    def test_tracker(self):
+        tracker = ChangeTracker(exclude=['updated'])
+        self.assertEqual(tracker.update({'a': {'updated': 1, 'b': 1}}), [])
+        self.assertEqual(tracker.update({'a': {'updated': 2, 'b': 1}}), [])
+        self.assertEqual(tracker.update({'a': {'updated': 3, 'b': 2}}),
+                         [Change(('a', 'b'), CHANGED, 1, 2)])
+        self.assertEqual(tracker.update({}),
+                         [Change(('a',), REMOVED, {'updated': 3, 'b': 2},
+                                 None)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,326 @@
+import heapq
+import unittest
+
+from genie.libs.parser.iosxe.show_isis import ShowIsisDatabaseDetail
+from genie.libs.parser.iosxe.show_ospf_database import \
+    ShowIpOspfDatabaseNetwork, ShowIpOspfDatabaseOpaqueArea, \
+    ShowIpOspfDatabaseRouter
+from genie.libs.parser.iosxr.show_isis import ShowIsisDatabaseDetail as \
+                                               XrShowIsisDatabaseDetail
+from genie.libs.parser.utils.benchmark import IsisDomainWorkload, \
+                                              OspfAreaWorkload
+from genie.libs.parser.utils.graph import Graph, IsisGraph, NETWORK, \
+                                          NodeTable, OspfGraph, lsp_node
+from genie.libs.parser.utils.tests.fake_device import golden_outputs
+
+
+def dict_spf(workload, source):
+    # dijkstra over the links of the workload, as a consumer of the parsed
+    # dicts would do it
+    adjacency = {}
+    for router in range(workload.routers):
+        router_id = workload.router_id(router)
+        adjacency.setdefault(router_id, {}).update(workload.links[router])
+    for lan, members in workload.lans.items():
+        network = (NETWORK, workload.lan_address(lan))
+        for member in members:
+            router_id = workload.router_id(member)
+            adjacency[router_id][network] = 10
+            adjacency.setdefault(network, {})[router_id] = 0
+    distances, heap = {}, [(0, str(source), source)]
+    while heap:
+        distance, _, node = heapq.heappop(heap)
+        if node in distances:
+            continue
+        distances[node] = distance
+        for target, metric in adjacency[node].items():
+            if target not in distances:
+                heapq.heappush(heap, (distance + metric, str(target),
+                                      target))
+    return {node: distance for node, distance in distances.items()
+            if not isinstance(node, tuple)}
+
+
+def golden_area():
+    # router and network lsas of the same area in the golden outputs
+    graph = OspfGraph()
+    for output, arguments in golden_outputs('iosxe',
+                                            'ShowIpOspfDatabaseRouter'):
+        if '10.4.1.1' in output:
+            graph.update(ShowIpOspfDatabaseRouter(device=None).parse(
+                output=output, **arguments))
+    for output, arguments in golden_outputs('iosxe',
+                                            'ShowIpOspfDatabaseNetwork'):
+        graph.update(ShowIpOspfDatabaseNetwork(device=None).parse(
+            output=output, **arguments))
+    return graph
+
+
+class TestGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = Graph()
+        self.graph.set_edges('a', [('b', 1), ('c', 2), ('c', 1)])
+        self.graph.set_edges('b', [('a', 1), ('d', 2)])
+        self.graph.set_edges('c', [('a', 1), ('d', 2), ('lan', 1)])
+        self.graph.set_edges('d', [('b', 2), ('c', 2), ('e', 1)])
+        self.graph.set_edges('lan', [('c', 0), ('f', 0)], pseudo=True)
+        self.graph.set_edges('f', [('lan', 5)])
+
+    def test_csr(self):
+        offsets, targets, weights = self.graph.csr()
+        number = self.graph.nodes.get
+        start, end = offsets[number('a')], offsets[number('a') + 1]
+        # the lowest weight of a repeated target is kept
+        self.assertEqual(dict(zip(targets[start:end], weights[start:end])),
+                         {number('b'): 1, number('c'): 1})
+        # d -> e has no reverse edge
+        offsets, targets, _ = self.graph.csr(two_way=True)
+        self.assertNotIn(number('e'), targets)
+        self.assertIs(self.graph.csr(two_way=True)[0], offsets)
+        # a change rebuilds the rows
+        self.assertFalse(self.graph.set_edges('f', [('lan', 5)]))
+        self.assertTrue(self.graph.set_edges('f', [('lan', 6)]))
+        self.assertIsNot(self.graph.csr(two_way=True)[0], offsets)
+
+    def test_spf(self):
+        paths = self.graph.spf('a')
+        self.assertEqual(dict(paths.reachable()),
+                         {'a': 0, 'b': 1, 'c': 1, 'd': 3, 'f': 2})
+        self.assertIsNone(paths.distance('e'))
+        self.assertIsNone(paths.distance('unknown'))
+        self.assertEqual(paths.path('f'), ['a', 'c', 'lan', 'f'])
+        # equal cost paths through b and c
+        self.assertEqual(paths.first_hops('d'), {'b', 'c'})
+        self.assertEqual(paths.first_hops('f'), {'c'})
+        self.assertEqual(paths.first_hops('a'), set())
+        # without the two way check d reaches e
+        self.assertEqual(self.graph.spf('a', two_way=False).distance('e'), 4)
+        with self.assertRaises(KeyError):
+            self.graph.spf('unknown')
+
+    def test_pseudonode(self):
+        # the routers behind a pseudonode next to the source are first hops
+        paths = self.graph.spf('f')
+        self.assertEqual(paths.first_hops('c'), {'c'})
+        self.assertEqual(paths.first_hops('a'), {'c'})
+        self.assertEqual(paths.first_hops('lan'), set())
+
+    def test_pseudonode_equal_cost(self):
+        # lan is next to a and at the same cost through b, the routers
+        # behind it are reached through both
+        graph = Graph()
+        graph.set_edges('a', [('b', 1), ('lan', 3)])
+        graph.set_edges('b', [('a', 2), ('lan', 2)])
+        graph.set_edges('lan', [('a', 0), ('b', 0), ('c', 0)], pseudo=True)
+        graph.set_edges('c', [('lan', 2)])
+        paths = graph.spf('a')
+        self.assertEqual(paths.distance('c'), 3)
+        self.assertEqual(paths.first_hops('c'), {'b', 'c'})
+        self.assertEqual(paths.first_hops('lan'), {'b'})
+
+    def test_shared_nodes(self):
+        # graphs sharing a node table keep their own edges
+        nodes = NodeTable()
+        first, second = Graph(nodes), Graph(nodes)
+        first.set_edges('a', [('b', 1)])
+        first.set_edges('b', [('a', 1)])
+        second.set_edges('c', [('a', 2)])
+        second.set_edges('a', [('c', 2)])
+        self.assertEqual(len(nodes), 3)
+        self.assertEqual(dict(first.spf('a').reachable()), {'a': 0, 'b': 1})
+        self.assertEqual(dict(second.spf('c').reachable()), {'a': 2, 'c': 0})
+        with self.assertRaises(KeyError):
+            first.spf('c')
+
+    def test_transit(self):
+        # paths end at the nodes not used as transit but do not cross them
+        number = self.graph.nodes.get
+        paths = self.graph.spf('a', transit=lambda node: node != number('b'))
+        self.assertEqual(paths.distance('b'), 1)
+        self.assertEqual(paths.first_hops('d'), {'c'})
+
+
+class TestOspfGraph(unittest.TestCase):
+
+    def test_golden(self):
+        graph = golden_area()
+        paths = graph.spf('10.4.1.1')
+        self.assertEqual(dict(paths.reachable()),
+                         {'10.4.1.1': 0, '10.16.2.2': 1, '10.64.4.4': 1,
+                          '10.36.3.3': 2})
+        self.assertEqual(paths.first_hops('10.36.3.3'),
+                         {'10.16.2.2', '10.64.4.4'})
+        self.assertEqual(paths.path('10.64.4.4'),
+                         ['10.4.1.1', (NETWORK, '10.1.4.4'), '10.64.4.4'])
+        self.assertEqual(graph.routes('10.4.1.1')['10.36.3.3/32'],
+                         (3, {'10.36.3.3'}))
+
+    def test_te_metric(self):
+        graph = golden_area()
+        graph.te_metric = True
+        for output, arguments in golden_outputs(
+                'iosxe', 'ShowIpOspfDatabaseOpaqueArea'):
+            graph.update(ShowIpOspfDatabaseOpaqueArea(device=None).parse(
+                output=output, **arguments))
+        self.assertEqual(graph._te['10.4.1.1'], {'10.1.4.4': 1,
+                                                 '10.1.2.1': 1})
+        self.assertEqual(graph.spf('10.4.1.1').distance('10.36.3.3'), 2)
+
+    def test_synthetic(self):
+        workload = OspfAreaWorkload(routers=300, seed=1)
+        graph = OspfGraph(area='0.0.0.0')
+        self.assertEqual(graph.update(workload.router_lsas())['added'], 300)
+        graph.update(workload.network_lsas())
+        for router in (0, 7, 150):
+            source = workload.router_id(router)
+            self.assertEqual(dict(graph.spf(source).reachable()),
+                             dict_spf(workload, source))
+
+    def test_update(self):
+        workload = OspfAreaWorkload(routers=200, seed=2)
+        graph = OspfGraph(area='0.0.0.0')
+        graph.update(workload.router_lsas())
+        graph.update(workload.network_lsas())
+        self.assertEqual(graph.update(workload.router_lsas()),
+                         {'added': 0, 'changed': 0, 'removed': 0,
+                          'unchanged': 200})
+        workload.change(5)
+        counts = graph.update(workload.router_lsas())
+        self.assertEqual((counts['changed'], counts['unchanged']), (5, 195))
+        source = workload.router_id(0)
+        self.assertEqual(dict(graph.spf(source).reachable()),
+                         dict_spf(workload, source))
+
+        # a router whose lsa is withdrawn is no longer reached
+        parsed = workload.router_lsas()
+        lsas = parsed['vrf']['default']['address_family']['ipv4'][
+            'instance']['1']['areas']['0.0.0.0']['database']['lsa_types'][
+            1]['lsas']
+        withdrawn = workload.router_id(100)
+        del lsas['{} {}'.format(withdrawn, withdrawn)]
+        self.assertEqual(graph.update(parsed)['removed'], 1)
+        paths = graph.spf(source)
+        self.assertIsNone(paths.distance(withdrawn))
+        self.assertNotIn('{}/32'.format(withdrawn), graph.routes(source))
+
+    def test_area(self):
+        workload = OspfAreaWorkload(routers=10)
+        graph = OspfGraph(area='0.0.0.1')
+        self.assertEqual(graph.update(workload.router_lsas())['added'], 0)
+        self.assertEqual(len(graph.graph), 0)
+
+
+class TestIsisGraph(unittest.TestCase):
+
+    def test_lsp_node(self):
+        self.assertEqual(lsp_node('R1.00-00'), ('R1', 0, False))
+        self.assertEqual(lsp_node('R1.02-0A'), ('R1.02', 10, True))
+        self.assertEqual(lsp_node('0000.0CFF.0C35.00-01'),
+                         ('0000.0CFF.0C35', 1, False))
+
+    def test_golden(self):
+        for os_name, parser_class in (('iosxe', ShowIsisDatabaseDetail),
+                                      ('iosxr', XrShowIsisDatabaseDetail)):
+            for output, arguments in golden_outputs(os_name,
+                                                    'ShowIsisDatabaseDetail'):
+                with self.subTest(os=os_name):
+                    parsed = parser_class(device=None).parse(output=output,
+                                                             **arguments)
+                    graph = IsisGraph()
+                    counts = graph.update(parsed)
+                    self.assertEqual(counts['added'], len(graph.lsps))
+                    self.assertEqual(graph.update(parsed)['unchanged'],
+                                     len(graph.lsps))
+
+        output, arguments = golden_outputs('iosxe',
+                                           'ShowIsisDatabaseDetail')[0]
+        parsed = ShowIsisDatabaseDetail(device=None).parse(output=output,
+                                                           **arguments)
+        graph = IsisGraph()
+        graph.update(parsed)
+        for level in (1, 2):
+            self.assertEqual(graph.reachable('R1_xe', level),
+                             {'R1_xe': 0, 'R2_xr': 10, 'R3_nx': 10})
+            paths = graph.spf('R1_xe', level)
+            self.assertEqual(paths.path('R3_nx'),
+                             ['R1_xe', 'R1_xe.02', 'R3_nx'])
+            self.assertEqual(paths.first_hops('R3_nx'), {'R3_nx'})
+        self.assertEqual(graph.routes('R1_xe', 2)['10.36.3.3/32'],
+                         (11, {'R3_nx'}))
+
+    def test_topology(self):
+        parsed = XrShowIsisDatabaseDetail(device=None).parse(
+            output=golden_outputs('iosxr', 'ShowIsisDatabaseDetail')[-1][0])
+        # these systems only advertise ipv6 multi-topology neighbors
+        ipv4, ipv6 = IsisGraph(), IsisGraph(topology='ipv6')
+        ipv4.update(parsed)
+        ipv6.update(parsed)
+        system = lsp_node(next(key for _, key in ipv6.lsps))[0]
+        self.assertEqual(len(ipv4.reachable(system)), 1)
+        self.assertGreater(len(ipv6.reachable(system)), 1)
+        with self.assertRaises(ValueError):
+            IsisGraph(topology='clns')
+
+    def test_fragments(self):
+        workload = IsisDomainWorkload(routers=100, seed=3)
+        parsed = workload.lsps()
+        lsps = parsed['tag']['core']['level'][2]
+        graph = IsisGraph()
+        graph.update(parsed)
+        # the prefixes of both fragments belong to the system
+        distance = graph.spf('R4').distance('R0')
+        self.assertEqual(graph.routes('R4')['172.16.0.0/24'],
+                         (distance + 10, {'R0'}))
+        self.assertIn('10.0.0.1/32', graph.prefixes[2]['R0'])
+        # withdrawing the second fragment keeps the adjacencies of the first
+        del lsps['R0.00-01']
+        counts = graph.update(parsed)
+        self.assertEqual((counts['removed'], counts['unchanged']),
+                         (1, len(lsps)))
+        self.assertNotIn('172.16.0.0/24', graph.routes('R4'))
+        self.assertEqual(graph.reachable('R4')['R0'],
+                         graph.spf('R0').distance('R4'))
+        # withdrawing the first one as well removes the system
+        del lsps['R0.00-00']
+        graph.update(parsed)
+        self.assertNotIn('R0', graph.reachable('R4'))
+        self.assertNotIn('R0', graph.prefixes[2])
+
+    def test_update(self):
+        workload = IsisDomainWorkload(routers=200, seed=4)
+        graph = IsisGraph()
+        graph.update(workload.lsps())
+        workload.change(5)
+        counts = graph.update(workload.lsps())
+        self.assertEqual(counts['changed'], 5)
+        rebuilt = IsisGraph()
+        rebuilt.update(workload.lsps())
+        for system in ('R0', 'R77', 'R150'):
+            self.assertEqual(graph.reachable(system),
+                             rebuilt.reachable(system))
+            self.assertEqual(graph.routes(system), rebuilt.routes(system))
+
+    def test_overload(self):
+        workload = IsisDomainWorkload(routers=50, seed=5)
+        parsed = workload.lsps()
+        graph = IsisGraph()
+        graph.update(parsed)
+        paths = graph.spf('R0')
+        through = next(system for system, _ in paths.reachable()
+                       if system != 'R0' and any(
+                           paths.path(other)[1:-1].count(system)
+                           for other, _ in paths.reachable()))
+        lsp = parsed['tag']['core']['level'][2][through + '.00-00']
+        lsp['overload_bit'] = 1
+        lsp['lsp_sequence_num'] = '0x00000002'
+        graph.update(parsed)
+        paths = graph.spf('R0')
+        # still reached, no longer crossed
+        self.assertIsNotNone(paths.distance(through))
+        for system, _ in paths.reachable():
+            self.assertNotIn(through, paths.path(system)[1:-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
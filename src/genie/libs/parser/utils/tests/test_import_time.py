@@ -0,0 +1,26 @@
+import unittest
+
+from genie.libs.parser.utils.benchmark import import_time
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_lazy_imports(self):
+        result = import_time('genie.libs.parser.utils', runs=1)
+        self.assertIsNotNone(result['cumulative_us'])
+
+        # only loaded once a CaaS parser, an extension or a parser runs
+        for module in ('pkg_resources', 'pyats.tcl', 'genie.metaparser',
+                       'genie.json.make_json', 'genie.libs.parser.base'):
+            self.assertNotIn(module, result['imported'])
+
+    def test_lazy_base_attributes(self):
+        from genie.libs import parser
+        from genie.libs.parser.base import CaasMetaParser
+        self.assertIs(parser.CaasMetaParser, CaasMetaParser)
+        with self.assertRaises(AttributeError):
+            parser.not_a_parser_attribute
+
+
+if __name__ == '__main__':
+    unittest.main()
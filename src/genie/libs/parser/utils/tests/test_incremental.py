@@ -0,0 +1,78 @@
+import unittest
+
+from genie.libs.parser.iosxe.show_interface import ShowInterfaces
+from genie.libs.parser.iosxe.show_run import ShowRunInterface
+from genie.libs.parser.nxos.show_interface import ShowInterface
+from genie.libs.parser.utils import synthetic
+from genie.libs.parser.utils.incremental import IncrementalParser, \
+                                                split_blocks
+from genie.libs.parser.utils.tests.fake_device import FakeDevice, \
+                                                      golden_outputs
+
+
+class TestIncrementalParser(unittest.TestCase):
+
+    def test_golden_outputs(self):
+        for os_name, parser_class in (('iosxe', ShowInterfaces),
+                                      ('iosxe', ShowRunInterface),
+                                      ('nxos', ShowInterface)):
+            for index, (output, arguments) in enumerate(
+                    golden_outputs(os_name, parser_class.__name__)):
+                with self.subTest(parser=parser_class.__name__, index=index):
+                    poller = IncrementalParser(parser_class, **arguments)
+                    expected = parser_class(device=None).parse(
+                        output=output, **poller.kwargs)
+                    self.assertEqual(poller.parse(output), expected)
+                    self.assertEqual(poller.parse(output), expected)
+                    self.assertEqual(poller.parsed_blocks, 0)
+
+    def test_changes(self):
+        output = synthetic.iosxe_show_interfaces(20)
+        blocks = split_blocks(output, ShowInterfaces.block_header)
+        self.assertEqual(len(blocks), 20)
+
+        device = FakeDevice('R1', 'iosxe', {'show interfaces': output})
+        poller = IncrementalParser(ShowInterfaces, device=device,
+                                   command='show interfaces')
+        first = poller.parse()
+        self.assertEqual(poller.parsed_blocks, 20)
+        self.assertEqual(len(poller.changes.added), 20)
+
+        # one counter moves, one interface is removed
+        blocks[3] = blocks[3].replace('packets input', 'packets input ', 1) \
+            .replace(' packets input ', '1 packets input')
+        del blocks[7]
+        second_output = '\n'.join(blocks)
+        second = poller.parse(second_output)
+        self.assertEqual(second, ShowInterfaces(device=None).parse(
+            output=second_output))
+        self.assertEqual((poller.parsed_blocks, poller.reused_blocks), (1, 18))
+        self.assertEqual(poller.changes.changed, {'GigabitEthernet1/0/4'})
+        self.assertEqual(poller.changes.removed, {'GigabitEthernet1/0/8'})
+        self.assertEqual(poller.changes.added, set())
+        # the unchanged sub-dicts are shared, the previous result is intact
+        self.assertIs(second['GigabitEthernet1/0/1'],
+                      first['GigabitEthernet1/0/1'])
+        self.assertIn('GigabitEthernet1/0/8', first)
+
+    def test_unnumbered_reference(self):
+        output, arguments = golden_outputs('iosxe', 'ShowInterfaces')[24]
+        poller = IncrementalParser(ShowInterfaces, **arguments)
+        expected = ShowInterfaces(device=None).parse(output=output)
+        self.assertEqual(poller.parse(output), expected)
+
+        # the referenced loopback changes, the unnumbered interface follows
+        changed = output.replace('Loopback0 is up, line protocol is up',
+                                 'Loopback0 is up, line protocol is up ')
+        poller.parse(changed)
+        self.assertEqual(poller.changes.changed,
+                         {'Loopback0', 'GigabitEthernet3'})
+
+    def test_not_supported(self):
+        from genie.libs.parser.iosxe.show_routing import ShowIpRoute
+        with self.assertRaises(TypeError):
+            IncrementalParser(ShowIpRoute)
+
+
+if __name__ == '__main__':
+    unittest.main()
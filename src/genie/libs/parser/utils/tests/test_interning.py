@@ -0,0 +1,113 @@
+import unittest
+
+from genie.libs.parser.iosxe.show_arp import ShowArp
+from genie.libs.parser.iosxe.show_bgp import ShowBgpAllDetail
+from genie.libs.parser.iosxe.show_fdb import ShowMacAddressTable
+from genie.libs.parser.iosxe.show_routing import ShowIpRoute
+from genie.libs.parser.nxos.show_arp import ShowIpArp as NxosShowIpArp
+from genie.libs.parser.nxos.show_fdb import ShowMacAddressTable as \
+                                            NxosShowMacAddressTable
+from genie.libs.parser.nxos.show_routing import ShowIpRoute as \
+                                                NxosShowIpRoute
+from genie.libs.parser.utils import synthetic
+from genie.libs.parser.utils.interning import Interner, InternMixin, \
+                                              intern_parsed
+from genie.libs.parser.utils.tests.fake_device import golden_outputs
+
+PARSERS = [('iosxe', ShowIpRoute),
+           ('nxos', NxosShowIpRoute),
+           ('iosxe', ShowBgpAllDetail),
+           ('iosxe', ShowMacAddressTable),
+           ('nxos', NxosShowMacAddressTable),
+           ('iosxe', ShowArp),
+           ('nxos', NxosShowIpArp)]
+
+
+def fresh(text):
+    # a str built at run time, not shared with the constants of the module
+    return ''.join(list(text))
+
+
+class TestInterner(unittest.TestCase):
+
+    def test_intern_parsed(self):
+        parsed = {fresh('Gi1'): {'state': fresh('up'), 'vlan': 10,
+                                 'peers': [fresh('10.0.0.1')],
+                                 'neighbors': [{'name': fresh('R2')}]},
+                  fresh('Gi2'): {'state': fresh('up'), 'vlan': 10,
+                                 'peers': [fresh('10.0.0.1'), None],
+                                 'neighbors': [{'name': fresh('R2')}],
+                                 'description': fresh('uplink'),
+                                 'member_of': fresh('Gi1')}}
+        interned = intern_parsed(parsed, fields=('state', 'peers', 'name',
+                                                 'member_of'))
+        self.assertEqual(interned, parsed)
+        self.assertEqual(list(interned), list(parsed))
+        first, second = interned['Gi1'], interned['Gi2']
+        self.assertIs(first['state'], second['state'])
+        self.assertIs(first['peers'][0], second['peers'][0])
+        self.assertIs(first['neighbors'][0]['name'],
+                      second['neighbors'][0]['name'])
+        # a field value and an equal key are one instance
+        self.assertIs(second['member_of'], next(iter(interned)))
+        # the other fields are not interned
+        self.assertIs(second['description'], parsed['Gi2']['description'])
+
+    def test_scope(self):
+        interner = Interner()
+        interner.intern_parsed({fresh('Gi1'): {}})
+        self.assertEqual(len(interner), 1)
+        self.assertIs(interner(fresh('Gi1')), interner('Gi1'))
+        # a new interner does not know the strings of the last one
+        self.assertEqual(len(Interner()), 0)
+
+
+class TestInternMixin(unittest.TestCase):
+
+    def test_parsers(self):
+        for os_name, parser_class in PARSERS:
+            self.assertTrue(issubclass(parser_class, InternMixin))
+            self.assertTrue(parser_class.intern_fields)
+            for output, arguments in golden_outputs(os_name,
+                                                    parser_class.__name__):
+                with self.subTest(os=os_name, parser=parser_class.__name__):
+                    self.assertEqual(
+                        parser_class(device=None).parse(
+                            output=output, intern_strings=True,
+                            **arguments),
+                        parser_class(device=None).parse(output=output,
+                                                        **arguments))
+
+    def test_shared_values(self):
+        parsed = ShowMacAddressTable(device=None).parse(
+            output=synthetic.iosxe_show_mac_address_table(2000),
+            intern_strings=True)
+        interfaces = {}
+        entry_types = set()
+        for vlan in parsed['mac_table']['vlans'].values():
+            for mac in vlan['mac_addresses'].values():
+                for name, interface in mac['interfaces'].items():
+                    interfaces.setdefault(name, set()).update(
+                        (id(name), id(interface['interface'])))
+                    entry_types.add(id(interface['entry_type']))
+        # one instance per interface name, key and value
+        self.assertTrue(all(len(ids) == 1 for ids in interfaces.values()))
+        self.assertLessEqual(len(entry_types), 2)
+
+    def test_routes(self):
+        parsed = ShowIpRoute(device=None).parse(
+            output=synthetic.iosxe_show_ip_route(1000), intern_strings=True)
+        next_hops = {}
+        routes = parsed['vrf']['default']['address_family']['ipv4']['routes']
+        for route in routes.values():
+            for path in route.get('next_hop', {}).get('next_hop_list',
+                                                      {}).values():
+                next_hops.setdefault(path['next_hop'], set()).add(
+                    id(path['next_hop']))
+        # one instance per next hop
+        self.assertLess(len(next_hops), len(routes))
+        self.assertTrue(all(len(ids) == 1 for ids in next_hops.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,233 @@
+import unittest
+import warnings
+
+from genie.libs.parser.nxos.show_bgp import ShowBgpSessions, \
+                                            ShowBgpProcessVrfAll, \
+                                            ShowBgpPolicyStatisticsNeighbor
+from genie.libs.parser.utils.common import Common
+from genie.libs.parser.utils.tests.fake_device import FakeDevice
+
+NAMESPACE = '{http://www.cisco.com/nxos:7.0.3.I7.1.:bgp}'
+
+
+def element(tag, *children, text=None):
+    if text is not None:
+        return '<{t}>{x}</{t}>'.format(t=tag, x=text)
+    return '<{t}>{c}</{t}>'.format(t=tag, c=''.join(children))
+
+
+def reply(path, body):
+    '''NX-OS `| xml` reply, `path` holds the command tags and
+    (__XML__PARAM__ tag, value) pairs'''
+    for tag in reversed(path):
+        if isinstance(tag, tuple):
+            body = element(tag[0], element('__XML__value', text=tag[1]), body)
+        else:
+            body = element(tag, body)
+    return ('<?xml version="1.0" encoding="ISO-8859-1"?>\n'
+            '<nf:rpc-reply xmlns:nf="urn:ietf:params:xml:ns:netconf:base:1.0"'
+            ' xmlns="http://www.cisco.com/nxos:7.0.3.I7.1.:bgp">\n'
+            '<nf:data>' + body + '</nf:data>\n</nf:rpc-reply>\n]]>]]>\n')
+
+
+def sessions_reply(vrfs=2, neighbors=2):
+    rows = []
+    for vrf in range(vrfs):
+        rows.append(element(
+            'ROW_vrf',
+            element('vrf-name-out', text='VRF{}'.format(vrf)),
+            element('local-as', text='333'),
+            element('vrfpeers', text=str(neighbors)),
+            element('vrfestablishedpeers', text=str(neighbors)),
+            element('router-id', text='10.106.0.{}'.format(vrf)),
+            element('TABLE_neighbor', *[element(
+                'ROW_neighbor',
+                element('neighbor-id', text='10.{}.0.{}'.format(vrf, index)),
+                element('connectionsdropped', text='0'),
+                element('remoteas', text='65001'),
+                element('lastflap', text='PT1H4M41S'),
+                element('lastread', text='PT47S'),
+                element('lastwrite', text='PT3S'),
+                element('state', text='Established'),
+                element('localport', text='179'),
+                element('remoteport', text='41000'),
+                element('notificationssent', text='0'),
+                element('notificationsreceived', text='0'))
+                for index in range(neighbors)])))
+    return reply(['show', 'bgp', 'sessions'], element(
+        '__readonly__',
+        element('totalpeers', text=str(vrfs * neighbors)),
+        element('totalestablishedpeers', text=str(vrfs * neighbors)),
+        element('localas', text='333'),
+        element('TABLE_vrf', *rows)))
+
+
+class TestIterparseXml(unittest.TestCase):
+
+    def test_rows(self):
+        output = sessions_reply(vrfs=3, neighbors=2)
+        seen = []
+        for namespace, row in Common.iterparse_xml(
+                output, rows=('vrf', 'neighbor'), readonly=True,
+                expect_command='show bgp sessions'):
+            self.assertEqual(namespace, NAMESPACE)
+            tag = row.tag.replace(namespace, '')
+            if tag == 'ROW_vrf':
+                # the neighbors were handed out and removed before
+                self.assertEqual(
+                    len(row.find('{}TABLE_neighbor'.format(namespace))), 0)
+                tag += ' ' + row.find('{}vrf-name-out'.format(namespace)).text
+            elif tag == 'ROW_neighbor':
+                tag += ' ' + row.find('{}neighbor-id'.format(namespace)).text
+            seen.append(tag)
+        self.assertEqual(seen, [
+            'totalpeers', 'totalestablishedpeers', 'localas',
+            'ROW_neighbor 10.0.0.0', 'ROW_neighbor 10.0.0.1', 'ROW_vrf VRF0',
+            'ROW_neighbor 10.1.0.0', 'ROW_neighbor 10.1.0.1', 'ROW_vrf VRF1',
+            'ROW_neighbor 10.2.0.0', 'ROW_neighbor 10.2.0.1', 'ROW_vrf VRF2'])
+
+    def test_chunks(self):
+        output = sessions_reply(vrfs=4, neighbors=3)
+        # junk characters in the middle of the reply are dropped as well
+        output = output.replace('<TABLE_vrf>', ']]>]]><TABLE_vrf>')
+        expected = [row.find('{}vrf-name-out'.format(NAMESPACE)).text
+                    for _, row in Common.iterparse_xml(output, rows=('vrf',))]
+        self.assertEqual(expected, ['VRF0', 'VRF1', 'VRF2', 'VRF3'])
+        for chunk_size in (1, 5, 64):
+            self.assertEqual(
+                [row.find('{}vrf-name-out'.format(NAMESPACE)).text
+                 for _, row in Common.iterparse_xml(
+                     output, rows=('vrf',), chunk_size=chunk_size)],
+                expected)
+
+    def test_command(self):
+        output = reply(['show', 'bgp', 'vrf', ('__XML__PARAM__vrf-name', 'red'),
+                        'ipv4', 'unicast', 'policy', 'statistics',
+                        'redistribute'],
+                       element('__readonly__', element('TABLE_vrf')))
+        self.assertEqual(list(Common.iterparse_xml(
+            output, rows=('vrf',),
+            expect_command='show bgp vrf red ipv4 unicast policy statistics '
+                           'redistribute')), [])
+        with self.assertRaises(AssertionError):
+            list(Common.iterparse_xml(
+                output, expect_command='show bgp vrf blue ipv4 unicast policy '
+                                       'statistics redistribute'))
+
+        # command without any output
+        output = reply(['show', 'bgp', 'sessions'], '')
+        self.assertEqual(list(Common.iterparse_xml(
+            output, expect_command='show bgp sessions')), [])
+        with self.assertRaises(AssertionError):
+            list(Common.iterparse_xml(output, expect_command='show bgp'))
+
+        # no show element, nothing to compare
+        self.assertEqual(list(Common.iterparse_xml(
+            '<rpc-reply><data/></rpc-reply>', expect_command='show bgp')), [])
+
+    def test_missing_readonly(self):
+        output = reply(['show', 'bgp', 'sessions'],
+                       element('TABLE_vrf', element(
+                           'ROW_vrf', element('vrf-name-out', text='red'))))
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            rows = list(Common.iterparse_xml(
+                output, rows=('vrf',), expect_command='show bgp sessions'))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(len(caught), 1)
+
+
+class TestBgpXmlParsers(unittest.TestCase):
+
+    def test_sessions(self):
+        device = FakeDevice('R1', 'nxos',
+                            {'show bgp sessions | xml': sessions_reply()})
+        parsed = ShowBgpSessions(device=device).xml()
+        self.assertEqual(
+            (parsed['total_peers'], parsed['total_established_peers'],
+             parsed['local_as']), (4, 4, 333))
+        self.assertEqual(sorted(parsed['vrf']), ['VRF0', 'VRF1'])
+        self.assertEqual(parsed['vrf']['VRF1']['neighbor']['10.1.0.1'], {
+            'connections_dropped': 0, 'remote_as': 65001,
+            'last_flap': '01:04:41', 'last_read': '00:00:47',
+            'last_write': '00:00:03', 'state': 'established',
+            'local_port': 179, 'remote_port': 41000,
+            'notifications_sent': 0, 'notifications_received': 0})
+
+    def test_sessions_empty_age(self):
+        output = sessions_reply(vrfs=3, neighbors=4)
+        output = output.replace('<lastread>PT47S</lastread>',
+                                '<lastread></lastread>', 1)
+        device = FakeDevice('R1', 'nxos', {'show bgp sessions | xml': output})
+        parsed = ShowBgpSessions(device=device).xml()
+        self.assertEqual(parsed['total_peers'], 12)
+        neighbors = [neighbor for vrf in parsed['vrf'].values()
+                     for neighbor in vrf['neighbor'].values()]
+        self.assertEqual(len(neighbors), 12)
+        self.assertEqual(sum(neighbor['last_read'] == 'never'
+                             for neighbor in neighbors), 1)
+
+    def test_process(self):
+        body = element(
+            '__readonly__',
+            element('processid', text='29474'),
+            element('protocolstate', text='Running'),
+            element('forwardingstatesaved', text='false'),
+            element('TABLE_vrf', element(
+                'ROW_vrf',
+                element('vrf-name-out', text='default'),
+                element('vrf-id', text='1'),
+                element('vrf-est-peers', text='2'),
+                element('TABLE_af', element(
+                    'ROW_af',
+                    element('af-name', text='IPv4 Unicast'),
+                    element('af-table-id', text='1'))))))
+        output = reply(['show', 'bgp',
+                        '__XML__OPT_Cmd_show_ip_bgp_session_cmd_vrf',
+                        'process', '__XML__OPT_Cmd_show_bgp_process_cmd_vrf',
+                        '__XML__OPT_Cmd_show_bgp_process_cmd___readonly__'],
+                       body)
+        self.assertEqual(ShowBgpProcessVrfAll(device=None).xml(output=output), {
+            'bgp_pid': 29474,
+            'bgp_protocol_state': 'running',
+            'bgp_performance_mode': 'No',
+            'vrf': {'default': {
+                'vrf_id': '1',
+                'num_established_peers': 2,
+                'vrf_rd': 'not configured',
+                'address_family': {'ipv4 unicast': {'table_id': '0x1'}}}}})
+
+    def test_policy_statistics(self):
+        command = 'show bgp vrf red ipv4 unicast policy statistics neighbor ' \
+                  '10.1.1.1'
+        body = element('TABLE_vrf', element(
+            'ROW_vrf',
+            element('vrf-name-polstats', text='red'),
+            element('rpm-handle-count', text='1'),
+            element('TABLE_rmap', element(
+                'ROW_rmap',
+                element('name', text='RM1'),
+                element('action', text='permit'),
+                element('seqnum', text='10'),
+                element('totalacceptcount', text='2'),
+                element('totalrejectcount', text='0'),
+                element('TABLE_cmd', element(
+                    'ROW_cmd',
+                    element('command', text='match ip address prefix-list p1'),
+                    element('comparecount', text='2'),
+                    element('matchcount', text='1')))))))
+        output = reply(['show', 'bgp', 'vrf', ('__XML__PARAM__vrf-name', 'red'),
+                        'ipv4', 'unicast', 'policy', 'statistics', 'neighbor',
+                        ('__XML__PARAM__neighbor-id', '10.1.1.1')],
+                       element('__readonly__', body))
+        device = FakeDevice('R1', 'nxos', {command + ' | xml': output})
+        parsed = ShowBgpPolicyStatisticsNeighbor(device=device).xml(
+            address_family='ipv4 unicast', neighbor='10.1.1.1', vrf='red')
+        self.assertEqual(parsed['vrf']['red']['rpm_handle_count'], 1)
+        self.assertEqual(
+            parsed['vrf']['red']['route_map']['RM1'][1]['total_accept_count'],
+            2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+import os
+import json
+import unittest
+
+from genie.libs.parser.nxos.show_interface import ShowInterface
+from genie.libs.parser.nxos.show_routing import ShowIpRoute, ShowRouting
+from genie.libs.parser.utils import synthetic
+from genie.libs.parser.utils.benchmark import json_benchmark
+from genie.libs.parser.utils.common import Common
+from genie.libs.parser.utils.tests.fake_device import FakeDevice
+
+# `show interface Ethernet1/1 | json` of the device behind
+# nxos/tests/ShowInterface/cli/equal/golden9_output.txt
+GOLDEN9_JSON = {'TABLE_interface': {'ROW_interface': {
+    'interface': 'Ethernet1/1', 'state': 'up', 'admin_state': 'up',
+    'share_state': 'Dedicated', 'eth_bundle': '101',
+    'eth_hw_desc': '100/1000/10000/25000 Ethernet',
+    'eth_hw_addr': 'ecce.1323.15e8', 'eth_bia_addr': 'ecce.1323.15e8',
+    'desc': 'FAN-OUT-S1_E6/1', 'eth_mtu': '9216', 'eth_bw': 10000000,
+    'eth_dly': 10, 'eth_reliability': '255', 'eth_txload': '1',
+    'eth_rxload': '1', 'medium': 'broadcast', 'encapsulation': 'ARPA',
+    'eth_mode': 'trunk', 'eth_duplex': 'full', 'eth_speed': '10 Gb/s',
+    'eth_media': '10G', 'eth_beacon': 'off', 'eth_autoneg': 'on',
+    'eth_fec_mode': 'Auto', 'eth_in_flowctrl': 'off',
+    'eth_out_flowctrl': 'off', 'eth_mdix': 'off', 'eth_ratemode': 'dedicated',
+    'eth_swt_monitor': 'off', 'eth_ethertype': '0x8100',
+    'eth_eee_state': 'n/a', 'eth_link_flapped': '3d21h',
+    'eth_clear_counters': 'never', 'eth_reset_cntr': 1,
+    'eth_load_interval1_rx': 30, 'eth_inrate1_bits': '1016',
+    'eth_inrate1_pkts': '0', 'eth_load_interval1_tx': '30',
+    'eth_outrate1_bits': '15584', 'eth_outrate1_pkts': '23',
+    'eth_inrate1_summary_bits': '1.02 Kbps',
+    'eth_load_interval2_rx': '300', 'eth_inrate2_bits': '1000',
+    'eth_inrate2_pkts': '0', 'eth_load_interval2_tx': '300',
+    'eth_outrate2_bits': '15192', 'eth_outrate2_pkts': '22',
+    'eth_inucast': '40035', 'eth_inmcast': '342220', 'eth_inbcast': '625',
+    'eth_inpkts': '382880', 'eth_inbytes': '47065718',
+    'eth_jumbo_inpkts': '1', 'eth_storm_supp_bytes': '0', 'eth_runts': 0,
+    'eth_giants': 0, 'eth_crc': 0, 'eth_nobuf': 0, 'eth_inerr': 0,
+    'eth_frame': 0, 'eth_overrun': 0, 'eth_underrun': 0, 'eth_ignored': 0,
+    'eth_watchdog': 0, 'eth_bad_eth': 0, 'eth_bad_proto': 0,
+    'eth_in_ifdown_drops': 0, 'eth_dribble': 0, 'eth_indiscard': 0,
+    'eth_inpause': 0, 'eth_outucast': '41008', 'eth_outmcast': '6289446',
+    'eth_outbcast': '2645', 'eth_outpkts': '6333099',
+    'eth_outbytes': '466627432', 'eth_jumbo_outpkts': '2', 'eth_outerr': 0,
+    'eth_coll': 0, 'eth_deferred': 0, 'eth_latecoll': 0,
+    'eth_lostcarrier': 0, 'eth_nocarrier': 0, 'eth_babbles': 0,
+    'eth_outdiscard': 0, 'eth_outpause': 0}}}
+
+
+def golden_expected(os_name, class_name, name):
+    path = os.path.join(os.path.dirname(os.path.dirname(
+        os.path.dirname(__file__))), os_name, 'tests', class_name, 'cli',
+        'equal', name + '_expected.py')
+    scope = {}
+    with open(path) as f:
+        exec(f.read(), scope)
+    return scope['expected_output']
+
+
+class TestJsonHelpers(unittest.TestCase):
+
+    def test_load_json(self):
+        self.assertEqual(Common.load_json(''), {})
+        self.assertEqual(Common.load_json('\n]]>]]>\n'), {})
+        self.assertEqual(
+            Common.load_json('show ip route | json\n{"a": {"b": 1}}\n]]>]]>'),
+            {'a': {'b': 1}})
+
+    def test_json_rows(self):
+        self.assertEqual(Common.json_rows({}, 'vrf'), [])
+        self.assertEqual(Common.json_rows({'TABLE_vrf': {}}, 'vrf'), [])
+        # a single row is an object
+        self.assertEqual(
+            Common.json_rows({'TABLE_vrf': {'ROW_vrf': {'id': 1}}}, 'vrf'),
+            [{'id': 1}])
+        self.assertEqual(
+            Common.json_rows({'TABLE_vrf': {'ROW_vrf': [{'id': 1},
+                                                        {'id': 2}]}}, 'vrf'),
+            [{'id': 1}, {'id': 2}])
+        # repeated tables
+        self.assertEqual(
+            Common.json_rows({'TABLE_vrf': [{'ROW_vrf': {'id': 1}},
+                                            {'ROW_vrf': [{'id': 2}]}]}, 'vrf'),
+            [{'id': 1}, {'id': 2}])
+
+
+class TestShowInterfaceJson(unittest.TestCase):
+
+    def test_golden(self):
+        device = FakeDevice('R1', 'nxos', {
+            'show interface Ethernet1/1 | json': json.dumps(GOLDEN9_JSON)})
+        parsed = ShowInterface(device=device, context='json').parse(
+            interface='Ethernet1/1')
+        self.assertEqual(parsed,
+                         golden_expected('nxos', 'ShowInterface', 'golden9'))
+        self.assertEqual(device.executed,
+                         ['show interface Ethernet1/1 | json'])
+
+    def test_paired_outputs(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                text = synthetic.nxos_show_interface(40, seed=seed)
+                reply = synthetic.nxos_show_interface_json(40, seed=seed)
+                self.assertEqual(
+                    ShowInterface(device=None, context='json').parse(
+                        output=reply),
+                    ShowInterface(device=None).parse(
+                        command='show interface', output=text))
+
+    def test_admin_down(self):
+        reply = {'TABLE_interface': {'ROW_interface': [
+            {'interface': 'Ethernet1/5', 'state': 'down',
+             'state_rsn_desc': 'Administratively down', 'admin_state': 'down',
+             'share_state': 'Dedicated'},
+            {'interface': 'Vlan1', 'svi_admin_state': 'down',
+             'svi_rsn_desc': 'Administratively down',
+             'svi_line_proto': 'down', 'svi_hw_desc': 'EtherSVI',
+             'svi_mac': '547f.ee6d.7d7c', 'svi_ip_addr': '10.10.10.1',
+             'svi_ip_mask': 24, 'svi_mtu': '1500'}]}}
+        parsed = ShowInterface(device=None).json(output=json.dumps(reply))
+        self.assertFalse(parsed['Ethernet1/5']['enabled'])
+        self.assertEqual(parsed['Ethernet1/5']['oper_status'], 'down')
+        self.assertEqual(parsed['Vlan1']['oper_status'], 'down')
+        self.assertFalse(parsed['Vlan1']['enabled'])
+        self.assertEqual(parsed['Vlan1']['ipv4'], {
+            '10.10.10.1/24': {'ip': '10.10.10.1', 'prefix_length': '24'}})
+
+
+class TestShowIpRouteJson(unittest.TestCase):
+
+    def test_paired_outputs(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                text = synthetic.nxos_show_ip_route(60, seed=seed, ecmp=3)
+                reply = synthetic.nxos_show_ip_route_json(60, seed=seed,
+                                                          ecmp=3)
+                expected = ShowIpRoute(device=None).parse(output=text)
+                parsed = ShowIpRoute(device=None, context='json').parse(
+                    output=reply)
+                # the cli prints the ages above a week as weeks and days
+                for vrf in (expected, parsed):
+                    for route in vrf['vrf']['default']['address_family']\
+                            ['ipv4']['routes'].values():
+                        for path in route['next_hop']['next_hop_list']\
+                                .values():
+                            del path['updated']
+                self.assertEqual(parsed, expected)
+
+    def test_command(self):
+        reply = {'TABLE_vrf': {'ROW_vrf': {
+            'vrf-name-out': 'red',
+            'TABLE_addrf': {'ROW_addrf': {
+                'addrf': 'ipv4',
+                'TABLE_prefix': {'ROW_prefix': {
+                    'ipprefix': '10.1.1.0/24', 'ucast-nhops': '1',
+                    'mcast-nhops': '0', 'attached': 'true',
+                    'TABLE_path': {'ROW_path': {
+                        'ipnexthop': '10.1.1.1', 'ifname': 'Vlan10',
+                        'uptime': 'P2DT4H', 'pref': '0', 'metric': '0',
+                        'clientname': 'direct', 'ubest': 'true',
+                        'mbest': 'false'}}}}}}}}}
+        device = FakeDevice('R1', 'nxos', {
+            'show ip route vrf red | json': json.dumps(reply)})
+        parsed = ShowIpRoute(device=device, context='json').parse(vrf='red')
+        route = parsed['vrf']['red']['address_family']['ipv4']['routes']\
+            ['10.1.1.0/24']
+        self.assertTrue(route['attached'])
+        self.assertEqual(route['next_hop']['next_hop_list'][1], {
+            'index': 1, 'next_hop': '10.1.1.1', 'source_protocol': 'direct',
+            'best_ucast_nexthop': True, 'updated': '2d04h',
+            'outgoing_interface': 'Vlan10', 'metric': 0,
+            'route_preference': 0})
+
+    def test_show_routing(self):
+        # ShowRouting commands have no json() of their own
+        self.assertNotIn('json', ShowRouting.CONTEXT_LIST)
+        self.assertIn('json', ShowIpRoute.CONTEXT_LIST)
+
+
+class TestJsonBenchmark(unittest.TestCase):
+
+    def test_json_benchmark(self):
+        for name in synthetic.JSON_GENERATORS:
+            with self.subTest(name=name):
+                result = json_benchmark(name, size=20, repeat=1)
+                self.assertTrue(result['equal'])
+                self.assertGreater(result['speedup'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+import copy
+import unittest
+
+from genie.libs.parser.iosxe.show_interface import ShowInterfaces
+from genie.libs.parser.iosxr.show_interface import ShowInterfacesDetail
+from genie.libs.parser.nxos.show_interface import ShowInterface
+from genie.libs.parser.utils import synthetic
+from genie.libs.parser.utils.benchmark import CounterWorkload
+from genie.libs.parser.utils.rates import CLEARED, NEW, RateEngine, \
+                                          WRAPPED, clear_age
+from genie.libs.parser.utils.tests.fake_device import FakeDevice, \
+                                                      golden_outputs
+
+
+def counters(**values):
+    values.setdefault('last_clear', 'never')
+    return {'counters': values}
+
+
+class TestClearAge(unittest.TestCase):
+
+    def test_formats(self):
+        self.assertEqual(clear_age('00:01:30'), 90)
+        self.assertEqual(clear_age('17:00:12'), 61212)
+        self.assertEqual(clear_age('1d02h'), 93600)
+        self.assertEqual(clear_age('4w3d'), 31 * 86400)
+        self.assertEqual(clear_age('1y2w'), 379 * 86400)
+        for text in ('never', 'Unknown', '', None):
+            self.assertIsNone(clear_age(text))
+
+
+class TestRateEngine(unittest.TestCase):
+
+    def test_parsers(self):
+        outputs = [(ShowInterfaces, output, arguments) for output, arguments
+                   in golden_outputs('iosxe', 'ShowInterfaces')]
+        outputs.extend((ShowInterfacesDetail, output, arguments)
+                       for output, arguments in
+                       golden_outputs('iosxr', 'ShowInterfacesDetail'))
+        outputs.append((ShowInterface, synthetic.nxos_show_interface(20),
+                        {'command': 'show interface'}))
+        for parser_class, output, arguments in outputs:
+            with self.subTest(parser=parser_class.__module__):
+                parsed = parser_class(device=None).parse(output=output,
+                                                         **arguments)
+                engine = RateEngine()
+                first = engine.update('R1', parsed, timestamp=1000)
+                self.assertTrue(all(flag == NEW for flag in first.flags))
+                rates = engine.update('R1', parsed, timestamp=1060)
+                self.assertEqual(len(rates), len(first))
+                for interface in rates.interfaces:
+                    for counter, (delta, rate) in rates.get(
+                            interface).items():
+                        self.assertEqual((delta, rate), (0, 0.0))
+
+    def test_rates(self):
+        parsed = ShowInterfaces(device=None).parse(
+            output=synthetic.iosxe_show_interfaces(10))
+        engine = RateEngine()
+        engine.update(FakeDevice('R1', 'iosxe', {}), parsed, timestamp=100)
+        polled = copy.deepcopy(parsed)
+        interface = next(iter(polled))
+        polled[interface]['counters']['in_octets'] += 3000
+        rates = engine.update('R1', polled, timestamp=400)
+        self.assertEqual(rates.get(interface)['in_octets'], (3000, 10.0))
+        self.assertEqual(rates.seconds[rates.row(interface)], 300)
+        self.assertEqual(rates.to_dict()[interface]['counters'][
+            'in_octets'], {'delta': 3000, 'rate': 10.0})
+        self.assertIsNone(rates.get('Unknown1'))
+
+    def test_wrap(self):
+        engine = RateEngine(counters=('in_octets', 'out_octets'))
+        engine.update('R1', {'Gi1': counters(in_octets=2 ** 32 - 100,
+                                             out_octets=2 ** 64 - 100)}, 0)
+        rates = engine.update('R1', {'Gi1': counters(in_octets=100,
+                                                     out_octets=50)}, 10)
+        self.assertEqual(rates.get('Gi1'), {'in_octets': (200, 20.0),
+                                            'out_octets': (150, 15.0)})
+        self.assertEqual(rates.flags[0], WRAPPED)
+
+    def test_clear(self):
+        engine = RateEngine(counters=('in_octets',))
+        engine.update('R1', {'Gi1': counters(in_octets=10 ** 9),
+                             'Gi2': counters(in_octets=10 ** 6)}, 0)
+        # cleared 30 seconds ago, then reset without a clear
+        rates = engine.update('R1', {
+            'Gi1': counters(in_octets=600, last_clear='00:00:30'),
+            'Gi2': counters(in_octets=300)}, 300)
+        self.assertEqual(rates.get('Gi1')['in_octets'], (600, 20.0))
+        self.assertEqual(rates.get('Gi2')['in_octets'], (300, 1.0))
+        self.assertEqual(list(rates.flags), [CLEARED, CLEARED])
+        # a clear older than the previous sample is not a new one
+        rates = engine.update('R1', {
+            'Gi1': counters(in_octets=900, last_clear='00:05:30'),
+            'Gi2': counters(in_octets=600)}, 600)
+        self.assertEqual(rates.get('Gi1')['in_octets'], (300, 1.0))
+        self.assertEqual(list(rates.flags), [0, 0])
+
+    def test_missing(self):
+        engine = RateEngine(counters=('in_octets', 'in_errors'))
+        engine.update('R1', {'Gi1': counters(in_octets=10)}, 0)
+        rates = engine.update('R1', {'Gi1': counters(in_octets=20,
+                                                     in_errors=1)}, 10)
+        self.assertEqual(rates.get('Gi1'), {'in_octets': (10, 1.0)})
+        self.assertEqual(rates.deltas['in_errors'][0], -1)
+
+    def test_eviction(self):
+        engine = RateEngine(counters=('in_octets',), max_missed=1)
+        engine.update('R1', {'Gi1': counters(in_octets=1),
+                             'Gi2': counters(in_octets=1)}, 0)
+        engine.update('R1', {'Gi1': counters(in_octets=2)}, 10)
+        self.assertEqual(len(engine), 2)
+        engine.update('R1', {'Gi1': counters(in_octets=3)}, 20)
+        self.assertEqual(len(engine), 1)
+        # the slot is reused, the interface coming back is new
+        rates = engine.update('R1', {'Gi1': counters(in_octets=4),
+                                     'Gi2': counters(in_octets=9)}, 30)
+        self.assertEqual(len(engine.interfaces), 2)
+        self.assertEqual(list(rates.flags), [0, NEW])
+        self.assertEqual(rates.get('Gi1')['in_octets'], (1, 0.1))
+
+        engine.update('R2', {'Gi1': counters(in_octets=1)}, 100)
+        self.assertEqual(engine.expire(50, now=110), 2)
+        self.assertEqual(engine.interfaces.count(None), 2)
+        self.assertEqual(engine.remove('R2'), 1)
+        self.assertEqual(len(engine), 0)
+
+    def test_bounded(self):
+        engine = RateEngine(counters=('in_octets',), max_interfaces=4)
+        engine.update('R1', {'Gi1': counters(in_octets=1),
+                             'Gi2': counters(in_octets=1)}, 0)
+        engine.update('R2', {'Gi1': counters(in_octets=1),
+                             'Gi2': counters(in_octets=1)}, 10)
+        # the interface sampled the longest ago makes room
+        engine.update('R3', {'Gi1': counters(in_octets=1)}, 20)
+        self.assertEqual(len(engine), 4)
+        self.assertEqual(len(engine.interfaces), 4)
+        self.assertNotIn(('R1', 'Gi1'), engine)
+        self.assertIn(('R3', 'Gi1'), engine)
+        # a device alone over the limit keeps the interfaces that fit
+        with self.assertLogs('genie.libs.parser.utils.rates', 'WARNING'):
+            rates = engine.update('R4', {'Gi{}'.format(index):
+                                         counters(in_octets=1)
+                                         for index in range(6)}, 30)
+        self.assertEqual(len(rates), 4)
+        self.assertEqual(len(engine.interfaces), 4)
+
+    def test_scattered(self):
+        # the interfaces of a device in slots freed by other devices
+        workload = CounterWorkload(devices=3, interfaces=20)
+        engine = RateEngine()
+        for device in range(3):
+            engine.update(workload.device(device), workload.parsed(device, 0),
+                          1.0)
+        engine.remove(workload.device(1))
+        parsed = workload.parsed(0, 0)
+        parsed['Loopback0'] = parsed.pop(workload.names[0])
+        engine.update(workload.device(0), parsed, 1.0)
+        engine.update(workload.device(0), workload.parsed(0, 1), 301.0)
+        rates = engine.update(workload.device(0), workload.parsed(0, 2),
+                              601.0)
+        self.assertEqual(rates.deltas['in_octets'].tolist(),
+                         [300 * speed for speed in workload.speeds])
+        self.assertEqual(rates.get(workload.names[0])['out_octets'],
+                         (600 * workload.speeds[0], 2.0 *
+                          workload.speeds[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
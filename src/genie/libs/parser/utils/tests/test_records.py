@@ -0,0 +1,145 @@
+import copy
+import json
+import pickle
+import sys
+import unittest
+
+from genie.metaparser.util.schemaengine import Any, Optional, Schema
+
+from genie.libs.parser.iosxe.show_bgp import ShowBgpAllDetail
+from genie.libs.parser.iosxe.show_fdb import ShowMacAddressTable
+from genie.libs.parser.iosxe.show_routing import ShowIpRoute
+from genie.libs.parser.nxos.show_fdb import ShowMacAddressTable as \
+                                            NxosShowMacAddressTable
+from genie.libs.parser.nxos.show_routing import ShowIpRoute as \
+                                                NxosShowIpRoute
+from genie.libs.parser.utils import synthetic
+from genie.libs.parser.utils.records import Record, RecordMixin, \
+                                            record_class, schema_level, \
+                                            to_dicts, to_records
+from genie.libs.parser.utils.tests.fake_device import golden_outputs
+
+PARSERS = [('iosxe', ShowBgpAllDetail),
+           ('iosxe', ShowIpRoute),
+           ('nxos', NxosShowIpRoute),
+           ('iosxe', ShowMacAddressTable),
+           ('nxos', NxosShowMacAddressTable)]
+
+SCHEMA = {'neighbor': {Any(): {Optional('route-type'): str,
+                               'state': str,
+                               Optional('counters'): {'in': int}}}}
+
+
+class TestRecord(unittest.TestCase):
+
+    def setUp(self):
+        self.parsed = {'neighbor': {'R2': {'state': 'up', 'route-type': 'E2',
+                                           'counters': {'in': 4}},
+                                    'R3': {'state': 'down'}}}
+
+    def test_schema_level(self):
+        self.assertEqual(len(schema_level(SCHEMA, ('neighbor', '{name}'))), 3)
+        with self.assertRaises(ValueError):
+            schema_level(SCHEMA, ('neighbors', '{name}'))
+        with self.assertRaises(ValueError):
+            schema_level(SCHEMA, ('neighbor', '{name}', 'state', '{x}'))
+        # the keys of an Any() level are not fixed
+        with self.assertRaises(ValueError):
+            record_class(SCHEMA, ('neighbor',))
+
+    def test_mapping(self):
+        expected = copy.deepcopy(self.parsed)
+        to_records(self.parsed, SCHEMA, [('neighbor', '{name}')])
+        record = self.parsed['neighbor']['R2']
+        self.assertIsInstance(record, Record)
+        self.assertEqual(type(record).__name__, 'NeighborRecord')
+        self.assertEqual(self.parsed, expected)
+        self.assertEqual(list(record), ['state', 'route-type', 'counters'])
+        self.assertEqual(record['route-type'], 'E2')
+        self.assertEqual(record['counters']['in'], 4)
+        self.assertEqual(record.get('missing', 0), 0)
+        self.assertNotIn('counters', self.parsed['neighbor']['R3'])
+        with self.assertRaises(KeyError):
+            self.parsed['neighbor']['R3']['counters']
+        # no slot for the missing optional keys, no instance dict
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertLess(sys.getsizeof(self.parsed['neighbor']['R3']),
+                        sys.getsizeof(record))
+        # records are read only
+        with self.assertRaises(TypeError):
+            record['state'] = 'down'
+
+    def test_dicts(self):
+        expected = copy.deepcopy(self.parsed)
+        to_records(self.parsed, SCHEMA, [('neighbor', '{name}')])
+        self.assertEqual(repr(self.parsed['neighbor']['R3']),
+                         repr({'state': 'down'}))
+        for copied in (to_dicts(self.parsed),
+                       pickle.loads(pickle.dumps(self.parsed)),
+                       copy.deepcopy(self.parsed)):
+            self.assertIs(type(copied['neighbor']['R2']), dict)
+            self.assertEqual(copied, expected)
+        self.assertEqual(json.loads(json.dumps(to_dicts(self.parsed))),
+                         expected)
+
+    def test_shapes(self):
+        classes = {}
+        to_records(self.parsed, SCHEMA, [('neighbor', '{name}')], classes)
+        base = classes[('neighbor', '{name}')]
+        # one class per set of keys, all of them based on the level class
+        self.assertEqual(len(base._shapes), 2)
+        self.assertIs(type(base.from_dict({'state': 'up'})),
+                      type(self.parsed['neighbor']['R3']))
+        # a key the schema does not know keeps the entry a dict
+        parsed = {'neighbor': {'R4': {'state': 'up', 'unknown': 1}}}
+        to_records(parsed, SCHEMA, [('neighbor', '{name}')], classes)
+        self.assertIs(type(parsed['neighbor']['R4']), dict)
+
+
+class TestRecordMixin(unittest.TestCase):
+
+    def test_parsers(self):
+        for os_name, parser_class in PARSERS:
+            self.assertTrue(issubclass(parser_class, RecordMixin))
+            for output, arguments in golden_outputs(os_name,
+                                                    parser_class.__name__):
+                with self.subTest(os=os_name, parser=parser_class.__name__):
+                    expected = parser_class(device=None).parse(output=output,
+                                                               **arguments)
+                    parsed = parser_class(device=None).parse(
+                        output=output, records=True, **arguments)
+                    self.assertEqual(parsed, expected)
+                    # the records convert back to a valid output
+                    self.assertEqual(to_dicts(parsed), expected)
+                    Schema(parser_class.schema).validate(to_dicts(parsed))
+
+    def test_bgp(self):
+        parsed = ShowBgpAllDetail(device=None).parse(
+            output=synthetic.iosxe_show_bgp_all_detail(200), records=True)
+        paths = 0
+        for vrf in parsed['instance']['default']['vrf'].values():
+            for af in vrf['address_family'].values():
+                for prefix in af['prefixes'].values():
+                    for path in prefix['index'].values():
+                        self.assertIsInstance(path, Record)
+                        self.assertIn('next_hop', path)
+                        paths += 1
+        self.assertEqual(paths, 200)
+
+    def test_memory(self):
+        output = synthetic.iosxe_show_mac_address_table(500)
+        parsed = ShowMacAddressTable(device=None).parse(output=output)
+        records = ShowMacAddressTable(device=None).parse(output=output,
+                                                         records=True)
+        for vlan in parsed['mac_table']['vlans']:
+            for mac, entry in parsed['mac_table']['vlans'][vlan][
+                    'mac_addresses'].items():
+                for name, interface in entry['interfaces'].items():
+                    record = records['mac_table']['vlans'][vlan][
+                        'mac_addresses'][mac]['interfaces'][name]
+                    self.assertLess(sys.getsizeof(record),
+                                    sys.getsizeof(interface))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import time
+import asyncio
+import unittest
+
+from genie.libs.parser.bigip.get_ltm_pool import LtmPool
+from genie.libs.parser.bigip.get_sys_version import SysVersion
+from genie.libs.parser.utils.rest import RestClient, acollect_rest, \
+                                         collect_rest, resolve_resources, \
+                                         iter_pages
+from genie.libs.parser.utils.tests.fake_device import StubServer
+
+FIXTURES = {
+    '/mgmt/tm/ltm/pool': {
+        'kind': 'tm:ltm:pool:poolcollectionstate',
+        'selfLink': 'https://localhost/mgmt/tm/ltm/pool?ver=14.1.2.6',
+        'items': [{'kind': 'tm:ltm:pool:poolstate', 'name': 'pool1',
+                   'partition': 'Common', 'loadBalancingMode': 'round-robin',
+                   'monitor': '/Common/http '}]},
+    '/mgmt/tm/sys/version': {
+        'kind': 'tm:sys:version:versionstats',
+        'entries': {'https://localhost/mgmt/tm/sys/version/0': {
+            'nestedStats': {'entries': {
+                'Product': {'description': 'BIG-IP'},
+                'Version': {'description': '14.1.2.6'}}}}}},
+    # empty body, {} as the rest() of the parsers
+    '/mgmt/tm/ltm/virtual': None,
+}
+
+
+class TestCollectRest(unittest.TestCase):
+
+    def test_parsers_and_prefixes(self):
+        errors = {}
+        with StubServer(FIXTURES) as stub, RestClient(stub.url) as client:
+            collected = collect_rest(
+                client, [LtmPool, '/mgmt/tm/sys/version', '/mgmt/tm/missing',
+                         '/mgmt/tm/ltm/virtual'], errors=errors)
+        self.assertEqual(list(collected), ['/mgmt/tm/ltm/pool',
+                                           '/mgmt/tm/sys/version',
+                                           '/mgmt/tm/ltm/virtual'])
+        self.assertEqual(collected['/mgmt/tm/ltm/pool'],
+                         FIXTURES['/mgmt/tm/ltm/pool'])
+        self.assertEqual(collected['/mgmt/tm/ltm/virtual'], {})
+        self.assertEqual(list(errors), ['/mgmt/tm/missing'])
+        self.assertIn('HTTPError', errors['/mgmt/tm/missing'])
+
+    def test_same_as_parsers(self):
+        with StubServer(FIXTURES) as stub, RestClient(stub.url) as client:
+            collected = collect_rest(client, [LtmPool, SysVersion])
+            for parser_class in (LtmPool, SysVersion):
+                self.assertEqual(
+                    collected[parser_class.cli_command],
+                    parser_class(device=client).rest())
+
+    def test_resolve(self):
+        paths = resolve_resources(['/mgmt/tm/ltm/pool/', LtmPool,
+                                   '/mgmt/tm/sys/'])
+        self.assertEqual(paths[0], '/mgmt/tm/ltm/pool')
+        self.assertEqual(len(paths), len(set(paths)))
+        self.assertIn('/mgmt/tm/sys/version', paths)
+        self.assertTrue(all(path.startswith(('/mgmt/tm/ltm/pool',
+                                             '/mgmt/tm/sys/'))
+                            for path in paths))
+
+    def test_bounded_concurrency(self):
+        fixtures = {'/mgmt/tm/stub/{}'.format(index): {'index': index}
+                    for index in range(24)}
+        with StubServer(fixtures, latency=0.05) as stub, \
+                RestClient(stub.url, max_connections=6) as client:
+            resolve_resources(list(fixtures))
+            start = time.perf_counter()
+            collected = collect_rest(client, list(fixtures),
+                                     max_connections=6)
+            elapsed = time.perf_counter() - start
+        self.assertEqual(collected, fixtures)
+        self.assertEqual(stub.max_in_flight, 6)
+        # 4 rounds of 6 requests instead of 24 sequential ones
+        self.assertLess(elapsed, 24 * 0.05 / 3)
+
+    def test_async_device(self):
+        class Response(object):
+            def __init__(self, data):
+                self.data = data
+
+            def json(self):
+                return self.data
+
+        class AsyncDevice(object):
+            async def aget(self, path):
+                await asyncio.sleep(0.01)
+                return Response(FIXTURES[path])
+
+        collected = asyncio.run(acollect_rest(
+            AsyncDevice(), [LtmPool, SysVersion]))
+        self.assertEqual(collected, {
+            path: FIXTURES[path] for path in ('/mgmt/tm/ltm/pool',
+                                              '/mgmt/tm/sys/version')})
+
+
+class TestIterPages(unittest.TestCase):
+
+    def pages(self, count, limit):
+        items = list(range(count))
+        return items, {
+            '/api/items?x=1&offset={}&limit={}'.format(offset, limit):
+                {'response': items[offset - 1:offset - 1 + limit]}
+            for offset in range(1, count + 4 * limit, limit)}
+
+    def test_pages(self):
+        for count in (0, 9, 10, 11):
+            items, fixtures = self.pages(count, limit=5)
+            with StubServer(fixtures) as stub, RestClient(stub.url) as client:
+                self.assertEqual(list(iter_pages(
+                    client.get, '/api/items?x=1', limit=5, prefetch=2)), items)
+            # the page of the end, and at most the prefetched one after it
+            self.assertLessEqual(len(stub.requests), count // 5 + 2)
+
+    def test_prefetch(self):
+        items, fixtures = self.pages(40, limit=5)
+        with StubServer(fixtures, latency=0.05) as stub, \
+                RestClient(stub.url) as client:
+            start = time.perf_counter()
+            self.assertEqual(list(iter_pages(
+                client.get, '/api/items?x=1', limit=5, prefetch=3)), items)
+            elapsed = time.perf_counter() - start
+        self.assertEqual(stub.max_in_flight, 3)
+        # 9 pages, 3 in flight
+        self.assertLess(elapsed, 9 * 0.05 / 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
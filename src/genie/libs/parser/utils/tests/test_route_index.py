@@ -0,0 +1,136 @@
+import random
+import unittest
+import ipaddress
+
+from genie.libs.parser.iosxe.show_routing import ShowIpRoute, ShowIpv6Route
+from genie.libs.parser.junos.show_route import ShowRoute
+from genie.libs.parser.nxos.show_routing import ShowIpRoute as \
+                                                NxosShowIpRoute
+from genie.libs.parser.utils import synthetic
+from genie.libs.parser.utils.route_index import NextHop, Route, RouteIndex
+from genie.libs.parser.utils.tests.fake_device import golden_outputs
+
+
+def random_prefixes(rng, count, bits):
+    prefixes = set()
+    while len(prefixes) < count:
+        length = rng.choice([0, 1, 7, 8, 12, 16, 20, 23, 24, 25, 32]
+                            if bits == 32 else [0, 16, 32, 48, 56, 64, 128])
+        address = rng.getrandbits(bits)
+        # most prefixes under a few parents, so they nest
+        address = (rng.choice([0x0A, 0xC0, 0x0B]) << (bits - 8)) | \
+            (address >> 8)
+        prefixes.add(str(ipaddress.ip_network((address, length),
+                                              strict=False)))
+    return sorted(prefixes)
+
+
+class TestRouteIndex(unittest.TestCase):
+
+    def test_brute_force(self):
+        rng = random.Random(1)
+        for bits in (32, 128):
+            prefixes = random_prefixes(rng, 400, bits)
+            index = RouteIndex()
+            for position, prefix in enumerate(prefixes):
+                index.insert(prefix, 'bgp', [('10.0.0.{}'.format(
+                    position % 3), None)])
+            self.assertEqual(len(index), len(prefixes))
+            networks = [ipaddress.ip_network(prefix) for prefix in prefixes]
+
+            for query in random_prefixes(rng, 300, bits) + prefixes[:50]:
+                query_network = ipaddress.ip_network(query)
+                covering = sorted(
+                    (network for network in networks
+                     if query_network.subnet_of(network)),
+                    key=lambda network: network.prefixlen)
+                self.assertEqual([prefix for prefix, _ in
+                                  index.covering(query)],
+                                 [str(network) for network in covering])
+                address = str(query_network.network_address)
+                expected = [network for network in networks
+                            if query_network.network_address in network]
+                found = index.lookup(address)
+                if expected:
+                    self.assertEqual(found[0], str(max(
+                        expected, key=lambda network: network.prefixlen)))
+                else:
+                    self.assertIsNone(found)
+                self.assertEqual(
+                    [prefix for prefix, _ in index.subnets(query)],
+                    [str(network) for network in sorted(
+                        (network for network in networks
+                         if network.subnet_of(query_network)),
+                        key=lambda network: (network.network_address,
+                                             network.prefixlen))])
+
+    def test_shared_next_hops(self):
+        index = RouteIndex()
+        index.insert('10.1.0.0/16', 'bgp', [('192.168.1.1', None)])
+        index.insert('10.2.0.0/16', 'bgp', [NextHop('192.168.1.1', None)])
+        index.insert('10.3.0.0/16', 'ospf', [('192.168.1.1', None)])
+        first, second, third = (index.lookup(address)[1] for address in
+                                ('10.1.1.1', '10.2.1.1', '10.3.1.1'))
+        self.assertIs(first, second)
+        self.assertIs(first.next_hops[0], third.next_hops[0])
+        # replaced route
+        index.insert('10.1.0.0/16', 'static', [('192.168.2.1', None)])
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.lookup('10.1.1.1'), ('10.1.0.0/16', Route(
+            'static', (NextHop('192.168.2.1', None),))))
+        self.assertIsNone(index.lookup('10.1.1.1', vrf='red'))
+        self.assertIsNone(index.lookup('2001:db8::1'))
+        self.assertEqual(list(index.subnets('2001:db8::/32')), [])
+
+    def test_parsed_tables(self):
+        for os_name, parser_class in (('iosxe', ShowIpRoute),
+                                      ('iosxe', ShowIpv6Route),
+                                      ('nxos', NxosShowIpRoute)):
+            for output, arguments in golden_outputs(os_name,
+                                                    parser_class.__name__):
+                parsed = parser_class(device=None).parse(output=output,
+                                                         **arguments)
+                index = RouteIndex().add(parsed)
+                for vrf, vrf_dict in parsed['vrf'].items():
+                    for af_dict in vrf_dict['address_family'].values():
+                        for prefix in af_dict.get('routes', {}):
+                            with self.subTest(parser=parser_class.__name__,
+                                              prefix=prefix):
+                                network = ipaddress.ip_network(prefix)
+                                found = index.covering(prefix, vrf=vrf)[-1]
+                                self.assertEqual(found[0], str(network))
+                                self.assertEqual(
+                                    found[1].source_protocol,
+                                    af_dict['routes'][prefix].get(
+                                        'source_protocol'))
+
+    def test_junos(self):
+        for output, arguments in golden_outputs('junos', 'ShowRoute'):
+            parsed = ShowRoute(device=None).parse(output=output, **arguments)
+            index = RouteIndex().add(parsed)
+            for table in parsed['route-information']['route-table']:
+                if table['table-name'] not in ('inet.0', 'inet6.0'):
+                    continue
+                for rt in table.get('rt', []):
+                    if 'rt-destination' not in rt:
+                        continue
+                    prefix, route = index.covering(rt['rt-destination'])[-1]
+                    self.assertEqual(prefix, str(ipaddress.ip_network(
+                        rt['rt-destination'], strict=False)))
+                    self.assertEqual(route.source_protocol, rt['rt-entry'][
+                        'protocol-name'].lower())
+
+    def test_synthetic_table(self):
+        parsed = ShowIpRoute(device=None).parse(
+            output=synthetic.iosxe_show_ip_route(3000))
+        index = RouteIndex().add(parsed)
+        self.assertEqual(len(index), 3000)
+        prefix, route = index.lookup('1.0.5.77')
+        self.assertEqual(prefix, '1.0.5.0/24')
+        self.assertEqual(len(list(index.subnets('1.0.0.0/20'))), 16)
+        # a few routes, many prefixes
+        self.assertLess(len(index._routes), 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
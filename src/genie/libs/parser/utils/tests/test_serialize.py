@@ -0,0 +1,93 @@
+import io
+import json
+import unittest
+
+from genie.libs.parser.iosxe.show_bgp import ShowBgpAllDetail
+from genie.libs.parser.iosxe.show_routing import ShowIpRoute
+from genie.libs.parser.nxos.show_routing import ShowIpRoute as \
+                                                NxosShowIpRoute
+from genie.libs.parser.utils import synthetic
+from genie.libs.parser.utils.records import to_dicts
+from genie.libs.parser.utils.serialize import MAGIC, dump, dumps, \
+                                              iter_frames, iter_json, load, \
+                                              loads
+from genie.libs.parser.utils.tests.fake_device import golden_outputs
+
+PARSERS = [('iosxe', ShowBgpAllDetail),
+           ('iosxe', ShowIpRoute),
+           ('nxos', NxosShowIpRoute)]
+
+
+class TestSerialize(unittest.TestCase):
+
+    def assertRoundTrip(self, parsed, schema=None, batch=2):
+        expected = json.loads(json.dumps(to_dicts(parsed)))
+        text = dumps(parsed, schema, batch=batch)
+        self.assertEqual(json.loads(text), expected)
+        self.assertEqual(loads(dumps(parsed, schema, binary=True,
+                                     batch=batch)), parsed)
+
+    def test_golden(self):
+        for os_name, parser_class in PARSERS:
+            for output, arguments in golden_outputs(os_name,
+                                                    parser_class.__name__):
+                parsed = parser_class(device=None).parse(output=output,
+                                                         **arguments)
+                with self.subTest(parser=parser_class.__module__,
+                                  size=len(output)):
+                    self.assertRoundTrip(parsed)
+                    self.assertRoundTrip(parsed, parser_class)
+                    self.assertRoundTrip(parsed, parser_class.schema,
+                                         batch=256)
+
+    def test_blocks(self):
+        parsed = ShowIpRoute(device=None).parse(
+            output=synthetic.iosxe_show_ip_route(100))
+        chunks = list(iter_json(parsed, ShowIpRoute, batch=10))
+        self.assertEqual(''.join(chunks), dumps(parsed, ShowIpRoute,
+                                                batch=10))
+        # the routes 10 at a time, the levels above them walked down
+        frames = list(iter_frames(parsed, ShowIpRoute, batch=10))
+        self.assertEqual(len(frames), 11)
+        self.assertTrue(frames[0].startswith(MAGIC))
+        self.assertRoundTrip(parsed, ShowIpRoute, batch=10)
+
+    def test_keys(self):
+        parsed = {'index': {1: {'next_hop': '10.0.0.1'}, 2: {}},
+                  'empty': {}, 'list': [{'a': 1}], 'flag': True}
+        self.assertEqual(dumps(parsed), json.dumps(parsed,
+                                                   separators=(',', ':')))
+        self.assertEqual(loads(dumps(parsed, binary=True)), parsed)
+        self.assertEqual(dumps({}), '{}')
+        self.assertEqual(loads(dumps({}, binary=True)), {})
+
+    def test_records(self):
+        parsed = ShowBgpAllDetail(device=None).parse(
+            output=synthetic.iosxe_show_bgp_all_detail(20), records=True)
+        self.assertRoundTrip(parsed, ShowBgpAllDetail)
+        self.assertEqual(loads(dumps(parsed, binary=True)), to_dicts(parsed))
+
+    def test_files(self):
+        parsed = {'vrf': {'default': {'routes': {str(index): {'metric': index}
+                                                 for index in range(10)}}}}
+        text = io.StringIO()
+        self.assertEqual(dump(parsed, text, batch=4), len(text.getvalue()))
+        self.assertEqual(load(io.BytesIO(text.getvalue().encode())), parsed)
+        data = io.BytesIO()
+        self.assertEqual(dump(parsed, data, binary=True, batch=4),
+                         len(data.getvalue()))
+        data.seek(0)
+        self.assertEqual(load(data), parsed)
+
+    def test_errors(self):
+        data = dumps({'a': 1}, binary=True)
+        with self.assertRaisesRegex(ValueError, 'format version 9'):
+            loads(MAGIC + b'\x09' + data[len(MAGIC) + 1:])
+        with self.assertRaisesRegex(ValueError, 'Truncated frame'):
+            loads(data[:-1])
+        with self.assertRaisesRegex(ValueError, 'Truncated frame length'):
+            loads(data + b'\x01')
+
+
+if __name__ == '__main__':
+    unittest.main()
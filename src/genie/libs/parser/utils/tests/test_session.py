@@ -0,0 +1,98 @@
+import time
+import unittest
+from unittest.mock import Mock
+
+from genie.metaparser.util.exceptions import SchemaEmptyParserError
+
+from genie.libs.parser.iosxe.show_bgp import ShowBgpSummary
+from genie.libs.parser.iosxe.show_vrf import ShowVrf
+from genie.libs.parser.utils.session import ParseSession, get_session, \
+                                            sub_parse
+from genie.libs.parser.utils.subcommands import execute_command
+from genie.libs.parser.utils.tests.fake_device import FakeDevice, \
+                                                     golden_output
+
+
+class TestParseSession(unittest.TestCase):
+
+    def setUp(self):
+        self.device = FakeDevice('R1', 'iosxe',
+                                 {'show vrf': golden_output('iosxe', 'ShowVrf'),
+                                  'show empty': ''})
+
+    def test_attach(self):
+        self.assertIsNone(get_session(self.device))
+        self.assertIsNone(get_session(Mock()))
+        with ParseSession(self.device) as session:
+            self.assertIs(get_session(self.device), session)
+            with ParseSession(self.device) as inner:
+                self.assertIs(get_session(self.device), inner)
+            self.assertIs(get_session(self.device), session)
+        self.assertIsNone(get_session(self.device))
+
+    def test_outputs(self):
+        with ParseSession(self.device):
+            execute_command(self.device, 'show vrf')
+            execute_command(self.device, 'show vrf')
+        execute_command(self.device, 'show vrf')
+        self.assertEqual(self.device.executed, ['show vrf', 'show vrf'])
+
+    def test_ttl(self):
+        with ParseSession(self.device, ttl=0.05):
+            execute_command(self.device, 'show vrf')
+            time.sleep(0.1)
+            execute_command(self.device, 'show vrf')
+        self.assertEqual(self.device.executed, ['show vrf', 'show vrf'])
+
+    def test_sub_parse(self):
+        with ParseSession(self.device) as session:
+            first = sub_parse(self.device, ShowVrf)
+            first['vrf'].clear()
+            second = sub_parse(self.device, ShowVrf)
+            self.assertTrue(second['vrf'])
+            sub_parse(self.device, ShowVrf, vrf='Mgmt-intf',
+                      output=self.device.outputs['show vrf'])
+        self.assertEqual(self.device.executed, ['show vrf'])
+        self.assertEqual((session.hits, session.misses), (1, 2))
+
+    def test_sub_parse_output(self):
+        first = self.device.outputs['show vrf']
+        second = first.replace('Mgmt-intf', 'Mgmt-vrf')
+        with ParseSession(self.device) as session:
+            self.assertIn('Mgmt-intf', sub_parse(self.device, ShowVrf,
+                                                 output=first)['vrf'])
+            # another output is parsed, not the memo of the first one
+            parsed = sub_parse(self.device, ShowVrf, output=second)
+            self.assertIn('Mgmt-vrf', parsed['vrf'])
+            self.assertNotIn('Mgmt-intf', parsed['vrf'])
+            sub_parse(self.device, ShowVrf, output=first)
+        self.assertEqual((session.hits, session.misses), (1, 2))
+
+    def test_sub_parse_exception(self):
+        with ParseSession(self.device):
+            for _ in range(2):
+                with self.assertRaises(SchemaEmptyParserError):
+                    sub_parse(self.device, ShowVrf, output='')
+
+    def test_composite_parser(self):
+        summary = golden_output('iosxe', 'ShowBgpSummary')
+        device = FakeDevice('R1', 'iosxe', {
+            'show vrf': golden_output('iosxe', 'ShowVrf'),
+            'show bgp vpnv4 unicast rd 100:1 summary': summary,
+            'show bgp vpnv4 unicast rd 200:1 summary': summary})
+        expected = [ShowBgpSummary(device=device).parse(
+            address_family='vpnv4 unicast', rd=rd) for rd in ('100:1', '200:1')]
+        device.executed = []
+
+        with ParseSession(device):
+            results = [ShowBgpSummary(device=device).parse(
+                address_family='vpnv4 unicast', rd=rd)
+                for rd in ('100:1', '200:1')]
+        self.assertEqual(results, expected)
+        self.assertEqual(device.executed,
+                         ['show bgp vpnv4 unicast rd 100:1 summary', 'show vrf',
+                          'show bgp vpnv4 unicast rd 200:1 summary'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import time
+import asyncio
+import unittest
+from unittest.mock import Mock
+
+from genie.libs.parser.iosxe.show_bgp import ShowBgpAllClusterIds
+from genie.libs.parser.utils.async_parse import aparse_parser
+from genie.libs.parser.utils.subcommands import execute_commands, \
+                                               sub_command_workers
+from genie.libs.parser.utils.tests.fake_device import FakeDevice, \
+                                                     AsyncFakeDevice, \
+                                                     golden_output
+
+COMMANDS = ['show vrf', 'show run | sec ipv4 vrf', 'show run | sec ipv6 vrf',
+            'show ip bgp all summary']
+
+
+class TestExecuteCommands(unittest.TestCase):
+
+    def test_serial_by_default(self):
+        device = FakeDevice('R1', 'iosxe',
+                            {command: command.upper() for command in COMMANDS})
+        outputs = execute_commands(device, COMMANDS + ['show vrf'])
+        self.assertEqual(list(outputs), COMMANDS)
+        self.assertEqual(outputs['show vrf'], 'SHOW VRF')
+        self.assertEqual(device.executed, COMMANDS)
+
+    def test_workers(self):
+        self.assertEqual(sub_command_workers(Mock()), 1)
+        self.assertEqual(sub_command_workers(Mock(sub_command_workers=4)), 4)
+        self.assertEqual(sub_command_workers(Mock(sub_command_workers=4),
+                                             max_workers=2), 2)
+
+    def test_concurrent_workers(self):
+        latency = 0.1
+        device = FakeDevice('R1', 'iosxe',
+                            {command: command for command in COMMANDS},
+                            latency=latency)
+        device.sub_command_workers = len(COMMANDS)
+        start = time.perf_counter()
+        outputs = execute_commands(device, COMMANDS)
+        self.assertLess(time.perf_counter() - start,
+                        latency * len(COMMANDS) / 2)
+        self.assertEqual(outputs, {command: command for command in COMMANDS})
+
+
+class TestCompositeParser(unittest.TestCase):
+
+    def setUp(self):
+        output = golden_output('iosxe', 'ShowBgpAllClusterIds')
+        self.outputs = {r'show vrf detail | inc \(VRF': output,
+                        'show bgp all cluster-ids': output}
+        self.expected = ShowBgpAllClusterIds(
+            device=FakeDevice('R1', 'iosxe', self.outputs)).parse()
+
+    def test_pooled_device(self):
+        device = FakeDevice('R1', 'iosxe', self.outputs, latency=0.2)
+        device.sub_command_workers = 2
+        start = time.perf_counter()
+        self.assertEqual(ShowBgpAllClusterIds(device=device).parse(),
+                         self.expected)
+        self.assertLess(time.perf_counter() - start, 0.35)
+        self.assertEqual(sorted(device.executed), sorted(self.outputs))
+
+    def test_async_device(self):
+        device = AsyncFakeDevice('R1', 'iosxe', self.outputs, latency=0.2)
+        start = time.perf_counter()
+        result = asyncio.run(aparse_parser(ShowBgpAllClusterIds(device=device)))
+        self.assertLess(time.perf_counter() - start, 0.35)
+        self.assertEqual(result, self.expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
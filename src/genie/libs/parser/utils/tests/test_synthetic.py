@@ -0,0 +1,80 @@
+import unittest
+
+from genie.libs.parser.utils import synthetic
+from genie.libs.parser.utils.benchmark import scaling_benchmark, \
+                                              growth_exponents
+
+
+class TestSyntheticOutputs(unittest.TestCase):
+
+    def parse(self, name, size):
+        func, parser_path, kwargs, _ = synthetic.GENERATORS[name]
+        parser_class = synthetic.load_parser_class(parser_path)
+        return parser_class(device=None).parse(output=func(size), **kwargs)
+
+    def test_seeded(self):
+        self.assertEqual(synthetic.iosxe_show_ip_route(50, seed=1),
+                         synthetic.iosxe_show_ip_route(50, seed=1))
+        self.assertNotEqual(synthetic.iosxe_show_ip_route(50, seed=1),
+                            synthetic.iosxe_show_ip_route(50, seed=2))
+
+    def test_iosxe_show_ip_route(self):
+        parsed = self.parse('iosxe_show_ip_route', 200)
+        routes = parsed['vrf']['default']['address_family']['ipv4']['routes']
+        self.assertEqual(len(routes), 200)
+        self.assertIn('1.0.199.0/24', routes)
+
+    def test_nxos_show_ip_route(self):
+        parsed = self.parse('nxos_show_ip_route', 200)
+        routes = parsed['vrf']['default']['address_family']['ipv4']['routes']
+        self.assertEqual(len(routes), 200)
+
+    def test_iosxe_show_bgp_all_detail(self):
+        parsed = self.parse('iosxe_show_bgp_all_detail', 101)
+        prefixes = parsed['instance']['default']['vrf']['default']\
+            ['address_family']['ipv4 unicast']['prefixes']
+        self.assertEqual(len(prefixes), 51)
+        self.assertEqual(
+            sum(len(prefix['index']) for prefix in prefixes.values()), 101)
+
+    def test_iosxe_show_mac_address_table(self):
+        parsed = self.parse('iosxe_show_mac_address_table', 300)
+        self.assertEqual(parsed['total_mac_addresses'], 300)
+        self.assertEqual(
+            sum(len(vlan['mac_addresses'])
+                for vlan in parsed['mac_table']['vlans'].values()), 300)
+
+    def test_iosxe_show_interfaces(self):
+        parsed = self.parse('iosxe_show_interfaces', 50)
+        self.assertEqual(len(parsed), 50)
+        self.assertIn('GigabitEthernet2/0/2', parsed)
+
+    def test_nxos_show_interface(self):
+        parsed = self.parse('nxos_show_interface', 50)
+        self.assertEqual(len(parsed), 50)
+        self.assertEqual(
+            parsed['Ethernet2/2']['port_channel']['port_channel_int'],
+            'Port-channel124')
+
+    def test_iosxe_show_logging(self):
+        parsed = self.parse('iosxe_show_logging', 300)
+        self.assertEqual(len(parsed['logs']), 300)
+
+
+class TestScalingBenchmark(unittest.TestCase):
+
+    def test_scaling_benchmark(self):
+        samples = scaling_benchmark('iosxe_show_logging', sizes=[10, 40],
+                                    memory=True)
+        self.assertEqual([sample['size'] for sample in samples], [10, 40])
+        self.assertTrue(all(sample['peak_bytes'] for sample in samples))
+        self.assertIn('time_exponent', samples[1])
+
+    def test_growth_exponents(self):
+        samples = [{'size': 10, 'seconds': 1.0},
+                   {'size': 100, 'seconds': 100.0}]
+        self.assertAlmostEqual(growth_exponents(samples)[0], 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from genie.libs.parser.iosxe.show_platform import ShowVersion
+from genie.libs.parser.iosxe.show_routing import ShowIpRoute
+from genie.libs.parser.iosxe.show_vrf import ShowVrf
+from genie.libs.parser.utils.techsupport import iter_sections, \
+                                                parse_tech_support
+from genie.libs.parser.utils.tests.fake_device import FakeDevice, \
+                                                     golden_output
+
+SECTIONS = [('show version', ShowVersion),
+            ('show ip route', ShowIpRoute),
+            ('show vrf', ShowVrf)]
+
+
+def banner(command):
+    return '------------------ {} ------------------\n'.format(command)
+
+
+class TestTechSupport(unittest.TestCase):
+
+    def setUp(self):
+        self.device = FakeDevice('R1', 'iosxe', {})
+        self.outputs = {command: golden_output('iosxe', parser.__name__)
+                                 .rstrip('\n') + '\n'
+                        for command, parser in SECTIONS}
+        self.expected = {command: parser(device=None).parse(
+                             output=self.outputs[command])
+                         for command, parser in SECTIONS}
+
+        capture = ['R1#show tech-support\n', '\n']
+        for command, _ in SECTIONS:
+            capture.append(banner(command))
+            capture.append(self.outputs[command])
+        capture.append(banner('show   platform  unknown-thing'))
+        capture.append('nothing to see\n')
+        capture.append(banner('show bgp all summary'))
+        capture.append('% BGP not active\n')
+        capture.append(banner('show version'))
+        capture.append('repeated section\n')
+        self.capture = ''.join(capture)
+
+    def test_iter_sections(self):
+        sections = list(iter_sections(self.capture.splitlines(True)))
+        self.assertEqual([command for command, _ in sections],
+                         ['show version', 'show ip route', 'show vrf',
+                          'show platform unknown-thing',
+                          'show bgp all summary', 'show version'])
+        self.assertEqual(sections[1][1].splitlines(),
+                         self.outputs['show ip route'].splitlines())
+
+    def test_nxos_banners(self):
+        capture = '`show version`\nCisco Nexus\n\n`show module`\nMod\n'
+        self.assertEqual(list(iter_sections(capture)),
+                         [('show version', 'Cisco Nexus\n\n'),
+                          ('show module', 'Mod\n')])
+
+    def test_parse_processes(self):
+        errors = {}
+        result = parse_tech_support(self.device, self.capture, max_workers=2,
+                                    errors=errors)
+        self.assertEqual(result, self.expected)
+        self.assertEqual(list(result), [command for command, _ in SECTIONS])
+        self.assertEqual(set(errors), {'show platform unknown-thing',
+                                       'show bgp all summary'})
+
+    def test_parse_threads(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = parse_tech_support(self.device, self.capture,
+                                        executor=executor)
+        self.assertEqual(result, self.expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+import unittest
+
+from genie.libs.parser.iosxe.show_cdp import ShowCdpNeighborsDetail
+from genie.libs.parser.iosxe.show_lldp import ShowLldpNeighborsDetail
+from genie.libs.parser.nxos.show_cdp import ShowCdpNeighborsDetail as \
+                                           NxosShowCdpNeighborsDetail
+from genie.libs.parser.nxos.show_lldp import ShowLldpNeighborsDetail as \
+                                            NxosShowLldpNeighborsDetail
+from genie.libs.parser.iosxr.show_cdp import ShowCdpNeighborsDetail as \
+                                            XrShowCdpNeighborsDetail
+from genie.libs.parser.utils.benchmark import TopologyWorkload
+from genie.libs.parser.utils.tests.fake_device import FakeDevice, \
+                                                      golden_outputs
+from genie.libs.parser.utils.topology import InterfaceNames, Link, \
+                                             Topology, device_name, \
+                                             neighbor_entries
+
+PARSERS = [('iosxe', ShowCdpNeighborsDetail),
+           ('iosxe', ShowLldpNeighborsDetail),
+           ('nxos', NxosShowCdpNeighborsDetail),
+           ('nxos', NxosShowLldpNeighborsDetail),
+           ('iosxr', XrShowCdpNeighborsDetail)]
+
+
+def cdp(*entries):
+    return {'total_entries_displayed': len(entries),
+            'index': {index: {'device_id': device_id,
+                              'local_interface': local,
+                              'port_id': port,
+                              'platform': 'cisco',
+                              'hold_time': 120,
+                              'entry_addresses': {},
+                              'management_addresses': {}}
+                      for index, (local, device_id, port) in
+                      enumerate(entries, 1)}}
+
+
+def lldp(*entries):
+    interfaces = {}
+    for local, system_name, port in entries:
+        interfaces.setdefault(local, {'port_id': {}})['port_id'][port] = {
+            'neighbors': {system_name: {'system_name': system_name,
+                                        'chassis_id': '0000.0000.0001',
+                                        'time_remaining': 100}}}
+    return {'total_entries': len(entries), 'interfaces': interfaces}
+
+
+class TestNames(unittest.TestCase):
+
+    def test_interfaces(self):
+        names = InterfaceNames()
+        for name in ('Gi1/0/1', 'gi1/0/1', 'GigabitEthernet1/0/1',
+                     'GigabitEthernet 1/0/1'):
+            self.assertEqual(names(name), 'GigabitEthernet1/0/1')
+        self.assertEqual(names('Eth1/1'), 'Ethernet1/1')
+        self.assertEqual(names('port-channel10'), 'Port-channel10')
+        self.assertEqual(names('mgmt0'), 'mgmt0')
+        # unknown types are kept
+        self.assertEqual(names('gbe0'), 'gbe0')
+        self.assertEqual(names('C8F9F9D61BC2:P1'), 'C8F9F9D61BC2:P1')
+
+    def test_os(self):
+        # the full names of each os agree
+        xr, generic = InterfaceNames('iosxr'), InterfaceNames()
+        self.assertEqual(xr('Te0/0/0/1'), generic('TenGigabitEthernet0/0/0/1'))
+        self.assertEqual(xr('TenGigE0/0/0/1'), 'TenGigabitEthernet0/0/0/1')
+        self.assertEqual(xr('Hu0/0/0/1'), generic('HundredGigabitEthernet'
+                                                  '0/0/0/1'))
+        # the abbreviations of each os differ
+        self.assertEqual(xr('Fi0/0/0/1'), 'FiftyGigabitEthernet0/0/0/1')
+        self.assertEqual(generic('Fi1/0/1'), 'FiveGigabitEthernet1/0/1')
+
+    def test_devices(self):
+        self.assertEqual(device_name('R1.example.com'), 'r1')
+        self.assertEqual(device_name('R1.example.com', strip_domain=False),
+                         'r1.example.com')
+        self.assertEqual(device_name('SW1(FOC1234X0AB)'), 'sw1')
+        self.assertEqual(device_name('10.1.1.1'), '10.1.1.1')
+
+
+class TestTopology(unittest.TestCase):
+
+    def test_link(self):
+        topology = Topology()
+        added, removed = topology.add(
+            'R1', cdp(('GigabitEthernet1/0/1', 'SW2.example.com(FOX1)',
+                       'Ethernet1/1')), os='iosxe')
+        self.assertEqual(added, [Link('r1', 'GigabitEthernet1/0/1', 'sw2',
+                                      'Ethernet1/1')])
+        self.assertEqual(removed, [])
+        # the other side, through lldp and abbreviated names, is the same
+        # link
+        added, removed = topology.add(
+            'sw2', lldp(('Ethernet1/1', 'r1.example.com', 'Gi1/0/1')),
+            os='nxos')
+        self.assertEqual((added, removed), ([], []))
+        self.assertEqual(len(topology), 1)
+        self.assertEqual(topology.link('R1', 'Gi1/0/1'),
+                         Link('r1', 'GigabitEthernet1/0/1', 'sw2',
+                              'Ethernet1/1'))
+        self.assertEqual(topology.link('SW2.example.com', 'Eth1/1'),
+                         Link('sw2', 'Ethernet1/1', 'r1',
+                              'GigabitEthernet1/0/1'))
+        self.assertIsNone(topology.link('R1', 'Gi1/0/2'))
+        self.assertIsNone(topology.link('R9', 'Gi1/0/1'))
+        self.assertEqual(topology.neighbors('r1'), [
+            Link('r1', 'GigabitEthernet1/0/1', 'sw2', 'Ethernet1/1')])
+
+    def test_incremental(self):
+        topology = Topology()
+        topology.add('R1', cdp(('Gi1', 'R2', 'Gi1'), ('Gi2', 'R3', 'Gi1')))
+        topology.add('R2', cdp(('Gi1', 'R1', 'Gi1')))
+        self.assertEqual(len(topology), 2)
+        # R1 loses R3 and still reports R2
+        added, removed = topology.add('R1', cdp(('Gi1', 'R2', 'Gi1')))
+        self.assertEqual(added, [])
+        self.assertEqual(removed, [Link('r1', 'GigabitEthernet2', 'r3',
+                                        'GigabitEthernet1')])
+        # R2 still reports the link R1 no longer sees
+        added, removed = topology.add('R1', cdp())
+        self.assertEqual((added, removed), ([], []))
+        self.assertEqual(len(topology), 1)
+        self.assertEqual(topology.remove('R2'), [
+            Link('r2', 'GigabitEthernet1', 'r1', 'GigabitEthernet1')])
+        self.assertEqual(len(topology), 0)
+        self.assertEqual(list(topology.links()), [])
+
+    def test_shared_segment(self):
+        topology = Topology()
+        topology.add('R1', cdp(('Gi1', 'R2', 'Gi1'), ('Gi1', 'R3', 'Gi1')))
+        self.assertEqual(len(topology.peers('R1', 'Gi1')), 2)
+        topology.add('R1', cdp(('Gi1', 'R3', 'Gi1')))
+        self.assertEqual(topology.peers('R1', 'Gi1'), [
+            Link('r1', 'GigabitEthernet1', 'r3', 'GigabitEthernet1')])
+
+    def test_device(self):
+        device = FakeDevice('R1', 'iosxr', {})
+        topology = Topology()
+        topology.add(device, cdp(('Te0/0/0/1', 'R2', 'Te1/0/1')))
+        self.assertEqual(topology.link('R1', 'TenGigE0/0/0/1').interface,
+                         'TenGigabitEthernet0/0/0/1')
+        self.assertEqual(topology.device_os[topology.device('R1')], 'iosxr')
+
+    def test_order(self):
+        # 'Fi' is FiftyGigE on iosxr, FiveGigabitEthernet in the generic
+        # table read while the os of XR1 is unknown
+        reports = [('R1', lldp(('Gi1', 'XR1', 'Fi0/0/0/1')), 'iosxe'),
+                   ('XR1', lldp(('FiftyGigE0/0/0/1', 'R1', 'Gi1')), 'iosxr')]
+        for order in (reports, reports[::-1]):
+            with self.subTest(first=order[0][0]):
+                topology = Topology()
+                for name, parsed, os_name in order:
+                    topology.add(name, parsed, os=os_name)
+                self.assertEqual(list(topology.links()), [
+                    Link('r1', 'GigabitEthernet1', 'xr1',
+                         'FiftyGigabitEthernet0/0/0/1')] if order is reports
+                    else [Link('xr1', 'FiftyGigabitEthernet0/0/0/1', 'r1',
+                               'GigabitEthernet1')])
+                self.assertEqual(topology.link('XR1', 'Fi0/0/0/1').peer_device,
+                                 'r1')
+
+    def test_merge(self):
+        # two names of one interface of XR1 before its os is known
+        topology = Topology()
+        topology.add('R1', cdp(('Gi1', 'XR1', 'Fi0/0/0/1')), os='iosxe')
+        topology.add('R2', cdp(('Gi1', 'XR1', 'FiftyGigE0/0/0/1')),
+                     os='iosxe')
+        self.assertEqual(len(topology.neighbors('XR1')), 2)
+        topology.device('XR1', os='iosxr')
+        self.assertEqual(len(topology), 2)
+        self.assertEqual(sorted(link.peer_device for link in
+                                topology.peers('XR1', 'Fi0/0/0/1')),
+                         ['r1', 'r2'])
+        self.assertEqual(topology.link('R2', 'Gi1').peer_interface,
+                         'FiftyGigabitEthernet0/0/0/1')
+        # the links of the merged interface are forgotten with their device
+        self.assertEqual(len(topology.remove('R2')), 1)
+        self.assertEqual(len(topology.neighbors('XR1')), 1)
+
+    def test_golden(self):
+        for os_name, parser_class in PARSERS:
+            for output, arguments in golden_outputs(os_name,
+                                                    parser_class.__name__):
+                with self.subTest(os=os_name, parser=parser_class.__name__):
+                    parsed = parser_class(device=None).parse(output=output,
+                                                             **arguments)
+                    protocol, entries = neighbor_entries(parsed)
+                    self.assertEqual(protocol, 'lldp' if 'Lldp' in
+                                     parser_class.__name__ else 'cdp')
+                    topology = Topology()
+                    added, _ = topology.add('local', parsed, os=os_name)
+                    self.assertEqual(len(added), len(topology))
+                    self.assertLessEqual(len(topology), len(entries))
+                    for link in added:
+                        self.assertEqual(topology.link(
+                            link.peer_device, link.peer_interface),
+                            link._replace(device=link.peer_device,
+                                          interface=link.peer_interface,
+                                          peer_device=link.device,
+                                          peer_interface=link.interface))
+
+    def test_synthetic(self):
+        workload = TopologyWorkload(devices=50, links=400)
+        topology = Topology()
+        for device in range(50):
+            os_name, parsed = workload.parsed(device)
+            topology.add(workload.name(device), parsed, os=os_name)
+        # both sides report each link, under different names
+        self.assertEqual(len(topology), 400)
+        self.assertEqual(len(topology.interface_names), 800)
+
+
+if __name__ == '__main__':
+    unittest.main()
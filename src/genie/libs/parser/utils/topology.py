@@ -0,0 +1,429 @@
+'''Topology of the CDP and LLDP neighbors of many devices
+
+The neighbor parsers of every os return what one device sees:
+
+    * IOS-XE/NX-OS/IOS-XR ``ShowCdpNeighborsDetail``: index -> entry with
+      ``device_id``, ``local_interface`` and ``port_id``
+    * IOS-XE/NX-OS/IOS-XR ``ShowLldpNeighborsDetail``: interfaces -> local
+      interface -> port_id -> remote port -> neighbors -> system name
+
+Stitching those into links means matching the names a device gives its own
+interfaces against the names its neighbors report, ``Gi1/0/1`` against
+``GigabitEthernet1/0/1``, ``TenGigE0/0/0/1`` against ``Te0/0/0/1`` and
+``R1`` against ``R1.example.com``.  `Topology` ingests the parsed outputs
+one device at a time and keeps the links in an adjacency index:
+
+    >>> topology = Topology()
+    >>> topology.add('R1', ShowCdpNeighborsDetail(device=r1).parse(),
+    ...              os='iosxe')
+    >>> topology.add('R2', ShowLldpNeighborsDetail(device=r2).parse(),
+    ...              os='nxos')
+    >>> topology.link('R1', 'Gi1/0/1')
+    Link(device='r1', interface='GigabitEthernet1/0/1', peer_device='r2',
+         peer_interface='Ethernet1/1')
+
+The names are normalized once through precomputed tables, `InterfaceNames`
+per os and `device_name`, and every distinct name is only normalized once.
+The interfaces a neighbor reports on a device of unknown os are read with the
+generic table, and read again with the table of its os once it is known,
+so the links do not depend on the order the devices are added in.
+Devices and interfaces are numbered, a link is a pair of interface numbers
+and lives as long as one side reports it through one protocol.  Adding the
+output of a device again replaces what it reported before with that protocol
+and only updates the links that changed.
+'''
+
+# python
+import re
+import logging
+import collections
+from array import array
+
+from .common import INTERFACE_ABBREVIATION_MAPPING_TABLE
+
+log = logging.getLogger(__name__)
+
+Link = collections.namedtuple('Link', ['device', 'interface', 'peer_device',
+                                       'peer_interface'])
+
+# full names given to the same interface type by the different os, mapped
+# to the name used by the topology
+FULL_NAME_ALIASES = {
+    'TenGigE': 'TenGigabitEthernet',
+    'FortyGigE': 'FortyGigabitEthernet',
+    'FiftyGigE': 'FiftyGigabitEthernet',
+    'TwentyFiveGigabitEthernet': 'TwentyFiveGigE',
+    'HundredGigabitEthernet': 'HundredGigE',
+    'TwoHundredGigE': 'TwoHundredGigabitEthernet',
+    'FourHundredGigabitEthernet': 'FourHundredGigE',
+}
+
+# interface type and number, 'Gi1/0/1', 'Bundle-Ether10', 'port-channel 5'
+_INTERFACE = re.compile(r'^(?P<type>[A-Za-z][-A-Za-z]*?)(?P<number>\d\S*)$')
+
+# 'SW1(FOC1234X0AB)', the serial number nx-os appends to its device id
+_SERIAL = re.compile(r'\([^)]*\)$')
+
+_ADDRESS = re.compile(r'^[\d.]+$|:')
+
+# lldp values standing for a missing system name
+_NOT_ADVERTISED = {'not advertised', 'null'}
+
+
+class InterfaceNames(object):
+    '''Normalize the interface names of one os
+
+    The abbreviations of ``INTERFACE_ABBREVIATION_MAPPING_TABLE`` for the os
+    and the full names themselves are matched without case, the full names
+    are mapped through `FULL_NAME_ALIASES` so all os agree on them.
+
+        Args:
+            os (`str`): os naming the interfaces, 'generic' when unknown
+    '''
+
+    def __init__(self, os='generic'):
+        self.os = os
+        table = dict(INTERFACE_ABBREVIATION_MAPPING_TABLE['generic'])
+        table.update(INTERFACE_ABBREVIATION_MAPPING_TABLE.get(os, {}))
+        self.types = {}
+        for full in set(table.values()) | set(FULL_NAME_ALIASES):
+            self.types[full.lower()] = FULL_NAME_ALIASES.get(full, full)
+        for short, full in table.items():
+            self.types.setdefault(short.lower(),
+                                  FULL_NAME_ALIASES.get(full, full))
+        # normalized name of every name seen
+        self.names = {}
+
+    def __call__(self, name):
+        try:
+            return self.names[name]
+        except KeyError:
+            pass
+        normalized = name.replace(' ', '')
+        m = _INTERFACE.match(normalized)
+        if m:
+            full = self.types.get(m.group('type').lower())
+            if full is not None:
+                normalized = full + m.group('number')
+        self.names[name] = normalized
+        return normalized
+
+
+def device_name(name, strip_domain=True):
+    '''Normalize a device name
+
+        Args:
+            name (`str`): hostname, cdp device id or lldp system name
+            strip_domain (`bool`): drop the domain of a fully qualified name
+
+        Returns:
+            `str`, lower case without the serial number nx-os appends
+    '''
+    name = _SERIAL.sub('', name.strip()).lower()
+    if strip_domain and not _ADDRESS.search(name):
+        name = name.split('.', 1)[0]
+    return name
+
+
+def _cdp_neighbors(parsed):
+    for entry in parsed.get('index', {}).values():
+        yield (entry.get('local_interface'),
+               entry.get('device_id') or entry.get('system_name'),
+               entry.get('port_id'))
+
+
+def _lldp_neighbors(parsed):
+    for local, interface in parsed.get('interfaces', {}).items():
+        for port, port_dict in interface.get('port_id', {}).items():
+            for neighbor, entry in port_dict.get('neighbors', {}).items():
+                for name in (entry.get('system_name'), neighbor,
+                             entry.get('chassis_id')):
+                    if name and name.lower() not in _NOT_ADVERTISED:
+                        yield local, name, port
+                        break
+
+
+def neighbor_entries(parsed):
+    '''The neighbors of a parsed CDP or LLDP neighbors detail output
+
+        Args:
+            parsed (`dict`): result of a ShowCdpNeighborsDetail or
+                             ShowLldpNeighborsDetail
+
+        Returns:
+            (protocol, list of (local interface, neighbor, port)) tuple, the
+            protocol is 'cdp' or 'lldp'
+    '''
+    if 'index' in parsed or 'total_entries_displayed' in parsed:
+        protocol, entries = 'cdp', _cdp_neighbors(parsed)
+    else:
+        protocol, entries = 'lldp', _lldp_neighbors(parsed)
+    return protocol, [entry for entry in entries if all(entry)]
+
+
+class Topology(object):
+    '''Links between devices, from their CDP and LLDP neighbors
+
+    Device `d` is ``devices[d]``, interface `i` is ``interface_names[i]`` of
+    device ``interface_devices[i]``.  A link is stored once per direction in
+    ``_peers``, the first peer of an interface or -1, with ``_more`` holding
+    the other peers of the interfaces seeing several, and counted in
+    ``_links`` by the observations reporting it.
+
+        Args:
+            strip_domain (`bool`): match 'r1' and 'r1.example.com'
+    '''
+
+    def __init__(self, strip_domain=True):
+        self.strip_domain = strip_domain
+        self.devices = []
+        self.device_os = []
+        self._device_ids = {}
+        self._device_names = {}
+        self.interface_names = []
+        self.interface_devices = array('i')
+        # interface number by normalized name, per device
+        self._interfaces = []
+        # interface number by reported name, per device of unknown os
+        self._raw_names = {}
+        self._peers = array('i')
+        self._more = {}
+        # observation count by link, the two interfaces packed in an int
+        self._links = {}
+        # packed (local, remote) pairs reported by (device, protocol)
+        self._reported = {}
+        self._names = {}
+
+    def __len__(self):
+        return len(self._links)
+
+    def _names_of(self, os):
+        names = self._names.get(os)
+        if names is None:
+            names = self._names[os] = InterfaceNames(os)
+        return names
+
+    def device(self, name, os=None):
+        '''Number of a device, added when unknown'''
+        try:
+            number = self._device_names[name]
+        except KeyError:
+            normalized = device_name(name, self.strip_domain)
+            number = self._device_ids.get(normalized)
+            if number is None:
+                number = self._device_ids[normalized] = len(self.devices)
+                self.devices.append(normalized)
+                self.device_os.append(None)
+                self._interfaces.append({})
+            self._device_names[name] = number
+        if os and self.device_os[number] is None:
+            self.device_os[number] = os
+            self._rename(number)
+        return number
+
+    def _rename(self, device):
+        '''Read the interface names of a device again with its os table
+
+        Interfaces the os table gives the same name are merged into the
+        first one, the links reported on the others move to it.
+        '''
+        raw_names = self._raw_names.pop(device, None)
+        if not raw_names:
+            return
+        names = self._names_of(self.device_os[device])
+        # the interfaces sharing a name are merged into the lowest number
+        merged = {}
+
+        def kept(number):
+            while number in merged:
+                number = merged[number]
+            return number
+
+        normalized = {}
+        for name, number in raw_names.items():
+            name = names(name)
+            number, other = kept(number), kept(normalized.setdefault(
+                name, number))
+            if other != number:
+                merged[max(number, other)] = min(number, other)
+        # an interface is named by the first name read for it
+        interfaces, named = {}, set()
+        for name, number in normalized.items():
+            number = interfaces[name] = kept(number)
+            if number not in named:
+                named.add(number)
+                self.interface_names[number] = name
+        self._interfaces[device] = interfaces
+        if merged:
+            self._merge({number: kept(number) for number in merged})
+
+    def _merge(self, merged):
+        '''Move the reported links of interfaces to the ones they merged
+        into'''
+        for key, pairs in list(self._reported.items()):
+            moved = set()
+            for pair in pairs:
+                local, remote = pair >> 32, pair & 0xffffffff
+                moved.add(merged.get(local, local) << 32 |
+                          merged.get(remote, remote))
+            if moved != set(pairs):
+                self._update(key, moved)
+
+    def interface(self, device, name):
+        '''Number of an interface of a device number, added when unknown
+
+        The names are read with the table of the os of the device, the
+        generic one while it is unknown, until `device` is given its os.
+        '''
+        os = self.device_os[device]
+        normalized = self._names_of(os or 'generic')(name)
+        interfaces = self._interfaces[device]
+        number = interfaces.get(normalized)
+        if number is None:
+            number = interfaces[normalized] = len(self.interface_names)
+            self.interface_names.append(normalized)
+            self.interface_devices.append(device)
+            self._peers.append(-1)
+        if os is None:
+            self._raw_names.setdefault(device, {})[name] = number
+        return number
+
+    def _connect(self, first, second):
+        if self._peers[first] < 0:
+            self._peers[first] = second
+        else:
+            self._more.setdefault(first, set()).add(second)
+
+    def _disconnect(self, first, second):
+        more = self._more.get(first)
+        if self._peers[first] == second:
+            self._peers[first] = more.pop() if more else -1
+        elif more:
+            more.discard(second)
+        if more is not None and not more:
+            del self._more[first]
+
+    def _observe(self, pair, count):
+        '''Count an observation in or out, returns the link when it changed'''
+        local, remote = pair >> 32, pair & 0xffffffff
+        key = local << 32 | remote if local < remote else remote << 32 | local
+        observed = self._links.get(key, 0) + count
+        if observed > 0:
+            self._links[key] = observed
+            if observed == count:
+                self._connect(local, remote)
+                self._connect(remote, local)
+                return self._link(local, remote)
+        elif key in self._links:
+            del self._links[key]
+            self._disconnect(local, remote)
+            self._disconnect(remote, local)
+            return self._link(local, remote)
+        return None
+
+    def add(self, device, parsed, os=None):
+        '''Replace the neighbors a device reports with one protocol
+
+            Args:
+                device (`str`): hostname of the device, or a device object
+                                with ``name`` and ``os``
+                parsed (`dict`): result of its ShowCdpNeighborsDetail or
+                                 ShowLldpNeighborsDetail
+                os (`str`): os of the device, names its interfaces
+
+            Returns:
+                (added, removed) lists of `Link`
+        '''
+        protocol, entries = neighbor_entries(parsed)
+        os = os or getattr(device, 'os', None)
+        local_device = self.device(getattr(device, 'name', device), os)
+        pairs = set()
+        for local, neighbor, port in entries:
+            remote_device = self.device(neighbor)
+            pairs.add(self.interface(local_device, local) << 32 |
+                      self.interface(remote_device, port))
+        return self._update((local_device, protocol), pairs)
+
+    def remove(self, device):
+        '''Forget the neighbors a device reported
+
+            Returns:
+                list of the removed `Link`
+        '''
+        number = self._device_names.get(getattr(device, 'name', device))
+        removed = []
+        for protocol in ('cdp', 'lldp'):
+            if (number, protocol) in self._reported:
+                removed.extend(self._update((number, protocol), set())[1])
+        return removed
+
+    def _update(self, key, pairs):
+        old = self._reported.get(key)
+        old = set(old) if old is not None else set()
+        added, removed = [], []
+        for pair in pairs - old:
+            link = self._observe(pair, 1)
+            if link is not None:
+                added.append(link)
+        for pair in old - pairs:
+            link = self._observe(pair, -1)
+            if link is not None:
+                removed.append(link)
+        if pairs:
+            self._reported[key] = array('q', sorted(pairs))
+        else:
+            self._reported.pop(key, None)
+        return added, removed
+
+    def _link(self, local, remote):
+        return Link(self.devices[self.interface_devices[local]],
+                    self.interface_names[local],
+                    self.devices[self.interface_devices[remote]],
+                    self.interface_names[remote])
+
+    def _find(self, device, interface):
+        number = self._device_names.get(device)
+        if number is None:
+            number = self._device_ids.get(device_name(device,
+                                                      self.strip_domain))
+            if number is None:
+                return None
+        names = self._names_of(self.device_os[number] or 'generic')
+        return self._interfaces[number].get(names(interface))
+
+    def link(self, device, interface):
+        '''The link of an interface
+
+            Returns:
+                `Link`, None when the interface has no neighbor
+        '''
+        number = self._find(device, interface)
+        if number is None or self._peers[number] < 0:
+            return None
+        return self._link(number, self._peers[number])
+
+    def _all_peers(self, number):
+        if number is None or self._peers[number] < 0:
+            return []
+        return [self._link(number, peer) for peer in
+                [self._peers[number]] + sorted(self._more.get(number, ()))]
+
+    def peers(self, device, interface):
+        '''All the links of an interface, several on a shared segment'''
+        return self._all_peers(self._find(device, interface))
+
+    def neighbors(self, device):
+        '''The links of a device'''
+        number = self._device_names.get(device)
+        if number is None:
+            number = self._device_ids.get(device_name(device,
+                                                      self.strip_domain))
+            if number is None:
+                return []
+        return [link for interface in self._interfaces[number].values()
+                for link in self._all_peers(interface)]
+
+    def links(self):
+        '''Every link once'''
+        for key in self._links:
+            yield self._link(key >> 32, key & 0xffffffff)